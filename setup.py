@@ -46,8 +46,10 @@ class CleanCommand(Command):
                 '*_notes.md',
                 '*_analysis.md',
                 '.slide_extract_progress*.json',
+                '.slide_extract_partial_*.md',
                 '.slide_dir_extract_manifest.txt',
                 '.slide_dir_extract_progress.json',
+                '.slide_dir_extract_batch_api.json',
             ],
             'build': [
                 '**/__pycache__',
@@ -264,6 +266,7 @@ setup(
         "console_scripts": [
             "slide-extract=slide_extract.cli.single:main",
             "slide-dir-extract=slide_extract.cli.batch:main",
+            "slide-extract-mock-server=slide_extract.cli.mock_server:main",
         ],
     },
     cmdclass={
@@ -19,6 +19,8 @@ Examples:
   slide-dir-extract -i ./pdfs -p prompt.md -o ./outputs --suffix "_notes"
   slide-dir-extract -i ./presentations -p prompt.md --resume
   slide-dir-extract -i ./presentations -p prompt.md --clean-start
+  slide-dir-extract -i ./presentations -p prompt.md --batch-api
+  slide-dir-extract -i ./presentations -p prompt.md --plan --plan-json plan.json
         """,
     )
 
@@ -63,6 +65,25 @@ Examples:
         help="Show current processing status and exit"
     )
 
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="Submit all slides through the provider's offline batch API (OpenAI, Anthropic)"
+    )
+    
+    parser.add_argument(
+        "--batch-poll-interval",
+        type=float,
+        default=60.0,
+        help="Seconds between batch job status checks (default: 60)"
+    )
+    
+    parser.add_argument(
+        "--batch-max-wait",
+        type=float,
+        help="Exit after waiting this many seconds; rerun with --batch-api to resume collection"
+    )
+
     # Add common arguments
     CommonCLI.add_common_arguments(parser)
 
@@ -70,6 +91,7 @@ Examples:
 
 def main() -> int:
     """Batch directory processor with manifest-based resume capability."""
+    llm_client = None
     try:
         # Parse arguments
         args = parse_arguments()
@@ -124,22 +146,76 @@ def main() -> int:
         prompt_path = Path(args.prompt)
         prompt_text = CommonCLI.load_and_validate_prompt(prompt_path)
         
+        # Dry run: estimate the run without processing
+        if args.plan or args.plan_json:
+            pdf_files = batch_processor.discover_pdfs()
+            if not pdf_files:
+                raise CLIError(f"No PDF files found in {input_dir}")
+            return CommonCLI.run_plan(
+                Path(args.config) if args.config else None,
+                pdf_files,
+                prompt_text,
+                pack_slides=args.pack_slides,
+                plan_json=args.plan_json
+            )
+        
         # Initialize LLM (unless no-ai mode)
         llm_client = CommonCLI.initialize_llm(
             Path(args.config) if args.config else None,
-            args.no_ai
+            args.no_ai,
+            cache_mode=args.cache_mode,
+            skip_health_check=args.skip_health_check,
+            cassette=CommonCLI.cassette_from_args(args)
+        )
+        
+        slide_packer = CommonCLI.create_slide_packer(
+            Path(args.config) if args.config else None,
+            args.no_ai,
+            pack_slides=args.pack_slides
+        )
+        
+        retry_policy = CommonCLI.create_retry_policy(
+            Path(args.config) if args.config else None
+        ) if llm_client else None
+        
+        session = CommonCLI.create_session(
+            Path(args.config) if args.config else None,
+            args.no_ai,
+            session=args.session
         )
         
         # Process directory
         logger.info(f"Processing directory: {input_dir} -> {output_dir}")
         logger.info(f"Output naming: [filename]{args.suffix}{args.extension}")
         
-        result = batch_processor.process_directory(
-            llm_client=llm_client,
-            prompt=prompt_text,
-            resume=args.resume,
-            clean_start=args.clean_start
-        )
+        telemetry = CommonCLI.create_telemetry(llm_client, args.telemetry_report)
+        if args.batch_api:
+            if telemetry:
+                # Provider batch jobs report no per-request latency
+                logger.warning("--telemetry-report is not supported with --batch-api; no report written")
+                telemetry = None
+            result = batch_processor.process_directory_batch_api(
+                llm_client=llm_client,
+                prompt=prompt_text,
+                resume=args.resume,
+                clean_start=args.clean_start,
+                poll_interval=args.batch_poll_interval,
+                max_wait=args.batch_max_wait,
+                retry_policy=retry_policy
+            )
+        else:
+            result = batch_processor.process_directory(
+                llm_client=llm_client,
+                prompt=prompt_text,
+                resume=args.resume,
+                clean_start=args.clean_start,
+                slide_packer=slide_packer,
+                retry_policy=retry_policy,
+                telemetry=telemetry,
+                session=session
+            )
+        
+        CommonCLI.write_telemetry_report(telemetry, args.telemetry_report)
         
         # Final status summary
         final_summary = batch_processor.get_status_summary()
@@ -160,6 +236,40 @@ def main() -> int:
             for error_file in final_summary['error_files']:
                 print(f"  - {error_file}")
         
+        cache_summary = CommonCLI.format_cache_summary(llm_client)
+        if cache_summary:
+            logger.info(cache_summary)
+            print(cache_summary)
+        
+        retry_summary = CommonCLI.format_retry_summary(retry_policy)
+        if retry_summary:
+            logger.info(retry_summary)
+            print(retry_summary)
+        
+        cassette_summary = CommonCLI.format_cassette_summary(llm_client)
+        if cassette_summary:
+            logger.info(cassette_summary)
+        
+        hedging_summary = CommonCLI.format_hedging_summary(llm_client)
+        if hedging_summary:
+            logger.info(hedging_summary)
+            print(hedging_summary)
+        
+        failover_summary = CommonCLI.format_failover_summary(llm_client)
+        if failover_summary:
+            logger.info(failover_summary)
+            print(failover_summary)
+        
+        key_pool_summary = CommonCLI.format_key_pool_summary(llm_client)
+        if key_pool_summary:
+            logger.info(key_pool_summary)
+            print(key_pool_summary)
+        
+        routing_summary = CommonCLI.format_routing_summary(llm_client)
+        if routing_summary:
+            logger.info(routing_summary)
+            print(routing_summary)
+        
         return result
         
     except KeyboardInterrupt:
@@ -177,6 +287,11 @@ def main() -> int:
         logger = logging.getLogger(__name__)
         logger.exception(f"Unexpected error during batch processing: {e}")
         return 1
+    
+    finally:
+        # Delete provider-side resources such as Gemini cached content
+        if llm_client is not None:
+            llm_client.close()
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -1,14 +1,30 @@
 """Shared CLI utilities and common functionality."""
 
+import json
 import logging
 import sys
 from pathlib import Path
 from typing import Optional, List
 import argparse
 
+from ..core.cassette import CassetteError
 from ..core.config_manager import ConfigManager, ConfigurationError
-from ..core.llm_client import create_llm_client, LLMError
+from ..core.failover import create_failover_client
+from ..core.health_check import HealthCheckError, create_health_check_cache
+from ..core.http_transport import HTTPTransportError, configure_http_transport, start_prewarm
+from ..core.key_pool import KeyPoolError
+from ..core.llm_client import LLMError
+from ..core.model_registry import ModelRegistryError, configure_model_registry
+from ..core.model_router import RoutingError, create_model_router
+from ..core.output_budget import OutputBudgetError
+from ..core.planner import PlanningError, RunPlanner, format_plan_table, write_plan_json
+from ..core.response_cache import CACHE_MODES, create_response_cache, ResponseCacheError
+from ..core.retry_policy import create_retry_policy
+from ..core.session import SessionError, create_conversation_session
+from ..core.slide_packer import create_slide_packer
+from ..core.telemetry import TelemetryCollector, TelemetryError
 from ..core.file_manager import FileManager, FileManagerError
+from ..core.pdf_processor import PDFProcessingError
 
 class CommonCLI:
     """Shared CLI operations for both single and batch processing."""
@@ -60,7 +76,10 @@ class CommonCLI:
             raise CLIError(str(e))
     
     @staticmethod
-    def initialize_llm(config_path: Optional[Path], no_ai: bool):
+    def initialize_llm(
+        config_path: Optional[Path], no_ai: bool, cache_mode: Optional[str] = None,
+        skip_health_check: bool = False, cassette: Optional[dict] = None
+    ):
         """Initialize LLM client with proper error handling."""
         logger = logging.getLogger(__name__)
         
@@ -72,13 +91,46 @@ class CommonCLI:
             # Initialize configuration
             config_manager = ConfigManager(config_path)
             
-            # Create LLM client
-            llm_config = config_manager.get_llm_config()
-            llm_client = create_llm_client(llm_config)
+            # Record or replay LLM traffic (command line overrides config)
+            if cassette:
+                config_manager.set_cassette_config(cassette)
+            
+            # Model limits (vision, image size, context window, rate limits)
+            configure_model_registry(config_manager.get_model_overrides())
+            
+            # All provider clients share one pooled HTTP transport
+            configure_http_transport(config_manager.get_connection_pool_config())
+            
+            # Create LLM client (with failover entries, if configured)
+            chain_config = config_manager.get_llm_chain_config()
+            breaker_config = config_manager.get_circuit_breaker_config()
+
+            # Set up response cache (command line overrides config)
+            cache_config = config_manager.get_cache_config()
+            if cache_mode:
+                cache_config["mode"] = cache_mode
+            response_cache = create_response_cache(cache_config)
+
+            llm_client = create_failover_client(
+                chain_config, breaker_config, response_cache=response_cache
+            )
+
+            # Route slides to cheaper or stronger models by complexity, if configured
+            llm_client = create_model_router(
+                llm_client, config_manager.get_routing_config(), response_cache=response_cache
+            )
+
+            # Open pooled connections in the background while the first PDF renders
+            start_prewarm(llm_client.endpoint_urls())
+
+            if skip_health_check:
+                logger.info("Skipping LLM health check")
+                return llm_client
 
-            # Test connection
-            logger.info("Testing LLM connection...")
-            if llm_client.test_connection():
+            # Cheap probe; a recent success is reused from the state file
+            logger.info("Checking LLM health...")
+            health_cache = create_health_check_cache(config_manager.get_health_check_config())
+            if llm_client.health_check(health_cache):
                 model_info = llm_client.get_model_info()
                 logger.info(
                     "LLM connection successful: %s %s",
@@ -90,7 +142,10 @@ class CommonCLI:
                 logger.error("LLM connection test failed")
                 raise CLIError("LLM connection failed")
 
-        except (ConfigurationError, LLMError) as e:
+        except (
+            CassetteError, ConfigurationError, HealthCheckError, HTTPTransportError, KeyPoolError,
+            LLMError, ModelRegistryError, OutputBudgetError, ResponseCacheError, RoutingError
+        ) as e:
             logger.error("LLM initialization failed: %s", e)
             raise CLIError(
                 "No LLM/AI has been configured. "
@@ -98,6 +153,252 @@ class CommonCLI:
                 "follow the README instructions to set up an LLM API key."
             ) from e
     
+    @staticmethod
+    def create_slide_packer(config_path: Optional[Path], no_ai: bool, pack_slides: bool = False):
+        """Create the multi-slide request packer if packing is enabled."""
+        if no_ai:
+            return None
+        
+        try:
+            packing_config = ConfigManager(config_path).get_packing_config()
+        except ConfigurationError as e:
+            raise CLIError(str(e))
+        
+        if pack_slides:
+            packing_config["enabled"] = True
+        
+        slide_packer = create_slide_packer(packing_config)
+        if slide_packer:
+            logging.getLogger(__name__).info(
+                "Packing up to %d slides per request (token budget: %d)",
+                slide_packer.max_slides, slide_packer.token_budget
+            )
+        return slide_packer
+    
+    @staticmethod
+    def create_session(config_path: Optional[Path], no_ai: bool, session: bool = False):
+        """Create the per-deck conversation session if sessions are enabled."""
+        if no_ai:
+            return None
+        
+        try:
+            session_config = ConfigManager(config_path).get_session_config()
+        except ConfigurationError as e:
+            raise CLIError(str(e))
+        
+        if session:
+            session_config["enabled"] = True
+        
+        try:
+            conversation = create_conversation_session(session_config)
+        except SessionError as e:
+            raise CLIError(f"Invalid session configuration: {e}")
+        if conversation:
+            logging.getLogger(__name__).info(
+                "Session mode: history compacted after %d turns (%s)",
+                conversation.max_turns, conversation.strategy
+            )
+        return conversation
+    
+    @staticmethod
+    def run_plan(
+        config_path: Optional[Path], pdf_paths: List[Path], prompt_text: str,
+        pack_slides: bool = False, plan_json: Optional[str] = None
+    ) -> int:
+        """Print the pre-flight estimate for a run without calling any provider."""
+        try:
+            config_manager = ConfigManager(config_path)
+            configure_model_registry(config_manager.get_model_overrides())
+            planner = RunPlanner(
+                config_manager.get_llm_settings(),
+                config_manager.get_planning_config(),
+                slide_packer=CommonCLI.create_slide_packer(config_path, False, pack_slides=pack_slides),
+            )
+            plan = planner.plan(pdf_paths, prompt_text)
+        except (ConfigurationError, ModelRegistryError, PlanningError, PDFProcessingError) as e:
+            raise CLIError(f"Planning failed: {e}")
+        
+        if plan_json == "-":
+            print(json.dumps(plan, indent=2))
+            return 0
+        
+        print(format_plan_table(plan))
+        if plan_json:
+            write_plan_json(plan, Path(plan_json))
+            print(f"\nPlan written to {plan_json}")
+        return 0
+    
+    @staticmethod
+    def create_retry_policy(config_path: Optional[Path]):
+        """Create the retry policy for LLM requests from configuration."""
+        try:
+            retry_config = ConfigManager(config_path).get_retry_config()
+        except ConfigurationError as e:
+            raise CLIError(str(e))
+        
+        return create_retry_policy(retry_config)
+    
+    @staticmethod
+    def format_retry_summary(retry_policy) -> Optional[str]:
+        """Format retry statistics for the run summary."""
+        if retry_policy is None:
+            return None
+        
+        stats = retry_policy.get_stats()
+        if not stats["requests"]:
+            return None
+        
+        by_kind = ", ".join(
+            f"{kind}: {count}" for kind, count in stats["retries_by_kind"].items() if count
+        )
+        return (
+            f"LLM retries: {stats['retries']} over {stats['requests']} requests"
+            + (f" ({by_kind})" if by_kind else "")
+            + f", {stats['failures']} failed, {stats['deadline_exceeded']} hit the slide deadline"
+        )
+    
+    @staticmethod
+    def format_repair_summary(note_generator) -> Optional[str]:
+        """Format section repair statistics for the run summary."""
+        if note_generator is None:
+            return None
+        
+        stats = note_generator.get_repair_stats()
+        if not stats["repaired"] and not stats["failed"]:
+            return None
+        
+        return (
+            f"Section repairs: {stats['repaired']} slides repaired, "
+            f"{stats['failed']} fell back to a full retry"
+        )
+    
+    @staticmethod
+    def format_hedging_summary(llm_client) -> Optional[str]:
+        """Format hedged request statistics for the run summary."""
+        if llm_client is None:
+            return None
+        
+        stats = llm_client.get_hedging_stats()
+        if not stats or not stats["requests"]:
+            return None
+        
+        return (
+            f"Hedged requests: {stats['hedged']}/{stats['requests']} "
+            f"({stats['hedge_rate'] * 100:.1f}%), {stats['hedge_wins']} won by the hedge, "
+            f"{stats['cancelled']} cancelled"
+        )
+    
+    @staticmethod
+    def format_cassette_summary(llm_client) -> Optional[str]:
+        """Format cassette record/replay counts for the run summary."""
+        if llm_client is None:
+            return None
+        
+        stats = llm_client.get_cassette_stats()
+        if not stats:
+            return None
+        
+        if stats["mode"] == "record":
+            return f"Cassette: recorded {stats['recorded']} requests to {stats['path']}"
+        return (
+            f"Cassette: replayed {stats['replayed']} requests from {stats['path']} "
+            f"({stats['misses']} not recorded)"
+        )
+    
+    @staticmethod
+    def cassette_from_args(args: argparse.Namespace) -> Optional[dict]:
+        """Build cassette overrides from --record-cassette/--replay-cassette."""
+        overrides = {}
+        if args.record_cassette:
+            overrides = {"mode": "record", "path": args.record_cassette}
+        elif args.replay_cassette:
+            overrides = {"mode": "replay", "path": args.replay_cassette}
+        if args.replay_time_scale is not None:
+            overrides["time_scale"] = args.replay_time_scale
+        return overrides or None
+    
+    @staticmethod
+    def format_failover_summary(llm_client) -> Optional[str]:
+        """Format failover chain statistics for the run summary."""
+        if llm_client is None or not hasattr(llm_client, "get_failover_stats"):
+            return None
+        
+        stats = llm_client.get_failover_stats()
+        responses = ", ".join(
+            f"{model}: {count}" for model, count in stats["responses_by_model"].items()
+        ) or "none"
+        opened = sum(entry["times_opened"] for entry in stats["entries"])
+        return f"Failover: responses by model ({responses}), circuits opened {opened} times"
+    
+    @staticmethod
+    def format_key_pool_summary(llm_client) -> Optional[str]:
+        """Format per-member API key pool usage for the run summary."""
+        if llm_client is None or not hasattr(llm_client, "get_key_pool_stats"):
+            return None
+        
+        stats = llm_client.get_key_pool_stats()
+        members = ", ".join(
+            f"{member['name']}: {member['requests']} requests, {member['rate_limited']} rate limited"
+            + (f", {member['avg_latency']:.1f}s avg" if member["avg_latency"] is not None else "")
+            for member in stats["members"]
+        )
+        return f"Key pool ({stats['model']}): {members}"
+    
+    @staticmethod
+    def format_routing_summary(llm_client) -> Optional[str]:
+        """Format the mix of routes and models used for the run summary."""
+        if llm_client is None or not hasattr(llm_client, "get_routing_stats"):
+            return None
+        
+        stats = llm_client.get_routing_stats()
+        routes = ", ".join(f"{route}: {count}" for route, count in stats["slides_by_route"].items())
+        models = ", ".join(f"{model}: {count}" for model, count in stats["responses_by_model"].items())
+        return f"Model routing: slides by route ({routes or 'none'}), responses by model ({models or 'none'})"
+    
+    @staticmethod
+    def create_telemetry(llm_client, report_path: Optional[str]) -> Optional[TelemetryCollector]:
+        """Create a telemetry collector when a report was requested and an LLM is in use."""
+        if llm_client is None or not report_path:
+            return None
+        return TelemetryCollector()
+    
+    @staticmethod
+    def write_telemetry_report(telemetry: Optional[TelemetryCollector], report_path: Optional[str]) -> None:
+        """Write the telemetry report and log its batch-level summary."""
+        if telemetry is None:
+            return
+        
+        try:
+            report = telemetry.write_report(report_path)
+        except TelemetryError as e:
+            raise CLIError(str(e))
+        
+        batch = report["batch"]
+        logging.getLogger(__name__).info(
+            "Telemetry: %d requests, %d retries, latency p50 %.2fs / p95 %.2fs, "
+            "%d input / %d output tokens (%d thinking)",
+            batch["requests"], batch["retries"], batch["latency"]["p50"],
+            batch["latency"]["p95"], batch["input_tokens"], batch["output_tokens"],
+            batch["thinking_tokens"]
+        )
+    
+    @staticmethod
+    def format_cache_summary(llm_client) -> Optional[str]:
+        """Format response cache statistics for the run summary."""
+        if llm_client is None:
+            return None
+
+        cache_stats = llm_client.get_cache_stats()
+        if not cache_stats:
+            return None
+
+        return (
+            f"Response cache ({cache_stats['mode']}): "
+            f"{cache_stats['hits']}/{cache_stats['lookups']} hits "
+            f"({cache_stats['hit_rate'] * 100:.1f}%), "
+            f"{cache_stats['writes']} writes, {cache_stats['evictions']} evictions"
+        )
+
     @staticmethod
     def load_and_validate_prompt(prompt_path: Path) -> str:
         """Load and validate prompt file."""
@@ -124,13 +425,22 @@ class CommonCLI:
             logger.info(f"Output written to stdout ({len(content)} characters)")
     
     @staticmethod
-    def add_common_arguments(parser: argparse.ArgumentParser) -> None:
+    def add_common_arguments(parser: argparse.ArgumentParser, multiple_prompts: bool = False) -> None:
         """Add common arguments used by both CLI commands."""
-        parser.add_argument(
-            "--prompt", "-p", 
-            required=True,
-            help="Path to Markdown file containing the generation prompt"
-        )
+        if multiple_prompts:
+            parser.add_argument(
+                "--prompt", "-p",
+                nargs="+",
+                required=True,
+                help="Path(s) to Markdown files containing generation prompts; several prompts "
+                     "share one extraction of each deck and need one --output each"
+            )
+        else:
+            parser.add_argument(
+                "--prompt", "-p", 
+                required=True,
+                help="Path to Markdown file containing the generation prompt"
+            )
         
         parser.add_argument(
             "--config", "-c", 
@@ -149,6 +459,69 @@ class CommonCLI:
             help="Use placeholder mode without AI (for testing)"
         )
         
+        parser.add_argument(
+            "--pack-slides",
+            action="store_true",
+            help="Send several consecutive slides per request (sized from processing.packing)"
+        )
+        
+        parser.add_argument(
+            "--session",
+            action="store_true",
+            help="Process each deck as one provider conversation (sized from processing.session)"
+        )
+        
+        parser.add_argument(
+            "--cache-mode",
+            choices=CACHE_MODES,
+            help="Response cache mode: read (reuse and store), write (refresh), off "
+                 "(default: from config)"
+        )
+
+        cassette_group = parser.add_mutually_exclusive_group()
+        cassette_group.add_argument(
+            "--record-cassette",
+            metavar="PATH",
+            help="Record LLM requests (hashed), responses, token usage and latencies to PATH"
+        )
+        cassette_group.add_argument(
+            "--replay-cassette",
+            metavar="PATH",
+            help="Serve LLM responses from a recorded cassette instead of the network"
+        )
+        
+        parser.add_argument(
+            "--replay-time-scale",
+            type=float,
+            metavar="X",
+            help="Multiply recorded latencies by X on replay (0 = instant; default: 1)"
+        )
+        
+        parser.add_argument(
+            "--skip-health-check",
+            action="store_true",
+            help="Start processing without checking that the LLM provider is reachable"
+        )
+
+        parser.add_argument(
+            "--telemetry-report",
+            metavar="PATH",
+            help="Write per-request telemetry (latency, tokens, retries) with per-deck "
+                 "percentiles as JSON to PATH"
+        )
+        
+        parser.add_argument(
+            "--plan",
+            action="store_true",
+            help="Estimate tokens, requests, time and cost without processing (dry run)"
+        )
+        
+        parser.add_argument(
+            "--plan-json",
+            metavar="PATH",
+            help="Write the --plan estimate as JSON to PATH ('-' for stdout); implies --plan"
+        )
+
         parser.add_argument(
             "--version", 
             action="version", 
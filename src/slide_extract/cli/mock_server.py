@@ -0,0 +1,104 @@
+"""Local OpenAI-compatible stand-in server for offline load testing."""
+
+import argparse
+import logging
+import sys
+
+from .common import CommonCLI
+from ..core.mock_provider import LATENCY_DISTRIBUTIONS, MockChatServer, MockResponder
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command-line arguments for the mock server."""
+    parser = argparse.ArgumentParser(
+        description="Serve deterministic slide analyses over the OpenAI chat-completions API",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  slide-extract-mock-server --port 8080
+  slide-extract-mock-server --latency 2 --latency-spread 0.5 --distribution lognormal \\
+      --tokens-per-second 80 --rate-limit-rate 0.05 --server-error-rate 0.02
+        """,
+    )
+
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument(
+        "--latency", type=float, default=0.0,
+        help="Seconds before the first token; the median for lognormal (default: 0)"
+    )
+    parser.add_argument(
+        "--latency-spread", type=float, default=0.0,
+        help="Uniform: +/- seconds around --latency; lognormal: sigma (default: 0)"
+    )
+    parser.add_argument(
+        "--distribution", choices=LATENCY_DISTRIBUTIONS, default="fixed",
+        help="Latency distribution (default: fixed)"
+    )
+    parser.add_argument(
+        "--tokens-per-second", type=float,
+        help="Output token throughput (default: unlimited)"
+    )
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=0.0,
+        help="Fraction of requests answered with HTTP 429 (default: 0)"
+    )
+    parser.add_argument(
+        "--server-error-rate", type=float, default=0.0,
+        help="Fraction of requests answered with HTTP 500/503 (default: 0)"
+    )
+    parser.add_argument(
+        "--retry-after", type=float, default=1.0,
+        help="Retry-After seconds sent with 429 responses (default: 1)"
+    )
+    parser.add_argument(
+        "--requests-per-minute", type=int,
+        help="Per-API-key request limit, reported in x-ratelimit headers (default: unlimited)"
+    )
+    parser.add_argument(
+        "--no-vision", action="store_true",
+        help="Reject image inputs with HTTP 400, like a text-only local model"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency and failures (default: 0)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging (DEBUG level)")
+
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Run the mock server until interrupted."""
+    args = parse_arguments()
+    CommonCLI.setup_logging(args.verbose, "slide_extract_mock_server.log")
+    logger = logging.getLogger(__name__)
+
+    responder = MockResponder(
+        latency_mean=args.latency,
+        latency_spread=args.latency_spread,
+        latency_distribution=args.distribution,
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+    try:
+        server = MockChatServer(
+            responder, host=args.host, port=args.port, requests_per_minute=args.requests_per_minute,
+            vision=not args.no_vision
+        )
+    except OSError as e:
+        logger.error(f"Cannot start mock server: {e}")
+        return 1
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info(f"Mock server stopped: {responder.get_stats()}")
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,8 +8,11 @@ from typing import List
 
 from .common import CommonCLI, CLIError
 from ..core.pdf_processor import PDFProcessor, PDFProcessingError
+from ..core.model_registry import rendering_options
 from ..core.note_generator import NoteGenerator, NoteGenerationError
-from ..core.progress_manager import ProgressManager
+from ..core.prompt_fanout import (
+    PromptFanOutError, PromptJob, fan_out_workers, generate_deck_for_prompts, pair_prompts_with_outputs
+)
 
 def parse_arguments() -> argparse.Namespace:
     """Parse command-line arguments for single file processing."""
@@ -21,6 +24,8 @@ Examples:
   slide-extract -i presentation.pdf -p prompt.md
   slide-extract -i slide1.pdf slide2.pdf -p prompt.md -o notes.md
   slide-extract -i presentation.pdf -p prompt.md -v --resume
+  slide-extract -i presentation.pdf -p prompt.md --plan
+  slide-extract -i deck.pdf -p notes.md quiz.md -o deck_notes.md deck_quiz.md
         """,
     )
 
@@ -33,7 +38,8 @@ Examples:
 
     parser.add_argument(
         "--output", "-o", 
-        help="Path to output Markdown file (default: write to stdout)"
+        nargs="+",
+        help="Path to output Markdown file, one per prompt (default: write to stdout)"
     )
     
     parser.add_argument(
@@ -49,12 +55,13 @@ Examples:
     )
 
     # Add common arguments
-    CommonCLI.add_common_arguments(parser)
+    CommonCLI.add_common_arguments(parser, multiple_prompts=True)
 
     return parser.parse_args()
 
 def main() -> int:
     """Enhanced single file processor with resume capability."""
+    llm_client = None
     try:
         # Parse arguments
         args = parse_arguments()
@@ -71,94 +78,157 @@ def main() -> int:
         pdf_paths = [Path(path) for path in args.input]
         CommonCLI.validate_pdf_files(pdf_paths)
         
-        prompt_path = Path(args.prompt)
-        output_path = Path(args.output) if args.output else None
+        # One output file per prompt; every prompt shares one extraction of each deck
+        try:
+            prompt_outputs = pair_prompts_with_outputs(
+                [Path(path) for path in args.prompt],
+                [Path(path) for path in args.output] if args.output else None
+            )
+        except PromptFanOutError as e:
+            raise CLIError(str(e))
+        
+        # Dry run: estimate the run without processing
+        if args.plan or args.plan_json:
+            if args.plan_json and len(prompt_outputs) > 1:
+                raise CLIError("--plan-json takes a single --prompt")
+            result = 0
+            for prompt_path, _ in prompt_outputs:
+                result = result or CommonCLI.run_plan(
+                    Path(args.config) if args.config else None,
+                    pdf_paths,
+                    CommonCLI.load_and_validate_prompt(prompt_path),
+                    pack_slides=args.pack_slides,
+                    plan_json=args.plan_json
+                )
+            return result
         
         # Initialize LLM
         llm_client = CommonCLI.initialize_llm(
             Path(args.config) if args.config else None, 
-            args.no_ai
+            args.no_ai,
+            cache_mode=args.cache_mode,
+            skip_health_check=args.skip_health_check,
+            cassette=CommonCLI.cassette_from_args(args)
         )
         
-        # Load prompt
-        prompt_text = CommonCLI.load_and_validate_prompt(prompt_path)
+        # Load prompts
+        prompt_texts = {
+            prompt_path: CommonCLI.load_and_validate_prompt(prompt_path)
+            for prompt_path, _ in prompt_outputs
+        }
         
-        # Initialize processors
-        pdf_processor = PDFProcessor()
-        note_generator = NoteGenerator(llm_client)
+        slide_packer = CommonCLI.create_slide_packer(
+            Path(args.config) if args.config else None,
+            args.no_ai,
+            pack_slides=args.pack_slides
+        )
         
-        # Process each PDF file
-        all_notes = []
+        # Initialize processors (rendering sized for the configured models)
+        pdf_processor = PDFProcessor(**rendering_options(llm_client))
+        retry_policy = CommonCLI.create_retry_policy(
+            Path(args.config) if args.config else None
+        ) if llm_client else None
         
-        for pdf_path in pdf_paths:
-            logger.info(f"Processing PDF: {pdf_path}")
-            
-            # Initialize progress manager for this file
-            progress_manager = ProgressManager(
+        telemetry = CommonCLI.create_telemetry(llm_client, args.telemetry_report)
+        
+        # One generator per prompt (context and sessions are per prompt); all share the client
+        jobs = [
+            PromptJob(
+                prompt_path=prompt_path,
+                prompt=prompt_texts[prompt_path],
                 output_path=output_path,
-                mode='single',
-                file_path=pdf_path
+                note_generator=NoteGenerator(
+                    llm_client, slide_packer=slide_packer, retry_policy=retry_policy, telemetry=telemetry,
+                    session=CommonCLI.create_session(
+                        Path(args.config) if args.config else None,
+                        args.no_ai,
+                        session=args.session
+                    )
+                )
             )
-            
-            # Clean start if requested
-            if args.clean_start:
-                progress_manager.cleanup_state()
-                logger.info("Starting fresh (clean start requested)")
-            
-            # Check for resumable work
-            start_slide = 1
-            if args.resume or progress_manager.has_incomplete_work():
-                if progress_manager.has_incomplete_work():
-                    start_slide, state = progress_manager.get_resume_point()
-                    logger.info(f"Resuming from slide {start_slide} of {pdf_path}")
-                else:
-                    logger.info("No previous progress found, starting from beginning")
+            for prompt_path, output_path in prompt_outputs
+        ]
+        workers = fan_out_workers(llm_client, len(jobs))
+        
+        # Process each PDF file
+        for pdf_path in pdf_paths:
+            logger.info(f"Processing PDF: {pdf_path}")
             
             # Get PDF info
             pdf_info = pdf_processor.get_pdf_info(pdf_path)
             logger.info(f"PDF {pdf_path.name}: {pdf_info['page_count']} pages, {pdf_info['total_images']} images")
             
-            # Extract slide content with multi-modal support
+            # Extract slide content with multi-modal support (once for all prompts)
             logger.info("Extracting slide content with multi-modal analysis")
             slide_contents = pdf_processor.extract_slide_content(pdf_path)
             
-            # Add file header
-            if len(pdf_paths) > 1:
-                header = f"# Notes for {pdf_path.name}\n\n"
-                all_notes.append(header)
-            
             # Generate notes with resume capability
-            logger.info(f"Generating speaker notes with multi-modal analysis (starting from slide {start_slide})")
-            slide_notes = note_generator.generate_notes_for_slide_contents_resumable(
-                slide_contents, 
-                prompt_text,
-                progress_manager,
-                start_from_slide=start_slide
+            logger.info(f"Generating speaker notes with multi-modal analysis for {len(jobs)} prompt(s)")
+            deck_notes = generate_deck_for_prompts(
+                jobs,
+                slide_contents,
+                pdf_path,
+                resume=args.resume,
+                clean_start=args.clean_start,
+                workers=workers
             )
             
-            all_notes.append(slide_notes)
-            
-            # Clean up progress state on successful completion
-            progress_manager.cleanup_state()
+            for job in jobs:
+                # Add file header
+                if len(pdf_paths) > 1:
+                    job.notes.append(f"# Notes for {pdf_path.name}\n\n")
+                job.notes.append(deck_notes[job.prompt_path])
             
             logger.info(f"Successfully processed {pdf_path}")
         
-        # Combine all notes
-        final_notes = "".join(all_notes)
-        
         # Output results
-        CommonCLI.handle_output(final_notes, output_path)
+        for job in jobs:
+            CommonCLI.handle_output("".join(job.notes), job.output_path)
+        CommonCLI.write_telemetry_report(telemetry, args.telemetry_report)
         
         # Log summary
         pdf_summary = pdf_processor.get_processing_summary()
-        note_summary = note_generator.get_generation_summary()
-
-        logger.info(
-            f"Processing complete: "
-            f"{pdf_summary['files_processed']} files, "
-            f"{note_summary['notes_generated']} notes generated, "
-            f"{note_summary['total_characters']} characters"
-        )
+        for job in jobs:
+            note_summary = job.note_generator.get_generation_summary()
+            logger.info(
+                f"Processing complete{f' ({job.name})' if len(jobs) > 1 else ''}: "
+                f"{pdf_summary['files_processed']} files, "
+                f"{note_summary['notes_generated']} notes generated, "
+                f"{note_summary['total_characters']} characters"
+            )
+        
+        cache_summary = CommonCLI.format_cache_summary(llm_client)
+        if cache_summary:
+            logger.info(cache_summary)
+        
+        retry_summary = CommonCLI.format_retry_summary(retry_policy)
+        if retry_summary:
+            logger.info(retry_summary)
+        
+        for job in jobs:
+            repair_summary = CommonCLI.format_repair_summary(job.note_generator)
+            if repair_summary:
+                logger.info(repair_summary)
+        
+        cassette_summary = CommonCLI.format_cassette_summary(llm_client)
+        if cassette_summary:
+            logger.info(cassette_summary)
+        
+        hedging_summary = CommonCLI.format_hedging_summary(llm_client)
+        if hedging_summary:
+            logger.info(hedging_summary)
+        
+        failover_summary = CommonCLI.format_failover_summary(llm_client)
+        if failover_summary:
+            logger.info(failover_summary)
+        
+        key_pool_summary = CommonCLI.format_key_pool_summary(llm_client)
+        if key_pool_summary:
+            logger.info(key_pool_summary)
+        
+        routing_summary = CommonCLI.format_routing_summary(llm_client)
+        if routing_summary:
+            logger.info(routing_summary)
         
         return 0
         
@@ -177,6 +247,11 @@ def main() -> int:
         logger = logging.getLogger(__name__)
         logger.exception(f"Unexpected error: {e}")
         return 1
+    
+    finally:
+        # Delete provider-side resources such as Gemini cached content
+        if llm_client is not None:
+            llm_client.close()
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,597 @@
+"""Offline provider batch-API processing for whole directories."""
+
+import hashlib
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .file_manager import FileManager, FileManagerError
+from .http_transport import get_shared_http_client
+from .llm_client import LLMClient, LLMError
+from .manifest_manager import FileRecord, FileStatus, ManifestManager
+from .note_generator import NoteGenerator
+from .pdf_processor import PDFProcessor, PDFProcessingError
+from .retry_policy import RetryPolicy
+from .structured_output import AnalysisSchema, StructuredOutputError
+
+logger = logging.getLogger(__name__)
+
+# Normalized job states reported by every backend
+JOB_IN_PROGRESS = "in_progress"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class BatchAPIError(Exception):
+    """Custom exception for batch-API processing errors."""
+
+
+@dataclass
+class BatchRequest:
+    """A single slide request within a provider batch job."""
+    custom_id: str
+    user_prompt: str
+    system_prompt: Optional[str] = None
+    images: List[str] = field(default_factory=list)
+    # JSON schema the response must match (structured output)
+    schema: Optional[Dict[str, Any]] = None
+
+
+class BatchBackend:
+    """Interface for submitting, polling and collecting provider batch jobs."""
+
+    name = "base"
+
+    def submit(self, requests: List[BatchRequest]) -> str:
+        """Submit requests as one batch job and return the job identifier."""
+        raise NotImplementedError
+
+    def poll(self, job_id: str) -> str:
+        """Return the normalized state of a batch job."""
+        raise NotImplementedError
+
+    def collect(self, job_id: str) -> Dict[str, str]:
+        """Return response text by custom_id for every succeeded request."""
+        raise NotImplementedError
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API (JSONL input file + /v1/batches)."""
+
+    name = "openai"
+
+    _STATUS_MAP = {
+        "validating": JOB_IN_PROGRESS,
+        "in_progress": JOB_IN_PROGRESS,
+        "finalizing": JOB_IN_PROGRESS,
+        "cancelling": JOB_IN_PROGRESS,
+        "completed": JOB_COMPLETED,
+        # Expired jobs still return results for the requests that finished
+        "expired": JOB_COMPLETED,
+        "failed": JOB_FAILED,
+        "cancelled": JOB_FAILED,
+    }
+
+    def __init__(self, llm_client: LLMClient):
+        self.llm_client = llm_client
+        self.client = llm_client.client
+
+    def submit(self, requests: List[BatchRequest]) -> str:
+        lines = []
+        for request in requests:
+            lines.append(json.dumps({
+                "custom_id": request.custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self.llm_client.build_request_params(
+                    request.user_prompt, request.images, request.system_prompt, schema=request.schema
+                ),
+            }))
+
+        input_file = self.client.files.create(
+            file=("slide_requests.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    def poll(self, job_id: str) -> str:
+        batch = self.client.batches.retrieve(job_id)
+        counts = getattr(batch, "request_counts", None)
+        if counts is not None:
+            logger.info(
+                "OpenAI batch %s: %s (%s/%s completed, %s failed)",
+                job_id, batch.status, counts.completed, counts.total, counts.failed
+            )
+        return self._STATUS_MAP.get(batch.status, JOB_IN_PROGRESS)
+
+    def collect(self, job_id: str) -> Dict[str, str]:
+        batch = self.client.batches.retrieve(job_id)
+        if not batch.output_file_id:
+            return {}
+
+        results = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            response = entry.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            choices = (response.get("body") or {}).get("choices") or []
+            content = choices[0].get("message", {}).get("content") if choices else None
+            if content:
+                results[entry["custom_id"]] = content.strip()
+        return results
+
+
+class AnthropicBatchBackend(BatchBackend):
+    """Anthropic Message Batches API (/v1/messages/batches)."""
+
+    name = "anthropic"
+    API_PATH = "/v1/messages/batches"
+
+    REQUEST_TIMEOUT = 120.0
+
+    def __init__(self, llm_client: LLMClient, http_client=None):
+        self.llm_client = llm_client
+        self.http = http_client or get_shared_http_client()
+        # The SDK client's base URL, so a configured proxy or gateway also receives batch jobs
+        self.api_url = str(llm_client.client.base_url).rstrip("/") + self.API_PATH
+        self.headers = {
+            "x-api-key": llm_client.api_key,
+            "anthropic-version": "2023-06-01",
+            "anthropic-beta": "message-batches-2024-09-24",
+        }
+
+    def _request(self, method: str, url: str, **kwargs):
+        kwargs.setdefault("timeout", self.REQUEST_TIMEOUT)
+        response = self.http.request(method, url, headers=self.headers, **kwargs)
+        if response.status_code >= 400:
+            raise BatchAPIError(
+                f"Anthropic batch API error {response.status_code}: {response.text[:500]}"
+            )
+        return response
+
+    def submit(self, requests: List[BatchRequest]) -> str:
+        body = {
+            "requests": [
+                {
+                    "custom_id": request.custom_id,
+                    "params": self.llm_client.build_request_params(
+                        request.user_prompt, request.images, request.system_prompt, schema=request.schema
+                    ),
+                }
+                for request in requests
+            ]
+        }
+        return self._request("POST", self.api_url, json=body).json()["id"]
+
+    def poll(self, job_id: str) -> str:
+        batch = self._request("GET", f"{self.api_url}/{job_id}").json()
+        logger.info(
+            "Anthropic batch %s: %s %s", job_id, batch.get("processing_status"),
+            batch.get("request_counts", {})
+        )
+        return JOB_COMPLETED if batch.get("processing_status") == "ended" else JOB_IN_PROGRESS
+
+    def collect(self, job_id: str) -> Dict[str, str]:
+        batch = self._request("GET", f"{self.api_url}/{job_id}").json()
+        results_url = batch.get("results_url")
+        if not results_url:
+            return {}
+
+        results = {}
+        for line in self._request("GET", results_url).text.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            result = entry.get("result") or {}
+            if result.get("type") != "succeeded":
+                continue
+            blocks = (result.get("message") or {}).get("content") or []
+            # Structured output arrives as the input of the forced tool call
+            text = "".join(
+                json.dumps(block.get("input")) if block.get("type") == "tool_use" else block.get("text", "")
+                for block in blocks if block.get("type") in ("text", "tool_use")
+            )
+            if text:
+                results[entry["custom_id"]] = text.strip()
+        return results
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    Local stand-in that mimics a provider batch endpoint on disk.
+
+    Jobs are persisted as JSONL files so submit and collect can happen in
+    different processes. Requests are answered by a responder callable once
+    the job has been polled `polls_until_complete` times.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        work_dir: Path,
+        responder: Callable[[BatchRequest], str],
+        polls_until_complete: int = 1,
+    ):
+        self.work_dir = Path(work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.responder = responder
+        self.polls_until_complete = polls_until_complete
+
+    def _job_path(self, job_id: str, kind: str) -> Path:
+        return self.work_dir / f"{job_id}.{kind}"
+
+    def submit(self, requests: List[BatchRequest]) -> str:
+        job_id = f"local_batch_{uuid.uuid4().hex[:12]}"
+        with open(self._job_path(job_id, "input.jsonl"), "w", encoding="utf-8") as f:
+            for request in requests:
+                f.write(json.dumps(request.__dict__) + "\n")
+        self._write_status(job_id, {"status": JOB_IN_PROGRESS, "polls": 0})
+        return job_id
+
+    def _write_status(self, job_id: str, status: Dict[str, Any]) -> None:
+        with open(self._job_path(job_id, "status.json"), "w", encoding="utf-8") as f:
+            json.dump(status, f)
+
+    def poll(self, job_id: str) -> str:
+        status_path = self._job_path(job_id, "status.json")
+        if not status_path.exists():
+            return JOB_FAILED
+
+        with open(status_path, "r", encoding="utf-8") as f:
+            status = json.load(f)
+
+        if status["status"] == JOB_IN_PROGRESS:
+            status["polls"] += 1
+            if status["polls"] >= self.polls_until_complete:
+                self._run_job(job_id)
+                status["status"] = JOB_COMPLETED
+            self._write_status(job_id, status)
+
+        return status["status"]
+
+    def _run_job(self, job_id: str) -> None:
+        with open(self._job_path(job_id, "input.jsonl"), "r", encoding="utf-8") as f:
+            requests = [BatchRequest(**json.loads(line)) for line in f if line.strip()]
+
+        with open(self._job_path(job_id, "output.jsonl"), "w", encoding="utf-8") as f:
+            for request in requests:
+                try:
+                    entry = {"custom_id": request.custom_id, "text": self.responder(request)}
+                except Exception as e:
+                    entry = {"custom_id": request.custom_id, "error": str(e)}
+                f.write(json.dumps(entry) + "\n")
+
+    def collect(self, job_id: str) -> Dict[str, str]:
+        output_path = self._job_path(job_id, "output.jsonl")
+        if not output_path.exists():
+            return {}
+
+        results = {}
+        with open(output_path, "r", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry.get("text"):
+                    results[entry["custom_id"]] = entry["text"]
+        return results
+
+
+def create_batch_backend(llm_client: LLMClient) -> BatchBackend:
+    """
+    Create the batch backend for the client's provider.
+
+    Args:
+        llm_client: Configured LLM client
+
+    Returns:
+        Provider batch backend
+
+    Raises:
+        BatchAPIError: If the provider has no supported batch API
+    """
+    if llm_client.provider == "openai":
+        return OpenAIBatchBackend(llm_client)
+    if llm_client.provider == "anthropic":
+        return AnthropicBatchBackend(llm_client)
+
+    raise BatchAPIError(
+        f"Batch API mode is not supported for provider '{llm_client.provider}'. "
+        f"Supported providers: openai, anthropic"
+    )
+
+
+class BatchAPIRunner:
+    """Serializes pending slides into a batch job and ingests the results."""
+
+    STATE_FILENAME = ".slide_dir_extract_batch_api.json"
+
+    def __init__(
+        self,
+        manifest: ManifestManager,
+        llm_client: LLMClient,
+        backend: BatchBackend,
+        prompt: str,
+        poll_interval: float = 60.0,
+        max_wait: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        """
+        Initialize the batch-API runner.
+
+        Args:
+            manifest: Manifest tracking the directory being processed
+            llm_client: Client used to build request bodies and for fallback requests
+            backend: Provider batch backend
+            prompt: Analysis prompt text
+            poll_interval: Seconds between job status polls
+            max_wait: Maximum seconds to wait for the job (None waits indefinitely)
+            retry_policy: Retry policy for fallback single-slide requests
+        """
+        self.manifest = manifest
+        self.llm_client = llm_client
+        self.backend = backend
+        self.prompt = prompt
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self.retry_policy = retry_policy
+        self.state_file = manifest.output_dir / self.STATE_FILENAME
+        self.file_manager = FileManager()
+
+    def run(self, records: List[FileRecord], pdf_processor: PDFProcessor) -> int:
+        """
+        Submit (or resume) the batch job, wait for it and ingest the results.
+
+        Args:
+            records: Manifest records still to be processed
+            pdf_processor: Processor used to extract slide content
+
+        Returns:
+            Exit code (0 for success)
+        """
+        state = self.load_state()
+
+        if state is None:
+            if not records:
+                logger.info("All files already processed successfully")
+                return 0
+            state = self.submit(records, pdf_processor)
+            if state is None:
+                return 1
+        else:
+            logger.info(
+                "Resuming batch job %s submitted at %s", state["job_id"], state["submitted_at"]
+            )
+            if state.get("prompt_checksum") != self._checksum(self.prompt):
+                logger.warning("Prompt changed since the batch job was submitted; "
+                               "collecting results for the original prompt")
+
+        self.wait_for_completion(state)
+        return self.collect(state, pdf_processor)
+
+    def submit(self, records: List[FileRecord], pdf_processor: PDFProcessor) -> Optional[Dict[str, Any]]:
+        """
+        Serialize all slides of the given files into one batch job and submit it.
+
+        Args:
+            records: Manifest records to include
+            pdf_processor: Processor used to extract slide content
+
+        Returns:
+            Persisted job state, or None if there was nothing to submit
+        """
+        requests: List[BatchRequest] = []
+        files: Dict[str, Dict[str, Any]] = {}
+
+        for file_index, record in enumerate(records):
+            try:
+                slide_contents = pdf_processor.extract_slide_content(Path(record.input_path))
+            except PDFProcessingError as e:
+                logger.error(f"Processing error for {record.filename}: {e}")
+                self.manifest.update_file_status(
+                    record.filename, FileStatus.ERROR, error_message=str(e)
+                )
+                continue
+
+            custom_ids = {}
+            for slide_num in sorted(slide_contents):
+                slide_content = slide_contents[slide_num]
+                custom_id = f"f{file_index}-s{slide_num}"
+                request = self.llm_client.build_slide_request(
+                    slide_content.text,
+                    self.prompt,
+                    slide_num,
+                    context=self._build_text_context(slide_contents, slide_num),
+                    image_base64=slide_content.image_base64,
+                )
+                requests.append(BatchRequest(custom_id=custom_id, **request))
+                custom_ids[str(slide_num)] = custom_id
+
+            files[record.filename] = {
+                "input_path": record.input_path,
+                "output_path": record.output_path,
+                "total_slides": len(slide_contents),
+                "custom_ids": custom_ids,
+            }
+            self.manifest.update_file_status(
+                record.filename,
+                FileStatus.IN_PROGRESS,
+                total_slides=len(slide_contents),
+                start_time=datetime.now(),
+            )
+
+        if not requests:
+            logger.error("No slide requests to submit")
+            return None
+
+        try:
+            job_id = self.backend.submit(requests)
+        except Exception as e:
+            raise BatchAPIError(f"Failed to submit batch job: {e}") from e
+
+        state = {
+            "job_id": job_id,
+            "backend": self.backend.name,
+            "model": self.llm_client.model,
+            "prompt_checksum": self._checksum(self.prompt),
+            "submitted_at": datetime.now().isoformat(),
+            "files": files,
+        }
+        self.save_state(state)
+        logger.info(
+            "Submitted batch job %s with %d slide requests from %d files",
+            job_id, len(requests), len(files)
+        )
+        return state
+
+    def wait_for_completion(self, state: Dict[str, Any]) -> None:
+        """
+        Poll the batch job until it finishes.
+
+        Raises:
+            BatchAPIError: If the job fails or the maximum wait is exceeded
+        """
+        job_id = state["job_id"]
+        started = time.monotonic()
+
+        while True:
+            try:
+                status = self.backend.poll(job_id)
+            except BatchAPIError:
+                raise
+            except Exception as e:
+                raise BatchAPIError(f"Failed to poll batch job {job_id}: {e}") from e
+
+            if status == JOB_COMPLETED:
+                logger.info("Batch job %s completed", job_id)
+                return
+            if status == JOB_FAILED:
+                raise BatchAPIError(
+                    f"Batch job {job_id} failed; remove {self.state_file} to resubmit"
+                )
+
+            if self.max_wait is not None and time.monotonic() - started > self.max_wait:
+                raise BatchAPIError(
+                    f"Batch job {job_id} still running after {self.max_wait:.0f}s; "
+                    f"run again with --batch-api to resume collection"
+                )
+
+            logger.debug("Batch job %s in progress, polling again in %.0fs", job_id, self.poll_interval)
+            time.sleep(self.poll_interval)
+
+    def collect(self, state: Dict[str, Any], pdf_processor: PDFProcessor) -> int:
+        """
+        Ingest batch results into per-file outputs and the manifest.
+
+        Slides without a valid result are re-requested individually and fall
+        back to placeholder notes if that fails.
+
+        Returns:
+            Exit code (0 for success)
+        """
+        try:
+            results = self.backend.collect(state["job_id"])
+        except Exception as e:
+            raise BatchAPIError(f"Failed to collect batch job {state['job_id']}: {e}") from e
+
+        logger.info("Collected %d results from batch job %s", len(results), state["job_id"])
+
+        note_generator = NoteGenerator(self.llm_client, retry_policy=self.retry_policy)
+        schema = AnalysisSchema.from_prompt(self.prompt) if self.llm_client.structured_output else None
+        error_count = 0
+
+        for filename, info in state["files"].items():
+            try:
+                slide_contents = pdf_processor.extract_slide_content(Path(info["input_path"]))
+                notes = []
+                for slide_num in sorted(int(n) for n in info["custom_ids"]):
+                    analysis = results.get(info["custom_ids"][str(slide_num)])
+                    if analysis and schema:
+                        analysis = self._render(schema, analysis, slide_num)
+                    notes.append(note_generator.complete_slide_analysis(
+                        slide_contents[slide_num], self.prompt, analysis,
+                        model=self.llm_client.model_label if analysis else None
+                    ))
+
+                self.file_manager.write_output_file("".join(notes), Path(info["output_path"]))
+                self.manifest.update_file_status(
+                    filename,
+                    FileStatus.COMPLETED,
+                    completed_slides=info["total_slides"],
+                    completion_time=datetime.now(),
+                )
+                logger.info(f"✓ Completed {filename} from batch results")
+
+            except (PDFProcessingError, FileManagerError, LLMError, KeyError) as e:
+                error_count += 1
+                logger.error(f"✗ Failed to ingest batch results for {filename}: {e}")
+                self.manifest.update_file_status(
+                    filename, FileStatus.ERROR, error_message=str(e)
+                )
+
+        self.cleanup_state()
+        return 0 if error_count == 0 else 1
+
+    @staticmethod
+    def _render(schema: AnalysisSchema, analysis: str, slide_num: int) -> str:
+        """Render a structured result; one that does not match is left to validation and repair."""
+        try:
+            return schema.render(analysis, slide_numbers=[slide_num])
+        except StructuredOutputError as e:
+            logger.warning("Batch result for slide %d does not match the response schema: %s", slide_num, e)
+            return analysis
+
+    @staticmethod
+    def _build_text_context(slide_contents: Dict, slide_num: int, max_slides: int = 3) -> str:
+        """Build context from previous slide texts (analyses are not available in batch mode)."""
+        entries = []
+        for previous in range(max(1, slide_num - max_slides), slide_num):
+            if previous in slide_contents:
+                entries.append(f"Slide {previous}: {slide_contents[previous].text[:200]}...")
+        return "\n\n".join(entries)
+
+    @staticmethod
+    def _checksum(text: str) -> str:
+        return hashlib.md5(text.encode("utf-8")).hexdigest()[:16]
+
+    def load_state(self) -> Optional[Dict[str, Any]]:
+        """Load the persisted job state, if any."""
+        if not self.state_file.exists():
+            return None
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            raise BatchAPIError(f"Corrupt batch job state {self.state_file}: {e}") from e
+
+        if state.get("backend") != self.backend.name:
+            raise BatchAPIError(
+                f"Pending batch job {state.get('job_id')} was submitted with the "
+                f"'{state.get('backend')}' backend, not '{self.backend.name}'"
+            )
+        return state
+
+    def save_state(self, state: Dict[str, Any]) -> None:
+        """Persist the job state so collection survives restarts."""
+        with open(self.state_file, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+
+    def cleanup_state(self) -> None:
+        """Remove the job state after successful ingestion."""
+        try:
+            if self.state_file.exists():
+                self.state_file.unlink()
+        except OSError as e:
+            logger.error(f"Failed to cleanup batch job state: {e}")
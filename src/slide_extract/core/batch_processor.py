@@ -9,7 +9,9 @@ from .manifest_manager import ManifestManager, FileStatus, FileRecord
 from .progress_manager import ProgressManager
 from .file_manager import FileManager, FileManagerError
 from .pdf_processor import PDFProcessor, PDFProcessingError
+from .model_registry import rendering_options
 from .note_generator import NoteGenerator, NoteGenerationError
+from .batch_api import BatchAPIRunner, BatchAPIError, create_batch_backend
 
 class BatchProcessingError(Exception):
     """Custom exception for batch processing errors."""
@@ -54,7 +56,11 @@ class BatchProcessor:
         llm_client, 
         prompt: str, 
         resume: bool = True,
-        clean_start: bool = False
+        clean_start: bool = False,
+        slide_packer=None,
+        retry_policy=None,
+        telemetry=None,
+        session=None
     ) -> int:
         """
         Process all PDFs in directory with comprehensive resume capability.
@@ -64,6 +70,10 @@ class BatchProcessor:
             prompt: Analysis prompt text
             resume: Whether to resume from existing progress
             clean_start: Force clean start, ignore existing progress
+            slide_packer: Optional packer for sending several slides per request
+            retry_policy: Optional retry policy for LLM requests
+            telemetry: Optional collector for per-request telemetry records
+            session: Optional conversation session, restarted for each PDF
             
         Returns:
             Exit code (0 for success)
@@ -82,22 +92,7 @@ class BatchProcessor:
             return 1
         
         # Initialize or load manifest
-        existing_records = self.manifest.load_manifest() if resume else []
-        
-        if not existing_records:
-            # Create new manifest
-            command_args = f"slide-dir-extract -i {self.input_dir} -o {self.output_dir} --suffix {self.suffix}"
-            self.manifest.initialize_manifest(pdf_files, command_args)
-            self.logger.info(f"Initialized new batch processing for {len(pdf_files)} files")
-        else:
-            # Resume existing batch
-            self.logger.info(f"Resuming batch processing from existing manifest")
-            
-            # Detect file changes
-            changed_files = self.manifest.detect_file_changes(self.input_dir)
-            if changed_files:
-                self.logger.warning(f"Detected changes in {len(changed_files)} files since last run")
-                # Could implement logic to re-process changed files
+        self._initialize_or_resume_manifest(pdf_files, resume)
         
         # Get processing status
         summary = self.manifest.get_processing_summary()
@@ -119,9 +114,12 @@ class BatchProcessor:
         
         self.logger.info(f"Processing {total_to_process} files...")
         
-        # Initialize processors
-        pdf_processor = PDFProcessor()
-        note_generator = NoteGenerator(llm_client)
+        # Initialize processors (rendering sized for the configured models)
+        pdf_processor = PDFProcessor(**rendering_options(llm_client))
+        note_generator = NoteGenerator(
+            llm_client, slide_packer=slide_packer, retry_policy=retry_policy, telemetry=telemetry,
+            session=session
+        )
         
         success_count = 0
         error_count = 0
@@ -171,6 +169,96 @@ class BatchProcessor:
         
         return 0 if error_count == 0 else 1
     
+    def _initialize_or_resume_manifest(self, pdf_files: List[Path], resume: bool) -> None:
+        """Create a new manifest or resume from the existing one."""
+        existing_records = self.manifest.load_manifest() if resume else []
+        
+        if not existing_records:
+            # Create new manifest
+            command_args = f"slide-dir-extract -i {self.input_dir} -o {self.output_dir} --suffix {self.suffix}"
+            self.manifest.initialize_manifest(pdf_files, command_args)
+            self.logger.info(f"Initialized new batch processing for {len(pdf_files)} files")
+        else:
+            # Resume existing batch
+            self.logger.info(f"Resuming batch processing from existing manifest")
+            
+            # Detect file changes
+            changed_files = self.manifest.detect_file_changes(self.input_dir)
+            if changed_files:
+                self.logger.warning(f"Detected changes in {len(changed_files)} files since last run")
+                # Could implement logic to re-process changed files
+    
+    def process_directory_batch_api(
+        self,
+        llm_client,
+        prompt: str,
+        resume: bool = True,
+        clean_start: bool = False,
+        backend=None,
+        poll_interval: float = 60.0,
+        max_wait: Optional[float] = None,
+        retry_policy=None
+    ) -> int:
+        """
+        Process all PDFs in directory through the provider's offline batch API.
+        
+        All pending slides are submitted as one batch job. The job identifier is
+        persisted in the output directory so an interrupted run resumes polling
+        and collection instead of resubmitting.
+        
+        Args:
+            llm_client: LLM client for building requests and fallback analysis
+            prompt: Analysis prompt text
+            resume: Whether to resume from existing progress
+            clean_start: Force clean start, ignore existing progress
+            backend: Batch backend (default: the client's provider backend)
+            poll_interval: Seconds between job status polls
+            max_wait: Maximum seconds to wait for the job before exiting
+            retry_policy: Optional retry policy for fallback requests
+            
+        Returns:
+            Exit code (0 for success)
+        """
+        if llm_client is None:
+            raise BatchProcessingError("Batch API mode requires an LLM client (not available with --no-ai)")
+        
+        try:
+            runner = BatchAPIRunner(
+                manifest=self.manifest,
+                llm_client=llm_client,
+                backend=backend or create_batch_backend(llm_client),
+                prompt=prompt,
+                poll_interval=poll_interval,
+                max_wait=max_wait,
+                retry_policy=retry_policy
+            )
+            
+            if clean_start:
+                self.manifest.cleanup_manifest()
+                runner.cleanup_state()
+                self.logger.info("Starting fresh (clean start requested)")
+            
+            pdf_files = self.discover_pdfs()
+            if not pdf_files:
+                self.logger.error("No PDF files found to process")
+                return 1
+            
+            self._initialize_or_resume_manifest(pdf_files, resume or runner.load_state() is not None)
+            
+            files_to_process = self.manifest.get_files_by_status(FileStatus.PENDING)
+            result = runner.run(files_to_process, PDFProcessor(**rendering_options(llm_client)))
+        
+        except KeyboardInterrupt:
+            self.logger.info("Batch API processing interrupted by user")
+            self.logger.info("Batch job state saved. Run the same command to resume collection.")
+            return 130
+        
+        except BatchAPIError as e:
+            raise BatchProcessingError(str(e))
+        
+        self.logger.info(f"Final status: {self.manifest.get_processing_summary()}")
+        return result
+    
     def _process_single_file(
         self, 
         record: FileRecord, 
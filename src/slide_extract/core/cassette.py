@@ -0,0 +1,256 @@
+"""Record/replay cassettes of LLM traffic with the originally observed latencies."""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# off:    requests go to the provider and nothing is stored
+# record: requests go to the provider and every outcome is written to a fresh cassette
+# replay: recorded outcomes are served back without the network
+CASSETTE_MODES = ("off", "record", "replay")
+
+# HTTP status used to re-raise a recorded failure so it is classified the same way
+_REPLAY_STATUS = {
+    "rate_limit": 429,
+    "server_error": 503,
+    "deadline": 504,
+    "connection": 502,
+    "fatal": 400,
+}
+
+
+class CassetteError(Exception):
+    """Custom exception for cassette errors."""
+
+
+class ReplayedError(Exception):
+    """A recorded provider failure, re-raised with its HTTP status and Retry-After hint."""
+
+    def __init__(self, message: str, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        headers = {"retry-after": f"{retry_after:g}"} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=status_code, headers=headers)
+
+
+class Cassette:
+    """
+    Stores request outcomes in a JSON Lines file and serves them back in order.
+
+    Requests are identified by a hash of the rendered prompt and images, so no
+    prompt text is written to disk. Each interaction stores the response (or
+    failure kind), token usage and the observed latency. Repeated requests
+    with the same key (e.g. retries) are replayed in recorded order; once a
+    key's interactions are used up the last one is repeated. Recording
+    replaces an existing cassette file.
+    """
+
+    def __init__(self, path: Union[str, Path], mode: str = "replay", time_scale: float = 1.0):
+        """
+        Initialize the cassette.
+
+        Args:
+            path: Cassette file (JSON Lines)
+            mode: "record" or "replay"
+            time_scale: Multiplier applied to recorded latencies on replay
+                (0 replays instantly)
+
+        Raises:
+            CassetteError: If the mode is invalid or the cassette cannot be read
+        """
+        if mode not in ("record", "replay"):
+            raise CassetteError(f"Invalid cassette mode '{mode}', expected record or replay")
+        if time_scale < 0:
+            raise CassetteError(f"Cassette time_scale must not be negative: {time_scale}")
+
+        self.path = Path(path).expanduser()
+        self.mode = mode
+        self.time_scale = float(time_scale)
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._file = None
+
+        if mode == "record":
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "w", encoding="utf-8")
+            except OSError as e:
+                raise CassetteError(f"Cannot open cassette {self.path} for recording: {e}") from e
+            logger.info("Recording LLM traffic to %s", self.path)
+        else:
+            self._load()
+            logger.info(
+                "Replaying %d recorded requests from %s (time scale %g)",
+                sum(len(items) for items in self._interactions.values()), self.path, self.time_scale
+            )
+
+    @property
+    def closed(self) -> bool:
+        """Whether a recording cassette has been closed."""
+        return self.mode == "record" and self._file is None
+
+    @property
+    def replaying(self) -> bool:
+        """Whether requests are served from the cassette."""
+        return self.mode == "replay"
+
+    def _load(self) -> None:
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError as e:
+            raise CassetteError(f"Cannot read cassette {self.path}: {e}") from e
+
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                interaction = json.loads(line)
+                self._interactions.setdefault(interaction["key"], deque()).append(interaction)
+            except (ValueError, KeyError, TypeError) as e:
+                raise CassetteError(f"Invalid cassette entry at {self.path}:{line_number}: {e}") from e
+
+    def record(
+        self, key: str, model: str, latency: float, response: Optional[str] = None,
+        usage: Optional[Dict[str, int]] = None, error: Optional[BaseException] = None
+    ) -> None:
+        """
+        Append one request outcome to the cassette.
+
+        Args:
+            key: Request hash
+            model: Provider-qualified model that served the request
+            latency: Observed request latency in seconds
+            response: Response text, if the request succeeded
+            usage: Token usage reported by the provider
+            error: Exception raised by the request, if it failed
+        """
+        interaction: Dict[str, Any] = {
+            "key": key,
+            "model": model,
+            "latency": round(latency, 4),
+        }
+        if error is not None:
+            try:
+                from .retry_policy import classify_error
+            except ImportError:
+                from retry_policy import classify_error
+
+            kind, retry_after = classify_error(error)
+            interaction["error"] = {"kind": kind, "message": str(error), "retry_after": retry_after}
+        else:
+            interaction["response"] = response
+            interaction["usage"] = dict(usage or {})
+
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(interaction) + "\n")
+            self._file.flush()
+            self.stats["recorded"] += 1
+
+    def play(
+        self, key: str, cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[str, Dict[str, int], str]:
+        """
+        Serve the next recorded outcome for a request after its scaled latency.
+
+        Args:
+            key: Request hash
+            cancel_event: Event that ends the simulated wait early when set
+
+        Returns:
+            Tuple of (response text, token usage, recorded model)
+
+        Raises:
+            CassetteError: If the request was never recorded or the wait was cancelled
+            ReplayedError: If the recorded request failed
+        """
+        with self._lock:
+            queue = self._interactions.get(key)
+            if not queue:
+                self.stats["misses"] += 1
+                raise CassetteError(f"Request {key[:12]} is not in cassette {self.path}")
+            interaction = queue.popleft() if len(queue) > 1 else queue[0]
+            self.stats["replayed"] += 1
+
+        delay = interaction.get("latency", 0.0) * self.time_scale
+        if delay > 0:
+            if cancel_event is not None:
+                if cancel_event.wait(delay):
+                    raise CassetteError("Replayed request cancelled")
+            else:
+                time.sleep(delay)
+
+        error = interaction.get("error")
+        if error:
+            raise ReplayedError(
+                f"Replayed {error['kind']} failure: {error['message']}",
+                _REPLAY_STATUS.get(error["kind"], 400),
+                error.get("retry_after"),
+            )
+        return interaction["response"], interaction.get("usage") or {}, interaction.get("model")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get record/replay counts.
+
+        Returns:
+            Dictionary with the mode and recorded, replayed and missed request counts
+        """
+        with self._lock:
+            return {"mode": self.mode, "path": str(self.path), **self.stats}
+
+    def close(self) -> None:
+        """Close the cassette file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_open_cassettes: Dict[Tuple[Path, str], Cassette] = {}
+_open_lock = threading.Lock()
+
+
+def create_cassette(cassette_config: Dict[str, Any]) -> Optional[Cassette]:
+    """
+    Factory function to create (or reuse) a cassette from configuration.
+
+    Every LLMClient built from the same configuration (fallbacks, routes,
+    hedge clients) shares one Cassette per file and mode.
+
+    Args:
+        cassette_config: Cassette options (mode, path, time_scale)
+
+    Returns:
+        Cassette instance, or None if recording and replay are off
+
+    Raises:
+        CassetteError: If the options are invalid
+    """
+    mode = cassette_config.get("mode", "off") or "off"
+    if mode not in CASSETTE_MODES:
+        raise CassetteError(
+            f"Invalid cassette mode '{mode}', expected one of {', '.join(CASSETTE_MODES)}"
+        )
+    if mode == "off":
+        return None
+    if not cassette_config.get("path"):
+        raise CassetteError(f"Cassette mode '{mode}' requires a cassette path")
+
+    path = Path(cassette_config["path"]).expanduser().resolve()
+    with _open_lock:
+        cassette = _open_cassettes.get((path, mode))
+        if cassette is None or cassette.closed:
+            cassette = Cassette(path, mode, cassette_config.get("time_scale", 1.0))
+            _open_cassettes[(path, mode)] = cassette
+        return cassette
@@ -0,0 +1,149 @@
+"""Request slots per endpoint and concurrent execution of independent LLM requests."""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RequestSlots:
+    """
+    Bounds the requests in flight to one endpoint.
+
+    Local inference servers process a fixed number of sequences at once
+    (llama.cpp ``--parallel``, vLLM ``--max-num-seqs``); requests beyond
+    that queue on the server and only add latency.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize the slots.
+
+        Args:
+            limit: Maximum concurrent requests
+        """
+        self.limit = max(1, limit)
+        self._semaphore = threading.BoundedSemaphore(self.limit)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "waited": 0, "peak_in_flight": 0}
+        self._in_flight = 0
+
+    @contextmanager
+    def acquire(self) -> Iterator[None]:
+        """Hold one slot for the duration of a request, waiting if all are busy."""
+        if not self._semaphore.acquire(blocking=False):
+            with self._lock:
+                self.stats["waited"] += 1
+            self._semaphore.acquire()
+        with self._lock:
+            self._in_flight += 1
+            self.stats["requests"] += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self._in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get slot usage statistics.
+
+        Returns:
+            Dictionary with the limit, request count, requests that waited
+            for a slot and the peak number in flight
+        """
+        with self._lock:
+            return {"limit": self.limit, **self.stats}
+
+
+_slots: Dict[str, RequestSlots] = {}
+_slots_lock = threading.Lock()
+
+
+def get_request_slots(endpoint: str, limit: int) -> RequestSlots:
+    """
+    Get the process-wide slots of an endpoint.
+
+    Every client calling the same endpoint (fallbacks, routes, hedge clients)
+    shares its slots. The first limit configured for an endpoint wins.
+
+    Args:
+        endpoint: Endpoint identifier, e.g. the base URL
+        limit: Maximum concurrent requests to the endpoint
+
+    Returns:
+        Shared RequestSlots
+    """
+    with _slots_lock:
+        slots = _slots.get(endpoint)
+        if slots is None:
+            slots = _slots[endpoint] = RequestSlots(limit)
+        elif slots.limit != max(1, limit):
+            logger.warning(
+                "Ignoring max_concurrency %d for %s; already limited to %d", limit, endpoint, slots.limit
+            )
+        return slots
+
+
+def reset_request_slots() -> None:
+    """Forget all endpoint slots (for tests and reconfiguration)."""
+    with _slots_lock:
+        _slots.clear()
+
+
+class PerThread:
+    """
+    Attribute descriptor holding a separate value for each thread.
+
+    Clients shared by concurrent requests record per-response details (such
+    as the model that answered) here, so each worker reads the value of its
+    own request. Threads that have not set the value read ``None``.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._key = f"_{name}_per_thread"
+
+    def _local(self, instance: Any) -> threading.local:
+        local = instance.__dict__.get(self._key)
+        if local is None:
+            # setdefault is atomic, so racing threads share one local
+            local = instance.__dict__.setdefault(self._key, threading.local())
+        return local
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        return getattr(self._local(instance), "value", None)
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        self._local(instance).value = value
+
+
+def run_concurrently(
+    tasks: Dict[Hashable, Callable[[], Any]], max_workers: int
+) -> Dict[Hashable, Tuple[Any, Optional[Exception]]]:
+    """
+    Run independent tasks on a thread pool.
+
+    Args:
+        tasks: Callables keyed by an identifier, e.g. the slide number
+        max_workers: Maximum tasks running at once
+
+    Returns:
+        (result, None) or (None, exception) per task key, in the order of ``tasks``
+    """
+    def outcome(task: Callable[[], Any]) -> Tuple[Any, Optional[Exception]]:
+        try:
+            return task(), None
+        except Exception as e:
+            return None, e
+
+    workers = max(1, min(max_workers, len(tasks)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="slide-request") as executor:
+        futures = {key: executor.submit(outcome, task) for key, task in tasks.items()}
+        return {key: future.result() for key, future in futures.items()}
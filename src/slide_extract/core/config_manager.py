@@ -3,7 +3,7 @@
 import logging
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 try:
     import yaml
@@ -13,6 +13,10 @@ except ImportError as e:
         "Install it with: pip install pyyaml"
     ) from e
 
+try:
+    from .llm_client import KEYLESS_PROVIDERS
+except ImportError:
+    from llm_client import KEYLESS_PROVIDERS
 
 logger = logging.getLogger(__name__)
 
@@ -139,11 +143,13 @@ class ConfigManager:
             "ANTHROPIC_API_KEY",
             "GOOGLE_AI_API_KEY",
             "OPENROUTER_API_KEY",
+            "OPENAI_COMPATIBLE_API_KEY",
         ]
 
-        for key_name in api_key_names:
-            if key_name in os.environ:
-                env_keys[key_name] = os.environ[key_name]
+        # Suffixed names (e.g. OPENAI_API_KEY_2) hold additional keys for key pools
+        for name, value in os.environ.items():
+            if any(name == key_name or name.startswith(key_name + "_") for key_name in api_key_names):
+                env_keys[name] = value
 
         return env_keys
 
@@ -157,13 +163,70 @@ class ConfigManager:
         Raises:
             ConfigurationError: If configuration is invalid
         """
-        if not self.config:
-            self.load_configuration()
-
         if not self.api_keys:
             self.load_api_keys()
 
+        return self._with_api_key(self.get_llm_settings())
+
+    def get_llm_settings(self) -> Dict[str, Any]:
+        """
+        Get LLM configuration with defaults applied, without resolving the API key.
+
+        Returns:
+            LLM configuration dictionary
+        """
+        if not self.config:
+            self.load_configuration()
+
         llm_config = self.config.get("llm", {}).copy()
+
+        # Set default values
+        llm_config.setdefault("max_tokens", 4000)
+        llm_config.setdefault("temperature", 0.3)
+        llm_config.setdefault("prompt_caching", True)
+        llm_config["cassette"] = self.get_cassette_config()
+
+        # Explicit SDK timeouts come from the processing options
+        processing_config = self.get_processing_config()
+        llm_config.setdefault("request_timeout", processing_config["request_timeout"])
+        llm_config.setdefault("connect_timeout", processing_config["connect_timeout"])
+
+        return llm_config
+
+    def get_cassette_config(self) -> Dict[str, Any]:
+        """Get LLM traffic record/replay options."""
+        if not self.config:
+            self.load_configuration()
+
+        cassette_config = dict(self.config.get("llm", {}).get("cassette", {}) or {})
+
+        # Set defaults
+        cassette_config.setdefault("mode", "off")
+        cassette_config.setdefault("path", None)
+        cassette_config.setdefault("time_scale", 1.0)
+
+        return cassette_config
+
+    def set_cassette_config(self, cassette_config: Dict[str, Any]) -> None:
+        """
+        Override the record/replay options for every LLM client built afterwards.
+
+        Args:
+            cassette_config: Cassette options (mode, path, time_scale)
+        """
+        if not self.config:
+            self.load_configuration()
+
+        llm_config = self.config.setdefault("llm", {})
+        llm_config["cassette"] = {**(llm_config.get("cassette") or {}), **cassette_config}
+
+    def _with_api_key(self, llm_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add the provider's API key to an LLM configuration entry.
+
+        Raises:
+            ConfigurationError: If the provider is unknown or its key is missing
+        """
         provider = llm_config.get("provider")
 
         if not provider:
@@ -175,8 +238,16 @@ class ConfigManager:
             "anthropic": "ANTHROPIC_API_KEY",
             "google": "GOOGLE_AI_API_KEY",
             "openrouter": "OPENROUTER_API_KEY",
+            "openai_compatible": "OPENAI_COMPATIBLE_API_KEY",
         }
 
+        if provider in KEYLESS_PROVIDERS:
+            # Local servers started with --api-key still get their key
+            optional_key = api_key_mapping.get(provider)
+            if optional_key in self.api_keys and not llm_config.get("api_key"):
+                llm_config["api_key"] = self.api_keys[optional_key]
+            return self._with_key_pool(llm_config)
+
         required_key = api_key_mapping.get(provider)
         if not required_key:
             raise ConfigurationError(f"Unknown LLM provider: {provider}")
@@ -188,13 +259,119 @@ class ConfigManager:
             )
 
         llm_config["api_key"] = self.api_keys[required_key]
+        return self._with_key_pool(llm_config)
 
-        # Set default values
-        llm_config.setdefault("max_tokens", 4000)
-        llm_config.setdefault("temperature", 0.3)
+    def _with_key_pool(self, llm_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resolve the API keys of an entry's `key_pool` members.
 
+        Each member names its key with `api_key_env` (looked up in the key file,
+        then the environment) and/or sets its own `base_url`; members without
+        either reuse the entry's key and endpoint. Members whose key is missing
+        are skipped.
+        """
+        pool_config = llm_config.get("key_pool") or {}
+        if not pool_config.get("enabled"):
+            return llm_config
+
+        members = []
+        for index, member in enumerate(pool_config.get("members") or [], 1):
+            member = dict(member)
+            key_name = member.get("api_key_env")
+            if key_name:
+                api_key = self.api_keys.get(key_name) or os.environ.get(key_name)
+                if not api_key:
+                    logger.warning("Skipping key pool member %d: API key '%s' not found", index, key_name)
+                    continue
+                member["api_key"] = api_key
+            members.append(member)
+
+        llm_config["key_pool"] = {**pool_config, "members": members}
         return llm_config
 
+    def get_llm_chain_config(self) -> List[Dict[str, Any]]:
+        """
+        Get the ordered provider/model failover chain.
+
+        The primary `llm` entry comes first, followed by each `llm.fallbacks`
+        entry. Fallback entries inherit the primary's generation settings
+        unless they override them; entries whose API key is missing are skipped.
+
+        Returns:
+            List of complete LLM configurations in priority order
+
+        Raises:
+            ConfigurationError: If the primary configuration is invalid
+        """
+        primary = self.get_llm_config()
+        chain = [primary]
+
+        for index, entry in enumerate(primary.get("fallbacks") or [], 1):
+            try:
+                chain.append(self._derive_llm_entry(primary, entry))
+            except ConfigurationError as e:
+                logger.warning("Skipping LLM fallback %d: %s", index, e)
+
+        return chain
+
+    def _derive_llm_entry(self, primary: Dict[str, Any], entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build a complete LLM configuration for a secondary provider/model entry.
+
+        The entry inherits the primary's generation settings unless it overrides
+        them; the provider defaults to the primary's provider.
+        """
+        derived = {
+            key: value for key, value in primary.items()
+            if key not in (
+                "api_key", "base_url", "fallbacks", "hedging", "key_pool", "max_concurrency", "routing"
+            )
+        }
+        derived.update(entry)
+        return self._with_api_key(derived)
+
+    def get_routing_config(self) -> Dict[str, Any]:
+        """
+        Get per-slide model routing options.
+
+        Each route in `llm.routing.routes` is resolved to a complete LLM
+        configuration; routes whose API key is missing are dropped, and rules
+        pointing at them fall back to the primary model.
+
+        Returns:
+            Dictionary with `enabled`, resolved `routes` and the ordered `rules`
+        """
+        primary = self.get_llm_config()
+        routing_config = dict(primary.get("routing", {}) or {})
+
+        # Set defaults
+        routing_config.setdefault("enabled", False)
+        routing_config.setdefault("rules", [])
+
+        routes = {}
+        for name, entry in (routing_config.get("routes") or {}).items():
+            try:
+                routes[name] = self._derive_llm_entry(primary, entry or {})
+            except ConfigurationError as e:
+                logger.warning("Skipping model route '%s': %s", name, e)
+        routing_config["routes"] = routes
+
+        return routing_config
+
+    def get_circuit_breaker_config(self) -> Dict[str, Any]:
+        """Get circuit breaker options for the failover chain."""
+        if not self.config:
+            self.load_configuration()
+
+        breaker_config = dict(self.config.get("llm", {}).get("circuit_breaker", {}) or {})
+
+        # Set defaults
+        breaker_config.setdefault("failure_threshold", 3)
+        breaker_config.setdefault("latency_threshold", None)
+        breaker_config.setdefault("reset_timeout", 60)
+
+        return breaker_config
+
     def get_processing_config(self) -> Dict[str, Any]:
         """Get processing configuration options."""
         if not self.config:
@@ -205,11 +382,126 @@ class ConfigManager:
         # Set defaults
         processing_config.setdefault("batch_size", 10)
         processing_config.setdefault("request_timeout", 60)
+        processing_config.setdefault("connect_timeout", 10)
         processing_config.setdefault("max_retries", 3)
         processing_config.setdefault("parallel_processing", True)
 
         return processing_config
 
+    def get_packing_config(self) -> Dict[str, Any]:
+        """Get multi-slide request packing options."""
+        processing_config = self.get_processing_config()
+
+        packing_config = processing_config.get("packing", {}) or {}
+
+        # Set defaults
+        packing_config.setdefault("enabled", False)
+        packing_config.setdefault("token_budget", 12000)
+        packing_config.setdefault("max_slides", 4)
+        packing_config.setdefault("output_tokens_per_slide", 1500)
+        packing_config.setdefault("image_tokens", 1000)
+
+        return packing_config
+
+    def get_session_config(self) -> Dict[str, Any]:
+        """Get conversation session options."""
+        processing_config = self.get_processing_config()
+
+        session_config = dict(processing_config.get("session", {}) or {})
+
+        # Set defaults
+        session_config.setdefault("enabled", False)
+        session_config.setdefault("max_turns", 6)
+        session_config.setdefault("keep_turns", 2)
+        session_config.setdefault("max_history_tokens", 12000)
+        session_config.setdefault("strategy", "summarize")
+        session_config.setdefault("max_summary_chars", 2000)
+
+        return session_config
+
+    def get_retry_config(self) -> Dict[str, Any]:
+        """Get retry policy options."""
+        processing_config = self.get_processing_config()
+
+        retry_config = dict(processing_config.get("retry", {}) or {})
+
+        # Set defaults
+        retry_config.setdefault("max_retries", processing_config["max_retries"])
+        retry_config.setdefault("base_delay", 2.0)
+        retry_config.setdefault("max_delay", 60.0)
+        retry_config.setdefault("slide_deadline", 600)
+
+        return retry_config
+
+    def get_connection_pool_config(self) -> Dict[str, Any]:
+        """Get the shared HTTP connection pool options."""
+        processing_config = self.get_processing_config()
+
+        pool_config = dict(processing_config.get("connection_pool", {}) or {})
+
+        # Set defaults
+        pool_config.setdefault("max_connections", 20)
+        pool_config.setdefault("max_keepalive_connections", 10)
+        pool_config.setdefault("keepalive_expiry", 30.0)
+        pool_config.setdefault("http2", True)
+        pool_config.setdefault("prewarm", True)
+        pool_config.setdefault("prewarm_connections", 2)
+
+        return pool_config
+
+    def get_health_check_config(self) -> Dict[str, Any]:
+        """Get startup health check options."""
+        processing_config = self.get_processing_config()
+
+        health_config = dict(processing_config.get("health_check", {}) or {})
+
+        # Set defaults
+        health_config.setdefault("ttl", 3600)
+        health_config.setdefault("state_path", None)
+
+        return health_config
+
+    def get_planning_config(self) -> Dict[str, Any]:
+        """Get the assumptions used by the pre-flight run planner."""
+        if not self.config:
+            self.load_configuration()
+
+        planning_config = dict(self.config.get("planning", {}) or {})
+
+        # Set defaults
+        planning_config.setdefault("concurrency", 1)
+        planning_config.setdefault("base_latency", 3.0)
+        planning_config.setdefault("output_tokens_per_second", 60)
+        planning_config.setdefault("output_tokens_per_slide", 1200)
+        planning_config.setdefault("context_chars", 2000)
+        planning_config.setdefault("requests_per_minute", None)
+        planning_config.setdefault("input_tokens_per_minute", None)
+        planning_config.setdefault("pricing", {})
+
+        return planning_config
+
+    def get_model_overrides(self) -> Dict[str, Dict[str, Any]]:
+        """Get model capability overrides keyed by "provider/model" pattern."""
+        if not self.config:
+            self.load_configuration()
+
+        return dict(self.config.get("models", {}) or {})
+
+    def get_cache_config(self) -> Dict[str, Any]:
+        """Get response cache configuration options."""
+        if not self.config:
+            self.load_configuration()
+
+        cache_config = self.config.get("cache", {}) or {}
+
+        # Set defaults
+        cache_config.setdefault("mode", "off")
+        cache_config.setdefault("path", None)
+        cache_config.setdefault("max_size_mb", 500)
+        cache_config.setdefault("max_age_days", 30)
+
+        return cache_config
+
     def create_sample_key_file(self) -> Path:
         """
         Create a sample API key file in the user's home directory.
@@ -0,0 +1,285 @@
+"""Provider failover chain with per-entry circuit breakers."""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    from .concurrency import PerThread
+    from .key_pool import create_key_pool_client
+    from .llm_client import LLMClient, LLMError
+    from .model_registry import ModelCapabilities
+    from .response_cache import ResponseCache
+except ImportError:
+    from concurrency import PerThread
+    from key_pool import create_key_pool_client
+    from llm_client import LLMClient, LLMError
+    from model_registry import ModelCapabilities
+    from response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Tracks the health of one chain entry and stops traffic to it while it is failing."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        latency_threshold: Optional[float] = None,
+        reset_timeout: float = 60.0,
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures (or latency spikes) that open the circuit
+            latency_threshold: Seconds above which a successful response counts as a spike
+            reset_timeout: Seconds an open circuit waits before allowing a probe request
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.consecutive_slow = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent to this entry.
+
+        An open circuit becomes half-open after the reset timeout and then
+        admits a single probe request.
+
+        Returns:
+            True if the request may be sent
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful response and its latency."""
+        with self._lock:
+            self.consecutive_failures = 0
+            slow = self.latency_threshold is not None and latency > self.latency_threshold
+            self.consecutive_slow = self.consecutive_slow + 1 if slow else 0
+
+            if self.state == HALF_OPEN and not slow:
+                logger.info("Circuit closed after successful probe")
+                self.state = CLOSED
+                self._probe_in_flight = False
+            elif self.state == HALF_OPEN or self.consecutive_slow >= self.failure_threshold:
+                self._open(f"latency spike ({latency:.1f}s)")
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self._open(f"{self.consecutive_failures} consecutive failures")
+
+    def _open(self, reason: str) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        self.consecutive_slow = 0
+        logger.warning("Circuit opened: %s", reason)
+
+
+class FailoverLLMClient:
+    """
+    Sends requests to the first healthy entry of an ordered provider/model chain.
+
+    Behaves like an LLMClient; attributes not defined here are read from the
+    primary (first) entry.
+    """
+
+    # Entry that produced the calling thread's most recent response
+    last_model = PerThread()
+
+    def __init__(self, clients: List[LLMClient], breaker_config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the failover client.
+
+        Args:
+            clients: LLM clients in priority order
+            breaker_config: Circuit breaker options shared by all entries
+        """
+        if not clients:
+            raise LLMError("Failover chain has no entries")
+
+        breaker_config = breaker_config or {}
+        self.clients = clients
+        self.breakers = [
+            CircuitBreaker(
+                failure_threshold=breaker_config.get("failure_threshold", 3),
+                latency_threshold=breaker_config.get("latency_threshold"),
+                reset_timeout=breaker_config.get("reset_timeout", 60.0),
+            )
+            for _ in clients
+        ]
+        self.primary = clients[0]
+        self.model_counts: Dict[str, int] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing on the failover client itself
+        primary = self.__dict__.get("primary")
+        if primary is None:
+            raise AttributeError(name)
+        return getattr(primary, name)
+
+    @property
+    def stream_listener(self):
+        return self.primary.stream_listener
+
+    @stream_listener.setter
+    def stream_listener(self, listener) -> None:
+        for client in self.clients:
+            client.stream_listener = listener
+
+    @property
+    def telemetry(self):
+        return self.primary.telemetry
+
+    @telemetry.setter
+    def telemetry(self, collector) -> None:
+        for client in self.clients:
+            client.telemetry = collector
+
+    def _call(self, method: str, *args, **kwargs) -> str:
+        """Call a generation method on the first entry whose circuit admits the request."""
+        last_error: Optional[LLMError] = None
+        attempted = False
+
+        for client, breaker in zip(self.clients, self.breakers):
+            # Checked lazily so a half-open entry only reserves its probe when it is used
+            if not breaker.allow_request():
+                continue
+            attempted = True
+            try:
+                return self._attempt(client, breaker, method, *args, **kwargs)
+            except LLMError as e:
+                last_error = e
+                logger.warning("%s failed, trying next failover entry: %s", client.model_label, e)
+
+        if not attempted:
+            # Every circuit is open: probe the primary rather than failing outright
+            logger.warning("All failover entries are unavailable, probing %s", self.primary.model_label)
+            return self._attempt(self.primary, self.breakers[0], method, *args, **kwargs)
+
+        raise last_error
+
+    def _attempt(self, client: LLMClient, breaker: CircuitBreaker, method: str, *args, **kwargs) -> str:
+        """Send one request to a chain entry and update its circuit breaker."""
+        started = time.monotonic()
+        try:
+            response = getattr(client, method)(*args, **kwargs)
+        except LLMError:
+            breaker.record_failure()
+            raise
+
+        breaker.record_success(time.monotonic() - started)
+        self.last_model = client.last_model
+        self.model_counts[self.last_model] = self.model_counts.get(self.last_model, 0) + 1
+        if client is not self.primary:
+            logger.info("Response produced by failover entry %s", self.last_model)
+        return response
+
+    def generate_slide_analysis(self, *args, **kwargs) -> str:
+        """Generate a slide analysis on the first healthy chain entry."""
+        return self._call("generate_slide_analysis", *args, **kwargs)
+
+    def generate_packed_slide_analysis(self, *args, **kwargs) -> str:
+        """Generate a packed slide analysis on the first healthy chain entry."""
+        return self._call("generate_packed_slide_analysis", *args, **kwargs)
+
+    def generate_section_repair(self, *args, **kwargs) -> str:
+        """Generate missing analysis sections with the first healthy chain entry."""
+        return self._call("generate_section_repair", *args, **kwargs)
+
+    def test_connection(self) -> bool:
+        """Return True if any chain entry is reachable."""
+        for client in self.clients:
+            if client.test_connection():
+                return True
+        return False
+
+    def health_check(self, cache=None) -> bool:
+        """Return True if any chain entry passes its health check."""
+        return any(client.health_check(cache) for client in self.clients)
+
+    def close(self) -> None:
+        """Release provider-side resources of every chain entry."""
+        for client in self.clients:
+            client.close()
+
+    def endpoint_urls(self) -> List[str]:
+        """Get the HTTP endpoints of every chain entry."""
+        return [url for client in self.clients for url in client.endpoint_urls()]
+
+    def model_capabilities(self) -> List[ModelCapabilities]:
+        """Get the capabilities of every chain entry's model."""
+        return [item for client in self.clients for item in client.model_capabilities()]
+
+    def get_failover_stats(self) -> Dict[str, Any]:
+        """
+        Get per-entry circuit state and the models that produced responses.
+
+        Returns:
+            Dictionary with entry states and response counts by model
+        """
+        return {
+            "entries": [
+                {"model": client.model_label, "state": breaker.state, "times_opened": breaker.times_opened}
+                for client, breaker in zip(self.clients, self.breakers)
+            ],
+            "responses_by_model": dict(self.model_counts),
+        }
+
+
+def create_failover_client(
+    chain_config: List[Dict[str, Any]],
+    breaker_config: Optional[Dict[str, Any]] = None,
+    response_cache: Optional[ResponseCache] = None,
+):
+    """
+    Factory function to create an LLM client for a provider chain.
+
+    Args:
+        chain_config: LLM configurations in priority order
+        breaker_config: Circuit breaker options
+        response_cache: Optional cache shared by all entries
+
+    Returns:
+        A plain LLMClient for a single entry, otherwise a FailoverLLMClient
+    """
+    clients = [create_key_pool_client(config, response_cache=response_cache) for config in chain_config]
+    if len(clients) == 1:
+        return clients[0]
+
+    logger.info("Failover chain: %s", " -> ".join(client.model_label for client in clients))
+    return FailoverLLMClient(clients, breaker_config)
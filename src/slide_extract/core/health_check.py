@@ -0,0 +1,128 @@
+"""TTL cache for cheap provider health checks, persisted in a local state file."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path.home() / ".cache" / "slide-extract" / "health.json"
+
+
+class HealthCheckError(Exception):
+    """Custom exception for health check cache errors."""
+
+
+def compute_health_key(provider: str, model: str, base_url: Optional[str], api_key: Optional[str]) -> str:
+    """
+    Compute the state-file key for a provider endpoint and credential.
+
+    The API key is hashed so that rotating a key invalidates the cached result
+    without the key itself being written to disk.
+
+    Args:
+        provider: LLM provider name
+        model: Model identifier
+        base_url: Custom endpoint, if any
+        api_key: Provider API key, if any
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    hash_obj = hashlib.sha256()
+    for part in (provider, model, base_url or "", api_key or ""):
+        hash_obj.update(str(part).encode("utf-8"))
+        hash_obj.update(b"\x00")
+    return hash_obj.hexdigest()
+
+
+class HealthCheckCache:
+    """Remembers successful health checks for ``ttl`` seconds across runs."""
+
+    def __init__(self, state_path: Optional[Union[str, Path]] = None, ttl: float = 3600):
+        """
+        Initialize the health check cache.
+
+        Args:
+            state_path: JSON state file (default: ~/.cache/slide-extract/health.json)
+            ttl: Seconds a successful check stays valid
+
+        Raises:
+            HealthCheckError: If ttl is negative
+        """
+        if ttl < 0:
+            raise HealthCheckError(f"Health check ttl must not be negative: {ttl}")
+
+        self.state_path = Path(state_path).expanduser() if state_path else DEFAULT_STATE_PATH
+        self.ttl = float(ttl)
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, float]:
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable health check state %s: %s", self.state_path, e)
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def is_fresh(self, key: str) -> bool:
+        """
+        Check whether a successful health check for ``key`` is still valid.
+
+        Args:
+            key: Key from compute_health_key
+
+        Returns:
+            True if the last success is younger than the TTL
+        """
+        with self._lock:
+            checked_at = self._load().get(key)
+        return checked_at is not None and 0 <= time.time() - checked_at < self.ttl
+
+    def record_success(self, key: str) -> None:
+        """
+        Record a successful health check, dropping expired entries.
+
+        Failures to write the state file are logged and otherwise ignored.
+
+        Args:
+            key: Key from compute_health_key
+        """
+        now = time.time()
+        with self._lock:
+            state = {
+                name: checked_at for name, checked_at in self._load().items()
+                if isinstance(checked_at, (int, float)) and now - checked_at < self.ttl
+            }
+            state[key] = now
+
+            try:
+                self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+                temp_path.write_text(json.dumps(state), encoding="utf-8")
+                temp_path.replace(self.state_path)
+            except OSError as e:
+                logger.warning("Could not write health check state %s: %s", self.state_path, e)
+
+
+def create_health_check_cache(health_config: Dict[str, Any]) -> Optional[HealthCheckCache]:
+    """
+    Create a health check cache from configuration.
+
+    Args:
+        health_config: Health check options (ttl, state_path)
+
+    Returns:
+        HealthCheckCache, or None if caching is disabled (ttl of 0)
+    """
+    ttl = health_config.get("ttl", 3600)
+    if not ttl:
+        return None
+    return HealthCheckCache(health_config.get("state_path"), ttl)
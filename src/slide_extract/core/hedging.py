@@ -0,0 +1,223 @@
+"""Hedged LLM requests to cut tail latency on slow slides."""
+
+import logging
+import math
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "primary"
+HEDGE = "hedge"
+
+
+class LatencyTracker:
+    """Rolling window of request latencies."""
+
+    def __init__(self, window: int = 100):
+        self._samples: deque = deque(maxlen=max(1, window))
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Add a completed request latency."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Return the latency at the given percentile (nearest-rank).
+
+        Args:
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None without samples
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(1, math.ceil(pct / 100 * len(samples)))
+        return samples[min(rank, len(samples)) - 1]
+
+
+class RequestHedger:
+    """
+    Sends a duplicate request when the original exceeds a latency percentile.
+
+    The first valid response wins and the other request is cancelled.
+    Streamed requests stop reading as soon as they are cancelled; a
+    non-streamed request cannot be interrupted and its result is discarded.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        min_samples: int = 10,
+        window: int = 100,
+        min_delay: float = 5.0,
+        max_hedge_rate: float = 0.1,
+    ):
+        """
+        Initialize the request hedger.
+
+        Args:
+            percentile: Latency percentile after which a hedge is sent
+            min_samples: Completed requests required before hedging starts
+            window: Number of recent latencies the percentile is computed over
+            min_delay: Minimum seconds to wait before hedging
+            max_hedge_rate: Maximum fraction of requests that may be hedged
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_hedge_rate = max_hedge_rate
+        self.latencies = LatencyTracker(window)
+
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "cancelled": 0}
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait for the original request, or None if hedging is not warmed up."""
+        if len(self.latencies) < self.min_samples:
+            return None
+        threshold = self.latencies.percentile(self.percentile)
+        return max(self.min_delay, threshold or 0.0)
+
+    def _may_hedge(self) -> bool:
+        """Check the hedge-rate budget and reserve a hedge if allowed."""
+        with self._lock:
+            if (self.stats["hedged"] + 1) > self.max_hedge_rate * self.stats["requests"]:
+                return False
+            self.stats["hedged"] += 1
+            return True
+
+    def run(
+        self,
+        primary: Callable[[threading.Event], str],
+        hedge: Callable[[threading.Event], str],
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        """
+        Run a request, hedging it if it is slower than the latency threshold.
+
+        Args:
+            primary: Callable sending the original request; receives a cancel event
+            hedge: Callable sending the duplicate request; receives a cancel event
+            validate: Optional check a response must pass to win
+
+        Returns:
+            The first valid response; if none arrives, the rejected response of
+            the original (else of the hedge), so the caller can still repair it
+
+        Raises:
+            Exception: The original request's error if no response arrives
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+
+        results: "queue.Queue" = queue.Queue()
+        cancel_events = {PRIMARY: threading.Event(), HEDGE: threading.Event()}
+        started = time.monotonic()
+
+        def launch(name: str, func: Callable[[threading.Event], str]) -> None:
+            def target() -> None:
+                try:
+                    results.put((name, func(cancel_events[name]), None))
+                except Exception as e:
+                    results.put((name, None, e))
+
+            threading.Thread(target=target, name=f"llm-{name}", daemon=True).start()
+
+        launch(PRIMARY, primary)
+        pending = {PRIMARY}
+        errors: Dict[str, Exception] = {}
+        rejected: Dict[str, Any] = {}
+
+        delay = self.hedge_delay()
+        hedge_at = started + delay if delay is not None else None
+
+        while pending:
+            timeout = None
+            if hedge_at is not None:
+                timeout = max(0.0, hedge_at - time.monotonic())
+
+            try:
+                name, response, error = results.get(timeout=timeout)
+            except queue.Empty:
+                # The original is slower than the threshold: hedge once if the budget allows
+                if self._may_hedge():
+                    logger.info(
+                        "Request exceeded p%g latency (%.1fs), sending hedged request",
+                        self.percentile, delay
+                    )
+                    launch(HEDGE, hedge)
+                    pending.add(HEDGE)
+                hedge_at = None
+                continue
+
+            pending.discard(name)
+            if error is None and (validate is None or validate(response)):
+                for other in pending:
+                    cancel_events[other].set()
+                with self._lock:
+                    if pending:
+                        self.stats["cancelled"] += 1
+                    if name == HEDGE:
+                        self.stats["hedge_wins"] += 1
+                self.latencies.record(time.monotonic() - started)
+                return response
+
+            # A failed original is not hedged; the retry policy handles it
+            if error is not None:
+                errors[name] = error
+            else:
+                logger.info("Rejected the %s response as invalid", name)
+                rejected[name] = response
+
+        for name in (PRIMARY, HEDGE):
+            if name in rejected:
+                self.latencies.record(time.monotonic() - started)
+                return rejected[name]
+        raise errors.get(PRIMARY) or errors[HEDGE]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hedging statistics.
+
+        Returns:
+            Dictionary with request, hedge and cancellation counts and the current threshold
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats["hedge_rate"] = stats["hedged"] / stats["requests"] if stats["requests"] else 0.0
+        stats["threshold_seconds"] = self.hedge_delay()
+        return stats
+
+
+def create_request_hedger(hedging_config: Dict[str, Any]) -> Optional[RequestHedger]:
+    """
+    Factory function to create a request hedger from configuration.
+
+    Args:
+        hedging_config: Hedging configuration dictionary
+
+    Returns:
+        Configured RequestHedger, or None when hedging is disabled
+    """
+    if not hedging_config or not hedging_config.get("enabled"):
+        return None
+
+    return RequestHedger(
+        percentile=hedging_config.get("percentile", 95),
+        min_samples=hedging_config.get("min_samples", 10),
+        window=hedging_config.get("window", 100),
+        min_delay=hedging_config.get("min_delay", 5.0),
+        max_hedge_rate=hedging_config.get("max_hedge_rate", 0.1),
+    )
@@ -0,0 +1,210 @@
+"""Process-wide pooled HTTP transport shared by all provider clients."""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONFIG = {
+    "max_connections": 20,
+    "max_keepalive_connections": 10,
+    "keepalive_expiry": 30.0,
+    "http2": True,
+    "prewarm": True,
+    "prewarm_connections": 2,
+}
+
+_lock = threading.Lock()
+_pool_config: Dict[str, Any] = dict(DEFAULT_POOL_CONFIG)
+_shared_client = None
+# Called with every response received through the shared client (e.g. to read rate-limit headers)
+_response_hooks: List[Callable[[Any], None]] = []
+
+
+class HTTPTransportError(Exception):
+    """Custom exception for shared HTTP transport errors."""
+
+
+def http2_available() -> bool:
+    """Check whether httpx can negotiate HTTP/2 (requires the optional h2 package)."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def configure_http_transport(pool_config: Optional[Dict[str, Any]]) -> None:
+    """
+    Set the connection pool options used by the shared client.
+
+    Options only take effect if the shared client has not been created yet;
+    once provider clients hold the pool it is left in place.
+
+    Args:
+        pool_config: Connection pool options (see ``DEFAULT_POOL_CONFIG``)
+
+    Raises:
+        HTTPTransportError: If the pool limits are inconsistent
+    """
+    global _pool_config
+
+    merged = {**DEFAULT_POOL_CONFIG, **(pool_config or {})}
+    if merged["max_connections"] < 1:
+        raise HTTPTransportError("connection_pool.max_connections must be at least 1")
+    if merged["max_keepalive_connections"] > merged["max_connections"]:
+        raise HTTPTransportError(
+            "connection_pool.max_keepalive_connections cannot exceed max_connections"
+        )
+
+    with _lock:
+        if _shared_client is not None:
+            logger.debug("Shared HTTP client already created; pool options unchanged")
+            return
+        _pool_config = merged
+
+
+def add_response_hook(hook: Callable[[Any], None]) -> None:
+    """
+    Register a callable that receives every ``httpx.Response`` of the shared client.
+
+    Hooks run on the requesting thread before the body is read; exceptions
+    they raise are logged and ignored.
+
+    Args:
+        hook: Callable taking the response
+    """
+    with _lock:
+        if hook not in _response_hooks:
+            _response_hooks.append(hook)
+
+
+def remove_response_hook(hook: Callable[[Any], None]) -> None:
+    """Unregister a response hook added with ``add_response_hook``."""
+    with _lock:
+        if hook in _response_hooks:
+            _response_hooks.remove(hook)
+
+
+def _dispatch_response(response) -> None:
+    for hook in list(_response_hooks):
+        try:
+            hook(response)
+        except Exception as e:
+            logger.debug("HTTP response hook failed: %s", e)
+
+
+def get_shared_http_client():
+    """
+    Get the process-wide pooled ``httpx.Client``, creating it on first use.
+
+    httpx clients are thread-safe, so every LLMClient (fallbacks, routes,
+    hedge clients) and every worker thread reuses the same keep-alive pool.
+    Per-request timeouts are still set by each SDK client.
+
+    Returns:
+        Shared httpx.Client instance
+    """
+    global _shared_client
+
+    with _lock:
+        if _shared_client is None:
+            import httpx
+
+            use_http2 = bool(_pool_config["http2"])
+            if use_http2 and not http2_available():
+                logger.debug("h2 package not installed; shared transport uses HTTP/1.1")
+                use_http2 = False
+
+            _shared_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=_pool_config["max_connections"],
+                    max_keepalive_connections=_pool_config["max_keepalive_connections"],
+                    keepalive_expiry=_pool_config["keepalive_expiry"],
+                ),
+                http2=use_http2,
+                event_hooks={"response": [_dispatch_response]},
+            )
+            logger.debug(
+                "Created shared HTTP transport: %d connections (%d keep-alive), HTTP/%s",
+                _pool_config["max_connections"],
+                _pool_config["max_keepalive_connections"],
+                "2" if use_http2 else "1.1",
+            )
+        return _shared_client
+
+
+def close_shared_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _shared_client
+
+    with _lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
+
+
+def prewarm_connections(base_urls: Iterable[str], connections: Optional[int] = None) -> int:
+    """
+    Open pooled connections to provider endpoints ahead of the first request.
+
+    Each URL receives ``connections`` concurrent HEAD requests so that the DNS
+    lookup and TLS handshake are paid once per pooled connection. Any HTTP
+    status counts as a warm connection; failures are logged and ignored.
+
+    Args:
+        base_urls: Provider base URLs
+        connections: Concurrent connections per URL (defaults to the pool config)
+
+    Returns:
+        Number of connections that completed a round trip
+    """
+    urls = list(dict.fromkeys(url for url in base_urls if url))
+    per_url = max(1, connections or _pool_config["prewarm_connections"])
+    if not urls:
+        return 0
+
+    client = get_shared_http_client()
+
+    def warm(url: str) -> bool:
+        try:
+            client.head(url, timeout=10.0)
+            return True
+        except Exception as e:
+            logger.debug("Pre-warming %s failed: %s", url, e)
+            return False
+
+    targets = [url for url in urls for _ in range(per_url)]
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        warmed = sum(executor.map(warm, targets))
+
+    logger.debug("Pre-warmed %d/%d connections to %s", warmed, len(targets), ", ".join(urls))
+    return warmed
+
+
+def start_prewarm(base_urls: Iterable[str], connections: Optional[int] = None) -> Optional[threading.Thread]:
+    """
+    Pre-warm connections on a background thread.
+
+    Args:
+        base_urls: Provider base URLs
+        connections: Concurrent connections per URL
+
+    Returns:
+        The started daemon thread, or None when pre-warming is disabled
+    """
+    if not _pool_config["prewarm"]:
+        return None
+
+    urls = [url for url in base_urls if url]
+    if not urls:
+        return None
+
+    thread = threading.Thread(
+        target=prewarm_connections, args=(urls, connections),
+        name="http-prewarm", daemon=True,
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,495 @@
+"""Pools of API keys and endpoints per provider, load-balanced by rate-limit headroom."""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    from .concurrency import PerThread
+    from .http_transport import add_response_hook
+    from .llm_client import LLMClient, LLMError, create_llm_client
+    from .model_registry import ModelCapabilities
+    from .response_cache import ResponseCache
+    from .retry_policy import RATE_LIMIT, classify_error
+except ImportError:
+    from concurrency import PerThread
+    from http_transport import add_response_hook
+    from llm_client import LLMClient, LLMError, create_llm_client
+    from model_registry import ModelCapabilities
+    from response_cache import ResponseCache
+    from retry_policy import RATE_LIMIT, classify_error
+
+logger = logging.getLogger(__name__)
+
+# Rate limits are accounted over a sliding one-minute window
+WINDOW_SECONDS = 60.0
+
+# Seconds a member is skipped after a 429 without a Retry-After hint
+DEFAULT_COOLDOWN = 10.0
+
+# Weight of the newest sample in the per-member latency average
+LATENCY_SMOOTHING = 0.2
+
+# (limit, remaining, reset) headers per dimension, OpenAI-style then Anthropic-style
+RATE_LIMIT_HEADERS = {
+    "requests": (
+        ("x-ratelimit-limit-requests", "anthropic-ratelimit-requests-limit"),
+        ("x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining"),
+        ("x-ratelimit-reset-requests", "anthropic-ratelimit-requests-reset"),
+    ),
+    "tokens": (
+        ("x-ratelimit-limit-tokens", "anthropic-ratelimit-tokens-limit"),
+        ("x-ratelimit-remaining-tokens", "anthropic-ratelimit-tokens-remaining"),
+        ("x-ratelimit-reset-tokens", "anthropic-ratelimit-tokens-reset"),
+    ),
+}
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class KeyPoolError(Exception):
+    """Custom exception for API key pool errors."""
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit reset header into seconds from now.
+
+    Accepts plain seconds ("12"), Go-style durations ("6m0s", "250ms") and
+    RFC 3339 timestamps ("2024-06-01T12:00:00Z").
+
+    Args:
+        value: Header value
+
+    Returns:
+        Seconds until the limit resets, or None if the value is not understood
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset_at.tzinfo is None:
+        reset_at = reset_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _credential_key(base_url: str, secret: str) -> str:
+    """Hash identifying an endpoint and API key pair."""
+    return hashlib.sha256(f"{base_url.rstrip('/')}|{secret}".encode("utf-8")).hexdigest()
+
+
+class PoolMember:
+    """
+    One API key/endpoint of a pool with its own limits, usage and health.
+
+    Limits come from the member configuration, else from the rate-limit
+    headers the provider returns, else from the model registry. Requests and
+    tokens sent in the last minute are counted locally, and the provider's
+    reported remaining quota is used while it is current.
+    """
+
+    def __init__(
+        self, name: str, client: LLMClient,
+        requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None
+    ):
+        """
+        Initialize a pool member.
+
+        Args:
+            name: Label used in logs and statistics (never the key itself)
+            client: LLM client bound to this key/endpoint
+            requests_per_minute: Configured request limit (overrides headers)
+            tokens_per_minute: Configured token limit (overrides headers)
+        """
+        self.name = name
+        self.client = client
+        capabilities = client.capabilities
+        self._configured = {"requests": requests_per_minute, "tokens": tokens_per_minute}
+        self.limits: Dict[str, Optional[int]] = {
+            "requests": requests_per_minute or capabilities.requests_per_minute,
+            "tokens": tokens_per_minute or capabilities.tokens_per_minute,
+        }
+        # Provider-reported remaining quota: dimension -> [remaining, valid until]
+        self._reported: Dict[str, List[float]] = {}
+        self._requests: Deque[float] = deque()
+        self._tokens: Deque[Tuple[float, int]] = deque()
+        self._lock = threading.Lock()
+
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.latency: Optional[float] = None
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "tokens": 0}
+
+    def observe_headers(self, headers: Any) -> None:
+        """
+        Update limits and remaining quota from provider response headers.
+
+        Args:
+            headers: Response headers (case-insensitive mapping)
+        """
+        now = time.monotonic()
+        with self._lock:
+            for dimension, (limit_names, remaining_names, reset_names) in RATE_LIMIT_HEADERS.items():
+                limit = next((headers.get(name) for name in limit_names if headers.get(name)), None)
+                remaining = next((headers.get(name) for name in remaining_names if headers.get(name)), None)
+                reset = next((headers.get(name) for name in reset_names if headers.get(name)), None)
+                try:
+                    if limit and not self._configured[dimension]:
+                        self.limits[dimension] = int(float(limit))
+                    if remaining is not None:
+                        valid_for = parse_reset(reset)
+                        self._reported[dimension] = [
+                            float(remaining), now + (WINDOW_SECONDS if valid_for is None else valid_for)
+                        ]
+                except ValueError:
+                    logger.debug("Ignoring malformed rate-limit header for %s", self.name)
+
+    def _prune(self, now: float) -> None:
+        while self._requests and now - self._requests[0] >= WINDOW_SECONDS:
+            self._requests.popleft()
+        while self._tokens and now - self._tokens[0][0] >= WINDOW_SECONDS:
+            self._tokens.popleft()
+
+    def headroom(self, now: Optional[float] = None) -> float:
+        """
+        Fraction of the tighter of the request and token limits still available.
+
+        Returns:
+            Value in [0, 1] (1.0 when no limit is known), or -1.0 while the
+            member is cooling down after a rate-limit response
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if now < self.cooldown_until:
+                return -1.0
+            self._prune(now)
+
+            used = {"requests": len(self._requests), "tokens": sum(tokens for _, tokens in self._tokens)}
+            fractions = []
+            for dimension, limit in self.limits.items():
+                if not limit:
+                    continue
+                remaining = limit - used[dimension]
+                reported = self._reported.get(dimension)
+                if reported and now < reported[1]:
+                    remaining = min(remaining, reported[0])
+                fractions.append(max(0.0, remaining) / limit)
+            return min(fractions) if fractions else 1.0
+
+    def begin(self) -> None:
+        """Account a request being sent through this member."""
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight += 1
+            self.stats["requests"] += 1
+            self._requests.append(now)
+            reported = self._reported.get("requests")
+            if reported:
+                reported[0] -= 1
+
+    def finish(
+        self, latency: float, tokens: int = 0, error_kind: Optional[str] = None,
+        retry_after: Optional[float] = None
+    ) -> None:
+        """
+        Account the outcome of a request.
+
+        Args:
+            latency: Request latency in seconds
+            tokens: Input plus output tokens used
+            error_kind: Error classification if the request failed
+            retry_after: Retry-After hint of a rate-limit response
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight -= 1
+            if tokens:
+                self._tokens.append((now, tokens))
+                self.stats["tokens"] += tokens
+            if error_kind is None:
+                self.latency = latency if self.latency is None else (
+                    LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * self.latency
+                )
+                return
+
+            self.stats["errors"] += 1
+            if error_kind == RATE_LIMIT:
+                self.stats["rate_limited"] += 1
+                reported = self._reported.get("requests")
+                reset = reported[1] - now if reported and reported[0] <= 0 else None
+                self.cooldown_until = now + (retry_after or reset or DEFAULT_COOLDOWN)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get usage, health and limit information for this member.
+
+        Returns:
+            Statistics dictionary
+        """
+        headroom = self.headroom()
+        with self._lock:
+            return {
+                "name": self.name,
+                **self.stats,
+                "avg_latency": round(self.latency, 3) if self.latency is not None else None,
+                "requests_per_minute": self.limits["requests"],
+                "tokens_per_minute": self.limits["tokens"],
+                "headroom": round(max(0.0, headroom), 3),
+                "cooling_down": headroom < 0,
+            }
+
+
+class KeyPoolLLMClient:
+    """
+    Spreads requests for one model over several API keys/endpoints.
+
+    Each request goes to the member with the most rate-limit headroom (ties
+    go to the member with fewer requests in flight, then fewer requests
+    sent, then the faster one). A
+    member answering 429 is cooled down and the request moves to the next
+    member, so aggregate throughput grows with the number of keys.
+    Attributes not defined here are read from the first member's client.
+    """
+
+    # Model of the member that produced the calling thread's most recent response
+    last_model = PerThread()
+
+    def __init__(self, members: List[PoolMember]):
+        """
+        Initialize the pooled client.
+
+        Args:
+            members: Pool members; all serve the same provider and model
+
+        Raises:
+            KeyPoolError: If the pool is empty
+        """
+        if not members:
+            raise KeyPoolError("An API key pool needs at least one member")
+
+        self.members = list(members)
+        self.primary = self.members[0].client
+        self._lock = threading.Lock()
+
+        # Rate-limit headers are matched to members by endpoint and credential
+        self._by_credential: Dict[str, PoolMember] = {}
+        for member in self.members:
+            base_url = getattr(member.client.client, "base_url", None)
+            if base_url is not None and member.client.api_key:
+                self._by_credential[_credential_key(str(base_url), member.client.api_key)] = member
+        if self._by_credential:
+            add_response_hook(self._observe_response)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing on the pool itself
+        primary = self.__dict__.get("primary")
+        if primary is None:
+            raise AttributeError(name)
+        return getattr(primary, name)
+
+    @property
+    def stream_listener(self):
+        return self.primary.stream_listener
+
+    @stream_listener.setter
+    def stream_listener(self, listener) -> None:
+        for member in self.members:
+            member.client.stream_listener = listener
+
+    @property
+    def telemetry(self):
+        return self.primary.telemetry
+
+    @telemetry.setter
+    def telemetry(self, collector) -> None:
+        for member in self.members:
+            member.client.telemetry = collector
+
+    def _observe_response(self, response) -> None:
+        """Response hook: record rate-limit headers for the member that sent the request."""
+        request = response.request
+        secret = request.headers.get("x-api-key") or request.headers.get("authorization", "")
+        secret = secret[len("Bearer "):] if secret.startswith("Bearer ") else secret
+        if not secret:
+            return
+
+        url = str(request.url)
+        for credential, member in self._by_credential.items():
+            base_url = str(member.client.client.base_url).rstrip("/")
+            if url.startswith(base_url) and credential == _credential_key(base_url, secret):
+                member.observe_headers(response.headers)
+                return
+
+    def _select(self, exclude: List[PoolMember]) -> PoolMember:
+        """Choose the member with the most headroom among those not yet tried."""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [member for member in self.members if member not in exclude]
+            return max(
+                candidates,
+                key=lambda member: (
+                    member.headroom(now), -member.in_flight,
+                    -member.stats["requests"], -(member.latency or 0.0),
+                ),
+            )
+
+    def _call(self, method: str, *args, **kwargs) -> str:
+        """Send a request through the best member, moving on when a member is rate limited."""
+        tried: List[PoolMember] = []
+        last_error: Optional[LLMError] = None
+
+        while len(tried) < len(self.members):
+            member = self._select(tried)
+            tried.append(member)
+
+            member.begin()
+            started = time.monotonic()
+            try:
+                response = getattr(member.client, method)(*args, **kwargs)
+            except LLMError as e:
+                kind, retry_after = classify_error(e)
+                member.finish(time.monotonic() - started, error_kind=kind, retry_after=retry_after)
+                if kind != RATE_LIMIT:
+                    raise
+                last_error = e
+                logger.info("Key pool member %s is rate limited; trying another member", member.name)
+                continue
+
+            usage = member.client.last_usage or {}
+            member.finish(
+                time.monotonic() - started,
+                tokens=usage.get("input_tokens", 0) + usage.get("output_tokens", 0),
+            )
+            self.last_model = member.client.last_model
+            return response
+
+        raise last_error
+
+    def generate_slide_analysis(self, *args, **kwargs) -> str:
+        """Generate a slide analysis through the member with the most headroom."""
+        return self._call("generate_slide_analysis", *args, **kwargs)
+
+    def generate_packed_slide_analysis(self, *args, **kwargs) -> str:
+        """Generate a packed slide analysis through the member with the most headroom."""
+        return self._call("generate_packed_slide_analysis", *args, **kwargs)
+
+    def generate_section_repair(self, *args, **kwargs) -> str:
+        """Generate missing analysis sections with the member with the most headroom."""
+        return self._call("generate_section_repair", *args, **kwargs)
+
+    def test_connection(self) -> bool:
+        """Return True if any member is reachable."""
+        return any(member.client.test_connection() for member in self.members)
+
+    def health_check(self, cache=None) -> bool:
+        """
+        Health-check every member.
+
+        Members that fail are removed from the pool while at least one remains.
+
+        Args:
+            cache: Health check cache, if enabled
+
+        Returns:
+            True if any member is healthy
+        """
+        healthy = [member for member in self.members if member.client.health_check(cache)]
+        if not healthy:
+            return False
+        for member in self.members:
+            if member not in healthy:
+                logger.warning("Key pool member %s is unavailable; removing it from the pool", member.name)
+        self.members = healthy
+        return True
+
+    def close(self) -> None:
+        """Release provider-side resources of every member."""
+        for member in self.members:
+            member.client.close()
+
+    def endpoint_urls(self) -> List[str]:
+        """Get the HTTP endpoints of every member."""
+        return list(dict.fromkeys(url for member in self.members for url in member.client.endpoint_urls()))
+
+    def model_capabilities(self) -> List[ModelCapabilities]:
+        """Get the capabilities of the pooled model."""
+        return self.primary.model_capabilities()
+
+    def get_key_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get per-member usage, errors, latency and limits.
+
+        Returns:
+            Dictionary with the model label and one entry per member
+        """
+        return {
+            "model": self.primary.model_label,
+            "members": [member.get_stats() for member in self.members],
+        }
+
+
+def create_key_pool_client(
+    config: Dict[str, Any], response_cache: Optional[ResponseCache] = None
+):
+    """
+    Factory function to create an LLM client, pooled over keys/endpoints if configured.
+
+    Each resolved `key_pool.members` entry becomes one member with its own
+    `api_key` and/or `base_url` (defaulting to the entry's) and optional limits.
+
+    Args:
+        config: LLM configuration with a resolved `key_pool` section
+        response_cache: Optional cache shared by all members
+
+    Returns:
+        A plain LLMClient without a pool, otherwise a KeyPoolLLMClient
+
+    Raises:
+        KeyPoolError: If the pool cannot be served by the provider's SDK
+    """
+    pool_config = config.get("key_pool") or {}
+    member_configs = pool_config.get("members") or []
+    base_config = {key: value for key, value in config.items() if key != "key_pool"}
+    if not pool_config.get("enabled") or not member_configs:
+        return create_llm_client(base_config, response_cache=response_cache)
+
+    if config.get("provider") == "google":
+        keys = {member.get("api_key") or config.get("api_key") for member in member_configs}
+        if len(keys) > 1:
+            # genai.configure() sets one process-wide key
+            raise KeyPoolError("Key pools with several Google AI keys are not supported by the Gemini SDK")
+
+    members = []
+    for index, member_config in enumerate(member_configs, 1):
+        client_config = dict(base_config)
+        for key in ("api_key", "base_url"):
+            if member_config.get(key):
+                client_config[key] = member_config[key]
+        name = member_config.get("name") or member_config.get("api_key_env") or f"member-{index}"
+        members.append(PoolMember(
+            name, create_llm_client(client_config, response_cache=response_cache),
+            member_config.get("requests_per_minute"), member_config.get("tokens_per_minute"),
+        ))
+
+    logger.info(
+        "API key pool for %s: %s", members[0].client.model_label, ", ".join(member.name for member in members)
+    )
+    return KeyPoolLLMClient(members)
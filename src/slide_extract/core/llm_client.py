@@ -1,11 +1,107 @@
 """LLM client for integrating with various language model providers."""
 
+import datetime
+import hashlib
+import json
 import logging
+import threading
 import time
-from typing import Dict, Any, Optional
+from contextlib import nullcontext
+from dataclasses import replace
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Callable, Dict, Any, List, Optional, Union
+
+try:
+    from .cassette import Cassette, create_cassette
+    from .concurrency import PerThread, RequestSlots, get_request_slots
+    from .health_check import HealthCheckCache, compute_health_key
+    from .hedging import RequestHedger, create_request_hedger
+    from .http_transport import get_shared_http_client
+    from .mock_provider import create_mock_responder
+    from .model_registry import ModelCapabilities, get_model_capabilities
+    from .output_budget import OutputBudget, get_output_budget
+    from .pdf_processor import SlideContent
+    from .response_cache import ResponseCache, compute_cache_key
+    from .session import ConversationSession, history_text
+    from .slide_packer import SlidePacker, estimate_text_tokens
+    from .streaming import consume_stream
+    from .structured_output import (
+        SCHEMA_NAME, AnalysisSchema, StructuredOutputError, structure_markdown, without_additional_properties
+    )
+    from .telemetry import TelemetryCollector
+except ImportError:
+    from cassette import Cassette, create_cassette
+    from concurrency import PerThread, RequestSlots, get_request_slots
+    from health_check import HealthCheckCache, compute_health_key
+    from hedging import RequestHedger, create_request_hedger
+    from http_transport import get_shared_http_client
+    from mock_provider import create_mock_responder
+    from model_registry import ModelCapabilities, get_model_capabilities
+    from output_budget import OutputBudget, get_output_budget
+    from pdf_processor import SlideContent
+    from response_cache import ResponseCache, compute_cache_key
+    from session import ConversationSession, history_text
+    from slide_packer import SlidePacker, estimate_text_tokens
+    from streaming import consume_stream
+    from structured_output import (
+        SCHEMA_NAME, AnalysisSchema, StructuredOutputError, structure_markdown, without_additional_properties
+    )
+    from telemetry import TelemetryCollector
 
 logger = logging.getLogger(__name__)
 
+# Providers that run without an API key
+KEYLESS_PROVIDERS = ("mock", "openai_compatible")
+
+# Providers speaking the OpenAI chat-completions wire format
+OPENAI_WIRE_PROVIDERS = ("openai", "openrouter", "openai_compatible")
+
+# Sent after a response that stopped at the output limit or whose stream broke off
+CONTINUE_PROMPT = (
+    "Your previous response was cut off before it was complete. Continue exactly where it "
+    "stopped, without repeating any text that was already written."
+)
+
+# Characters compared when joining a continuation to the text before it; shorter
+# repeats are too likely to be coincidental
+_CONTINUATION_OVERLAP = 200
+_CONTINUATION_MIN_OVERLAP = 16
+
+# HTTP statuses with which local servers reject image input
+_IMAGE_REJECTION_STATUSES = (400, 415, 422, 500)
+
+# Reasoning effort levels accepted in the `reasoning` configuration
+REASONING_EFFORTS = ("minimal", "low", "medium", "high")
+
+# Thinking budgets used for an effort level by providers that take a token budget
+_EFFORT_BUDGETS = {"minimal": 0, "low": 1024, "medium": 8192, "high": 24576}
+
+# Smallest thinking budget Anthropic accepts (0 turns thinking off)
+_ANTHROPIC_MIN_THINKING_BUDGET = 1024
+
+
+def _partial_text(error: BaseException) -> str:
+    """Text a failed streamed request produced before it broke off, if any."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        partial = getattr(error, "partial_text", None)
+        if partial:
+            return partial
+        error = error.__cause__ or error.__context__
+    return ""
+
+
+@lru_cache(maxsize=1)
+def _google_supports_thinking() -> bool:
+    """Return True if the installed Gemini SDK accepts a thinking_config."""
+    try:
+        from google.ai import generativelanguage as glm
+    except ImportError:
+        return False
+    return "thinking_config" in glm.GenerationConfig.meta.fields
+
 
 class LLMError(Exception):
     """Custom exception for LLM-related errors."""
@@ -14,39 +110,239 @@ class LLMError(Exception):
 class LLMClient:
     """Unified client for various LLM providers."""
 
-    def __init__(self, config: Dict[str, Any]):
+    # provider/model that produced the calling thread's most recent response
+    last_model = PerThread()
+    # token usage of the calling thread's most recent response
+    last_usage = PerThread()
+
+    def __init__(self, config: Dict[str, Any], response_cache: Optional[ResponseCache] = None):
         """
         Initialize LLM client with configuration.
 
         Args:
             config: LLM configuration dictionary
+            response_cache: Optional cache for previously generated responses
         """
         self.config = config
+        self.response_cache = response_cache
         self.provider = config.get("provider")
         self.model = config.get("model")
         self.api_key = config.get("api_key")
         self.max_tokens = config.get("max_tokens", 4000)
         self.temperature = config.get("temperature", 0.3)
+        self.prompt_caching = config.get("prompt_caching", True)
+        self.prompt_cache_ttl = config.get("prompt_cache_ttl", 3600)
+        self.request_timeout = config.get("request_timeout", 60)
+        self.connect_timeout = config.get("connect_timeout", 10)
+        # Concurrent requests the endpoint serves (e.g. a local server's slots)
+        self.max_concurrency = max(1, config.get("max_concurrency") or 1)
+        # Set when the server rejects image input; later requests send text only
+        self.vision_disabled = False
+        # Follow-up requests for responses that stop at the output limit
+        self.max_continuations = config.get("max_continuations", 2)
+        self.output_budget: Optional[OutputBudget] = get_output_budget(
+            config.get("adaptive_max_tokens") or {}
+        )
+        # Hidden reasoning: effort level (OpenAI style) and/or thinking token budget
+        reasoning_config = config.get("reasoning") or {}
+        self.reasoning_effort: Optional[str] = reasoning_config.get("effort")
+        self.reasoning_budget: Optional[int] = reasoning_config.get("budget_tokens")
+        # Ask for JSON matching a schema of the prompt's sections and render Markdown locally
+        self.structured_output = bool(config.get("structured_output", False))
+
+        streaming_config = config.get("streaming") or {}
+        self.streaming = streaming_config.get("enabled", False)
+        self.first_token_timeout = streaming_config.get("first_token_timeout", 30)
+        self.inter_token_timeout = streaming_config.get("inter_token_timeout", 15)
+        # Partial text kept from a broken stream and continued (None: regenerate instead)
+        self.resume_min_chars: Optional[int] = streaming_config.get("resume_min_chars", 200)
+        # Receives partial response text while a streamed request is in flight
+        self.stream_listener: Optional[Callable[[str], None]] = None
+        self._telemetry: Optional[TelemetryCollector] = None
+        # Per-thread cancellation and partial-output settings of the running request
+        self._request_state = threading.local()
+        self._google_models: Dict[str, Any] = {}
+        # Gemini cached content created by this client, deleted on close()
+        self._google_caches: List[Any] = []
+        self._google_models_lock = threading.Lock()
 
         if not self.provider:
             raise LLMError("No LLM provider specified")
-        if not self.api_key:
+        if not self.api_key and self.provider not in KEYLESS_PROVIDERS:
             raise LLMError(f"No API key provided for {self.provider}")
+        self._check_reasoning_config()
 
         self.client = self._initialize_client()
+        self.request_slots: Optional[RequestSlots] = None
+        if config.get("max_concurrency"):
+            endpoint = config.get("base_url") or self.provider
+            self.request_slots = get_request_slots(endpoint, self.max_concurrency)
+        self.cassette: Optional[Cassette] = create_cassette(config.get("cassette") or {})
+
+        hedging_config = config.get("hedging") or {}
+        self.hedger: Optional[RequestHedger] = create_request_hedger(hedging_config)
+        self.hedge_client: Optional["LLMClient"] = None
+        if self.hedger and hedging_config.get("model") and hedging_config["model"] != self.model:
+            self.hedge_client = LLMClient(
+                {**config, "model": hedging_config["model"], "hedging": None}
+            )
+
+    @property
+    def telemetry(self) -> Optional[TelemetryCollector]:
+        """Collector receiving one record per provider request, if enabled."""
+        return self._telemetry
+
+    @telemetry.setter
+    def telemetry(self, collector: Optional[TelemetryCollector]) -> None:
+        self._telemetry = collector
+        if getattr(self, "hedge_client", None):
+            self.hedge_client.telemetry = collector
+
+    def _check_reasoning_config(self) -> None:
+        """Validate the reasoning options and warn about ones the provider ignores."""
+        if self.reasoning_effort is not None and self.reasoning_effort not in REASONING_EFFORTS:
+            raise LLMError(
+                f"Unknown reasoning effort '{self.reasoning_effort}' (expected {', '.join(REASONING_EFFORTS)})"
+            )
+        if self.reasoning_budget is not None and self.reasoning_budget < 0:
+            raise LLMError(f"Reasoning budget_tokens must be >= 0: {self.reasoning_budget}")
+        if self.provider == "anthropic" and 0 < (self.thinking_budget or 0) < _ANTHROPIC_MIN_THINKING_BUDGET:
+            raise LLMError(
+                f"Anthropic thinking budget_tokens must be 0 or >= {_ANTHROPIC_MIN_THINKING_BUDGET}: "
+                f"{self.thinking_budget}"
+            )
+        if self.reasoning_budget is not None and not self.reasoning_effort and self.provider in (
+            "openai", "openai_compatible"
+        ):
+            logger.warning("%s takes reasoning.effort; ignoring reasoning.budget_tokens", self.model_label)
+        if self.thinking_budget is not None and self.provider == "google" and not _google_supports_thinking():
+            logger.warning(
+                "The installed google-generativeai SDK has no thinking_config; "
+                "the thinking budget for %s is not applied", self.model_label
+            )
+
+    @property
+    def thinking_budget(self) -> Optional[int]:
+        """Thinking token budget, from budget_tokens or else the effort level (None: model default)."""
+        if self.reasoning_budget is not None:
+            return self.reasoning_budget
+        return _EFFORT_BUDGETS.get(self.reasoning_effort)
+
+    @property
+    def cache_model_id(self) -> str:
+        """Model identifier for cache keys, including options that change responses."""
+        model_id = self.model
+        if self.reasoning_effort is not None or self.reasoning_budget is not None:
+            model_id = f"{model_id}#effort={self.reasoning_effort};budget={self.reasoning_budget}"
+        if self.structured_output:
+            model_id = f"{model_id}#structured"
+        return model_id
+
+    def _analysis_schema(self, prompt: str, packed: bool = False) -> Optional[AnalysisSchema]:
+        """Schema for analyses requested with a prompt, or None if structured output is off."""
+        return AnalysisSchema.from_prompt(prompt, packed=packed) if self.structured_output else None
+
+    def _generation_params(self, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Output limit, temperature, reasoning and response schema options for
+        OpenAI-style and Anthropic requests.
+
+        Fields the installed SDKs do not know are placed under ``extra_body``.
+        A response schema is sent as a JSON-schema response format, or to
+        Anthropic as the input schema of a tool the model must call.
+
+        Args:
+            max_tokens: Output token limit (default: that of the running request)
+
+        Returns:
+            Keyword arguments for ``chat.completions.create`` or ``messages.create``
+        """
+        limit = max_tokens or self._request_max_tokens()
+        params: Dict[str, Any] = {"max_tokens": limit, "temperature": self.temperature}
+        body: Dict[str, Any] = {}
+
+        if self.provider == "anthropic":
+            budget = self.thinking_budget
+            if budget:
+                # Thinking counts against max_tokens and requires the default temperature
+                params = {"max_tokens": limit + budget}
+                body["thinking"] = {"type": "enabled", "budget_tokens": budget}
+        elif self.provider == "openrouter":
+            if self.reasoning_effort:
+                body["reasoning"] = {"effort": self.reasoning_effort}
+            elif self.reasoning_budget is not None:
+                body["reasoning"] = (
+                    {"max_tokens": self.reasoning_budget} if self.reasoning_budget else {"enabled": False}
+                )
+        elif self.reasoning_effort:
+            body["reasoning_effort"] = self.reasoning_effort
+            if self.provider == "openai":
+                # OpenAI reasoning models reject max_tokens and a custom temperature
+                params = {"max_completion_tokens": limit}
+
+        schema = getattr(self._request_state, "schema", None)
+        if schema and self.provider == "anthropic":
+            params["tools"] = [{
+                "name": SCHEMA_NAME,
+                "description": "Record the analysis of the slide(s) in the request.",
+                "input_schema": schema,
+            }]
+            # Extended thinking does not allow forcing a particular tool
+            params["tool_choice"] = (
+                {"type": "auto"} if self.thinking_budget else {"type": "tool", "name": SCHEMA_NAME}
+            )
+        elif schema:
+            params["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": SCHEMA_NAME, "strict": True, "schema": schema},
+            }
+
+        if body:
+            params["extra_body"] = body
+        return params
+
+    def _google_generation_config(self) -> Dict[str, Any]:
+        """Generation config for Gemini requests, with the thinking budget and response schema."""
+        generation_config: Dict[str, Any] = {
+            "temperature": self.temperature,
+            "max_output_tokens": self._request_max_tokens(),
+        }
+        if self.thinking_budget is not None and _google_supports_thinking():
+            generation_config["thinking_config"] = {"thinking_budget": self.thinking_budget}
+        schema = getattr(self._request_state, "schema", None)
+        if schema:
+            generation_config["response_mime_type"] = "application/json"
+            generation_config["response_schema"] = without_additional_properties(schema)
+        return generation_config
+
+    def _sdk_timeout(self):
+        """Build explicit connect/read timeouts for httpx-based SDK clients."""
+        import httpx
+
+        return httpx.Timeout(self.request_timeout, connect=self.connect_timeout)
 
     def _initialize_client(self):
         """Initialize the appropriate client based on provider."""
+        # SDK-internal retries are disabled; RetryPolicy owns retries and backoff.
+        # httpx-based SDKs share one process-wide connection pool.
         try:
             if self.provider == "openai":
                 import openai
 
-                return openai.OpenAI(api_key=self.api_key)
+                return openai.OpenAI(
+                    api_key=self.api_key, base_url=self.config.get("base_url"),
+                    timeout=self._sdk_timeout(), max_retries=0,
+                    http_client=get_shared_http_client()
+                )
 
             elif self.provider == "anthropic":
                 import anthropic
 
-                return anthropic.Anthropic(api_key=self.api_key)
+                return anthropic.Anthropic(
+                    api_key=self.api_key, base_url=self.config.get("base_url"),
+                    timeout=self._sdk_timeout(), max_retries=0,
+                    http_client=get_shared_http_client()
+                )
 
             elif self.provider == "google":
                 import google.generativeai as genai
@@ -54,11 +350,30 @@ class LLMClient:
                 genai.configure(api_key=self.api_key)
                 return genai.GenerativeModel(self.model)
 
+            elif self.provider == "mock":
+                return create_mock_responder(self.config.get("mock") or {})
+
             elif self.provider == "openrouter":
                 import openai
 
                 base_url = self.config.get("base_url", "https://openrouter.ai/api/v1")
-                return openai.OpenAI(api_key=self.api_key, base_url=base_url)
+                return openai.OpenAI(
+                    api_key=self.api_key, base_url=base_url,
+                    timeout=self._sdk_timeout(), max_retries=0,
+                    http_client=get_shared_http_client()
+                )
+
+            elif self.provider == "openai_compatible":
+                import openai
+
+                # Local servers (llama.cpp, vLLM, Ollama) usually accept any key
+                if not self.config.get("base_url"):
+                    raise LLMError("Provider openai_compatible requires a base_url")
+                return openai.OpenAI(
+                    api_key=self.api_key or "not-needed", base_url=self.config["base_url"],
+                    timeout=self._sdk_timeout(), max_retries=0,
+                    http_client=get_shared_http_client()
+                )
 
             else:
                 raise LLMError(f"Unsupported LLM provider: {self.provider}")
@@ -71,7 +386,8 @@ class LLMClient:
 
     def generate_slide_analysis(
         self, slide_text: str, prompt: str, slide_number: int, 
-        context: str = "", image_base64: str = None
+        context: str = "", image_base64: str = None, use_cache: bool = True,
+        session: Optional[ConversationSession] = None
     ) -> str:
         """
         Generate analysis for a single slide using the configured LLM.
@@ -82,6 +398,9 @@ class LLMClient:
             slide_number: Slide number for context
             context: Cumulative context from previous slides
             image_base64: Base64-encoded image of the slide (for multi-modal)
+            use_cache: Whether the response cache may be consulted
+            session: Conversation whose history is sent with the request and
+                which records the response
 
         Returns:
             Generated slide analysis
@@ -92,55 +411,537 @@ class LLMClient:
         try:
             # Create the full prompt with context
             full_prompt = self._create_slide_prompt(slide_text, prompt, slide_number, context)
+            user_prompt = self._create_slide_message(slide_text, slide_number, context)
+            images = [image_base64] if image_base64 else []
 
-            # Generate response based on provider and modality
-            if image_base64 and self._supports_vision():
-                return self._generate_multimodal_response(full_prompt, image_base64)
-            else:
-                return self._generate_text_response(full_prompt)
+            return self._complete(
+                prompt, user_prompt, full_prompt, images, f"slide {slide_number}", use_cache, session,
+                schema=self._analysis_schema(prompt), slide_numbers=[slide_number]
+            )
 
         except Exception as e:
             logger.error("Failed to generate slide analysis: %s", e)
             raise LLMError(f"Failed to generate slide analysis: {e}") from e
-            
-    def _supports_vision(self) -> bool:
-        """Check if the current provider/model supports vision capabilities."""
-        vision_models = {
-            'openai': ['gpt-4o', 'gpt-4o-mini', 'gpt-4-vision-preview'],
-            'anthropic': ['claude-3-5-sonnet-20241022', 'claude-3-opus-20240229', 'claude-3-haiku-20240307'],
-            'google': ['gemini-1.5-pro', 'gemini-1.5-flash', 'gemini-pro-vision'],
-            'openrouter': []  # Most models on OpenRouter support vision if they're GPT-4o or Claude-3
+
+    def generate_section_repair(
+        self, slide_text: str, prompt: str, slide_number: int, analysis: str,
+        sections: List[str], image_base64: str = None, use_cache: bool = True
+    ) -> str:
+        """
+        Ask for only the sections an existing slide analysis lacks.
+
+        The request carries the existing analysis as text; the slide image is
+        sent only when the images section itself must be written.
+
+        Args:
+            slide_text: Extracted text from the slide
+            prompt: Analysis prompt/instructions
+            slide_number: Slide number
+            analysis: Existing analysis with missing or incomplete sections
+            sections: Section headings to write, e.g. "**Slide Narration:**"
+            image_base64: Base64-encoded image of the slide, if the images
+                section is requested
+            use_cache: Whether the response cache may be consulted
+
+        Returns:
+            Response containing the requested sections
+
+        Raises:
+            LLMError: If generation fails
+        """
+        try:
+            user_prompt = self._create_repair_message(slide_text, slide_number, analysis, sections)
+            full_prompt = f"\n{prompt}\n\n{user_prompt}"
+            images = [image_base64] if image_base64 else []
+            schema = self._analysis_schema(prompt)
+
+            # Repairs are shorter than full analyses; keep them out of the learned lengths
+            return self._complete(
+                prompt, user_prompt, full_prompt, images, f"slide {slide_number} repair", use_cache,
+                adaptive_limit=False, schema=schema.subset(sections) if schema else None,
+                slide_numbers=[slide_number]
+            )
+
+        except Exception as e:
+            logger.error("Failed to generate section repair: %s", e)
+            raise LLMError(f"Failed to generate section repair: {e}") from e
+
+    def generate_packed_slide_analysis(
+        self, slides: List[SlideContent], prompt: str, context: str = "",
+        use_cache: bool = True, session: Optional[ConversationSession] = None
+    ) -> str:
+        """
+        Generate analysis for several consecutive slides in a single request.
+
+        The model is asked to wrap each slide's analysis in delimiters so the
+        response can be split with SlidePacker.split_packed_response.
+
+        Args:
+            slides: Slides to analyze, in order
+            prompt: Analysis prompt/instructions
+            context: Cumulative context from slides before the group
+            use_cache: Whether the response cache may be consulted
+            session: Conversation whose history is sent with the request and
+                which records the response
+
+        Returns:
+            Raw packed response containing one delimited section per slide
+
+        Raises:
+            LLMError: If generation fails
+        """
+        try:
+            user_prompt = SlidePacker.build_packed_message(slides, context)
+            full_prompt = f"\n{prompt}\n\n{user_prompt}"
+            images = [slide.image_base64 for slide in slides if slide.image_base64]
+            numbers = [slide.slide_number for slide in slides]
+
+            return self._complete(
+                prompt, user_prompt, full_prompt, images,
+                f"slides {numbers[0]}-{numbers[-1]}", use_cache, session, slide_count=len(slides),
+                schema=self._analysis_schema(prompt, packed=True), slide_numbers=numbers
+            )
+
+        except Exception as e:
+            logger.error("Failed to generate packed slide analysis: %s", e)
+            raise LLMError(f"Failed to generate packed slide analysis: {e}") from e
+
+    def build_slide_request(
+        self, slide_text: str, prompt: str, slide_number: int,
+        context: str = "", image_base64: str = None
+    ) -> Dict[str, Any]:
+        """
+        Build the provider-neutral parts of a slide request without sending it.
+
+        Args:
+            slide_text: Extracted text from the slide
+            prompt: Analysis prompt/instructions
+            slide_number: Slide number for context
+            context: Cumulative context from previous slides
+            image_base64: Base64-encoded image of the slide (for multi-modal)
+
+        Returns:
+            Dictionary with system_prompt, user_prompt, images and the JSON
+            schema of the response (None unless structured output is on)
+        """
+        if self.prompt_caching:
+            system_prompt = prompt
+            user_prompt = self._create_slide_message(slide_text, slide_number, context)
+        else:
+            system_prompt = None
+            user_prompt = self._create_slide_prompt(slide_text, prompt, slide_number, context)
+
+        images = [image_base64] if image_base64 and self.capabilities.vision else []
+        schema = self._analysis_schema(prompt)
+        return {
+            "system_prompt": system_prompt, "user_prompt": user_prompt, "images": images,
+            "schema": schema.json_schema() if schema else None,
         }
-        
-        if self.provider not in vision_models:
-            return False
+
+    def build_request_params(
+        self, user_prompt: str, images: List[str], system_prompt: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the request body for the provider's message API.
+
+        Used for requests that are not sent through the SDK directly, such as
+        offline batch jobs.
+
+        Args:
+            user_prompt: Per-request message
+            images: Base64-encoded images to attach
+            system_prompt: Static instructions, if sent separately
+            schema: JSON schema the response must match (see build_slide_request)
+
+        Returns:
+            Request body dictionary in the provider's wire format
+
+        Raises:
+            LLMError: If the provider has no message API body format
+        """
+        self._request_state.schema = schema
+        try:
+            return self._request_body(user_prompt, images, system_prompt)
+        finally:
+            self._request_state.schema = None
+
+    def _request_body(self, user_prompt: str, images: List[str], system_prompt: Optional[str]) -> Dict[str, Any]:
+        """Request body for build_request_params, with the schema already on the request state."""
+        if self.provider in OPENAI_WIRE_PROVIDERS:
+            content: Any = user_prompt
+            if images:
+                content = [{"type": "text", "text": user_prompt}] + [
+                    {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image}"}}
+                    for image in images
+                ]
+            params = self._generation_params(self.max_tokens)
+            # SDK extra_body fields are top-level fields of the wire body
+            extra = params.pop("extra_body", {})
+            return {
+                "model": self.model,
+                "messages": self._openai_messages(content, system_prompt),
+                **params,
+                **extra,
+            }
+
+        if self.provider == "anthropic":
+            content = [{"type": "text", "text": user_prompt}] + [
+                {
+                    "type": "image",
+                    "source": {"type": "base64", "media_type": "image/png", "data": image},
+                }
+                for image in images
+            ]
+            generation = self._generation_params(self.max_tokens)
+            extra = generation.pop("extra_body", {})
+            params = {
+                "model": self.model,
+                **generation,
+                **extra,
+                "messages": [{"role": "user", "content": content}],
+            }
+            system = self._anthropic_system(system_prompt).get("system")
+            if system:
+                params["system"] = system
+            return params
+
+        raise LLMError(f"Request body format not available for provider: {self.provider}")
+
+    def _complete(
+        self, prompt: str, user_prompt: str, full_prompt: str, images: List[str],
+        description: str, use_cache: bool = True, session: Optional[ConversationSession] = None,
+        slide_count: int = 1, adaptive_limit: bool = True,
+        schema: Optional[AnalysisSchema] = None, slide_numbers: Optional[List[int]] = None
+    ) -> str:
+        """
+        Run one request through the response cache and the configured provider.
+
+        Args:
+            prompt: Static instruction prompt
+            user_prompt: Per-request message following the instructions
+            full_prompt: Instructions and message combined
+            images: Base64-encoded images to attach
+            description: Human-readable request description for logging
+            use_cache: Whether the response cache may be consulted
+            session: Conversation whose history precedes the message
+            slide_count: Slides covered by the request, for the adaptive output limit
+            adaptive_limit: Whether the adaptive output limit applies and learns
+                from this request
+            schema: Schema the response must match; the validated response is
+                rendered to Markdown
+            slide_numbers: Slides covered by the request, used when rendering
+
+        Returns:
+            Generated response text
+        """
+        use_vision = bool(images) and self.capabilities.vision
+        history = session.messages() if session else None
+        message = user_prompt
+
+        cache_key = None
+        if use_cache and self.response_cache and self.response_cache.enabled:
+            cache_key = compute_cache_key(
+                self.provider, self.cache_model_id, self.temperature, self.max_tokens,
+                f"{history_text(history)}{full_prompt}", images if use_vision else None
+            )
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Using cached response for %s", description)
+                self.last_model = self.model_label
+                if self.telemetry:
+                    self.telemetry.record_cache_hit(self.model_label)
+                if session:
+                    session.add(description, message, cached)
+                return cached
+
+        # Send the static instructions as a separate, cacheable prefix so providers
+        # can reuse them across slides; otherwise send a single combined prompt
+        if self.prompt_caching:
+            system_prompt = prompt
+        else:
+            system_prompt = None
+            user_prompt = full_prompt
+
+        # Ask for no more output than responses to this prompt usually need
+        max_tokens = None
+        if self.output_budget and adaptive_limit:
+            max_tokens = self.output_budget.limit(prompt, self.model_label, self.max_tokens, slide_count)
+
+        response_schema = schema.json_schema() if schema else None
+
+        def attempt(client: "LLMClient", cancel=None, emit_partial: bool = True, **kwargs):
+            # Truncation and usage are thread-local, so read them on the sending thread
+            try:
+                text = client._send(
+                    kwargs.pop("message", user_prompt), kwargs.pop("images", images), system_prompt,
+                    cancel, emit_partial=emit_partial, history=kwargs.pop("history", history),
+                    schema=response_schema, **kwargs
+                )
+            except LLMError as e:
+                # Keep what a broken stream delivered and continue it like a truncated response
+                partial = _partial_text(e)
+                if (
+                    client.resume_min_chars is None or self.max_continuations < 1 or schema
+                    or len(partial.strip()) < max(1, client.resume_min_chars)
+                ):
+                    raise
+                logger.warning(
+                    "Stream for %s broke off after %d characters; keeping the partial response (%s)",
+                    description, len(partial), e
+                )
+                if not kwargs.get("continuation"):
+                    partial = partial.lstrip()
+                return client.model_label, partial, True, estimate_text_tokens(partial)
+            usage = getattr(client._request_state, "usage", None) or {}
+            return (
+                client.model_label, text, getattr(client._request_state, "truncated", False),
+                usage.get("output_tokens") or estimate_text_tokens(text),
+            )
+
+        client = self
+        if self.hedger:
+            # Duplicate slow requests to the same or an alternate model; first valid wins
+            hedge_client = self.hedge_client or self
+            self.last_model, response, truncated, output_tokens = self.hedger.run(
+                lambda cancel: attempt(self, cancel, max_tokens=max_tokens),
+                lambda cancel: attempt(hedge_client, cancel, emit_partial=False, max_tokens=max_tokens),
+                validate=lambda result: bool(result[1].strip()) and not result[2],
+            )
+            if self.last_model != self.model_label:
+                client = hedge_client
+        else:
+            self.last_model, response, truncated, output_tokens = attempt(self, max_tokens=max_tokens)
+
+        # Continue a response cut off at the output limit or by a broken stream
+        # instead of regenerating it (a schema-constrained reply would restart)
+        continuations = 0
+        while truncated and not schema and continuations < self.max_continuations:
+            continuations += 1
+            logger.info(
+                "Response for %s is incomplete; continuing (%d/%d)",
+                description, continuations, self.max_continuations
+            )
+            _, continued, truncated, tokens = attempt(
+                client, message=CONTINUE_PROMPT, images=[], continuation=True,
+                history=(history or []) + [
+                    {"role": "user", "content": user_prompt}, {"role": "assistant", "content": response},
+                ],
+            )
+            joined = self._join_continuation(response, continued)
+            # A restarted response replaces the partial one, also in the recorded length
+            output_tokens = tokens if joined == continued.strip() else output_tokens + tokens
+            response = joined
+        if truncated:
+            logger.warning(
+                "Response for %s is still cut off after %d continuations", description, continuations
+            )
+            response = response.rstrip()
+            # A rerun should get another chance at the full response
+            cache_key = None
+
+        if self.output_budget and adaptive_limit:
+            self.output_budget.record(prompt, self.model_label, output_tokens, slide_count)
+        if schema:
+            try:
+                response = schema.render(response, slide_numbers)
+            except StructuredOutputError as e:
+                # Left to the caller's validation and repair; not worth caching
+                logger.warning("Structured response for %s does not match the schema: %s", description, e)
+                cache_key = None
+        if cache_key:
+            self.response_cache.put(cache_key, response, self.provider, self.model)
+        if session:
+            session.add(description, message, response)
+
+        return response
             
-        if self.provider == 'openrouter':
-            # For OpenRouter, check if model name contains known vision models
-            vision_keywords = ['gpt-4o', 'claude-3', 'gemini', 'vision']
-            return any(keyword in self.model.lower() for keyword in vision_keywords)
-        
-        return self.model in vision_models[self.provider]
+    @staticmethod
+    def _join_continuation(partial: str, continuation: str) -> str:
+        """
+        Join a truncated response and its continuation.
+
+        Models occasionally restart from the beginning or repeat the last words
+        before the cut; a restart replaces the partial text and a repeated
+        overlap is kept only once.
+        """
+        opening = partial.lstrip()[:_CONTINUATION_OVERLAP]
+        if opening and continuation.lstrip().startswith(opening):
+            return continuation.strip()
+
+        longest = min(_CONTINUATION_OVERLAP, len(partial), len(continuation))
+        for size in range(longest, _CONTINUATION_MIN_OVERLAP - 1, -1):
+            if partial.endswith(continuation[:size]):
+                return (partial + continuation[size:]).rstrip()
+        return (partial + continuation).rstrip()
+
+    @property
+    def model_label(self) -> str:
+        """Provider-qualified model name, e.g. 'openai/gpt-4o'."""
+        return f"{self.provider}/{self.model}"
+
+    def _send(
+        self, user_prompt: str, images: List[str], system_prompt: Optional[str],
+        cancel_event: Optional[threading.Event] = None, emit_partial: bool = True,
+        history: Optional[List[Dict[str, str]]] = None, max_tokens: Optional[int] = None,
+        continuation: bool = False, schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Send one request to the provider.
+
+        Whether the response stopped at the output limit is left in
+        ``self._request_state.truncated`` for the calling thread.
+
+        Args:
+            user_prompt: Per-request message (or the full prompt)
+            images: Base64-encoded images; ignored if the model has no vision support
+            system_prompt: Static instructions, if sent separately
+            cancel_event: Event that aborts a streamed response when set
+            emit_partial: Whether streamed text is forwarded to the stream listener
+            history: Earlier user/assistant messages of a conversation session
+            max_tokens: Output token limit (default: the configured max_tokens)
+            continuation: Whether the request continues a truncated response
+            schema: JSON schema the response must match
 
-    def _generate_multimodal_response(self, prompt: str, image_base64: str) -> str:
-        """Generate response using both text and image input."""
-        if self.provider == "openai" or self.provider == "openrouter":
-            return self._generate_openai_vision_response(prompt, image_base64)
+        Returns:
+            Generated response text
+        """
+        use_vision = bool(images) and self.capabilities.vision
+        max_images = self.capabilities.max_images_per_request
+        if use_vision and max_images and len(images) > max_images:
+            logger.warning(
+                "%s accepts at most %d images per request; sending the first %d of %d",
+                self.model_label, max_images, max_images, len(images)
+            )
+            images = images[:max_images]
+        key = None
+        if self.cassette:
+            key = compute_cache_key(
+                self.provider, self.cache_model_id, self.temperature, self.max_tokens,
+                f"{system_prompt or ''}\n\n{history_text(history)}{user_prompt}",
+                images if use_vision else None
+            )
+        # Decoded size of the base64 payloads
+        image_bytes = sum(
+            len(image) * 3 // 4 - image[-2:].count("=") for image in images
+        ) if use_vision else 0
+
+        start = time.monotonic()
+        self._request_state.usage = None
+        self._request_state.truncated = False
+        try:
+            if self.cassette and self.cassette.replaying:
+                response = self._replay(key, cancel_event, emit_partial)
+            else:
+                self._request_state.cancel_event = cancel_event
+                self._request_state.emit_partial = emit_partial
+                self._request_state.history = history
+                self._request_state.max_tokens = max_tokens
+                self._request_state.continuation = continuation
+                self._request_state.schema = schema
+                try:
+                    with self.request_slots.acquire() if self.request_slots else nullcontext():
+                        response = self._generate(user_prompt, images if use_vision else [], system_prompt)
+                finally:
+                    self._request_state.cancel_event = None
+                    self._request_state.emit_partial = True
+                    self._request_state.history = None
+                    self._request_state.max_tokens = None
+                    self._request_state.continuation = False
+                    self._request_state.schema = None
+        except Exception as e:
+            self._observe(key, time.monotonic() - start, image_bytes, error=e, continuation=continuation)
+            raise
+
+        self._observe(key, time.monotonic() - start, image_bytes, response=response, continuation=continuation)
+        return response
+
+    def _generate(self, user_prompt: str, images: List[str], system_prompt: Optional[str]) -> str:
+        """Generate a response, falling back to text only if the server rejects images."""
+        if not images:
+            return self._generate_text_response(user_prompt, system_prompt)
+        try:
+            return self._generate_multimodal_response(user_prompt, images, system_prompt)
+        except LLMError as e:
+            if not self._rejects_images(e):
+                raise
+            if not self.vision_disabled:
+                logger.warning(
+                    "%s rejected image input; sending slide text only from now on (%s)", self.model_label, e
+                )
+                self.vision_disabled = True
+            return self._generate_text_response(user_prompt, system_prompt)
+
+    def _rejects_images(self, error: LLMError) -> bool:
+        """Return True if a local server refused a request because of its images."""
+        status = getattr(error.__cause__, "status_code", None)
+        return (
+            self.provider == "openai_compatible"
+            and status in _IMAGE_REJECTION_STATUSES
+            and "image" in str(error).lower()
+        )
+
+    def _observe(
+        self, key: Optional[str], latency: float, image_bytes: int,
+        response: Optional[str] = None, error: Optional[BaseException] = None,
+        continuation: bool = False
+    ) -> None:
+        """Report one provider request to the recording cassette and telemetry."""
+        usage = (getattr(self._request_state, "usage", None) or {}) if error is None else None
+        if self.cassette and not self.cassette.replaying:
+            self.cassette.record(key, self.model_label, latency, response=response, usage=usage, error=error)
+        if self.telemetry:
+            self.telemetry.record_attempt(
+                self.model_label, latency, image_bytes, usage=usage, failed=error is not None,
+                continuation=continuation
+            )
+
+    def _replay(
+        self, key: str, cancel_event: Optional[threading.Event], emit_partial: bool
+    ) -> str:
+        """Serve a request from the replay cassette with its recorded (scaled) latency."""
+        response, usage, model = self.cassette.play(key, cancel_event)
+        self.last_usage = self._request_state.usage = {
+            "input_tokens": 0, "output_tokens": 0, "cached_tokens": 0, "cache_write_tokens": 0,
+            "thinking_tokens": 0, **usage,
+        }
+        logger.debug("Replayed response recorded from %s", model)
+        if emit_partial and self.stream_listener:
+            self.stream_listener(response)
+        return response
+
+    @property
+    def capabilities(self) -> ModelCapabilities:
+        """Registered capabilities and limits of the configured model."""
+        capabilities = get_model_capabilities(self.provider, self.model)
+        return replace(capabilities, vision=False) if self.vision_disabled else capabilities
+
+    def _generate_multimodal_response(
+        self, prompt: str, image_base64: Union[str, List[str]],
+        system_prompt: Optional[str] = None
+    ) -> str:
+        """Generate response using both text and image input (one or more images)."""
+        if self.provider in OPENAI_WIRE_PROVIDERS:
+            return self._generate_openai_vision_response(prompt, image_base64, system_prompt)
         elif self.provider == "anthropic":
-            return self._generate_anthropic_vision_response(prompt, image_base64)
+            return self._generate_anthropic_vision_response(prompt, image_base64, system_prompt)
         elif self.provider == "google":
-            return self._generate_google_vision_response(prompt, image_base64)
+            return self._generate_google_vision_response(prompt, image_base64, system_prompt)
+        elif self.provider == "mock":
+            return self._generate_mock_response(prompt, system_prompt)
         else:
             raise LLMError(f"Multi-modal generation not supported for provider: {self.provider}")
     
-    def _generate_text_response(self, prompt: str) -> str:
+    def _generate_text_response(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """Generate text-only response."""
-        if self.provider == "openai" or self.provider == "openrouter":
-            return self._generate_openai_response(prompt)
+        if self.provider in OPENAI_WIRE_PROVIDERS:
+            return self._generate_openai_response(prompt, system_prompt)
         elif self.provider == "anthropic":
-            return self._generate_anthropic_response(prompt)
+            return self._generate_anthropic_response(prompt, system_prompt)
         elif self.provider == "google":
-            return self._generate_google_response(prompt)
+            return self._generate_google_response(prompt, system_prompt)
+        elif self.provider == "mock":
+            return self._generate_mock_response(prompt, system_prompt)
         else:
             raise LLMError(f"Generation not implemented for provider: {self.provider}")
 
@@ -148,6 +949,15 @@ class LLMClient:
         self, slide_text: str, prompt: str, slide_number: int, context: str = ""
     ) -> str:
         """Create a complete prompt for slide analysis with context."""
+        return f"""
+{prompt}
+
+{self._create_slide_message(slide_text, slide_number, context)}"""
+
+    def _create_slide_message(
+        self, slide_text: str, slide_number: int, context: str = ""
+    ) -> str:
+        """Create the per-slide part of the prompt that follows the static instructions."""
         context_section = ""
         if context:
             context_section = f"""
@@ -158,10 +968,7 @@ class LLMClient:
 ---
 """
         
-        return f"""
-{prompt}
-
-{context_section}
+        return f"""{context_section}
 ## Current Slide to Analyze
 
 **Slide Number:** {slide_number}
@@ -172,14 +979,361 @@ Please provide a comprehensive analysis following the format specified in the pr
 Consider the context from previous slides when analyzing this slide.
 """
 
-    def _generate_openai_response(self, prompt: str) -> str:
+    @staticmethod
+    def _create_repair_message(
+        slide_text: str, slide_number: int, analysis: str, sections: List[str]
+    ) -> str:
+        """Create the message asking for the missing sections of an analysis."""
+        requested = "\n".join(f"- {section}" for section in sections)
+        return f"""## Existing Analysis
+
+{analysis.strip()}
+
+---
+
+## Current Slide to Analyze
+
+**Slide Number:** {slide_number}
+**Slide Text Content:** 
+{slide_text}
+
+## Sections to Write
+
+The existing analysis of this slide lacks these required sections, or they are incomplete:
+{requested}
+
+Write only these sections, each starting with its heading exactly as listed and following the
+format specified in the prompt above. Do not repeat the other sections.
+"""
+
+    @staticmethod
+    def _as_image_list(image_base64: Union[str, List[str]]) -> List[str]:
+        """Normalize one or more base64-encoded images to a list."""
+        return image_base64 if isinstance(image_base64, list) else [image_base64]
+
+    def _history(self) -> List[Dict[str, str]]:
+        """Session history of the request running on this thread."""
+        return getattr(self._request_state, "history", None) or []
+
+    def _openai_messages(self, user_content, system_prompt: Optional[str]) -> list:
+        """Build chat messages with the static instructions and session history first for prefix caching."""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.extend(self._history())
+        messages.append({"role": "user", "content": user_content})
+        return messages
+
+    def _anthropic_messages(self, user_content) -> list:
+        """Build Anthropic messages, marking the end of the session history as cacheable."""
+        messages = [dict(message) for message in self._history()]
+        if messages and self.prompt_caching:
+            messages[-1]["content"] = [{
+                "type": "text", "text": messages[-1]["content"],
+                "cache_control": {"type": "ephemeral"},
+            }]
+        messages.append({"role": "user", "content": user_content})
+        return messages
+
+    def _google_contents(self, parts):
+        """Build Gemini contents, replaying the session history as chat turns."""
+        history = self._history()
+        if not history:
+            return parts
+        return [
+            {"role": "user" if message["role"] == "user" else "model", "parts": [message["content"]]}
+            for message in history
+        ] + [{"role": "user", "parts": parts if isinstance(parts, list) else [parts]}]
+
+    def _anthropic_system(self, system_prompt: Optional[str]) -> Dict[str, Any]:
+        """Build Anthropic request arguments that mark the instructions as cacheable."""
+        if not system_prompt:
+            return {}
+        return {
+            "system": [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+            "extra_headers": {"anthropic-beta": "prompt-caching-2024-07-31"},
+        }
+
+    def _get_google_model(self, system_prompt: Optional[str]):
+        """
+        Get a Gemini model with the static instructions attached.
+
+        Uses Gemini cached content when the provider accepts it (the prompt must meet
+        the model's minimum cacheable size) and otherwise falls back to a plain
+        system instruction. Models are reused for every slide sharing the prompt.
+        """
+        if not system_prompt:
+            return self.client
+
+        prompt_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+        # Held while creating, so concurrent slides do not each create cached content
+        with self._google_models_lock:
+            if prompt_hash in self._google_models:
+                return self._google_models[prompt_hash]
+
+            import google.generativeai as genai
+
+            model = None
+            try:
+                from google.generativeai import caching
+
+                cached_content = caching.CachedContent.create(
+                    model=f"models/{self.model}",
+                    display_name=f"slide-extract-{prompt_hash[:12]}",
+                    system_instruction=system_prompt,
+                    ttl=datetime.timedelta(seconds=self.prompt_cache_ttl),
+                )
+                self._google_caches.append(cached_content)
+                model = genai.GenerativeModel.from_cached_content(cached_content=cached_content)
+                logger.info("Created Gemini cached content %s for prompt instructions", cached_content.name)
+            except Exception as e:
+                logger.info("Gemini cached content unavailable, using system instruction: %s", e)
+
+            if model is None:
+                model = genai.GenerativeModel(self.model, system_instruction=system_prompt)
+
+            self._google_models[prompt_hash] = model
+            return model
+
+    def close(self) -> None:
+        """
+        Release provider-side resources created by this client (and its hedge client).
+
+        Gemini cached content is deleted rather than left to expire, since it
+        is billed for storage until its TTL runs out. Safe to call more than once.
+        """
+        with self._google_models_lock:
+            caches, self._google_caches = self._google_caches, []
+            self._google_models.clear()
+        for cached_content in caches:
+            try:
+                cached_content.delete()
+                logger.info("Deleted Gemini cached content %s", cached_content.name)
+            except Exception as e:
+                logger.warning("Failed to delete Gemini cached content %s: %s", cached_content.name, e)
+        if self.hedge_client:
+            self.hedge_client.close()
+
+    def _record_usage(self, response) -> Dict[str, int]:
+        """
+        Extract token usage from a provider response and log cached-token counts.
+
+        Args:
+            response: Raw provider response object
+
+        Returns:
+            Dictionary with input, output and cached token counts
+        """
+        def _count(obj, *names) -> int:
+            for name in names:
+                value = getattr(obj, name, None) if obj is not None else None
+                if isinstance(value, int):
+                    return value
+            return 0
+
+        usage = {
+            "input_tokens": 0, "output_tokens": 0, "cached_tokens": 0, "cache_write_tokens": 0,
+            "thinking_tokens": 0,
+        }
+
+        if self.provider == "google":
+            metadata = getattr(response, "usage_metadata", None)
+            usage["input_tokens"] = _count(metadata, "prompt_token_count")
+            usage["output_tokens"] = _count(metadata, "candidates_token_count")
+            usage["cached_tokens"] = _count(metadata, "cached_content_token_count")
+            usage["thinking_tokens"] = _count(metadata, "thoughts_token_count")
+        elif self.provider == "anthropic":
+            raw = getattr(response, "usage", None)
+            usage["input_tokens"] = _count(raw, "input_tokens")
+            usage["output_tokens"] = _count(raw, "output_tokens")
+            usage["cached_tokens"] = _count(raw, "cache_read_input_tokens")
+            usage["cache_write_tokens"] = _count(raw, "cache_creation_input_tokens")
+            # Thinking is billed as output but not reported separately; estimate it
+            usage["thinking_tokens"] = _count(raw, "thinking_tokens")
+            blocks = getattr(response, "content", None)
+            if not usage["thinking_tokens"] and isinstance(blocks, list):
+                usage["thinking_tokens"] = sum(
+                    estimate_text_tokens(block.thinking) for block in blocks
+                    if getattr(block, "type", None) == "thinking"
+                )
+        else:
+            raw = getattr(response, "usage", None)
+            usage["input_tokens"] = _count(raw, "prompt_tokens")
+            usage["output_tokens"] = _count(raw, "completion_tokens")
+            usage["cached_tokens"] = _count(getattr(raw, "prompt_tokens_details", None), "cached_tokens")
+            usage["thinking_tokens"] = _count(
+                getattr(raw, "completion_tokens_details", None), "reasoning_tokens"
+            )
+
+        self.last_usage = usage
+        self._request_state.usage = usage
+        if usage["input_tokens"]:
+            logger.info(
+                "Token usage: %d input (%d cached, %d cache writes), %d output (%d thinking)",
+                usage["input_tokens"], usage["cached_tokens"],
+                usage["cache_write_tokens"], usage["output_tokens"], usage["thinking_tokens"]
+            )
+        return usage
+
+    @staticmethod
+    def _anthropic_text(blocks) -> str:
+        """Text of an Anthropic response, without thinking blocks; tool input as JSON."""
+        return "".join(
+            json.dumps(block.input) if getattr(block, "type", None) == "tool_use"
+            else getattr(block, "text", "") or ""
+            for block in blocks or []
+            if getattr(block, "type", None) not in ("thinking", "redacted_thinking")
+        )
+
+    def _record_finish(self, reason: Any) -> None:
+        """Remember whether the running request stopped at the output limit."""
+        name = str(getattr(reason, "name", reason) or "").lower()
+        self._request_state.truncated = name in ("length", "max_tokens")
+
+    @staticmethod
+    def _google_finish_reason(response) -> Any:
+        """Finish reason of a Gemini response or final stream chunk, if reported."""
+        try:
+            return response.candidates[0].finish_reason
+        except (AttributeError, IndexError, TypeError):
+            return None
+
+    def _request_max_tokens(self) -> int:
+        """Output token limit of the running request."""
+        return getattr(self._request_state, "max_tokens", None) or self.max_tokens
+
+    def _clean(self, content: str) -> str:
+        """
+        Strip surrounding whitespace from response text.
+
+        Whitespace at a cut is kept, so that a truncated response and its
+        continuation join exactly.
+        """
+        if not getattr(self._request_state, "continuation", False):
+            content = content.lstrip()
+        if not getattr(self._request_state, "truncated", False):
+            content = content.rstrip()
+        return content
+
+    def _consume_stream(self, open_stream, extract_text):
+        """Consume a provider stream with the configured deadlines."""
+        return consume_stream(
+            open_stream,
+            extract_text,
+            first_token_timeout=self.first_token_timeout,
+            inter_token_timeout=self.inter_token_timeout,
+            on_text=self.stream_listener if getattr(self._request_state, "emit_partial", True) else None,
+            cancel_event=getattr(self._request_state, "cancel_event", None),
+        )
+
+    def _stream_openai(self, messages: list) -> str:
+        """Stream a chat completion from OpenAI or OpenRouter."""
+        extra = {"stream_options": {"include_usage": True}} if self.provider == "openai" else {}
+
+        def extract_text(chunk):
+            return chunk.choices[0].delta.content if chunk.choices else None
+
+        text, chunks = self._consume_stream(
+            lambda: self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                **self._generation_params(),
+                stream=True,
+                **extra,
+            ),
+            extract_text,
+        )
+        # Usage arrives on the final chunk when requested
+        self._record_usage(next((c for c in reversed(chunks) if getattr(c, "usage", None)), None))
+        self._record_finish(next(
+            (
+                c.choices[0].finish_reason for c in reversed(chunks)
+                if c.choices and getattr(c.choices[0], "finish_reason", None)
+            ),
+            None
+        ))
+        return text
+
+    def _stream_anthropic(self, content, system_prompt: Optional[str]) -> str:
+        """Stream a message from Anthropic."""
+        usage = SimpleNamespace(thinking_tokens=0)
+
+        def extract_text(event):
+            if event.type == "message_start":
+                for name in ("input_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+                    setattr(usage, name, getattr(event.message.usage, name, None))
+            elif event.type == "message_delta":
+                usage.output_tokens = event.usage.output_tokens
+                usage.stop_reason = getattr(getattr(event, "delta", None), "stop_reason", None)
+            elif event.type == "content_block_delta":
+                thinking = getattr(event.delta, "thinking", None)
+                if isinstance(thinking, str):
+                    usage.thinking_tokens += estimate_text_tokens(thinking)
+                # Tool input (structured output) streams as JSON fragments
+                if getattr(event.delta, "type", None) == "input_json_delta":
+                    return event.delta.partial_json
+                return getattr(event.delta, "text", None)
+            return None
+
+        text, _ = self._consume_stream(
+            lambda: self.client.messages.create(
+                model=self.model,
+                **self._generation_params(),
+                messages=self._anthropic_messages(content),
+                stream=True,
+                **self._anthropic_system(system_prompt),
+            ),
+            extract_text,
+        )
+        self._record_usage(SimpleNamespace(usage=usage))
+        self._record_finish(getattr(usage, "stop_reason", None))
+        return text
+
+    def _google_request_options(self) -> Dict[str, Any]:
+        """Request options giving Gemini calls an explicit deadline and no SDK retries."""
+        return {"timeout": self.request_timeout, "retry": None}
+
+    def _stream_google(self, contents, system_prompt: Optional[str], generation_config: Dict) -> str:
+        """Stream generated content from Google Gemini."""
+        def extract_text(chunk):
+            try:
+                return chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. the final usage chunk)
+                return None
+
+        text, chunks = self._consume_stream(
+            lambda: self._get_google_model(system_prompt).generate_content(
+                self._google_contents(contents), generation_config=generation_config, stream=True,
+                request_options=self._google_request_options()
+            ),
+            extract_text,
+        )
+        if chunks:
+            self._record_usage(chunks[-1])
+            self._record_finish(self._google_finish_reason(chunks[-1]))
+        return text
+
+    def _generate_openai_response(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """Generate response using OpenAI API."""
         try:
+            messages = self._openai_messages(prompt, system_prompt)
+            if self.streaming:
+                content = self._stream_openai(messages)
+                if not content:
+                    raise LLMError("Empty response content from OpenAI")
+                return self._clean(content)
+
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
+                messages=messages,
+                **self._generation_params(),
             )
 
             if not response.choices:
@@ -189,76 +1343,129 @@ Consider the context from previous slides when analyzing this slide.
             if not content:
                 raise LLMError("Empty response content from OpenAI")
 
-            return content.strip()
+            self._record_usage(response)
+            self._record_finish(getattr(response.choices[0], "finish_reason", None))
+            return self._clean(content)
 
         except Exception as e:
             raise LLMError(f"OpenAI API error: {e}") from e
 
-    def _generate_anthropic_response(self, prompt: str) -> str:
+    def _generate_mock_response(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Generate response using the offline mock provider (images are ignored)."""
+        try:
+            full_prompt = f"{history_text(self._history())}{prompt}"
+            if system_prompt:
+                full_prompt = f"{system_prompt}\n\n{full_prompt}"
+            if self.streaming:
+                content, _ = self._consume_stream(lambda: self.client.stream(full_prompt), lambda delta: delta)
+            else:
+                content = self.client.complete(full_prompt)
+            schema = getattr(self._request_state, "schema", None)
+            if schema:
+                content = structure_markdown(content, schema)
+
+            # Stop at the output limit like a real provider
+            limit = self._request_max_tokens()
+            truncated = estimate_text_tokens(content) > limit
+            if truncated:
+                content = content[:limit * 4]
+
+            self._record_usage(SimpleNamespace(usage=SimpleNamespace(
+                prompt_tokens=estimate_text_tokens(full_prompt),
+                completion_tokens=estimate_text_tokens(content),
+            )))
+            self._record_finish("length" if truncated else "stop")
+            return self._clean(content)
+
+        except Exception as e:
+            raise LLMError(f"Mock API error: {e}") from e
+
+    def _generate_anthropic_response(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """Generate response using Anthropic Claude API."""
         try:
+            if self.streaming:
+                content = self._stream_anthropic(prompt, system_prompt)
+                if not content:
+                    raise LLMError("Empty response content from Anthropic")
+                return self._clean(content)
+
             response = self.client.messages.create(
                 model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                messages=[{"role": "user", "content": prompt}],
+                **self._generation_params(),
+                messages=self._anthropic_messages(prompt),
+                **self._anthropic_system(system_prompt),
             )
 
             if not response.content:
                 raise LLMError("No response content returned from Anthropic")
 
             # Handle Anthropic's response format
-            content = response.content[0].text if response.content else ""
+            content = self._anthropic_text(response.content)
             if not content:
                 raise LLMError("Empty response content from Anthropic")
 
-            return content.strip()
+            self._record_usage(response)
+            self._record_finish(getattr(response, "stop_reason", None))
+            return self._clean(content)
 
         except Exception as e:
             raise LLMError(f"Anthropic API error: {e}") from e
 
-    def _generate_google_response(self, prompt: str) -> str:
+    def _generate_google_response(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """Generate response using Google Gemini API."""
         try:
             # Configure generation parameters
-            generation_config = {
-                "temperature": self.temperature,
-                "max_output_tokens": self.max_tokens,
-            }
+            generation_config = self._google_generation_config()
+
+            if self.streaming:
+                content = self._stream_google(prompt, system_prompt, generation_config)
+                if not content:
+                    raise LLMError("No response text returned from Google")
+                return self._clean(content)
 
-            response = self.client.generate_content(
-                prompt, generation_config=generation_config
+            response = self._get_google_model(system_prompt).generate_content(
+                self._google_contents(prompt), generation_config=generation_config,
+                request_options=self._google_request_options()
             )
 
             if not response.text:
                 raise LLMError("No response text returned from Google")
 
-            return response.text.strip()
+            self._record_usage(response)
+            self._record_finish(self._google_finish_reason(response))
+            return self._clean(response.text)
 
         except Exception as e:
             raise LLMError(f"Google API error: {e}") from e
             
-    def _generate_openai_vision_response(self, prompt: str, image_base64: str) -> str:
+    def _generate_openai_vision_response(
+        self, prompt: str, image_base64: Union[str, List[str]],
+        system_prompt: Optional[str] = None
+    ) -> str:
         """Generate response using OpenAI Vision API."""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            messages = self._openai_messages(
+                [{"type": "text", "text": prompt}] + [
                     {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{image_base64}"
-                                }
-                            }
-                        ]
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/png;base64,{image}"
+                        }
                     }
+                    for image in self._as_image_list(image_base64)
                 ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
+                system_prompt,
+            )
+            if self.streaming:
+                content = self._stream_openai(messages)
+                if not content:
+                    raise LLMError("Empty response content from OpenAI Vision")
+                return self._clean(content)
+
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                **self._generation_params(),
             )
 
             if not response.choices:
@@ -268,71 +1475,92 @@ Consider the context from previous slides when analyzing this slide.
             if not content:
                 raise LLMError("Empty response content from OpenAI Vision")
 
-            return content.strip()
+            self._record_usage(response)
+            self._record_finish(getattr(response.choices[0], "finish_reason", None))
+            return self._clean(content)
 
         except Exception as e:
             raise LLMError(f"OpenAI Vision API error: {e}") from e
 
-    def _generate_anthropic_vision_response(self, prompt: str, image_base64: str) -> str:
+    def _generate_anthropic_vision_response(
+        self, prompt: str, image_base64: Union[str, List[str]],
+        system_prompt: Optional[str] = None
+    ) -> str:
         """Generate response using Anthropic Claude Vision API."""
         try:
+            content = [{"type": "text", "text": prompt}] + [
+                {
+                    "type": "image",
+                    "source": {
+                        "type": "base64",
+                        "media_type": "image/png",
+                        "data": image,
+                    },
+                }
+                for image in self._as_image_list(image_base64)
+            ]
+            if self.streaming:
+                text = self._stream_anthropic(content, system_prompt)
+                if not text:
+                    raise LLMError("Empty response content from Anthropic Vision")
+                return self._clean(text)
+
             response = self.client.messages.create(
                 model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": "image/png",
-                                    "data": image_base64,
-                                },
-                            },
-                        ],
-                    }
-                ],
+                **self._generation_params(),
+                messages=self._anthropic_messages(content),
+                **self._anthropic_system(system_prompt),
             )
 
             if not response.content:
                 raise LLMError("No response content returned from Anthropic Vision")
 
-            content = response.content[0].text if response.content else ""
+            content = self._anthropic_text(response.content)
             if not content:
                 raise LLMError("Empty response content from Anthropic Vision")
 
-            return content.strip()
+            self._record_usage(response)
+            self._record_finish(getattr(response, "stop_reason", None))
+            return self._clean(content)
 
         except Exception as e:
             raise LLMError(f"Anthropic Vision API error: {e}") from e
 
-    def _generate_google_vision_response(self, prompt: str, image_base64: str) -> str:
+    def _generate_google_vision_response(
+        self, prompt: str, image_base64: Union[str, List[str]],
+        system_prompt: Optional[str] = None
+    ) -> str:
         """Generate response using Google Gemini Vision API."""
         try:
             import base64
             
             # Convert base64 to bytes for Gemini
-            image_bytes = base64.b64decode(image_base64)
+            image_parts = [
+                {"mime_type": "image/png", "data": base64.b64decode(image)}
+                for image in self._as_image_list(image_base64)
+            ]
             
             # Configure generation parameters
-            generation_config = {
-                "temperature": self.temperature,
-                "max_output_tokens": self.max_tokens,
-            }
-
-            response = self.client.generate_content(
-                [prompt, {"mime_type": "image/png", "data": image_bytes}],
-                generation_config=generation_config
+            generation_config = self._google_generation_config()
+
+            if self.streaming:
+                content = self._stream_google([prompt] + image_parts, system_prompt, generation_config)
+                if not content:
+                    raise LLMError("No response text returned from Google Vision")
+                return self._clean(content)
+
+            response = self._get_google_model(system_prompt).generate_content(
+                self._google_contents([prompt] + image_parts),
+                generation_config=generation_config,
+                request_options=self._google_request_options()
             )
 
             if not response.text:
                 raise LLMError("No response text returned from Google Vision")
 
-            return response.text.strip()
+            self._record_usage(response)
+            self._record_finish(self._google_finish_reason(response))
+            return self._clean(response.text)
 
         except Exception as e:
             raise LLMError(f"Google Vision API error: {e}") from e
@@ -348,7 +1576,7 @@ Consider the context from previous slides when analyzing this slide.
 
         try:
             response = self.generate_slide_analysis(
-                "Test slide content", test_prompt, 1
+                "Test slide content", test_prompt, 1, use_cache=False
             )
             logger.info("LLM connection test successful for %s", self.provider)
             return "successful" in response.lower()
@@ -356,6 +1584,89 @@ Consider the context from previous slides when analyzing this slide.
             logger.error("LLM connection test failed for %s: %s", self.provider, e)
             return False
 
+    def _probe(self) -> None:
+        """Make the cheapest authenticated request the provider offers."""
+        if self.provider == "openai":
+            self.client.models.retrieve(self.model)
+
+        elif self.provider in ("openrouter", "openai_compatible"):
+            self.client.models.list()
+
+        elif self.provider == "anthropic":
+            # No metadata endpoint in this SDK version: a 1-token request
+            self.client.messages.create(
+                model=self.model, max_tokens=1,
+                messages=[{"role": "user", "content": "ping"}],
+            )
+
+        elif self.provider == "google":
+            import google.generativeai as genai
+
+            name = self.model if self.model.startswith("models/") else f"models/{self.model}"
+            genai.get_model(name)
+
+    def health_check(self, cache: Optional[HealthCheckCache] = None) -> bool:
+        """
+        Check that the provider is reachable and the credentials are accepted.
+
+        Uses a model metadata/list request (or a 1-token request where no such
+        endpoint exists) instead of a full slide generation. A success is
+        remembered in ``cache`` so later runs within its TTL skip the request.
+
+        Args:
+            cache: Health check cache, if enabled
+
+        Returns:
+            True if the provider is healthy, False otherwise
+        """
+        if self.cassette and self.cassette.replaying:
+            return True
+
+        key = compute_health_key(self.provider, self.model, self.config.get("base_url"), self.api_key)
+        if cache and cache.is_fresh(key):
+            logger.debug("Using cached health check for %s", self.model_label)
+            return True
+
+        try:
+            self._probe()
+        except Exception as e:
+            logger.error("LLM health check failed for %s: %s", self.model_label, e)
+            return False
+
+        logger.info("LLM health check successful for %s", self.model_label)
+        if cache:
+            cache.record_success(key)
+        return True
+
+    def endpoint_urls(self) -> List[str]:
+        """
+        Get the HTTP endpoints this client (and its hedge client) connects to.
+
+        The Google SDK manages its own gRPC channel and the mock provider makes
+        no network calls, so neither contributes an endpoint.
+
+        Returns:
+            List of base URLs served by the shared HTTP transport
+        """
+        urls = []
+        if self.provider in ("anthropic", *OPENAI_WIRE_PROVIDERS):
+            urls.append(str(self.client.base_url))
+        if self.hedge_client:
+            urls.extend(self.hedge_client.endpoint_urls())
+        return urls
+
+    def model_capabilities(self) -> List[ModelCapabilities]:
+        """
+        Get the capabilities of every model this client (and its hedge client) may call.
+
+        Returns:
+            List of ModelCapabilities
+        """
+        capabilities = [self.capabilities]
+        if self.hedge_client:
+            capabilities.extend(self.hedge_client.model_capabilities())
+        return capabilities
+
     def get_model_info(self) -> Dict[str, Any]:
         """
         Get information about the configured model.
@@ -370,15 +1681,47 @@ Consider the context from previous slides when analyzing this slide.
             "temperature": self.temperature,
         }
 
+    def get_cassette_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get cassette record/replay counts.
+
+        Returns:
+            Dictionary of counts, or None if no cassette is in use
+        """
+        return self.cassette.get_stats() if self.cassette else None
+
+    def get_hedging_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get hedged request statistics.
+
+        Returns:
+            Statistics dictionary, or None if hedging is disabled
+        """
+        return self.hedger.get_stats() if self.hedger else None
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get response cache statistics.
+
+        Returns:
+            Dictionary with cache statistics, or None if caching is disabled
+        """
+        if not self.response_cache:
+            return None
+        return self.response_cache.get_stats()
+
 
-def create_llm_client(config: Dict[str, Any]) -> LLMClient:
+def create_llm_client(
+    config: Dict[str, Any], response_cache: Optional[ResponseCache] = None
+) -> LLMClient:
     """
     Factory function to create LLM client.
 
     Args:
         config: LLM configuration dictionary
+        response_cache: Optional cache for previously generated responses
 
     Returns:
         Configured LLM client
     """
-    return LLMClient(config)
+    return LLMClient(config, response_cache=response_cache)
@@ -0,0 +1,766 @@
+"""Offline mock LLM provider and local OpenAI-compatible stand-in server for load testing."""
+
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .slide_packer import SECTION_END, SECTION_START, estimate_text_tokens
+    from .structured_output import structure_markdown
+except ImportError:
+    from slide_packer import SECTION_END, SECTION_START, estimate_text_tokens
+    from structured_output import structure_markdown
+
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+# The last heading wins: earlier ones belong to session history
+_CURRENT_SLIDES = re.compile(r".*## Current (Slides?) to Analyze(.*)", re.DOTALL)
+_SLIDE = re.compile(
+    r"\*\*Slide Number:\*\*[ \t]*(\d+)[ \t]*\n\*\*Slide Text Content:\*\*[ \t]*\n(.*?)(?=\n\s*\n|\n###|\Z)",
+    re.DOTALL,
+)
+
+_TOPICS = (
+    "Problem statement", "Key definitions", "Worked example", "Design trade-offs",
+    "Data flow", "Performance considerations", "Common pitfalls", "Summary and next steps",
+)
+
+
+class MockProviderError(Exception):
+    """Injected provider failure carrying an HTTP status and response headers."""
+
+    def __init__(self, message: str, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        headers = {"retry-after": f"{retry_after:g}"} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=status_code, headers=headers)
+
+
+class MockResponder:
+    """
+    Produces deterministic, section-complete slide analyses with simulated
+    latency, token throughput and injected 429/5xx failures.
+
+    Response text depends only on the request, so identical requests always
+    receive identical responses. Latency and failures are drawn from a seeded
+    generator.
+    """
+
+    def __init__(
+        self,
+        latency_mean: float = 0.0,
+        latency_spread: float = 0.0,
+        latency_distribution: str = "fixed",
+        tokens_per_second: Optional[float] = None,
+        rate_limit_rate: float = 0.0,
+        server_error_rate: float = 0.0,
+        retry_after: Optional[float] = 1.0,
+        seed: int = 0,
+    ):
+        """
+        Initialize the mock responder.
+
+        Args:
+            latency_mean: Seconds before the first token (median for lognormal)
+            latency_spread: Uniform: +/- seconds around the mean; lognormal: sigma
+            latency_distribution: One of fixed, uniform or lognormal
+            tokens_per_second: Output throughput (None returns the text at once)
+            rate_limit_rate: Fraction of requests answered with HTTP 429
+            server_error_rate: Fraction of requests answered with HTTP 500/503
+            retry_after: Retry-After seconds sent with 429 responses (None omits it)
+            seed: Seed of the latency and failure generator
+        """
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency_distribution}")
+
+        self.latency_mean = latency_mean
+        self.latency_spread = latency_spread
+        self.latency_distribution = latency_distribution
+        self.tokens_per_second = tokens_per_second
+        self.rate_limit_rate = rate_limit_rate
+        self.server_error_rate = server_error_rate
+        self.retry_after = retry_after
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "rate_limited": 0, "server_errors": 0}
+
+    def _sample(self) -> Tuple[float, Optional[int]]:
+        """Draw the latency and injected failure status (if any) of the next request."""
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.latency_distribution == "uniform":
+                latency = self._rng.uniform(
+                    self.latency_mean - self.latency_spread, self.latency_mean + self.latency_spread
+                )
+            elif self.latency_distribution == "lognormal":
+                latency = self.latency_mean * math.exp(self._rng.gauss(0.0, self.latency_spread))
+            else:
+                latency = self.latency_mean
+
+            draw = self._rng.random()
+            status = None
+            if draw < self.rate_limit_rate:
+                status = 429
+                self.stats["rate_limited"] += 1
+            elif draw < self.rate_limit_rate + self.server_error_rate:
+                status = self._rng.choice((500, 503))
+                self.stats["server_errors"] += 1
+
+        return max(0.0, latency), status
+
+    @staticmethod
+    def build_response(prompt: str) -> str:
+        """
+        Build a deterministic analysis for the slides in a request.
+
+        Packed requests receive one delimited section per slide.
+
+        Args:
+            prompt: Request text (static instructions and slide message)
+
+        Returns:
+            Response text
+        """
+        # Connection tests ask for this phrase to be echoed
+        prefix = "Connection successful. " if "Connection successful" in prompt else ""
+
+        match = _CURRENT_SLIDES.match(prompt)
+        slides = _SLIDE.findall(match.group(2)) if match else []
+
+        if not slides:
+            return prefix + MockResponder._analysis(1, prompt[-200:].strip())
+
+        if len(slides) == 1 and match.group(1) == "Slide":
+            number, text = slides[0]
+            return prefix + MockResponder._analysis(int(number), text.strip())
+
+        return prefix + "\n\n".join(
+            f"{SECTION_START.format(number=number)}\n"
+            f"{MockResponder._analysis(int(number), text.strip())}\n"
+            f"{SECTION_END.format(number=number)}"
+            for number, text in slides
+        )
+
+    @staticmethod
+    def _analysis(slide_number: int, slide_text: str) -> str:
+        digest = int(hashlib.sha256(f"{slide_number}:{slide_text}".encode("utf-8")).hexdigest(), 16)
+        topics = [_TOPICS[(digest >> (3 * i)) % len(_TOPICS)] for i in range(3)]
+        summary = " ".join(slide_text.split()[:30]) or "No text on this slide"
+        return (
+            f"#### Slide: Slide {slide_number}\n\n"
+            f"**Slide Number:** {slide_number}\n\n"
+            f"**Slide Text:**\n{slide_text or '[No text]'}\n\n"
+            f"**Slide Images/Diagrams:**\n"
+            f"Mock description of the visual layout of slide {slide_number} (reference {digest % 10000:04d}).\n\n"
+            f"**Slide Topics:**\n" + "".join(f"*   {topic}\n" for topic in topics) + "\n"
+            f"**Slide Narration:**\n"
+            f'"This is deterministic mock narration for slide {slide_number}. The slide covers: '
+            f'{summary}. The discussion focuses on {topics[0].lower()}, then relates it to '
+            f'{topics[1].lower()} and closes with {topics[2].lower()} so that the audience can '
+            f'connect this slide to the rest of the presentation."'
+        )
+
+    def _fail(self, status: int) -> None:
+        if status == 429:
+            raise MockProviderError("Rate limit exceeded (injected)", 429, self.retry_after)
+        raise MockProviderError(f"Server error {status} (injected)", status)
+
+    def complete(self, prompt: str) -> str:
+        """
+        Answer a request after the simulated latency and generation time.
+
+        Args:
+            prompt: Request text
+
+        Returns:
+            Response text
+
+        Raises:
+            MockProviderError: If a failure is injected for this request
+        """
+        latency, status = self._sample()
+        if status is not None:
+            time.sleep(latency)
+            self._fail(status)
+
+        text = self.build_response(prompt)
+        duration = latency
+        if self.tokens_per_second:
+            duration += estimate_text_tokens(text) / self.tokens_per_second
+        time.sleep(duration)
+        return text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Answer a request as a stream of text deltas.
+
+        Args:
+            prompt: Request text
+
+        Returns:
+            Iterator of text deltas, paced at the configured throughput
+
+        Raises:
+            MockProviderError: If a failure is injected for this request
+        """
+        latency, status = self._sample()
+        if status is not None:
+            time.sleep(latency)
+            self._fail(status)
+
+        text = self.build_response(prompt)
+
+        def deltas() -> Iterator[str]:
+            time.sleep(latency)
+            for delta in re.findall(r"\S+\s*|\s+", text):
+                if self.tokens_per_second:
+                    time.sleep(estimate_text_tokens(delta) / self.tokens_per_second)
+                yield delta
+
+        return deltas()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get counts of requests and injected failures."""
+        with self._lock:
+            return dict(self.stats)
+
+
+def create_mock_responder(mock_config: Dict[str, Any]) -> MockResponder:
+    """
+    Factory function to create a mock responder from configuration.
+
+    Args:
+        mock_config: Mock provider configuration dictionary
+
+    Returns:
+        Configured MockResponder
+    """
+    latency = mock_config.get("latency") or {}
+    return MockResponder(
+        latency_mean=latency.get("mean", 0.0),
+        latency_spread=latency.get("spread", 0.0),
+        latency_distribution=latency.get("distribution", "fixed"),
+        tokens_per_second=mock_config.get("tokens_per_second"),
+        rate_limit_rate=mock_config.get("rate_limit_rate", 0.0),
+        server_error_rate=mock_config.get("server_error_rate", 0.0),
+        retry_after=mock_config.get("retry_after", 1.0),
+        seed=mock_config.get("seed", 0),
+    )
+
+
+def _has_images(messages: List[Dict[str, Any]]) -> bool:
+    """Return True if any chat message carries an image part."""
+    return any(
+        isinstance(message.get("content"), list)
+        and any(part.get("type") == "image_url" for part in message["content"])
+        for message in messages
+    )
+
+
+def _message_text(messages: List[Dict[str, Any]]) -> str:
+    """Join the text parts of chat messages (images are ignored)."""
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(part.get("text", "") for part in content if part.get("type") == "text")
+    return "\n\n".join(parts)
+
+
+def _structured_deltas(deltas: Iterator[str], schema: Dict[str, Any]) -> Iterator[str]:
+    """Stream the analysis as JSON once the Markdown stream is complete."""
+    yield structure_markdown("".join(deltas), schema)
+
+
+def _openai_batch_line(responder: "MockResponder", line: Dict[str, Any]) -> Dict[str, Any]:
+    """Answer one line of an OpenAI batch input file like the Batch API output file."""
+    body = line.get("body") or {}
+    schema = ((body.get("response_format") or {}).get("json_schema") or {}).get("schema")
+    try:
+        text = responder.complete(_message_text(body.get("messages") or []))
+    except MockProviderError as e:
+        return {
+            "id": f"batch_req_{uuid.uuid4().hex[:24]}", "custom_id": line.get("custom_id"),
+            "response": None, "error": {"code": str(e.status_code), "message": str(e)},
+        }
+    if schema:
+        text = structure_markdown(text, schema)
+    return {
+        "id": f"batch_req_{uuid.uuid4().hex[:24]}",
+        "custom_id": line.get("custom_id"),
+        "response": {
+            "status_code": 200,
+            "request_id": uuid.uuid4().hex,
+            "body": {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+            },
+        },
+        "error": None,
+    }
+
+
+def _anthropic_batch_result(responder: "MockResponder", request: Dict[str, Any]) -> Dict[str, Any]:
+    """Answer one request of an Anthropic message batch like its results file."""
+    params = request.get("params") or {}
+    try:
+        text = responder.complete(_message_text(params.get("messages") or []))
+    except MockProviderError as e:
+        return {"custom_id": request.get("custom_id"), "result": {
+            "type": "errored", "error": {"type": "error", "error": {"type": "api_error", "message": str(e)}},
+        }}
+    # A schema tool is answered with a call carrying the analysis as its input
+    tools = params.get("tools") or []
+    if tools:
+        content = [{
+            "type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:24]}", "name": tools[0].get("name"),
+            "input": json.loads(structure_markdown(text, tools[0].get("input_schema") or {})),
+        }]
+    else:
+        content = [{"type": "text", "text": text}]
+    return {"custom_id": request.get("custom_id"), "result": {
+        "type": "succeeded",
+        "message": {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": params.get("model", "mock"),
+            "content": content,
+            "stop_reason": "tool_use" if tools else "end_turn",
+            "usage": {"input_tokens": 0, "output_tokens": estimate_text_tokens(text)},
+        },
+    }}
+
+
+class _ChatCompletionsHandler(BaseHTTPRequestHandler):
+    """
+    Speaks the subset of the OpenAI chat-completions wire format the SDKs use.
+
+    Also serves the batch endpoints: OpenAI ``/files`` and ``/batches`` and
+    Anthropic ``/v1/messages/batches``. A job is answered when it is created
+    and reported as finished from the first status request on.
+    """
+
+    server_version = "slide-extract-mock/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("Mock server: " + format, *args)
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def do_GET(self) -> None:
+        path = self.path.rstrip("/")
+        message_batch = re.search(r"/messages/batches/([\w-]+)(/results)?$", path)
+        openai_batch = re.search(r"/batches/([\w-]+)$", path)
+        file_content = re.search(r"/files/([\w-]+)/content$", path)
+        if path.endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+        elif message_batch:
+            self._get_message_batch(message_batch.group(1), bool(message_batch.group(2)))
+        elif openai_batch:
+            self._get_openai_batch(openai_batch.group(1))
+        elif file_content and file_content.group(1) in self.server.files:
+            payload = self.server.files[file_content.group(1)]["content"]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def _create_file(self) -> None:
+        # The SDK uploads the batch input as multipart/form-data
+        body = self._read_body()
+        header = f"Content-Type: {self.headers.get('Content-Type', '')}\r\n\r\n".encode("latin-1")
+        form = BytesParser(policy=HTTP).parsebytes(header + body)
+        fields = {
+            part.get_param("name", header="content-disposition"): part
+            for part in (form.iter_parts() if form.is_multipart() else [])
+        }
+        if "file" not in fields:
+            self._send_json(400, {"error": {"message": "Missing file"}})
+            return
+        content = fields["file"].get_payload(decode=True) or b""
+        file_object = {
+            "id": f"file-{uuid.uuid4().hex[:24]}",
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": fields["file"].get_filename() or "upload.jsonl",
+            "purpose": fields["purpose"].get_content().strip() if "purpose" in fields else "batch",
+            "status": "processed",
+        }
+        with self.server.batch_lock:
+            self.server.files[file_object["id"]] = {**file_object, "content": content}
+        self._send_json(200, file_object)
+
+    def _create_openai_batch(self, request: Dict[str, Any]) -> None:
+        input_file = self.server.files.get(request.get("input_file_id"))
+        if input_file is None:
+            self._send_json(404, {"error": {"message": f"No such file: {request.get('input_file_id')}"}})
+            return
+        lines = [json.loads(line) for line in input_file["content"].decode("utf-8").splitlines() if line.strip()]
+        output = [_openai_batch_line(self.server.responder, line) for line in lines]
+        output_id = f"file-{uuid.uuid4().hex[:24]}"
+        content = "\n".join(json.dumps(entry) for entry in output).encode("utf-8")
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex[:24]}",
+            "object": "batch",
+            "endpoint": request.get("endpoint", "/v1/chat/completions"),
+            "input_file_id": input_file["id"],
+            "completion_window": request.get("completion_window", "24h"),
+            "status": "validating",
+            "output_file_id": None,
+            "error_file_id": None,
+            "created_at": int(time.time()),
+            "request_counts": {
+                "total": len(output),
+                "completed": sum(entry["error"] is None for entry in output),
+                "failed": sum(entry["error"] is not None for entry in output),
+            },
+        }
+        with self.server.batch_lock:
+            self.server.files[output_id] = {
+                "id": output_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+                "filename": "batch_output.jsonl", "purpose": "batch_output", "status": "processed",
+                "content": content,
+            }
+            self.server.batches[batch["id"]] = {**batch, "status": "completed", "output_file_id": output_id}
+        self._send_json(200, batch)
+
+    def _get_openai_batch(self, batch_id: str) -> None:
+        batch = self.server.batches.get(batch_id)
+        if batch is None or batch.get("object") != "batch":
+            self._send_json(404, {"error": {"message": f"No such batch: {batch_id}"}})
+        else:
+            self._send_json(200, batch)
+
+    def _create_message_batch(self, request: Dict[str, Any]) -> None:
+        results = [_anthropic_batch_result(self.server.responder, entry) for entry in request.get("requests") or []]
+        batch_id = f"msgbatch_{uuid.uuid4().hex[:24]}"
+        succeeded = sum(entry["result"]["type"] == "succeeded" for entry in results)
+        batch = {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "in_progress",
+            "request_counts": {
+                "processing": len(results), "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0,
+            },
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "results_url": None,
+        }
+        with self.server.batch_lock:
+            self.server.batches[batch_id] = {
+                **batch,
+                "processing_status": "ended",
+                "request_counts": {
+                    "processing": 0, "succeeded": succeeded, "errored": len(results) - succeeded,
+                    "canceled": 0, "expired": 0,
+                },
+                "results_url": f"http://{self.headers.get('Host')}/v1/messages/batches/{batch_id}/results",
+                "results": results,
+            }
+        self._send_json(200, batch)
+
+    def _get_message_batch(self, batch_id: str, results: bool) -> None:
+        batch = self.server.batches.get(batch_id)
+        if batch is None or batch.get("type") != "message_batch":
+            self._send_json(404, {"error": {"type": "not_found_error", "message": f"No such batch: {batch_id}"}})
+        elif results:
+            payload = "\n".join(json.dumps(entry) for entry in batch["results"]).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/binary")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        else:
+            self._send_json(200, {key: value for key, value in batch.items() if key != "results"})
+
+    def do_HEAD(self) -> None:
+        # Used by connection pre-warming; headers only, connection kept alive
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self) -> None:
+        path = self.path.rstrip("/")
+        if path.endswith("/files"):
+            self._create_file()
+            return
+        if not path.endswith(("/chat/completions", "/batches")):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        try:
+            request = json.loads(self._read_body() or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+            return
+        if path.endswith("/messages/batches"):
+            self._create_message_batch(request)
+            return
+        if path.endswith("/batches"):
+            self._create_openai_batch(request)
+            return
+
+        responder: MockResponder = self.server.responder
+        allowed, limit_headers = self.server.limiter.admit(self.headers.get("Authorization", ""))
+        if not allowed:
+            self._send_json(
+                429, {"error": {"message": "Rate limit exceeded for this key", "type": "rate_limit", "code": 429}},
+                headers=limit_headers,
+            )
+            return
+        if not self.server.vision and _has_images(request.get("messages") or []):
+            # What text-only local servers (e.g. llama.cpp without a projector) answer
+            self._send_json(400, {"error": {
+                "message": "image input is not supported by this model", "type": "invalid_request_error",
+            }})
+            return
+        prompt = _message_text(request.get("messages") or [])
+        model = request.get("model", "mock")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        usage = {"prompt_tokens": estimate_text_tokens(prompt)}
+        # Output stops at the request's max_tokens, like on a real server
+        max_chars = request["max_tokens"] * 4 if request.get("max_tokens") else None
+        finish_reason = "stop"
+        # JSON-schema response format: answer with the analysis as a conforming object
+        schema = ((request.get("response_format") or {}).get("json_schema") or {}).get("schema")
+
+        self.server.enter()
+        try:
+            if request.get("stream"):
+                deltas = responder.stream(prompt)
+                if schema:
+                    deltas = _structured_deltas(deltas, schema)
+            else:
+                text = responder.complete(prompt)
+                if schema:
+                    text = structure_markdown(text, schema)
+        except MockProviderError as e:
+            self._send_json(
+                e.status_code,
+                {"error": {"message": str(e), "type": "mock_error", "code": e.status_code}},
+                headers=e.response.headers,
+            )
+            return
+        finally:
+            self.server.leave()
+
+        if not request.get("stream"):
+            if max_chars is not None and len(text) > max_chars:
+                text, finish_reason = text[:max_chars], "length"
+            usage["completion_tokens"] = estimate_text_tokens(text)
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": finish_reason,
+                }],
+                "usage": usage,
+            }, headers=limit_headers)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        for name, value in limit_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.close_connection = True
+
+        def event(delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra: Any) -> None:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        try:
+            parts = []
+            event({"role": "assistant"})
+            for delta in deltas:
+                if max_chars is not None and len("".join(parts)) + len(delta) > max_chars:
+                    delta = delta[:max_chars - len("".join(parts))]
+                    finish_reason = "length"
+                parts.append(delta)
+                event({"content": delta})
+                if finish_reason == "length":
+                    break
+            event({}, finish_reason=finish_reason)
+            if (request.get("stream_options") or {}).get("include_usage"):
+                usage["completion_tokens"] = estimate_text_tokens("".join(parts))
+                usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+                chunk = {"id": completion_id, "object": "chat.completion.chunk",
+                         "created": int(time.time()), "model": model, "choices": [], "usage": usage}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("Mock server: client closed the stream")
+
+
+class _KeyRateLimiter:
+    """Per-API-key requests-per-minute limit reported with OpenAI-style headers."""
+
+    def __init__(self, requests_per_minute: Optional[int] = None, window: float = 60.0):
+        self.requests_per_minute = requests_per_minute
+        self.window = window
+        self._sent: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def admit(self, api_key: str) -> Tuple[bool, Dict[str, str]]:
+        """Count a request for a key; returns (allowed, rate-limit headers)."""
+        if not self.requests_per_minute:
+            return True, {}
+
+        now = time.monotonic()
+        with self._lock:
+            sent = [t for t in self._sent.get(api_key, []) if now - t < self.window]
+            allowed = len(sent) < self.requests_per_minute
+            if allowed:
+                sent.append(now)
+            self._sent[api_key] = sent
+
+        reset = self.window - (now - sent[0]) if sent else 0.0
+        headers = {
+            "x-ratelimit-limit-requests": str(self.requests_per_minute),
+            "x-ratelimit-remaining-requests": str(self.requests_per_minute - len(sent)),
+            "x-ratelimit-reset-requests": f"{reset:.3f}s",
+        }
+        if not allowed:
+            headers["retry-after"] = f"{reset:.3f}"
+        return allowed, headers
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    """Threading server that counts the requests being answered at once."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # Uploaded files and batch jobs of the batch endpoints
+        self.batch_lock = threading.Lock()
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+
+    def enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+class MockChatServer:
+    """Local HTTP server speaking the OpenAI chat-completions wire format."""
+
+    def __init__(
+        self, responder: MockResponder, host: str = "127.0.0.1", port: int = 0,
+        requests_per_minute: Optional[int] = None, vision: bool = True
+    ):
+        """
+        Initialize the server (port 0 picks a free port).
+
+        Args:
+            responder: Responder producing latency, failures and response text
+            host: Interface to bind
+            port: Port to bind
+            requests_per_minute: Per-API-key request limit; requests beyond it
+                are answered with 429 (None disables the limit)
+            vision: Whether image inputs are accepted; a text-only server
+                answers them with 400
+        """
+        self.httpd = _MockHTTPServer((host, port), _ChatCompletionsHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.responder = responder
+        self.httpd.limiter = _KeyRateLimiter(requests_per_minute)
+        self.httpd.vision = vision
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def peak_in_flight(self) -> int:
+        """Most requests that were being answered at the same time."""
+        return self.httpd.peak_in_flight
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to configure as the provider's `base_url`."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockChatServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-llm-server", daemon=True)
+        self._thread.start()
+        logger.info("Mock OpenAI-compatible server listening on %s", self.base_url)
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted."""
+        logger.info("Mock OpenAI-compatible server listening on %s", self.base_url)
+        self.httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "MockChatServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
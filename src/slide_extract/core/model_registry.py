@@ -0,0 +1,249 @@
+"""Registry of per-model capabilities and limits used to size rendering, packing and planning."""
+
+import fnmatch
+import logging
+import threading
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Capabilities keyed by "provider/model" glob patterns. Every matching pattern
+# applies, from the least to the most specific (longest literal prefix), so
+# family entries set the limits and narrower entries override single fields.
+# Rate limits are entry-tier defaults; raise them in the `models` config section.
+DEFAULT_MODELS: Dict[str, Dict[str, Any]] = {
+    # OpenAI: images are fitted into 2048x2048 before tokenization
+    "openai/*": {
+        "max_image_dimension": 2048, "max_image_bytes": 20 * MB, "max_images_per_request": 10,
+    },
+    "openai/gpt-4o*": {
+        "vision": True, "context_window": 128000, "requests_per_minute": 500,
+        "tokens_per_minute": 30000, "pdf_input": True,
+    },
+    "openai/gpt-4o-mini*": {"tokens_per_minute": 200000},
+    "openai/gpt-4.1*": {
+        "vision": True, "context_window": 1047576, "requests_per_minute": 500,
+        "tokens_per_minute": 30000, "pdf_input": True,
+    },
+    "openai/gpt-4-turbo*": {"vision": True, "context_window": 128000, "requests_per_minute": 500},
+    "openai/gpt-4-vision-preview": {"vision": True, "context_window": 128000, "requests_per_minute": 500},
+    "openai/gpt-3.5-turbo*": {
+        "vision": False, "context_window": 16385, "requests_per_minute": 3500, "tokens_per_minute": 200000,
+    },
+    # Anthropic: images above a 1568px long edge are downscaled server-side
+    "anthropic/claude-*": {
+        "max_image_dimension": 1568, "max_image_bytes": 5 * MB, "max_images_per_request": 100,
+        "context_window": 200000, "requests_per_minute": 50, "tokens_per_minute": 50000,
+    },
+    "anthropic/claude-3*": {"vision": True},
+    "anthropic/claude-3-5-sonnet*": {"pdf_input": True},
+    "anthropic/claude-3-7-sonnet*": {"vision": True, "pdf_input": True},
+    "anthropic/claude-sonnet-4*": {"vision": True, "pdf_input": True},
+    "anthropic/claude-opus-4*": {"vision": True, "pdf_input": True},
+    # Google: large images are tiled at 768px; inline requests are capped at 20MB
+    "google/gemini-*": {
+        "max_image_dimension": 3072, "max_image_bytes": 20 * MB, "max_images_per_request": 3000,
+        "context_window": 1048576, "requests_per_minute": 1000, "tokens_per_minute": 1000000,
+    },
+    "google/gemini-1.5*": {"vision": True, "pdf_input": True},
+    "google/gemini-1.5-pro*": {"context_window": 2097152},
+    "google/gemini-2*": {"vision": True, "pdf_input": True},
+    "google/gemini-2.5-pro*": {"requests_per_minute": 150, "tokens_per_minute": 2000000},
+    "google/gemini-pro": {"vision": False, "context_window": 32760},
+    "google/gemini-pro-vision": {"vision": True, "context_window": 16384, "max_images_per_request": 16},
+    # OpenRouter proxies many upstream models; recognise the vision families by name
+    "openrouter/*gpt-4o*": {"vision": True, "context_window": 128000},
+    "openrouter/*claude-3*": {"vision": True, "context_window": 200000},
+    "openrouter/*gemini*": {"vision": True},
+    "openrouter/*vision*": {"vision": True},
+    # Local OpenAI-compatible servers: text-only unless the model is a known
+    # vision family; no provider rate limits
+    "openai_compatible/*llava*": {"vision": True},
+    "openai_compatible/*-vl*": {"vision": True},
+    "openai_compatible/*vision*": {"vision": True},
+    "openai_compatible/*gemma-3*": {"vision": True},
+    "openai_compatible/*pixtral*": {"vision": True},
+    "mock/*": {"vision": True},
+}
+
+
+class ModelRegistryError(Exception):
+    """Custom exception for model registry errors."""
+
+
+@dataclass(frozen=True)
+class ModelCapabilities:
+    """What one model accepts and how fast it may be called. None means unknown/unlimited."""
+    vision: bool = False
+    max_image_dimension: Optional[int] = None      # Longest image side worth sending (pixels)
+    max_image_bytes: Optional[int] = None          # Largest accepted image payload (decoded bytes)
+    max_images_per_request: Optional[int] = None
+    context_window: Optional[int] = None           # Input plus output tokens
+    requests_per_minute: Optional[int] = None      # Default rate limits
+    tokens_per_minute: Optional[int] = None
+    pdf_input: bool = False                        # Accepts PDF documents directly
+
+
+_FIELDS = {f.name for f in fields(ModelCapabilities)}
+
+
+def _specificity(pattern: str) -> Tuple[int, int]:
+    """Sort key: exact names first, then the longest literal prefix."""
+    wildcard = min((pattern.find(c) for c in "*?[" if c in pattern), default=len(pattern))
+    return (wildcard == len(pattern), wildcard)
+
+
+class ModelRegistry:
+    """Looks up ModelCapabilities for provider/model pairs from defaults plus overrides."""
+
+    def __init__(self, overrides: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            overrides: Capabilities keyed by "provider/model" glob pattern;
+                applied after the built-in entries for the same pattern
+
+        Raises:
+            ModelRegistryError: If an override names an unknown capability
+        """
+        self.entries: Dict[str, Dict[str, Any]] = {
+            pattern: dict(values) for pattern, values in DEFAULT_MODELS.items()
+        }
+        for pattern, values in (overrides or {}).items():
+            if not isinstance(values, dict):
+                raise ModelRegistryError(f"Capabilities for '{pattern}' must be a mapping")
+            unknown = set(values) - _FIELDS
+            if unknown:
+                raise ModelRegistryError(
+                    f"Unknown capabilities for '{pattern}': {', '.join(sorted(unknown))} "
+                    f"(expected {', '.join(sorted(_FIELDS))})"
+                )
+            self.entries[pattern] = {**self.entries.get(pattern, {}), **values}
+        self._cache: Dict[str, ModelCapabilities] = {}
+
+    def get(self, provider: str, model: str) -> ModelCapabilities:
+        """
+        Get the capabilities of a model.
+
+        Unknown models are treated as text-only without limits.
+
+        Args:
+            provider: LLM provider name
+            model: Model name
+
+        Returns:
+            ModelCapabilities for the model
+        """
+        label = f"{provider}/{model}"
+        capabilities = self._cache.get(label)
+        if capabilities is None:
+            matches = sorted(
+                (pattern for pattern in self.entries if fnmatch.fnmatchcase(label, pattern)),
+                key=_specificity,
+            )
+            values: Dict[str, Any] = {}
+            for pattern in matches:
+                values.update(self.entries[pattern])
+            capabilities = ModelCapabilities(**values)
+            if not matches:
+                logger.debug("No capabilities registered for %s; assuming a text-only model", label)
+            self._cache[label] = capabilities
+        return capabilities
+
+
+_registry = ModelRegistry()
+_registry_lock = threading.Lock()
+
+
+def configure_model_registry(overrides: Optional[Dict[str, Dict[str, Any]]]) -> ModelRegistry:
+    """
+    Replace the process-wide registry with one that applies the given overrides.
+
+    Args:
+        overrides: Capabilities keyed by "provider/model" glob pattern (the
+            `models` config section), or None for the built-in defaults only
+
+    Returns:
+        The new registry
+
+    Raises:
+        ModelRegistryError: If an override is invalid
+    """
+    global _registry
+    registry = ModelRegistry(overrides)
+    with _registry_lock:
+        _registry = registry
+    return registry
+
+
+def get_model_capabilities(provider: str, model: str) -> ModelCapabilities:
+    """
+    Look up a model in the process-wide registry.
+
+    Args:
+        provider: LLM provider name
+        model: Model name
+
+    Returns:
+        ModelCapabilities for the model
+    """
+    return _registry.get(provider, model)
+
+
+def combine_capabilities(capabilities: List[ModelCapabilities]) -> ModelCapabilities:
+    """
+    Combine the capabilities of every model a run may use.
+
+    Slides are rendered once and may be sent to any of the models, so images
+    are needed if any model accepts them and every limit is the strictest one.
+
+    Args:
+        capabilities: Capabilities of each model
+
+    Returns:
+        Combined capabilities
+    """
+    if not capabilities:
+        return ModelCapabilities()
+    # Image limits only matter for the models that receive images
+    vision_models = [item for item in capabilities if item.vision]
+
+    def strictest(name: str, items: List[ModelCapabilities]) -> Optional[int]:
+        values = [getattr(item, name) for item in items if getattr(item, name)]
+        return min(values) if values else None
+
+    return ModelCapabilities(
+        vision=bool(vision_models),
+        max_image_dimension=strictest("max_image_dimension", vision_models),
+        max_image_bytes=strictest("max_image_bytes", vision_models),
+        max_images_per_request=strictest("max_images_per_request", vision_models),
+        context_window=strictest("context_window", capabilities),
+        requests_per_minute=strictest("requests_per_minute", capabilities),
+        tokens_per_minute=strictest("tokens_per_minute", capabilities),
+        pdf_input=all(item.pdf_input for item in capabilities),
+    )
+
+
+def rendering_options(llm_client: Any) -> Dict[str, Any]:
+    """
+    Get PDFProcessor options sized for the models an LLM client may call.
+
+    Args:
+        llm_client: LLMClient or wrapper exposing ``model_capabilities()``, or None
+
+    Returns:
+        Keyword arguments for PDFProcessor (empty without a client or models)
+    """
+    capabilities = llm_client.model_capabilities() if llm_client is not None else []
+    if not capabilities:
+        return {}
+    combined = combine_capabilities(capabilities)
+    return {
+        "render_images": combined.vision,
+        "max_image_dimension": combined.max_image_dimension,
+        "max_image_bytes": combined.max_image_bytes,
+    }
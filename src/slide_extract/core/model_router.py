@@ -0,0 +1,301 @@
+"""Per-slide model routing based on slide complexity."""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+try:
+    from .key_pool import create_key_pool_client
+    from .llm_client import LLMClient, LLMError
+    from .model_registry import ModelCapabilities
+    from .pdf_processor import SlideContent
+    from .response_cache import ResponseCache
+except ImportError:
+    from key_pool import create_key_pool_client
+    from llm_client import LLMClient, LLMError
+    from model_registry import ModelCapabilities
+    from pdf_processor import SlideContent
+    from response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUTE = "default"
+
+# Slide signals a rule may test, mapped to (signal, comparison)
+_CONDITIONS = {
+    "has_images": ("has_images", "eq"),
+    "min_image_count": ("image_count", "min"),
+    "max_image_count": ("image_count", "max"),
+    "min_text_chars": ("text_chars", "min"),
+    "max_text_chars": ("text_chars", "max"),
+}
+
+
+class RoutingError(Exception):
+    """Custom exception for invalid routing configuration."""
+
+
+class RoutingRule:
+    """A set of slide conditions that sends matching slides to a named route."""
+
+    def __init__(self, route: str, **conditions: Any):
+        """
+        Initialize the routing rule.
+
+        Args:
+            route: Name of the route matching slides are sent to
+            **conditions: Slide conditions (has_images, min/max_image_count, min/max_text_chars)
+
+        Raises:
+            RoutingError: If a condition is not recognised
+        """
+        unknown = set(conditions) - set(_CONDITIONS)
+        if unknown:
+            raise RoutingError(f"Unknown routing condition(s) for route '{route}': {sorted(unknown)}")
+        self.route = route
+        self.conditions = conditions
+
+    @staticmethod
+    def slide_signals(slide_content: SlideContent) -> Dict[str, Any]:
+        """Complexity signals of a slide computed during PDF extraction."""
+        return {
+            "has_images": slide_content.has_images,
+            "image_count": slide_content.image_count,
+            "text_chars": len(slide_content.text.strip()),
+        }
+
+    def matches(self, slide_content: SlideContent) -> bool:
+        """Return True if the slide meets every condition of the rule."""
+        signals = self.slide_signals(slide_content)
+        for name, expected in self.conditions.items():
+            signal, comparison = _CONDITIONS[name]
+            value = signals[signal]
+            if comparison == "eq" and bool(value) != bool(expected):
+                return False
+            if comparison == "min" and value < expected:
+                return False
+            if comparison == "max" and value > expected:
+                return False
+        return True
+
+
+class ModelRouter:
+    """
+    Sends each slide to the model chosen by complexity routing rules.
+
+    Behaves like an LLMClient. `route_slide` selects the model for the next
+    requests; slides that match no rule use the default (configured) client.
+    Attributes not defined here are read from the default client.
+    """
+
+    def __init__(self, default_client, routes: Dict[str, LLMClient], rules: List[RoutingRule]):
+        """
+        Initialize the model router.
+
+        Args:
+            default_client: Client for the configured model (may be a failover chain)
+            routes: Clients by route name
+            rules: Routing rules in priority order; the first match wins
+        """
+        self.default_client = default_client
+        self.routes = dict(routes)
+        self.rules = rules
+        self._active = default_client
+        self.route_counts: Dict[str, int] = {}
+        self.model_counts: Dict[str, int] = {}
+
+        for rule in rules:
+            if rule.route != DEFAULT_ROUTE and rule.route not in self.routes:
+                logger.warning("Routing rule targets unknown route '%s'; using the default model", rule.route)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing on the router itself
+        default_client = self.__dict__.get("default_client")
+        if default_client is None:
+            raise AttributeError(name)
+        return getattr(default_client, name)
+
+    @property
+    def stream_listener(self):
+        return self.default_client.stream_listener
+
+    @stream_listener.setter
+    def stream_listener(self, listener) -> None:
+        self.default_client.stream_listener = listener
+        for client in self.routes.values():
+            client.stream_listener = listener
+
+    @property
+    def telemetry(self):
+        return self.default_client.telemetry
+
+    @telemetry.setter
+    def telemetry(self, collector) -> None:
+        for client in [self.default_client, *self.routes.values()]:
+            client.telemetry = collector
+
+    @property
+    def capabilities(self) -> ModelCapabilities:
+        """Registered capabilities of the active route's model."""
+        return self._active.capabilities
+
+    @property
+    def last_model(self) -> Optional[str]:
+        """Provider/model label of the last response from the active route."""
+        return self._active.last_model
+
+    def route_name(self, slide_content: SlideContent) -> str:
+        """
+        Choose the route for a slide.
+
+        Args:
+            slide_content: Slide to route
+
+        Returns:
+            Name of the first matching route that is available, else the default route
+        """
+        for rule in self.rules:
+            if rule.matches(slide_content):
+                if rule.route in self.routes:
+                    return rule.route
+                break
+        return DEFAULT_ROUTE
+
+    def route_slide(self, slide_content: SlideContent) -> str:
+        """
+        Select the model used for the following requests.
+
+        Args:
+            slide_content: Slide about to be analyzed
+
+        Returns:
+            Name of the selected route
+        """
+        route = self.route_name(slide_content)
+        self._active = self.routes.get(route, self.default_client)
+        self.route_counts[route] = self.route_counts.get(route, 0) + 1
+        logger.debug("Slide %d routed to %s (%s)", slide_content.slide_number, route, self._active.model_label)
+        return route
+
+    def _call(self, method: str, *args, **kwargs) -> str:
+        response = getattr(self._active, method)(*args, **kwargs)
+        model = self._active.last_model
+        if model:
+            self.model_counts[model] = self.model_counts.get(model, 0) + 1
+        return response
+
+    def generate_slide_analysis(self, *args, **kwargs) -> str:
+        """Generate a slide analysis with the selected model."""
+        return self._call("generate_slide_analysis", *args, **kwargs)
+
+    def generate_packed_slide_analysis(self, *args, **kwargs) -> str:
+        """Generate a packed slide analysis with the selected model."""
+        return self._call("generate_packed_slide_analysis", *args, **kwargs)
+
+    def generate_section_repair(self, *args, **kwargs) -> str:
+        """Generate missing analysis sections with the selected model."""
+        return self._call("generate_section_repair", *args, **kwargs)
+
+    def test_connection(self) -> bool:
+        """
+        Test the default model and every route.
+
+        Routes that fail the test are removed so their slides use the default model.
+
+        Returns:
+            True if the default model is reachable
+        """
+        for name, client in list(self.routes.items()):
+            if not client.test_connection():
+                logger.warning("Model route '%s' (%s) is unavailable; using the default model", name, client.model_label)
+                del self.routes[name]
+        return self.default_client.test_connection()
+
+    def health_check(self, cache=None) -> bool:
+        """
+        Health-check the default model and every route.
+
+        Routes that fail are removed so their slides use the default model.
+
+        Args:
+            cache: Health check cache, if enabled
+
+        Returns:
+            True if the default model is healthy
+        """
+        for name, client in list(self.routes.items()):
+            if not client.health_check(cache):
+                logger.warning("Model route '%s' (%s) is unavailable; using the default model", name, client.model_label)
+                del self.routes[name]
+        return self.default_client.health_check(cache)
+
+    def close(self) -> None:
+        """Release provider-side resources of the default model and every route."""
+        for client in [self.default_client, *self.routes.values()]:
+            client.close()
+
+    def endpoint_urls(self) -> List[str]:
+        """Get the HTTP endpoints of the default model and every route."""
+        clients = [self.default_client, *self.routes.values()]
+        return [url for client in clients for url in client.endpoint_urls()]
+
+    def model_capabilities(self) -> List[ModelCapabilities]:
+        """Get the capabilities of the default model and every route."""
+        clients = [self.default_client, *self.routes.values()]
+        return [item for client in clients for item in client.model_capabilities()]
+
+    def get_routing_stats(self) -> Dict[str, Any]:
+        """
+        Get the mix of routes and models used.
+
+        Returns:
+            Dictionary with slide counts by route and response counts by model
+        """
+        return {
+            "slides_by_route": dict(self.route_counts),
+            "responses_by_model": dict(self.model_counts),
+        }
+
+
+def create_model_router(
+    default_client,
+    routing_config: Dict[str, Any],
+    response_cache: Optional[ResponseCache] = None,
+):
+    """
+    Factory function to wrap an LLM client with per-slide model routing.
+
+    Args:
+        default_client: Client for the configured model
+        routing_config: Routing configuration with resolved `routes` and ordered `rules`
+        response_cache: Optional cache shared by all routes
+
+    Returns:
+        A ModelRouter, or the default client when routing is disabled
+
+    Raises:
+        RoutingError: If a rule is invalid
+    """
+    if not routing_config or not routing_config.get("enabled"):
+        return default_client
+
+    rules = []
+    for rule_config in routing_config.get("rules") or []:
+        rule_config = dict(rule_config)
+        route = rule_config.pop("route", None)
+        if not route:
+            raise RoutingError(f"Routing rule without a route: {rule_config}")
+        rules.append(RoutingRule(route, **rule_config))
+
+    try:
+        routes = {
+            name: create_key_pool_client(config, response_cache=response_cache)
+            for name, config in (routing_config.get("routes") or {}).items()
+        }
+    except LLMError as e:
+        raise RoutingError(f"Failed to create routed model client: {e}") from e
+
+    logger.info(
+        "Model routing: %s",
+        ", ".join(f"{name} -> {client.model_label}" for name, client in routes.items()) or "no routes"
+    )
+    return ModelRouter(default_client, routes, rules)
@@ -1,38 +1,39 @@
 """Note generation module for creating speaker notes from slides and prompts."""
 
 import logging
-import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 try:
+    from .concurrency import run_concurrently
     from .llm_client import LLMClient, LLMError
+    from .model_registry import ModelCapabilities
+    from .model_router import ModelRouter
     from .pdf_processor import SlideContent
+    from .retry_policy import RetryPolicy
+    from .section_repair import (
+        SLIDE_IMAGES, SLIDE_NARRATION, SectionRepairError, find_incomplete_sections, merge_sections
+    )
+    from .session import ConversationSession
+    from .slide_packer import SlidePacker
+    from .telemetry import TelemetryCollector
 except ImportError:
+    from concurrency import run_concurrently
     from llm_client import LLMClient, LLMError
+    from model_registry import ModelCapabilities
+    from model_router import ModelRouter
     from pdf_processor import SlideContent
+    from retry_policy import RetryPolicy
+    from section_repair import (
+        SLIDE_IMAGES, SLIDE_NARRATION, SectionRepairError, find_incomplete_sections, merge_sections
+    )
+    from session import ConversationSession
+    from slide_packer import SlidePacker
+    from telemetry import TelemetryCollector
 
 logger = logging.getLogger(__name__)
 
 
-def retry_on_timeout(func, max_retries=3, delay=5):
-    """Retry function on timeout errors with exponential backoff."""
-    for attempt in range(max_retries):
-        try:
-            return func()
-        except LLMError as e:
-            error_str = str(e).lower()
-            if ('timeout' in error_str or 'deadline exceeded' in error_str or '504' in error_str) and attempt < max_retries - 1:
-                wait_time = delay * (2 ** attempt)  # Exponential backoff
-                logger.warning(f"API timeout (attempt {attempt + 1}/{max_retries}), retrying in {wait_time}s: {e}")
-                time.sleep(wait_time)
-                continue
-            else:
-                # Non-timeout error or max retries reached
-                raise
-    raise LLMError(f"Max retries ({max_retries}) exceeded")
-
-
 class NoteGenerationError(Exception):
     """Custom exception for note generation errors."""
 
@@ -40,17 +41,38 @@ class NoteGenerationError(Exception):
 class NoteGenerator:
     """Handles generation of speaker notes from slide content and user prompts."""
 
-    def __init__(self, llm_client: Optional[LLMClient] = None):
+    def __init__(
+        self, llm_client: Optional[LLMClient] = None, slide_packer: Optional[SlidePacker] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        telemetry: Optional[TelemetryCollector] = None,
+        session: Optional[ConversationSession] = None
+    ):
         """Initialize the note generator.
 
         Args:
             llm_client: LLM client for AI-powered note generation
+            slide_packer: Optional packer for sending several slides per request
+            retry_policy: Retry policy for LLM requests (default: RetryPolicy())
+            telemetry: Optional collector for per-request telemetry records
+            session: Optional conversation session; each deck is processed as
+                one conversation instead of resending rebuilt context per slide
         """
         self.generated_notes: List[str] = []
         self.llm_client = llm_client
+        self.slide_packer = slide_packer
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._slide_deadline: Optional[float] = None
+        self.telemetry = telemetry
+        self.session = session
+        self._deck: Optional[str] = None
+        if telemetry and llm_client:
+            llm_client.telemetry = telemetry
         self.use_ai = llm_client is not None
         self.cumulative_context: List[str] = []
         self.processed_slides: List[int] = []
+        self.repair_stats = {"repaired": 0, "failed": 0}
+        # Whether streamed text is forwarded to the progress manager's partial output
+        self.forward_partial_output = True
 
     def load_prompt_from_file(self, prompt_file: Path) -> str:
         """
@@ -325,9 +347,13 @@ class NoteGenerator:
             Generated notes string
         """
         logger.info(f"Starting note generation from slide {start_from_slide} of {len(slide_contents)} total slides")
+        file_path = getattr(progress_manager, "file_path", None)
+        self._deck = Path(file_path).name if isinstance(file_path, (str, Path)) else None
         
         # Update progress manager with total slides
         progress_manager.update_total_slides(len(slide_contents))
+        if self.session:
+            self.session.reset()
         
         # Load existing content if resuming
         existing_notes = []
@@ -343,6 +369,10 @@ class NoteGenerator:
         # Process slides from resume point
         new_notes = []
         processed_count = start_from_slide - 1
+        # Analyses prepared ahead by a packed request or a concurrent window
+        packed_analyses: Dict[int, str] = {}
+        packed_models: Dict[int, Optional[str]] = {}
+        packed_through = 0  # Last slide covered by a packed request or window
         
         try:
             for slide_num in range(start_from_slide, len(slide_contents) + 1):
@@ -352,90 +382,83 @@ class NoteGenerator:
                     
                 slide_content = slide_contents[slide_num]
                 
-                # Build cumulative context for this slide
-                context = self._build_context_for_slide(slide_num, max_context_chars=2000)
+                # Build cumulative context for this slide (sessions carry it as history)
+                context = "" if self.session else self._build_context_for_slide(
+                    slide_num, max_context_chars=2000
+                )
+                self._slide_deadline = self.retry_policy.start_deadline()
                 
                 logger.info(f"Requesting AI analysis for slide {slide_num} (context: {len(context)} chars, images: {slide_content.has_images})...")
                 
+                if self.use_ai and self.llm_client:
+                    # Emit streamed text to the progress layer as it arrives
+                    if self.forward_partial_output:
+                        self.llm_client.stream_listener = (
+                            lambda text, n=slide_num: progress_manager.record_partial_output(n, text)
+                        )
+                    self._route_slide(slide_content)
+                
                 try:
+                    # Pack this slide with the following ones when packing is enabled
+                    if (self.slide_packer and self.use_ai and self.llm_client
+                            and slide_num > packed_through):
+                        group_analyses, packed_through = self._generate_packed_group(
+                            slide_contents, slide_num, prompt, context
+                        )
+                        packed_analyses.update(group_analyses)
+                        packed_models.update(dict.fromkeys(group_analyses, self._last_model()))
+                    elif (self._concurrency() > 1 and not self.slide_packer and not self.session
+                            and self.use_ai and self.llm_client and slide_num > packed_through):
+                        # Request this slide and the following ones at once
+                        window_results, packed_through = self._generate_concurrent_window(
+                            slide_contents, slide_num, prompt, context
+                        )
+                        for window_slide, (analysis, model) in window_results.items():
+                            packed_analyses[window_slide] = analysis
+                            packed_models[window_slide] = model
+                    
                     # Generate analysis for this slide
-                    if self.use_ai and self.llm_client:
-                        # Use retry logic for LLM calls to handle timeouts
-                        slide_analysis = retry_on_timeout(
+                    from_packed = slide_num in packed_analyses
+                    if from_packed:
+                        slide_analysis = packed_analyses.pop(slide_num)
+                        slide_model = packed_models.pop(slide_num, None)
+                    elif self.use_ai and self.llm_client:
+                        # Retry transient provider errors within the slide deadline
+                        slide_analysis = self._request_with_retry(
                             lambda: self.llm_client.generate_slide_analysis(
                                 slide_content.text,
                                 prompt,
                                 slide_num,
                                 context=context,
-                                image_base64=slide_content.image_base64
-                            )
+                                image_base64=slide_content.image_base64,
+                                session=self.session
+                            ),
+                            f"Slide {slide_num} request",
+                            [slide_num]
                         )
+                        slide_model = self._last_model()
                     else:
                         # Fallback to placeholder
+                        slide_model = None
                         slide_analysis = self._generate_placeholder_notes(
                             slide_num, slide_content.text, prompt, slide_content
                         )
                     
-                    # Validate generated content - retry once with reformatting if validation fails
+                    # Validate generated content - repair or retry if validation fails
                     if not self._validate_generated_content(slide_analysis, slide_num):
-                        logger.warning(f"Slide {slide_num} validation failed, attempting to reformat...")
-                        
-                        # Try to fix the content by adding missing slide number if that's the only issue
-                        if self.use_ai and self.llm_client and '**Slide Number:**' not in slide_analysis:
-                            fixed_analysis = f"**Slide Number:** {slide_num}\n\n{slide_analysis}"
-                            if self._validate_generated_content(fixed_analysis, slide_num):
-                                logger.info(f"Fixed slide {slide_num} by adding missing slide number")
-                                slide_analysis = fixed_analysis
-                            else:
-                                # Still invalid, try one retry with explicit formatting instructions
-                                try:
-                                    logger.warning(f"Retrying slide {slide_num} with explicit formatting instructions...")
-                                    reformat_prompt = f"""Please reformat this slide analysis to include ALL required sections:
-
-**Slide Number:** {slide_num}
-**Slide Text:** [the text content from the slide]
-**Slide Images/Diagrams:** [description of any visual elements]
-**Slide Topics:** [key topics covered]
-**Slide Narration:** [detailed speaker notes - minimum 200 characters]
-
-Original content to reformat:
-{slide_analysis}"""
-                                    
-                                    slide_analysis = retry_on_timeout(
-                                        lambda: self.llm_client.generate_slide_analysis(
-                                            slide_content.text,
-                                            reformat_prompt,
-                                            slide_num,
-                                            context="",
-                                            image_base64=slide_content.image_base64
-                                        )
-                                    )
-                                    
-                                    # Final validation
-                                    if not self._validate_generated_content(slide_analysis, slide_num):
-                                        logger.error(f"Slide {slide_num} still invalid after retry, using fallback")
-                                        slide_analysis = self._generate_placeholder_notes(
-                                            slide_num, slide_content.text, prompt, slide_content
-                                        )
-                                    else:
-                                        logger.info(f"Successfully reformatted slide {slide_num}")
-                                        
-                                except Exception as retry_e:
-                                    logger.error(f"Retry failed for slide {slide_num}: {retry_e}, using fallback")
-                                    slide_analysis = self._generate_placeholder_notes(
-                                        slide_num, slide_content.text, prompt, slide_content
-                                    )
-                        else:
-                            # Non-AI mode or missing other sections, use placeholder
-                            logger.warning(f"Using placeholder for slide {slide_num} due to validation failure")
-                            slide_analysis = self._generate_placeholder_notes(
-                                slide_num, slide_content.text, prompt, slide_content
-                            )
+                        slide_analysis, slide_model = self._recover_invalid_analysis(
+                            slide_content, prompt, slide_analysis, slide_model
+                        )
                     
                     logger.info(f"AI analysis completed for slide {slide_num} ({len(slide_analysis)} chars)")
+                    if self.session and not from_packed:
+                        # Keep the analysis actually used, not a rejected first response
+                        self.session.revise_last(slide_analysis)
                     
                     # Format the slide analysis
-                    formatted_analysis = self._format_slide_analysis(slide_analysis, slide_num, slide_content)
+                    formatted_analysis = self._format_slide_analysis(
+                        slide_analysis, slide_num, slide_content, model=slide_model
+                    )
                     new_notes.append(formatted_analysis)
                     
                     # Update context history for next slide
@@ -465,6 +488,10 @@ Original content to reformat:
             logger.error(f"Critical error during processing: {e}")
             raise
         
+        finally:
+            if self.llm_client is not None:
+                self.llm_client.stream_listener = None
+        
         # Combine existing and new content
         all_notes = existing_notes + new_notes
         final_content = "".join(all_notes)
@@ -481,6 +508,349 @@ Original content to reformat:
         
         return final_content
 
+    def _recover_invalid_analysis(
+        self, slide_content: SlideContent, prompt: str, analysis: str, model: Optional[str]
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Recover an analysis that failed validation.
+        
+        Tries, in order: adding a missing slide number, a repair request for
+        only the missing sections, a full request with explicit formatting
+        instructions, and finally placeholder notes.
+        
+        Args:
+            slide_content: Slide the analysis belongs to
+            prompt: Generation prompt
+            analysis: Analysis that failed validation
+            model: Provider/model label that produced the analysis
+            
+        Returns:
+            Tuple of the analysis to use and the model that produced it
+        """
+        slide_num = slide_content.slide_number
+        logger.warning(f"Slide {slide_num} validation failed, attempting to reformat...")
+        
+        if not (self.use_ai and self.llm_client):
+            logger.warning(f"Using placeholder for slide {slide_num} due to validation failure")
+            return self._generate_placeholder_notes(
+                slide_num, slide_content.text, prompt, slide_content
+            ), None
+        
+        # Try to fix the content by adding missing slide number if that's the only issue
+        if '**Slide Number:**' not in analysis:
+            analysis = f"**Slide Number:** {slide_num}\n\n{analysis}"
+            if self._validate_generated_content(analysis, slide_num):
+                logger.info(f"Fixed slide {slide_num} by adding missing slide number")
+                return analysis, model
+        
+        # Ask for only the missing sections before regenerating everything
+        repaired = self._repair_sections(slide_content, prompt, analysis)
+        if repaired is not None:
+            return repaired, model
+        
+        # Still invalid, try one retry with explicit formatting instructions
+        try:
+            logger.warning(f"Retrying slide {slide_num} with explicit formatting instructions...")
+            reformat_prompt = f"""Please reformat this slide analysis to include ALL required sections:
+
+**Slide Number:** {slide_num}
+**Slide Text:** [the text content from the slide]
+**Slide Images/Diagrams:** [description of any visual elements]
+**Slide Topics:** [key topics covered]
+**Slide Narration:** [detailed speaker notes - minimum 200 characters]
+
+Original content to reformat:
+{analysis}"""
+            
+            analysis = self._request_with_retry(
+                lambda: self.llm_client.generate_slide_analysis(
+                    slide_content.text,
+                    reformat_prompt,
+                    slide_num,
+                    context="",
+                    image_base64=slide_content.image_base64
+                ),
+                f"Slide {slide_num} reformat request",
+                [slide_num]
+            )
+            
+            # Final validation
+            if self._validate_generated_content(analysis, slide_num):
+                logger.info(f"Successfully reformatted slide {slide_num}")
+                return analysis, self._last_model()
+            logger.error(f"Slide {slide_num} still invalid after retry, using fallback")
+                
+        except Exception as retry_e:
+            logger.error(f"Retry failed for slide {slide_num}: {retry_e}, using fallback")
+        
+        return self._generate_placeholder_notes(
+            slide_num, slide_content.text, prompt, slide_content
+        ), None
+
+    def _repair_sections(
+        self, slide_content: SlideContent, prompt: str, analysis: str
+    ) -> Optional[str]:
+        """
+        Request only the missing or incomplete sections of an analysis and merge them in.
+        
+        Args:
+            slide_content: Slide the analysis belongs to
+            prompt: Generation prompt
+            analysis: Analysis that failed validation
+            
+        Returns:
+            The repaired analysis, or None if it cannot be repaired
+        """
+        slide_num = slide_content.slide_number
+        sections = find_incomplete_sections(analysis)
+        if not sections or len(analysis.strip()) < 100:
+            # Nothing specific to ask for, or too little to build on
+            return None
+        
+        logger.info(f"Requesting missing sections of slide {slide_num}: {', '.join(sections)}")
+        try:
+            response = self._request_with_retry(
+                lambda: self.llm_client.generate_section_repair(
+                    slide_content.text,
+                    prompt,
+                    slide_num,
+                    analysis,
+                    sections,
+                    # The image is only needed to describe it
+                    image_base64=slide_content.image_base64 if SLIDE_IMAGES in sections else None
+                ),
+                f"Slide {slide_num} repair request",
+                [slide_num]
+            )
+            repaired = merge_sections(analysis, response, sections)
+        except (LLMError, SectionRepairError) as e:
+            logger.warning(f"Section repair failed for slide {slide_num}: {e}")
+            self.repair_stats["failed"] += 1
+            return None
+        
+        if not self._validate_generated_content(repaired, slide_num):
+            logger.warning(f"Slide {slide_num} still invalid after section repair")
+            self.repair_stats["failed"] += 1
+            return None
+        
+        logger.info(f"Repaired slide {slide_num} ({len(sections)} sections)")
+        self.repair_stats["repaired"] += 1
+        return repaired
+
+    def get_repair_stats(self) -> Dict[str, int]:
+        """
+        Get section repair statistics.
+        
+        Returns:
+            Dictionary with the number of repaired slides and failed repairs
+        """
+        return dict(self.repair_stats)
+
+    def complete_slide_analysis(
+        self, slide_content: SlideContent, prompt: str, analysis: Optional[str] = None,
+        context: str = "", model: Optional[str] = None
+    ) -> str:
+        """
+        Validate an analysis produced elsewhere and format it for output.
+        
+        An invalid analysis is first repaired by requesting only its missing
+        sections. If that is not possible, a single-slide request is made
+        and, if that also fails, placeholder notes are used.
+        
+        Args:
+            slide_content: Slide the analysis belongs to
+            prompt: Generation prompt
+            analysis: Previously generated analysis, if any
+            context: Context to use for a replacement request
+            model: Provider/model label that produced the analysis
+            
+        Returns:
+            Formatted slide analysis
+        """
+        slide_num = slide_content.slide_number
+        
+        if analysis is None or not self._validate_generated_content(analysis, slide_num):
+            repaired = None
+            if self.use_ai and self.llm_client:
+                self._route_slide(slide_content)
+                self._slide_deadline = self.retry_policy.start_deadline()
+                if analysis is not None:
+                    repaired = self._repair_sections(slide_content, prompt, analysis)
+            analysis = repaired
+            if analysis is None and self.use_ai and self.llm_client:
+                logger.warning(f"Requesting replacement analysis for slide {slide_num}")
+                try:
+                    analysis = self._request_with_retry(
+                        lambda: self.llm_client.generate_slide_analysis(
+                            slide_content.text,
+                            prompt,
+                            slide_num,
+                            context=context,
+                            image_base64=slide_content.image_base64
+                        ),
+                        f"Slide {slide_num} replacement request",
+                        [slide_num]
+                    )
+                    model = self._last_model()
+                except LLMError as e:
+                    logger.error(f"Replacement request failed for slide {slide_num}: {e}")
+            
+            if analysis is None or not self._validate_generated_content(analysis, slide_num):
+                logger.warning(f"Using placeholder for slide {slide_num}")
+                model = None
+                analysis = self._generate_placeholder_notes(
+                    slide_num, slide_content.text, prompt, slide_content
+                )
+        
+        return self._format_slide_analysis(analysis, slide_num, slide_content, model=model)
+
+    def _generate_packed_group(
+        self, slide_contents: Dict[int, SlideContent], start_slide: int, prompt: str, context: str
+    ) -> Tuple[Dict[int, str], int]:
+        """
+        Generate analyses for a packed group of consecutive slides in one request.
+        
+        Only sections that pass validation are returned; any other slide in the
+        group falls back to a single-slide request.
+        
+        Args:
+            slide_contents: Dictionary of slide content
+            start_slide: First slide of the group
+            prompt: Generation prompt
+            context: Context from slides before the group
+            
+        Returns:
+            Tuple of (slide number to validated analysis, last slide in the group)
+        """
+        # Only slides routed to the same model are packed together
+        group_key = self.llm_client.route_name if isinstance(self.llm_client, ModelRouter) else None
+        capabilities = getattr(self.llm_client, "capabilities", None)
+        group = self.slide_packer.plan_group(
+            slide_contents, start_slide, prompt, context,
+            max_output_tokens=getattr(self.llm_client, "max_tokens", None),
+            group_key=group_key,
+            capabilities=capabilities if isinstance(capabilities, ModelCapabilities) else None
+        )
+        if len(group) < 2:
+            return {}, start_slide
+        
+        slide_numbers = [slide.slide_number for slide in group]
+        logger.info(f"Requesting packed AI analysis for slides {slide_numbers}")
+        
+        try:
+            response = self._request_with_retry(
+                lambda: self.llm_client.generate_packed_slide_analysis(
+                    group, prompt, context=context, session=self.session
+                ),
+                f"Packed request for slides {slide_numbers}",
+                slide_numbers
+            )
+        except LLMError as e:
+            logger.warning(f"Packed request for slides {slide_numbers} failed, using single-slide requests: {e}")
+            return {}, slide_numbers[-1]
+        
+        sections = self.slide_packer.split_packed_response(response, slide_numbers)
+        valid_sections = {
+            slide_num: analysis for slide_num, analysis in sections.items()
+            if self._validate_generated_content(analysis, slide_num)
+        }
+        
+        fallback = sorted(set(slide_numbers) - set(valid_sections))
+        if fallback:
+            logger.warning(f"Slides {fallback} from packed request will use single-slide requests")
+        
+        return valid_sections, slide_numbers[-1]
+
+    def _concurrency(self) -> int:
+        """Number of slide requests the LLM endpoint serves at once."""
+        concurrency = getattr(self.llm_client, "max_concurrency", 1)
+        return concurrency if isinstance(concurrency, int) else 1
+
+    def _generate_concurrent_window(
+        self, slide_contents: Dict[int, SlideContent], start_slide: int, prompt: str, context: str
+    ) -> Tuple[Dict[int, Tuple[str, Optional[str]]], int]:
+        """
+        Request the analyses of consecutive slides concurrently.
+        
+        The window holds up to ``max_concurrency`` slides routed to the same
+        model, and every slide in it uses the context available at its first
+        slide. Analyses are validated and checkpointed in slide order by the
+        caller; slides whose request failed fall back to a single-slide request.
+        
+        Args:
+            slide_contents: Dictionary of slide content
+            start_slide: First slide of the window
+            prompt: Generation prompt
+            context: Context from slides before the window
+            
+        Returns:
+            Tuple of (slide number to (analysis, model), last slide in the window)
+        """
+        group_key = self.llm_client.route_name if isinstance(self.llm_client, ModelRouter) else None
+        window: List[SlideContent] = []
+        slide_num = start_slide
+        while slide_num in slide_contents and len(window) < self._concurrency():
+            slide_content = slide_contents[slide_num]
+            if window and group_key and group_key(slide_content) != group_key(window[0]):
+                break
+            window.append(slide_content)
+            slide_num += 1
+        if len(window) < 2:
+            return {}, start_slide
+        
+        slide_numbers = [slide.slide_number for slide in window]
+        logger.info(f"Requesting AI analysis for slides {slide_numbers} concurrently")
+        
+        def request(slide: SlideContent) -> Tuple[str, Optional[str]]:
+            analysis = self._request_with_retry(
+                lambda: self.llm_client.generate_slide_analysis(
+                    slide.text, prompt, slide.slide_number,
+                    context=context, image_base64=slide.image_base64
+                ),
+                f"Slide {slide.slide_number} request",
+                [slide.slide_number]
+            )
+            return analysis, self._last_model()
+        
+        # Interleaved partial output from several slides is not forwarded
+        listener = self.llm_client.stream_listener
+        self.llm_client.stream_listener = None
+        try:
+            outcomes = run_concurrently(
+                {slide.slide_number: (lambda s=slide: request(s)) for slide in window},
+                self._concurrency()
+            )
+        finally:
+            self.llm_client.stream_listener = listener
+        
+        results = {}
+        for number, (result, error) in outcomes.items():
+            if error is None:
+                results[number] = result
+            else:
+                logger.warning(f"Concurrent request for slide {number} failed, using a single-slide request: {error}")
+        return results, slide_numbers[-1]
+
+    def _route_slide(self, slide_content: SlideContent) -> None:
+        """Select the model for a slide when per-slide model routing is configured."""
+        if isinstance(self.llm_client, ModelRouter):
+            self.llm_client.route_slide(slide_content)
+
+    def _last_model(self) -> Optional[str]:
+        """Return the provider/model label of the calling thread's last LLM response, if known."""
+        model = getattr(self.llm_client, "last_model", None)
+        return model if isinstance(model, str) else None
+
+    def _request_with_retry(self, func, description: str, slides: Optional[List[int]] = None):
+        """Run an LLM request through the retry policy within the current slide deadline."""
+        if not self.telemetry:
+            return self.retry_policy.call(func, description, deadline=self._slide_deadline)
+        
+        with self.telemetry.track(slides or [], deck=self._deck) as call:
+            return self.retry_policy.call(
+                func, description, deadline=self._slide_deadline, on_retry=call.on_retry
+            )
+
     def _build_context_for_slide(self, slide_num: int, max_context_chars: int = 2000) -> str:
         """
         Build cumulative context for a specific slide.
@@ -543,27 +913,16 @@ Original content to reformat:
             logger.warning(f"Slide {slide_num} content too short ({len(content)} chars)")
             return False
         
-        # Check for required sections
-        required_sections = [
-            '**Slide Number:**',
-            '**Slide Text:**', 
-            '**Slide Images/Diagrams:**',
-            '**Slide Topics:**',
-            '**Slide Narration:**'
-        ]
-        
-        missing_sections = [section for section in required_sections if section not in content]
+        # Check for required sections and a reasonable narration length
+        incomplete_sections = find_incomplete_sections(content)
+        missing_sections = [section for section in incomplete_sections if section not in content]
         if missing_sections:
             logger.warning(f"Slide {slide_num} missing sections: {missing_sections}")
             return False
         
-        # Check for reasonable narration length
-        narration_start = content.find('**Slide Narration:**')
-        if narration_start > -1:
-            narration_content = content[narration_start:].split('---')[0]
-            if len(narration_content.strip()) < 200:  # Minimum narration length
-                logger.warning(f"Slide {slide_num} narration too short")
-                return False
+        if SLIDE_NARRATION in incomplete_sections:
+            logger.warning(f"Slide {slide_num} narration too short")
+            return False
         
         return True
 
@@ -582,8 +941,14 @@ Original content to reformat:
         
         logger.info(f"Output validation passed: {slide_count} slides, {len(content)} total characters")
 
-    def _format_slide_analysis(self, analysis: str, slide_num: int, slide_content) -> str:
+    def _format_slide_analysis(
+        self, analysis: str, slide_num: int, slide_content, model: Optional[str] = None
+    ) -> str:
         """Format slide analysis with consistent structure."""
+        # Record the provider/model that produced the slide as an HTML comment
+        if model:
+            analysis = f"{analysis.rstrip()}\n\n<!-- model: {model} -->\n"
+        
         # If analysis already has proper formatting, return as-is
         if '**Slide Number:**' in analysis:
             return analysis + '\n---\n\n'
@@ -0,0 +1,212 @@
+"""Adaptive max_tokens learned from observed output lengths, persisted across runs."""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    from .telemetry import percentile
+except ImportError:
+    from telemetry import percentile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path.home() / ".cache" / "slide-extract" / "output_lengths.json"
+
+
+class OutputBudgetError(Exception):
+    """Custom exception for adaptive output budget errors."""
+
+
+def compute_budget_key(prompt: str, model_label: str) -> str:
+    """
+    Compute the key of an output-length distribution.
+
+    Args:
+        prompt: Static instruction prompt (the prompt file)
+        model_label: Provider-qualified model name
+
+    Returns:
+        "<model label>:<prompt digest>"
+    """
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+    return f"{model_label}:{digest}"
+
+
+class OutputBudget:
+    """
+    Chooses max_tokens per request from the output lengths seen so far.
+
+    Lengths are kept per prompt file and model as output tokens per slide.
+    Once ``min_samples`` are known, a request for N slides gets
+    N x (``percentile`` of the lengths) x (1 + ``margin``), clamped to
+    [``floor``, configured max_tokens]. A lower limit stops providers from
+    reserving rate-limit capacity for tokens that are never produced;
+    responses that still hit it are continued by the client.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        margin: float = 0.25,
+        min_samples: int = 10,
+        window: int = 200,
+        floor: int = 512,
+        state_path: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Initialize the output budget.
+
+        Args:
+            percentile: Percentile of observed lengths the limit is based on
+            margin: Fractional headroom added on top of the percentile
+            min_samples: Observations needed before limits are lowered
+            window: Most recent observations kept per prompt and model
+            floor: Smallest limit ever set
+            state_path: JSON state file (default: ~/.cache/slide-extract/output_lengths.json)
+
+        Raises:
+            OutputBudgetError: If an option is out of range
+        """
+        if not 0 < percentile <= 100:
+            raise OutputBudgetError(f"Output budget percentile must be in (0, 100]: {percentile}")
+        if margin < 0 or min_samples < 1 or window < min_samples:
+            raise OutputBudgetError("Output budget needs margin >= 0 and 1 <= min_samples <= window")
+
+        self.percentile = percentile
+        self.margin = margin
+        self.min_samples = min_samples
+        self.window = window
+        self.floor = floor
+        self.state_path = Path(state_path).expanduser() if state_path else DEFAULT_STATE_PATH
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[int]] = self._load()
+
+    def _load(self) -> Dict[str, List[int]]:
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable output length state %s: %s", self.state_path, e)
+            return {}
+        if not isinstance(state, dict):
+            return {}
+        return {
+            key: [int(value) for value in values if isinstance(value, (int, float))]
+            for key, values in state.items() if isinstance(values, list)
+        }
+
+    def _save(self) -> None:
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(self._samples), encoding="utf-8")
+            temp_path.replace(self.state_path)
+        except OSError as e:
+            logger.warning("Could not write output length state %s: %s", self.state_path, e)
+
+    def limit(self, prompt: str, model_label: str, ceiling: int, slides: int = 1) -> int:
+        """
+        Get the max_tokens for a request.
+
+        Args:
+            prompt: Static instruction prompt
+            model_label: Provider-qualified model name
+            ceiling: Configured max_tokens, never exceeded
+            slides: Slides covered by the request
+
+        Returns:
+            Output token limit; the ceiling until enough lengths are known
+        """
+        with self._lock:
+            samples = list(self._samples.get(compute_budget_key(prompt, model_label), []))
+        if len(samples) < self.min_samples:
+            return ceiling
+        per_slide = percentile(samples, self.percentile) * (1 + self.margin)
+        return max(min(self.floor, ceiling), min(ceiling, math.ceil(per_slide * max(1, slides))))
+
+    def record(self, prompt: str, model_label: str, output_tokens: int, slides: int = 1) -> None:
+        """
+        Record the length of a complete response.
+
+        Args:
+            prompt: Static instruction prompt
+            model_label: Provider-qualified model name
+            output_tokens: Output tokens of the response, continuations included
+            slides: Slides covered by the request
+        """
+        if output_tokens <= 0:
+            return
+        key = compute_budget_key(prompt, model_label)
+        with self._lock:
+            samples = self._samples.setdefault(key, [])
+            samples.append(math.ceil(output_tokens / max(1, slides)))
+            del samples[:-self.window]
+            self._save()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the learned distribution per prompt and model.
+
+        Returns:
+            Dictionary keyed by "<model label>:<prompt digest>" with the sample
+            count, median and the per-slide limit currently applied
+        """
+        with self._lock:
+            samples = {key: list(values) for key, values in self._samples.items()}
+        return {
+            key: {
+                "samples": len(values),
+                "p50": percentile(values, 50),
+                "limit_per_slide": (
+                    math.ceil(percentile(values, self.percentile) * (1 + self.margin))
+                    if len(values) >= self.min_samples else None
+                ),
+            }
+            for key, values in samples.items()
+        }
+
+
+_budgets: Dict[Path, OutputBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def get_output_budget(budget_config: Dict[str, Any]) -> Optional[OutputBudget]:
+    """
+    Get the process-wide output budget for a configuration.
+
+    Clients sharing a state file (fallbacks, routes, hedge clients) share one
+    budget, so the file is written by a single owner.
+
+    Args:
+        budget_config: The `adaptive_max_tokens` options
+
+    Returns:
+        OutputBudget, or None when adaptive limits are disabled
+
+    Raises:
+        OutputBudgetError: If an option is out of range
+    """
+    if not budget_config.get("enabled"):
+        return None
+
+    state_path = budget_config.get("state_path")
+    key = Path(state_path).expanduser() if state_path else DEFAULT_STATE_PATH
+    with _budgets_lock:
+        budget = _budgets.get(key)
+        if budget is None:
+            budget = _budgets[key] = OutputBudget(
+                percentile=budget_config.get("percentile", 95),
+                margin=budget_config.get("margin", 0.25),
+                min_samples=budget_config.get("min_samples", 10),
+                window=budget_config.get("window", 200),
+                floor=budget_config.get("floor", 512),
+                state_path=key,
+            )
+        return budget
@@ -46,9 +46,27 @@ class SlideContent(NamedTuple):
 class PDFProcessor:
     """Handles extraction of text and visual content from PDF files."""
 
-    def __init__(self):
-        """Initialize the PDF processor."""
+    def __init__(
+        self,
+        render_images: bool = True,
+        max_image_dimension: Optional[int] = None,
+        max_image_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the PDF processor.
+
+        Args:
+            render_images: Whether slides are rendered at all (not needed for
+                text-only models)
+            max_image_dimension: Longest rendered side in pixels; pages are
+                rendered at a lower resolution to fit
+            max_image_bytes: Largest PNG payload; larger renders are redone
+                at a lower resolution
+        """
         self.processed_files: List[str] = []
+        self.render_images = render_images
+        self.max_image_dimension = max_image_dimension
+        self.max_image_bytes = max_image_bytes
 
     def extract_text_from_pdf(self, pdf_path: Path) -> Dict[int, str]:
         """
@@ -155,7 +173,9 @@ class PDFProcessor:
                 total_visual_elements = len(image_list) + len(drawings)
                 image_base64 = None
                 
-                if has_visual_content:
+                if not self.render_images:
+                    logger.debug("Skipping rendering of slide %d; no model accepts images", slide_number)
+                elif has_visual_content:
                     logger.debug("Found %d images and %d drawings on slide %d", 
                                 len(image_list), len(drawings), slide_number)
                     # Always render the entire page as an image for comprehensive visual analysis
@@ -196,6 +216,9 @@ class PDFProcessor:
     def _render_page_as_image(self, page, dpi: int = 150) -> str:
         """
         Render a PDF page as a base64-encoded image.
+
+        The resolution is lowered so the image fits the configured maximum
+        dimension and payload size.
         
         Args:
             page: PyMuPDF page object
@@ -205,17 +228,35 @@ class PDFProcessor:
             Base64-encoded image string
         """
         try:
-            # Render page as image
-            mat = fitz.Matrix(dpi / 72, dpi / 72)  # scaling factor
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Convert to PIL Image
-            img_data = pix.tobytes("png")
-            img = Image.open(io.BytesIO(img_data))
-            
+            if self.max_image_dimension:
+                longest_side = max(page.rect.width, page.rect.height) / 72
+                dpi = min(dpi, self.max_image_dimension / longest_side)
+
+            for _ in range(4):
+                # Render page as image
+                mat = fitz.Matrix(dpi / 72, dpi / 72)  # scaling factor
+                pix = page.get_pixmap(matrix=mat)
+
+                # Convert to PIL Image
+                img_data = pix.tobytes("png")
+                img = Image.open(io.BytesIO(img_data))
+
+                buffer = io.BytesIO()
+                img.save(buffer, format='PNG')
+                size = buffer.tell()
+                if not self.max_image_bytes or size <= self.max_image_bytes:
+                    break
+                # PNG size grows roughly with the pixel count
+                dpi *= 0.9 * (self.max_image_bytes / size) ** 0.5
+                logger.debug("Rendered page is %d bytes; re-rendering at %.0f dpi", size, dpi)
+            else:
+                logger.warning(
+                    "Page image exceeds %d bytes even at %.0f dpi; sending text only",
+                    self.max_image_bytes, dpi
+                )
+                return None
+
             # Convert to base64
-            buffer = io.BytesIO()
-            img.save(buffer, format='PNG')
             img_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
             
             logger.debug("Rendered page as %dx%d image (%d bytes)", 
@@ -269,6 +310,52 @@ class PDFProcessor:
             logger.error("Failed to get PDF info: %s", e)
             return {'page_count': 0, 'has_images': False, 'total_images': 0}
 
+    def probe_slides(self, pdf_path: Path, dpi: int = 150) -> List[Dict[str, any]]:
+        """
+        Collect per-slide metrics without rendering any page.
+
+        Used for planning: reports the text, the visual-content signals used by
+        `extract_slide_content` and the size the page would be rendered at.
+
+        Args:
+            pdf_path: Path to the PDF file
+            dpi: Resolution pages would be rendered at
+
+        Returns:
+            List of dictionaries with slide_number, text, has_images,
+            image_count, width and height (pixels)
+
+        Raises:
+            PDFProcessingError: If the PDF cannot be opened
+        """
+        try:
+            doc = fitz.open(str(pdf_path))
+        except Exception as open_error:
+            raise PDFProcessingError(
+                f"Failed to open PDF {pdf_path}: {str(open_error)}"
+            ) from open_error
+
+        slides = []
+        try:
+            for page_num in range(doc.page_count):
+                page = doc[page_num]
+                scale = dpi / 72
+                if self.max_image_dimension:
+                    scale = min(scale, self.max_image_dimension / max(page.rect.width, page.rect.height))
+                visual_elements = len(page.get_images()) + len(page.get_drawings())
+                slides.append({
+                    'slide_number': page_num + 1,
+                    'text': self._clean_text(page.get_text()),
+                    'has_images': visual_elements > 0,
+                    'image_count': visual_elements,
+                    'width': int(page.rect.width * scale),
+                    'height': int(page.rect.height * scale),
+                })
+        finally:
+            doc.close()
+
+        return slides
+
     def process_multiple_pdfs(self, pdf_paths: List[Path]) -> Dict[str, Dict[int, str]]:
         """
         Process multiple PDF files and extract text from all pages.
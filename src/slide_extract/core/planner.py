@@ -0,0 +1,335 @@
+"""Pre-flight estimation of tokens, requests, wall-clock time and cost for a run."""
+
+import json
+import logging
+import math
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+try:
+    from .model_registry import get_model_capabilities
+    from .model_router import DEFAULT_ROUTE, RoutingError, RoutingRule
+    from .pdf_processor import PDFProcessor, SlideContent
+    from .slide_packer import SlidePacker, estimate_text_tokens
+except ImportError:
+    from model_registry import get_model_capabilities
+    from model_router import DEFAULT_ROUTE, RoutingError, RoutingRule
+    from pdf_processor import PDFProcessor, SlideContent
+    from slide_packer import SlidePacker, estimate_text_tokens
+
+logger = logging.getLogger(__name__)
+
+# Approximate list prices in USD per million tokens (input, output); override in planning.pricing
+DEFAULT_PRICING = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "claude-3-5-sonnet-20241022": (3.00, 15.00),
+    "claude-3-opus-20240229": (15.00, 75.00),
+    "claude-3-haiku-20240307": (0.25, 1.25),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-1.5-pro": (1.25, 5.00),
+    "gemini-1.5-flash": (0.075, 0.30),
+}
+
+# Tokens added by the per-slide message template around the slide text
+MESSAGE_OVERHEAD_TOKENS = 60
+
+
+class PlanningError(Exception):
+    """Custom exception for run planning errors."""
+
+
+def estimate_image_tokens(provider: str, width: int, height: int) -> int:
+    """
+    Estimate the input tokens a provider charges for one image.
+
+    Args:
+        provider: LLM provider name
+        width: Image width in pixels
+        height: Image height in pixels
+
+    Returns:
+        Estimated image tokens
+    """
+    if width <= 0 or height <= 0:
+        return 0
+
+    if provider == "anthropic":
+        # Images are downscaled to a 1568px long edge; tokens ~= width * height / 750
+        scale = min(1.0, 1568 / max(width, height))
+        return math.ceil(width * scale * height * scale / 750)
+
+    if provider == "google":
+        # 258 tokens for small images, otherwise 258 per 768x768 tile
+        if width <= 384 and height <= 384:
+            return 258
+        return 258 * math.ceil(width / 768) * math.ceil(height / 768)
+
+    # OpenAI (and OpenAI-format providers): fit within 2048x2048, shortest side
+    # to 768px, then 170 tokens per 512px tile plus 85 base tokens
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+@dataclass
+class DeckEstimate:
+    """Projected requests, tokens, time and cost for one deck (or a whole run)."""
+
+    name: str
+    slides: int = 0
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    request_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    cost_usd: Optional[float] = 0.0
+    models: Dict[str, int] = field(default_factory=dict)
+
+
+class RunPlanner:
+    """Estimates a run from page metadata without rendering slides or calling a provider."""
+
+    def __init__(
+        self,
+        llm_settings: Dict[str, Any],
+        planning_config: Dict[str, Any],
+        slide_packer: Optional[SlidePacker] = None,
+        pdf_processor: Optional[PDFProcessor] = None,
+    ):
+        """
+        Initialize the run planner.
+
+        Args:
+            llm_settings: LLM configuration (API keys are not needed)
+            planning_config: Throughput, rate-limit and pricing assumptions
+            slide_packer: Packer used for the run, if packing is enabled
+            pdf_processor: PDF processor used to probe decks
+        """
+        self.llm_settings = llm_settings
+        self.config = planning_config
+        self.slide_packer = slide_packer
+        self.pdf_processor = pdf_processor or PDFProcessor()
+
+        # Unset rate limits default to the registered limits of the configured model
+        defaults = get_model_capabilities(llm_settings["provider"], llm_settings["model"])
+        self.requests_per_minute = planning_config.get("requests_per_minute") or defaults.requests_per_minute
+        self.input_tokens_per_minute = (
+            planning_config.get("input_tokens_per_minute") or defaults.tokens_per_minute
+        )
+
+        self.pricing = {model: tuple(prices) for model, prices in DEFAULT_PRICING.items()}
+        for model, prices in (planning_config.get("pricing") or {}).items():
+            self.pricing[model] = (prices["input"], prices["output"])
+        # Models already reported as unpriced, so each is warned about once per run
+        self._unpriced_models: Set[str] = set()
+
+        self.routes = {DEFAULT_ROUTE: llm_settings}
+        self.rules: List[RoutingRule] = []
+        routing = llm_settings.get("routing") or {}
+        if routing.get("enabled"):
+            for name, entry in (routing.get("routes") or {}).items():
+                self.routes[name] = {**llm_settings, **(entry or {})}
+            try:
+                for rule_config in routing.get("rules") or []:
+                    rule_config = dict(rule_config)
+                    self.rules.append(RoutingRule(rule_config.pop("route", DEFAULT_ROUTE), **rule_config))
+            except RoutingError as e:
+                raise PlanningError(str(e)) from e
+
+    def _route_settings(self, slide: SlideContent) -> Dict[str, Any]:
+        """LLM settings of the route a slide would be sent to."""
+        for rule in self.rules:
+            if rule.matches(slide):
+                return self.routes.get(rule.route, self.llm_settings)
+        return self.llm_settings
+
+    def _output_tokens(self, settings: Dict[str, Any], slides: int) -> int:
+        per_slide = min(self.config["output_tokens_per_slide"], settings.get("max_tokens", 4000))
+        return per_slide * slides
+
+    def plan_deck(self, pdf_path: Path, prompt: str) -> DeckEstimate:
+        """
+        Estimate one deck.
+
+        Args:
+            pdf_path: Path to the PDF deck
+            prompt: Generation prompt sent with every request
+
+        Returns:
+            DeckEstimate for the deck
+        """
+        probes = self.pdf_processor.probe_slides(pdf_path)
+        estimate = DeckEstimate(name=pdf_path.name, slides=len(probes))
+        prompt_tokens = estimate_text_tokens(prompt)
+        context_tokens = estimate_text_tokens("x" * self.config["context_chars"])
+
+        slides = {}
+        image_tokens = {}
+        for probe in probes:
+            slide = SlideContent(
+                slide_number=probe["slide_number"],
+                text=probe["text"],
+                image_base64=None,
+                has_images=probe["has_images"],
+                image_count=probe["image_count"],
+            )
+            settings = self._route_settings(slide)
+            capabilities = get_model_capabilities(settings["provider"], settings["model"])
+            image_tokens[slide.slide_number] = 0
+            if capabilities.vision:
+                # Every slide is rendered and attached as an image, fitted to the model's limit
+                width, height = probe["width"], probe["height"]
+                if capabilities.max_image_dimension:
+                    scale = min(1.0, capabilities.max_image_dimension / max(width, height, 1))
+                    width, height = int(width * scale), int(height * scale)
+                image_tokens[slide.slide_number] = estimate_image_tokens(
+                    settings["provider"], width, height
+                )
+                slide = slide._replace(image_base64="<rendered>")
+            slides[slide.slide_number] = slide
+
+        slide_num = 1
+        while slide_num in slides:
+            settings = self._route_settings(slides[slide_num])
+            group = [slides[slide_num]]
+            if self.slide_packer:
+                group = self.slide_packer.plan_group(
+                    slides, slide_num, prompt,
+                    max_output_tokens=settings.get("max_tokens"),
+                    group_key=lambda slide: id(self._route_settings(slide)),
+                    capabilities=get_model_capabilities(settings["provider"], settings["model"])
+                )
+
+            input_tokens = prompt_tokens + MESSAGE_OVERHEAD_TOKENS * len(group)
+            input_tokens += context_tokens if slide_num > 1 else 0
+            for slide in group:
+                input_tokens += estimate_text_tokens(slide.text) + image_tokens[slide.slide_number]
+            output_tokens = self._output_tokens(settings, len(group))
+
+            model = settings["model"]
+            label = f"{settings['provider']}/{model}"
+            estimate.requests += 1
+            estimate.input_tokens += input_tokens
+            estimate.output_tokens += output_tokens
+            estimate.request_seconds += (
+                self.config["base_latency"] + output_tokens / self.config["output_tokens_per_second"]
+            )
+            estimate.models[label] = estimate.models.get(label, 0) + len(group)
+
+            prices = self.pricing.get(model)
+            if prices is None or estimate.cost_usd is None:
+                if prices is None and model not in self._unpriced_models:
+                    self._unpriced_models.add(model)
+                    logger.warning("No pricing for model %s; cost is not estimated", model)
+                estimate.cost_usd = None
+            else:
+                estimate.cost_usd += (input_tokens * prices[0] + output_tokens * prices[1]) / 1_000_000
+
+            slide_num = group[-1].slide_number + 1
+
+        estimate.wall_seconds = self._wall_seconds(estimate)
+        return estimate
+
+    def _wall_seconds(self, estimate: DeckEstimate) -> float:
+        """Wall-clock time under the configured concurrency and rate limits."""
+        seconds = estimate.request_seconds / max(1, self.config["concurrency"])
+        rpm = self.requests_per_minute
+        if rpm:
+            seconds = max(seconds, estimate.requests / rpm * 60)
+        tpm = self.input_tokens_per_minute
+        if tpm:
+            seconds = max(seconds, estimate.input_tokens / tpm * 60)
+        return seconds
+
+    def plan(self, pdf_paths: List[Path], prompt: str) -> Dict[str, Any]:
+        """
+        Estimate every deck and the whole run.
+
+        Args:
+            pdf_paths: PDF decks to process, in order
+            prompt: Generation prompt
+
+        Returns:
+            Dictionary with per-deck estimates, the total and the assumptions used
+        """
+        decks = [self.plan_deck(pdf_path, prompt) for pdf_path in pdf_paths]
+
+        total = DeckEstimate(name="TOTAL")
+        for deck in decks:
+            total.slides += deck.slides
+            total.requests += deck.requests
+            total.input_tokens += deck.input_tokens
+            total.output_tokens += deck.output_tokens
+            total.request_seconds += deck.request_seconds
+            if deck.cost_usd is None or total.cost_usd is None:
+                total.cost_usd = None
+            else:
+                total.cost_usd += deck.cost_usd
+            for label, count in deck.models.items():
+                total.models[label] = total.models.get(label, 0) + count
+        total.wall_seconds = self._wall_seconds(total)
+
+        return {
+            "decks": [asdict(deck) for deck in decks],
+            "total": asdict(total),
+            "assumptions": {
+                **{key: self.config[key] for key in (
+                    "concurrency", "base_latency", "output_tokens_per_second", "output_tokens_per_slide",
+                )},
+                "requests_per_minute": self.requests_per_minute,
+                "input_tokens_per_minute": self.input_tokens_per_minute,
+            },
+        }
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def format_plan_table(plan: Dict[str, Any]) -> str:
+    """
+    Format a run plan as a plain-text table.
+
+    Args:
+        plan: Result of RunPlanner.plan
+
+    Returns:
+        Table with one row per deck and a total row
+    """
+    header = ("Deck", "Slides", "Requests", "Input tok", "Output tok", "Time", "Cost (USD)")
+    rows = []
+    for deck in plan["decks"] + [plan["total"]]:
+        cost = "n/a" if deck["cost_usd"] is None else f"{deck['cost_usd']:.2f}"
+        rows.append((
+            deck["name"], str(deck["slides"]), str(deck["requests"]),
+            f"{deck['input_tokens']:,}", f"{deck['output_tokens']:,}",
+            _format_duration(deck["wall_seconds"]), cost,
+        ))
+
+    widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header))]
+
+    def line(row):
+        cells = [row[0].ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+        return "  ".join(cells)
+
+    separator = "  ".join("-" * width for width in widths)
+    lines = [line(header), separator] + [line(row) for row in rows[:-1]] + [separator, line(rows[-1])]
+
+    models = ", ".join(f"{label}: {count}" for label, count in plan["total"]["models"].items())
+    lines.append("")
+    lines.append(f"Slides by model: {models or 'none'}")
+    return "\n".join(lines)
+
+
+def write_plan_json(plan: Dict[str, Any], path: Path) -> None:
+    """Write a run plan as JSON."""
+    path.write_text(json.dumps(plan, indent=2), encoding="utf-8")
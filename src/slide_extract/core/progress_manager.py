@@ -3,9 +3,10 @@
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, TextIO
 import json
 import logging
+import time
 
 @dataclass
 class SlideProgress:
@@ -35,11 +36,20 @@ class ProcessingState:
 class ProgressManager:
     """Manages processing progress with robust resume capability."""
     
+    # Seconds between flushes of streamed text to the partial output file
+    PARTIAL_FLUSH_INTERVAL = 1.0
+    
     def __init__(self, output_path: Optional[Path], mode: str, file_path: Path):
         self.mode = mode
         self.file_path = file_path
         self.output_path = output_path
         self.state_file = self._get_state_file_path()
+        self.partial_file = self.state_file.with_name(
+            self.state_file.name.replace(".slide_extract_progress_", ".slide_extract_partial_")
+        ).with_suffix(".md")
+        self._partial_slide: Optional[int] = None
+        self._partial_handle: Optional[TextIO] = None
+        self._partial_flushed = 0.0
         self.logger = logging.getLogger(__name__)
         
     def _get_state_file_path(self) -> Path:
@@ -166,8 +176,51 @@ class ProgressManager:
         if self.output_path and self.mode == 'single':
             self._append_to_output(content)
         
+        self.clear_partial_output()
+        
         self.logger.debug(f"Checkpointed slide {slide_num} ({len(content)} chars)")
     
+    def record_partial_output(self, slide_num: int, text: str) -> None:
+        """
+        Append streamed text for the slide currently being generated.
+        
+        The file stays open while the slide streams and is flushed at most
+        once per PARTIAL_FLUSH_INTERVAL rather than reopened for every chunk.
+        """
+        try:
+            if self._partial_slide != slide_num or self._partial_handle is None:
+                self._close_partial_output()
+                self._partial_slide = slide_num
+                self._partial_handle = open(self.partial_file, 'w', encoding='utf-8')
+                self._partial_handle.write(f"<!-- Streaming slide {slide_num} -->\n")
+                self._partial_flushed = 0.0
+            self._partial_handle.write(text)
+            now = time.monotonic()
+            if now - self._partial_flushed >= self.PARTIAL_FLUSH_INTERVAL:
+                self._partial_handle.flush()
+                self._partial_flushed = now
+        except OSError as e:
+            self.logger.debug(f"Failed to write partial output: {e}")
+    
+    def _close_partial_output(self) -> None:
+        """Close the partial output file of the current slide, if open."""
+        handle, self._partial_handle = self._partial_handle, None
+        if handle is not None:
+            try:
+                handle.close()
+            except OSError as e:
+                self.logger.debug(f"Failed to close partial output: {e}")
+    
+    def clear_partial_output(self) -> None:
+        """Remove streamed text once the slide is checkpointed."""
+        self._close_partial_output()
+        self._partial_slide = None
+        try:
+            if self.partial_file.exists():
+                self.partial_file.unlink()
+        except OSError as e:
+            self.logger.debug(f"Failed to remove partial output: {e}")
+    
     def _validate_slide_content(self, content: str) -> bool:
         """Validate slide content completeness and structure."""
         required_sections = [
@@ -277,6 +330,7 @@ class ProgressManager:
     
     def cleanup_state(self) -> None:
         """Remove state file after successful completion."""
+        self.clear_partial_output()
         try:
             if self.state_file.exists():
                 self.state_file.unlink()
@@ -0,0 +1,171 @@
+"""Notes for several prompts from a single extraction and rendering of each deck."""
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .concurrency import run_concurrently
+    from .model_router import ModelRouter
+    from .note_generator import NoteGenerator
+    from .pdf_processor import SlideContent
+    from .progress_manager import ProgressManager
+except ImportError:
+    from concurrency import run_concurrently
+    from model_router import ModelRouter
+    from note_generator import NoteGenerator
+    from pdf_processor import SlideContent
+    from progress_manager import ProgressManager
+
+logger = logging.getLogger(__name__)
+
+
+class PromptFanOutError(Exception):
+    """Custom exception for multi-prompt run errors."""
+
+
+@dataclass
+class PromptJob:
+    """One prompt of a run, the generator that applies it and where its notes go."""
+
+    prompt_path: Path
+    prompt: str
+    output_path: Optional[Path]
+    note_generator: NoteGenerator
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        """Prompt file name, for logging."""
+        return self.prompt_path.name
+
+
+def pair_prompts_with_outputs(
+    prompt_paths: Sequence[Path], output_paths: Optional[Sequence[Path]]
+) -> List[Tuple[Path, Optional[Path]]]:
+    """
+    Pair each prompt file with its output file.
+
+    Args:
+        prompt_paths: Prompt files, in command-line order
+        output_paths: Output files in the same order, or None for stdout
+
+    Returns:
+        List of (prompt path, output path or None)
+
+    Raises:
+        PromptFanOutError: If a prompt is repeated or several prompts do not
+            have one distinct output each
+    """
+    if len({path.resolve() for path in prompt_paths}) != len(prompt_paths):
+        raise PromptFanOutError("Each prompt file may be given only once")
+    outputs = list(output_paths or [])
+    if len(prompt_paths) == 1 and len(outputs) <= 1:
+        return [(prompt_paths[0], outputs[0] if outputs else None)]
+    if len(outputs) != len(prompt_paths):
+        raise PromptFanOutError(
+            f"{len(prompt_paths)} prompts need {len(prompt_paths)} output paths (got {len(outputs)})"
+        )
+    if len({path.resolve() for path in outputs}) != len(outputs):
+        raise PromptFanOutError("Each prompt needs its own output path")
+    return list(zip(prompt_paths, outputs))
+
+
+def fan_out_workers(llm_client, prompt_count: int) -> int:
+    """
+    Get the number of prompts processed at once.
+
+    Prompts share the client, so they run concurrently only up to its
+    ``max_concurrency``; endpoint request slots still bound the requests in
+    flight across all prompts and their slides. The model that answered is
+    recorded per thread, so each prompt labels its own slides. Per-slide
+    model routing keeps the selected route on the shared client, so routed
+    runs take one prompt at a time.
+
+    Args:
+        llm_client: Shared LLM client (None in no-AI mode)
+        prompt_count: Number of prompts
+
+    Returns:
+        Number of prompts to run concurrently
+    """
+    if llm_client is None or isinstance(llm_client, ModelRouter):
+        return 1
+    concurrency = getattr(llm_client, "max_concurrency", 1)
+    return max(1, min(prompt_count, concurrency if isinstance(concurrency, int) else 1))
+
+
+def generate_deck_for_prompts(
+    jobs: Sequence[PromptJob], slide_contents: Dict[int, SlideContent], pdf_path: Path,
+    resume: bool = False, clean_start: bool = False, workers: int = 1
+) -> Dict[Path, str]:
+    """
+    Generate one deck's notes for every prompt from a single extraction.
+
+    Each prompt keeps its own progress file (next to its output), so it
+    resumes independently of the others.
+
+    Args:
+        jobs: Prompts to apply
+        slide_contents: Extracted slides, shared by all prompts
+        pdf_path: Source deck
+        resume: Whether resuming was requested
+        clean_start: Whether to discard existing progress
+        workers: Prompts processed at once (see fan_out_workers)
+
+    Returns:
+        Notes per prompt path
+
+    Raises:
+        NoteGenerationError: If a prompt fails; prompts that completed have
+            their progress cleaned up, the others keep it for --resume
+    """
+    progress_managers = {}
+    tasks = {}
+    for job in jobs:
+        progress_manager = ProgressManager(output_path=job.output_path, mode='single', file_path=pdf_path)
+        if clean_start:
+            progress_manager.cleanup_state()
+            logger.info("Starting %s fresh (clean start requested)", job.name)
+
+        start_slide = 1
+        if progress_manager.has_incomplete_work():
+            start_slide, _ = progress_manager.get_resume_point()
+            logger.info("Resuming %s from slide %d of %s", job.name, start_slide, pdf_path)
+        elif resume:
+            logger.info("No previous progress found for %s, starting from beginning", job.name)
+
+        progress_managers[job.prompt_path] = progress_manager
+        tasks[job.prompt_path] = (
+            lambda job=job, manager=progress_manager, start=start_slide:
+            job.note_generator.generate_notes_for_slide_contents_resumable(
+                slide_contents, job.prompt, manager, start_from_slide=start
+            )
+        )
+
+    if workers < 2 or len(tasks) < 2:
+        notes = {}
+        for prompt_path, task in tasks.items():
+            notes[prompt_path] = task()
+            progress_managers[prompt_path].cleanup_state()
+        return notes
+
+    logger.info("Generating notes for %d prompts, %d at a time", len(tasks), workers)
+    # Partial output of concurrent prompts would interleave on the shared client
+    for job in jobs:
+        job.note_generator.forward_partial_output = False
+    outcomes = run_concurrently(tasks, workers)
+
+    notes = {}
+    failure = None
+    for prompt_path, (result, error) in outcomes.items():
+        if error is not None:
+            logger.error("Prompt %s failed for %s: %s", prompt_path.name, pdf_path, error)
+            failure = failure or error
+            continue
+        progress_managers[prompt_path].cleanup_state()
+        notes[prompt_path] = result
+    if failure is not None:
+        raise failure
+    return notes
@@ -0,0 +1,313 @@
+"""Content-addressed cache for LLM responses with size and age based eviction."""
+
+import base64
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# read:  serve hits from the cache and store fresh responses
+# write: always call the provider and overwrite cached entries (refresh)
+# off:   bypass the cache entirely
+CACHE_MODES = ("read", "write", "off")
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "slide-extract" / "responses.sqlite3"
+
+
+class ResponseCacheError(Exception):
+    """Custom exception for response cache errors."""
+
+
+def compute_cache_key(
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    prompt: str,
+    image_base64: Optional[Union[str, List[str]]] = None,
+) -> str:
+    """
+    Compute a content-addressed key for an LLM request.
+
+    Args:
+        provider: LLM provider name
+        model: Model identifier
+        temperature: Sampling temperature
+        max_tokens: Maximum output tokens
+        prompt: Fully rendered prompt sent to the model
+        image_base64: Base64-encoded slide image(s), if sent
+
+    Returns:
+        Hex-encoded SHA-256 digest identifying the request
+    """
+    hash_obj = hashlib.sha256()
+    for part in (provider, model, repr(float(temperature)), str(int(max_tokens))):
+        hash_obj.update(str(part).encode("utf-8"))
+        hash_obj.update(b"\x00")
+
+    hash_obj.update(prompt.encode("utf-8"))
+    hash_obj.update(b"\x00")
+
+    images = image_base64 if isinstance(image_base64, list) else [image_base64]
+    for image in images:
+        if not image:
+            continue
+        # Hash the decoded bytes so equivalent encodings share an entry
+        try:
+            hash_obj.update(base64.b64decode(image))
+        except (ValueError, TypeError):
+            hash_obj.update(image.encode("utf-8"))
+        hash_obj.update(b"\x00")
+
+    return hash_obj.hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed cache of LLM responses keyed by request content."""
+
+    # Run eviction after this many writes
+    EVICTION_INTERVAL = 50
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        mode: str = "read",
+        max_size_mb: float = 500,
+        max_age_days: float = 30,
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_path: Path to the SQLite database file
+            mode: One of 'read', 'write' or 'off'
+            max_size_mb: Maximum total size of cached responses in megabytes
+            max_age_days: Maximum age of cached responses in days (0 disables)
+
+        Raises:
+            ResponseCacheError: If the mode is invalid or the database cannot be opened
+        """
+        if mode not in CACHE_MODES:
+            raise ResponseCacheError(
+                f"Invalid cache mode '{mode}', expected one of {', '.join(CACHE_MODES)}"
+            )
+
+        self.mode = mode
+        self.cache_path = Path(cache_path).expanduser() if cache_path else DEFAULT_CACHE_PATH
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age_seconds = max_age_days * 86400
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if self.mode != "off":
+            self._open()
+            self.evict()
+
+    def _open(self) -> None:
+        """Open the database and create the schema if needed."""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    provider TEXT,
+                    model TEXT,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+            logger.info("Opened response cache at %s (mode: %s)", self.cache_path, self.mode)
+        except sqlite3.Error as e:
+            raise ResponseCacheError(
+                f"Failed to open response cache {self.cache_path}: {e}"
+            ) from e
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache is active."""
+        return self.mode != "off" and self._conn is not None
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from compute_cache_key
+
+        Returns:
+            Cached response text, or None on a miss or when reads are disabled
+        """
+        if not self.enabled or self.mode != "read":
+            return None
+
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row and self.max_age_seconds and now - row[1] > self.max_age_seconds:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self.stats["evictions"] += 1
+                    row = None
+
+                if row is None:
+                    self.stats["misses"] += 1
+                    return None
+
+                self._conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+                self.stats["hits"] += 1
+                return row[0]
+
+            except sqlite3.Error as e:
+                logger.warning("Response cache lookup failed: %s", e)
+                self.stats["misses"] += 1
+                return None
+
+    def put(self, key: str, response: str, provider: str = "", model: str = "") -> None:
+        """
+        Store a response in the cache.
+
+        Args:
+            key: Cache key from compute_cache_key
+            response: Response text to store
+            provider: LLM provider name (informational)
+            model: Model identifier (informational)
+        """
+        if not self.enabled:
+            return
+
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, response, provider, model, size, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, response, provider, model, len(response.encode("utf-8")), now, now),
+                )
+                self._conn.commit()
+                self.stats["writes"] += 1
+                self._writes_since_eviction += 1
+            except sqlite3.Error as e:
+                logger.warning("Response cache write failed: %s", e)
+                return
+
+        if self._writes_since_eviction >= self.EVICTION_INTERVAL:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove expired entries and trim the cache to its size limit.
+
+        Least recently used entries are removed first when over the size limit.
+
+        Returns:
+            Number of entries removed
+        """
+        if not self.enabled:
+            return 0
+
+        removed = 0
+        with self._lock:
+            self._writes_since_eviction = 0
+            try:
+                if self.max_age_seconds:
+                    cursor = self._conn.execute(
+                        "DELETE FROM responses WHERE created_at < ?",
+                        (time.time() - self.max_age_seconds,),
+                    )
+                    removed += cursor.rowcount
+
+                total_size = self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()[0]
+
+                if total_size > self.max_size_bytes:
+                    rows = self._conn.execute(
+                        "SELECT key, size FROM responses ORDER BY last_access ASC"
+                    ).fetchall()
+                    stale_keys = []
+                    for key, size in rows:
+                        if total_size <= self.max_size_bytes:
+                            break
+                        stale_keys.append((key,))
+                        total_size -= size
+                    self._conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+                    removed += len(stale_keys)
+
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("Response cache eviction failed: %s", e)
+                return 0
+
+        if removed:
+            self.stats["evictions"] += removed
+            logger.info("Evicted %d entries from response cache", removed)
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache usage statistics.
+
+        Returns:
+            Dictionary with hit/miss counts and hit rate
+        """
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "mode": self.mode,
+            "hits": self.stats["hits"],
+            "misses": self.stats["misses"],
+            "lookups": lookups,
+            "writes": self.stats["writes"],
+            "evictions": self.stats["evictions"],
+            "hit_rate": (self.stats["hits"] / lookups) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_response_cache(cache_config: Dict[str, Any]) -> Optional[ResponseCache]:
+    """
+    Factory function to create a response cache from configuration.
+
+    Args:
+        cache_config: Cache configuration dictionary
+
+    Returns:
+        Configured ResponseCache, or None when caching is off
+    """
+    mode = cache_config.get("mode", "off")
+    if mode == "off":
+        return None
+
+    return ResponseCache(
+        cache_path=Path(cache_config["path"]) if cache_config.get("path") else None,
+        mode=mode,
+        max_size_mb=cache_config.get("max_size_mb", 500),
+        max_age_days=cache_config.get("max_age_days", 30),
+    )
@@ -0,0 +1,299 @@
+"""Retry policy for LLM requests with typed error classification and jittered backoff."""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+try:
+    from .llm_client import LLMError
+    from .streaming import StreamTimeoutError
+except ImportError:
+    from llm_client import LLMError
+    from streaming import StreamTimeoutError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Error classes the policy distinguishes
+RATE_LIMIT = "rate_limit"      # HTTP 429 / quota exhausted
+SERVER_ERROR = "server_error"  # HTTP 5xx (other than gateway timeouts)
+CONNECTION = "connection"      # Connection refused/reset, DNS, TLS
+DEADLINE = "deadline"          # Read/stream timeouts, HTTP 504, deadline exceeded
+FATAL = "fatal"                # Everything else (auth, bad request, validation)
+
+RETRYABLE_KINDS = (RATE_LIMIT, SERVER_ERROR, CONNECTION, DEADLINE)
+
+
+def _sdk_error_types() -> Dict[str, Tuple[type, ...]]:
+    """Collect the exception types of whichever provider SDKs are installed."""
+    types: Dict[str, Tuple[type, ...]] = {DEADLINE: (StreamTimeoutError, TimeoutError), CONNECTION: (ConnectionError,)}
+
+    def add(kind: str, *extra: type) -> None:
+        types[kind] = types.get(kind, ()) + extra
+
+    try:
+        import httpx
+
+        add(DEADLINE, httpx.TimeoutException)
+        add(CONNECTION, httpx.TransportError)
+    except ImportError:
+        pass
+
+    for module_name in ("openai", "anthropic"):
+        try:
+            module = __import__(module_name)
+        except ImportError:
+            continue
+        # APITimeoutError subclasses APIConnectionError, so check deadlines first
+        add(DEADLINE, module.APITimeoutError)
+        add(CONNECTION, module.APIConnectionError)
+
+    try:
+        from google.api_core import exceptions as google_exceptions
+
+        add(RATE_LIMIT, google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests)
+        add(DEADLINE, google_exceptions.DeadlineExceeded, google_exceptions.GatewayTimeout)
+        add(SERVER_ERROR, google_exceptions.ServerError)
+    except ImportError:
+        pass
+
+    return types
+
+
+_ERROR_TYPES: Optional[Dict[str, Tuple[type, ...]]] = None
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """Return the HTTP status code carried by an SDK exception, if any."""
+    for name in ("status_code", "code"):
+        value = getattr(error, name, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return value
+    return None
+
+
+def parse_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Read a Retry-After hint from an SDK exception's HTTP response.
+
+    Args:
+        error: Exception raised by a provider SDK
+
+    Returns:
+        Seconds to wait, or None if the response carries no hint
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            return max(0.0, float(retry_after_ms) / 1000)
+
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+            return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def classify_error(error: BaseException) -> Tuple[str, Optional[float]]:
+    """
+    Classify an exception by type, following wrapped causes.
+
+    LLMError wraps the SDK exception as its cause, so the chain is walked
+    until a recognized provider or transport exception is found.
+
+    Args:
+        error: Exception raised by an LLM request
+
+    Returns:
+        Tuple of (error kind, Retry-After seconds or None)
+    """
+    global _ERROR_TYPES
+    if _ERROR_TYPES is None:
+        _ERROR_TYPES = _sdk_error_types()
+
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+
+        for kind in (DEADLINE, RATE_LIMIT, SERVER_ERROR, CONNECTION):
+            if isinstance(current, _ERROR_TYPES.get(kind, ())):
+                return kind, parse_retry_after(current)
+
+        status = _status_code(current)
+        if status is not None:
+            retry_after = parse_retry_after(current)
+            if status == 429:
+                return RATE_LIMIT, retry_after
+            if status in (408, 504):
+                return DEADLINE, retry_after
+            if status >= 500:
+                return SERVER_ERROR, retry_after
+            return FATAL, None
+
+        current = current.__cause__ or current.__context__
+
+    return FATAL, None
+
+
+class RetryPolicy:
+    """Retries LLM requests on transient errors within a per-slide deadline."""
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 2.0,
+        max_delay: float = 60.0,
+        slide_deadline: Optional[float] = 600.0,
+    ):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_retries: Retries after the first attempt
+            base_delay: Backoff ceiling for the first retry in seconds
+            max_delay: Upper bound for a single backoff in seconds
+            slide_deadline: Total seconds allowed for all attempts of one slide (None disables)
+        """
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.slide_deadline = slide_deadline
+
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Any] = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "deadline_exceeded": 0,
+            "retries_by_kind": {kind: 0 for kind in RETRYABLE_KINDS},
+        }
+
+    def start_deadline(self) -> Optional[float]:
+        """Return the monotonic time by which a slide started now must finish."""
+        if not self.slide_deadline:
+            return None
+        return time.monotonic() + self.slide_deadline
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the wait before the next attempt.
+
+        Uses full jitter over an exponentially growing ceiling; a provider
+        Retry-After hint is honored as a lower bound.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+            retry_after: Provider-requested wait in seconds
+
+        Returns:
+            Seconds to wait
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def call(
+        self, func: Callable[[], T], description: str = "LLM request",
+        deadline: Optional[float] = None,
+        on_retry: Optional[Callable[[str, float], None]] = None
+    ) -> T:
+        """
+        Run a request, retrying transient failures.
+
+        Args:
+            func: Callable performing the request
+            description: Request description for logging
+            deadline: Monotonic time after which no further attempt is started
+            on_retry: Called with the error kind and backoff before each retry
+
+        Returns:
+            The callable's result
+
+        Raises:
+            LLMError: If the request fails with a non-retryable error, retries are
+                exhausted or the deadline is reached
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except LLMError as e:
+                kind, retry_after = classify_error(e)
+
+                if kind not in RETRYABLE_KINDS or attempt >= self.max_retries:
+                    with self._lock:
+                        self.stats["failures"] += 1
+                    if kind in RETRYABLE_KINDS:
+                        logger.error(f"{description} failed after {attempt + 1} attempts ({kind}): {e}")
+                    raise
+
+                wait_time = self.backoff(attempt, retry_after)
+                if deadline is not None and time.monotonic() + wait_time >= deadline:
+                    with self._lock:
+                        self.stats["failures"] += 1
+                        self.stats["deadline_exceeded"] += 1
+                    raise LLMError(
+                        f"{description} exceeded its deadline after {attempt + 1} attempts: {e}"
+                    ) from e
+
+                with self._lock:
+                    self.stats["retries"] += 1
+                    self.stats["retries_by_kind"][kind] += 1
+
+                attempt += 1
+                logger.warning(
+                    f"{description} failed ({kind}, attempt {attempt}/{self.max_retries + 1}), "
+                    f"retrying in {wait_time:.1f}s: {e}"
+                )
+                if on_retry:
+                    on_retry(kind, wait_time)
+                time.sleep(wait_time)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get retry statistics.
+
+        Returns:
+            Dictionary with request, retry and failure counts
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["retries_by_kind"] = dict(self.stats["retries_by_kind"])
+        return stats
+
+
+def create_retry_policy(retry_config: Dict[str, Any]) -> RetryPolicy:
+    """
+    Factory function to create a retry policy from configuration.
+
+    Args:
+        retry_config: Retry configuration dictionary
+
+    Returns:
+        Configured RetryPolicy
+    """
+    return RetryPolicy(
+        max_retries=retry_config.get("max_retries", 3),
+        base_delay=retry_config.get("base_delay", 2.0),
+        max_delay=retry_config.get("max_delay", 60.0),
+        slide_deadline=retry_config.get("slide_deadline", 600.0),
+    )
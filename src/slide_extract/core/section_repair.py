@@ -0,0 +1,110 @@
+"""Detection of missing analysis sections and in-place merging of repaired ones."""
+
+import re
+from typing import List, Sequence, Tuple
+
+SLIDE_NUMBER = "**Slide Number:**"
+SLIDE_IMAGES = "**Slide Images/Diagrams:**"
+SLIDE_NARRATION = "**Slide Narration:**"
+
+# Sections every slide analysis must contain, in output order
+REQUIRED_SECTIONS = (
+    SLIDE_NUMBER,
+    "**Slide Text:**",
+    SLIDE_IMAGES,
+    "**Slide Topics:**",
+    SLIDE_NARRATION,
+)
+
+# Shortest narration accepted as complete
+MIN_NARRATION_CHARS = 200
+
+_SECTION_START = re.compile("|".join(re.escape(section) for section in REQUIRED_SECTIONS))
+_ORDER = {section: index for index, section in enumerate(REQUIRED_SECTIONS)}
+
+
+class SectionRepairError(Exception):
+    """Custom exception for section repair errors."""
+
+
+def find_incomplete_sections(content: str) -> List[str]:
+    """
+    Find the required sections an analysis lacks.
+
+    Args:
+        content: Slide analysis text
+
+    Returns:
+        Missing section headings in output order, plus the narration heading
+        if the narration is shorter than MIN_NARRATION_CHARS
+    """
+    incomplete = [section for section in REQUIRED_SECTIONS if section not in content]
+    if SLIDE_NARRATION not in incomplete:
+        narration = content[content.find(SLIDE_NARRATION):].split("---")[0]
+        if len(narration.strip()) < MIN_NARRATION_CHARS:
+            incomplete.append(SLIDE_NARRATION)
+    return incomplete
+
+
+def split_sections(content: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Split an analysis at its section headings.
+
+    Args:
+        content: Slide analysis text
+
+    Returns:
+        Tuple of the text before the first heading and a list of
+        (heading, section text including the heading) in order of appearance
+    """
+    matches = list(_SECTION_START.finditer(content))
+    if not matches:
+        return content, []
+
+    sections = []
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following else len(content)
+        sections.append((match.group(0), content[match.start():end].strip()))
+    return content[:matches[0].start()], sections
+
+
+def merge_sections(analysis: str, repair: str, sections: Sequence[str]) -> str:
+    """
+    Merge repaired sections into an analysis.
+
+    Incomplete sections are replaced where they stand; missing ones are
+    inserted after the closest preceding required section.
+
+    Args:
+        analysis: Analysis with missing or incomplete sections
+        repair: Response to the repair request
+        sections: Headings that were requested
+
+    Returns:
+        Analysis with the repaired sections in place
+
+    Raises:
+        SectionRepairError: If the response contains none of the requested sections
+    """
+    _, repaired_sections = split_sections(repair)
+    repaired = {}
+    for heading, text in repaired_sections:
+        if heading in sections:
+            repaired.setdefault(heading, text)
+    if not repaired:
+        raise SectionRepairError(f"Repair response contains none of the sections {list(sections)}")
+
+    prefix, merged = split_sections(analysis)
+    for heading, text in repaired.items():
+        existing = next((index for index, (name, _) in enumerate(merged) if name == heading), None)
+        if existing is not None:
+            merged[existing] = (heading, text)
+        else:
+            position = max(
+                (index + 1 for index, (name, _) in enumerate(merged) if _ORDER[name] < _ORDER[heading]),
+                default=0,
+            )
+            merged.insert(position, (heading, text))
+
+    body = "\n\n".join(text for _, text in merged)
+    return f"{prefix.rstrip()}\n\n{body}" if prefix.strip() else body
@@ -0,0 +1,208 @@
+"""Stateful provider sessions that carry earlier slides as conversation history."""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+try:
+    from .slide_packer import estimate_text_tokens
+except ImportError:
+    from slide_packer import estimate_text_tokens
+
+logger = logging.getLogger(__name__)
+
+TRUNCATE = "truncate"
+SUMMARIZE = "summarize"
+STRATEGIES = (TRUNCATE, SUMMARIZE)
+
+SUMMARY_HEADING = "## Earlier Slides Summary"
+
+
+class SessionError(Exception):
+    """Custom exception for conversation session errors."""
+
+
+@dataclass
+class SessionTurn:
+    """One request of a session and the response it produced."""
+    label: str
+    user_message: str
+    response: str
+
+    @property
+    def tokens(self) -> int:
+        """Estimated tokens the turn adds to every later request."""
+        return estimate_text_tokens(self.user_message) + estimate_text_tokens(self.response)
+
+
+class ConversationSession:
+    """
+    Processes a deck as one conversation with the provider.
+
+    Each request carries only the new slide; earlier slides travel as chat
+    history after the static instructions. History is compacted in steps
+    rather than sliding by one turn, so the conversation prefix stays
+    byte-identical between compactions and providers serve it from their
+    prompt cache. Dropped turns are either discarded or folded into a short
+    summary at the start of the history.
+    """
+
+    def __init__(
+        self,
+        max_turns: int = 6,
+        keep_turns: int = 2,
+        max_history_tokens: Optional[int] = 12000,
+        strategy: str = SUMMARIZE,
+        max_summary_chars: int = 2000,
+    ):
+        """
+        Initialize the session.
+
+        Args:
+            max_turns: Turns kept before the history is compacted
+            keep_turns: Most recent turns kept verbatim after compaction
+            max_history_tokens: Estimated history size that also triggers compaction
+            strategy: "summarize" to fold dropped turns into a summary, or
+                "truncate" to discard them
+            max_summary_chars: Upper bound on the summary length; the oldest
+                entries are dropped first
+
+        Raises:
+            SessionError: If the limits or strategy are invalid
+        """
+        if strategy not in STRATEGIES:
+            raise SessionError(
+                f"Unknown session strategy '{strategy}' (expected {', '.join(STRATEGIES)})"
+            )
+        if keep_turns < 1 or max_turns < keep_turns:
+            raise SessionError("Session limits need 1 <= keep_turns <= max_turns")
+
+        self.max_turns = max_turns
+        self.keep_turns = keep_turns
+        self.max_history_tokens = max_history_tokens
+        self.strategy = strategy
+        self.max_summary_chars = max_summary_chars
+        self.turns: List[SessionTurn] = []
+        self.summary: List[str] = []
+        self.stats = {"turns": 0, "compactions": 0, "dropped_turns": 0}
+
+    def reset(self) -> None:
+        """Start a new conversation, e.g. for the next deck."""
+        self.turns = []
+        self.summary = []
+
+    def add(self, label: str, user_message: str, response: str) -> None:
+        """
+        Append a completed request to the history.
+
+        Args:
+            label: Request description, e.g. "slide 3"
+            user_message: Message sent after the instructions (without images)
+            response: Response text
+        """
+        self.turns.append(SessionTurn(label, user_message, response))
+        self.stats["turns"] += 1
+        if len(self.turns) > self.max_turns or (
+            self.max_history_tokens and self.history_tokens() > self.max_history_tokens
+        ):
+            self._compact()
+
+    def revise_last(self, response: str) -> None:
+        """
+        Replace the response of the latest turn.
+
+        Used when the caller kept a different analysis than the provider
+        returned (a reformatted retry or placeholder notes).
+
+        Args:
+            response: Text to keep in the history instead
+        """
+        if self.turns:
+            self.turns[-1].response = response
+
+    def _compact(self) -> None:
+        """Drop the oldest turns down to keep_turns, summarizing them if configured."""
+        dropped = self.turns[:-self.keep_turns]
+        self.turns = self.turns[-self.keep_turns:]
+        if self.strategy == SUMMARIZE:
+            self.summary.extend(self._summarize(turn) for turn in dropped)
+            while len(self.summary) > 1 and len("\n".join(self.summary)) > self.max_summary_chars:
+                self.summary.pop(0)
+        self.stats["compactions"] += 1
+        self.stats["dropped_turns"] += len(dropped)
+        logger.info(
+            "Compacted session history: %s %d turns, keeping %d (~%d tokens)",
+            "summarized" if self.strategy == SUMMARIZE else "dropped",
+            len(dropped), len(self.turns), self.history_tokens()
+        )
+
+    @staticmethod
+    def _summarize(turn: SessionTurn) -> str:
+        """Summarize one turn from the first lines of its response."""
+        lines = [line.strip() for line in turn.response.split("\n") if line.strip()][:5]
+        return f"{turn.label[:1].upper()}{turn.label[1:]}: {' '.join(lines)[:300]}"
+
+    def history_tokens(self) -> int:
+        """Estimated tokens of the history sent with the next request."""
+        summary_tokens = estimate_text_tokens("\n".join(self.summary))
+        return summary_tokens + sum(turn.tokens for turn in self.turns)
+
+    def messages(self) -> List[Dict[str, str]]:
+        """
+        Get the history as alternating user/assistant chat messages.
+
+        The summary of compacted turns is prepended to the first kept turn so
+        the roles still alternate.
+
+        Returns:
+            List of {"role", "content"} messages, oldest first
+        """
+        messages = []
+        for index, turn in enumerate(self.turns):
+            content = turn.user_message
+            if index == 0 and self.summary:
+                content = f"{SUMMARY_HEADING}\n\n" + "\n".join(self.summary) + f"\n\n---\n{content}"
+            messages.append({"role": "user", "content": content})
+            messages.append({"role": "assistant", "content": turn.response})
+        return messages
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get session statistics.
+
+        Returns:
+            Dictionary with turn and compaction counts and the current history size
+        """
+        return {**self.stats, "history_tokens": self.history_tokens()}
+
+
+def history_text(history: Optional[List[Dict[str, str]]]) -> str:
+    """Flatten chat history into text for cache keys and single-prompt providers."""
+    return "\n\n".join(
+        f"[{message['role']}]\n{message['content']}" for message in history or []
+    )
+
+
+def create_conversation_session(session_config: Dict[str, Any]) -> Optional[ConversationSession]:
+    """
+    Factory function to create a conversation session from configuration.
+
+    Args:
+        session_config: Session configuration dictionary
+
+    Returns:
+        Configured ConversationSession, or None when sessions are disabled
+
+    Raises:
+        SessionError: If the configuration is invalid
+    """
+    if not session_config.get("enabled"):
+        return None
+
+    return ConversationSession(
+        max_turns=session_config.get("max_turns", 6),
+        keep_turns=session_config.get("keep_turns", 2),
+        max_history_tokens=session_config.get("max_history_tokens", 12000),
+        strategy=session_config.get("strategy", SUMMARIZE),
+        max_summary_chars=session_config.get("max_summary_chars", 2000),
+    )
@@ -0,0 +1,230 @@
+"""Packing of consecutive slides into a single LLM request."""
+
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from .model_registry import ModelCapabilities
+    from .pdf_processor import SlideContent
+except ImportError:
+    from model_registry import ModelCapabilities
+    from pdf_processor import SlideContent
+
+logger = logging.getLogger(__name__)
+
+SECTION_START = "<<<SLIDE {number}>>>"
+SECTION_END = "<<<END SLIDE {number}>>>"
+
+_SECTION_PATTERN = re.compile(
+    r"<<<SLIDE\s+(\d+)>>>\s*(.*?)\s*<<<END SLIDE\s+\1>>>", re.DOTALL
+)
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Estimate the token count of text (roughly four characters per token)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+class SlidePacker:
+    """Groups consecutive slides into packed requests sized from a token budget."""
+
+    def __init__(
+        self,
+        token_budget: int = 12000,
+        max_slides: int = 4,
+        output_tokens_per_slide: int = 1500,
+        image_tokens: int = 1000,
+    ):
+        """
+        Initialize the slide packer.
+
+        Args:
+            token_budget: Maximum estimated input plus output tokens per packed request
+            max_slides: Upper bound on slides per packed request
+            output_tokens_per_slide: Expected output tokens for one slide's notes
+            image_tokens: Estimated input tokens for one slide image
+        """
+        self.token_budget = token_budget
+        self.max_slides = max(1, max_slides)
+        self.output_tokens_per_slide = output_tokens_per_slide
+        self.image_tokens = image_tokens
+
+    def estimate_slide_tokens(self, slide_content: SlideContent) -> int:
+        """Estimate input plus output tokens contributed by one slide."""
+        tokens = estimate_text_tokens(slide_content.text) + self.output_tokens_per_slide
+        if slide_content.image_base64:
+            tokens += self.image_tokens
+        return tokens
+
+    def plan_group(
+        self,
+        slide_contents: Dict[int, SlideContent],
+        start_slide: int,
+        prompt: str,
+        context: str = "",
+        max_output_tokens: Optional[int] = None,
+        group_key: Optional[Callable[[SlideContent], Any]] = None,
+        capabilities: Optional[ModelCapabilities] = None,
+    ) -> List[SlideContent]:
+        """
+        Choose the consecutive slides to pack into one request.
+
+        Slides are added while the estimated tokens of the prompt, context and
+        slides stay within the budget (and the model's context window), the
+        expected output fits the response limit and the images fit the
+        model's per-request image limit. At least one slide is always returned.
+
+        Args:
+            slide_contents: Dictionary of slide number to SlideContent
+            start_slide: First slide of the group
+            prompt: Instruction prompt sent with the request
+            context: Context from previous slides
+            max_output_tokens: Response token limit of the model
+            group_key: Optional function; only slides with the same key as the
+                first slide are packed together (e.g. the model route)
+            capabilities: Registered limits of the model the group is sent to
+
+        Returns:
+            List of SlideContent objects in slide order
+        """
+        token_budget = self.token_budget
+        max_images = None
+        if capabilities:
+            if capabilities.context_window:
+                token_budget = min(token_budget, capabilities.context_window)
+            max_images = capabilities.max_images_per_request
+
+        used_tokens = estimate_text_tokens(prompt) + estimate_text_tokens(context)
+        group: List[SlideContent] = []
+        images = 0
+
+        slide_num = start_slide
+        while slide_num in slide_contents and len(group) < self.max_slides:
+            slide_content = slide_contents[slide_num]
+            slide_tokens = self.estimate_slide_tokens(slide_content)
+
+            if group:
+                if used_tokens + slide_tokens > token_budget:
+                    break
+                if max_images and slide_content.image_base64 and images >= max_images:
+                    break
+                if group_key and group_key(slide_content) != group_key(group[0]):
+                    break
+                expected_output = (len(group) + 1) * self.output_tokens_per_slide
+                if max_output_tokens and expected_output > max_output_tokens:
+                    break
+
+            group.append(slide_content)
+            used_tokens += slide_tokens
+            images += 1 if slide_content.image_base64 else 0
+            slide_num += 1
+
+        logger.debug(
+            "Planned packed group of %d slides starting at slide %d (~%d tokens)",
+            len(group), start_slide, used_tokens
+        )
+        return group
+
+    @staticmethod
+    def build_packed_message(slides: List[SlideContent], context: str = "") -> str:
+        """
+        Build the per-request message asking for delimited per-slide sections.
+
+        Args:
+            slides: Slides in the packed request, in order
+            context: Context from slides before the group
+
+        Returns:
+            Message text that follows the static instructions
+        """
+        context_section = ""
+        if context:
+            context_section = f"""
+## Previous Slides Context
+
+{context}
+
+---
+"""
+
+        # Only slides with an image get one attached, so number the attached images alone
+        slide_sections = []
+        image_index = 0
+        for slide in slides:
+            if slide.image_base64:
+                image_index += 1
+                heading = f"### Image {image_index}: Slide {slide.slide_number}"
+            else:
+                heading = f"### Slide {slide.slide_number} (no image)"
+            slide_sections.append(
+                f"{heading}\n\n"
+                f"**Slide Number:** {slide.slide_number}\n"
+                f"**Slide Text Content:** \n{slide.text}\n"
+            )
+
+        numbers = ", ".join(str(slide.slide_number) for slide in slides)
+        first = slides[0].slide_number
+        images_note = " The slide images are attached in the same order." if image_index else ""
+        return f"""{context_section}
+## Current Slides to Analyze
+
+The following {len(slides)} consecutive slides ({numbers}) are provided in order.{images_note}
+
+{chr(10).join(slide_sections)}
+Analyze EACH slide separately, following the format specified in the prompt above for a
+single slide. Wrap each slide's complete analysis in delimiters on their own lines:
+
+{SECTION_START.format(number=first)}
+...analysis of slide {first}...
+{SECTION_END.format(number=first)}
+
+Produce exactly one delimited section per slide, in slide order, and nothing outside them.
+"""
+
+    @staticmethod
+    def split_packed_response(response: str, slide_numbers: List[int]) -> Dict[int, str]:
+        """
+        Split a packed response into per-slide analyses.
+
+        Args:
+            response: Raw response text from the model
+            slide_numbers: Slide numbers that were requested
+
+        Returns:
+            Dictionary of slide number to analysis for every section found
+        """
+        wanted = set(slide_numbers)
+        sections: Dict[int, str] = {}
+
+        for match in _SECTION_PATTERN.finditer(response):
+            slide_num = int(match.group(1))
+            if slide_num in wanted and slide_num not in sections:
+                sections[slide_num] = match.group(2).strip()
+
+        missing = sorted(wanted - set(sections))
+        if missing:
+            logger.warning("Packed response is missing sections for slides %s", missing)
+
+        return sections
+
+
+def create_slide_packer(packing_config: Dict) -> Optional[SlidePacker]:
+    """
+    Factory function to create a slide packer from configuration.
+
+    Args:
+        packing_config: Packing configuration dictionary
+
+    Returns:
+        Configured SlidePacker, or None when packing is disabled
+    """
+    if not packing_config.get("enabled"):
+        return None
+
+    return SlidePacker(
+        token_budget=packing_config.get("token_budget", 12000),
+        max_slides=packing_config.get("max_slides", 4),
+        output_tokens_per_slide=packing_config.get("output_tokens_per_slide", 1500),
+        image_tokens=packing_config.get("image_tokens", 1000),
+    )
@@ -0,0 +1,148 @@
+"""Consumption of streamed LLM responses with first-token and inter-token deadlines."""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = "chunk"
+_DONE = "done"
+_ERROR = "error"
+
+# How often a cancellable stream checks for cancellation while waiting (seconds)
+CANCEL_POLL_INTERVAL = 0.25
+
+
+class StreamTimeoutError(Exception):
+    """Raised when a streamed response stalls past its deadline."""
+
+    def __init__(self, message: str, partial_text: str = ""):
+        super().__init__(message)
+        self.partial_text = partial_text
+
+
+class StreamInterruptedError(Exception):
+    """Raised when a stream fails after part of the response has arrived."""
+
+    def __init__(self, message: str, partial_text: str = ""):
+        super().__init__(message)
+        self.partial_text = partial_text
+
+
+class StreamCancelledError(Exception):
+    """Raised when a streamed response is cancelled by the caller."""
+
+
+def _close_stream(stream: Any) -> None:
+    """Close a provider stream so its reader thread stops waiting on the socket."""
+    close = getattr(stream, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception as e:
+            logger.debug("Failed to close stalled stream: %s", e)
+
+
+def consume_stream(
+    open_stream: Callable[[], Iterable[Any]],
+    extract_text: Callable[[Any], Optional[str]],
+    first_token_timeout: Optional[float] = 30.0,
+    inter_token_timeout: Optional[float] = 15.0,
+    on_text: Optional[Callable[[str], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Tuple[str, List[Any]]:
+    """
+    Read a streamed response, failing fast when it stalls.
+
+    The stream is opened and iterated on a reader thread so the deadlines
+    also cover connection setup and blocking socket reads. Chunks without
+    text (role markers, usage events) do not count as the first token.
+
+    Args:
+        open_stream: Callable that starts the request and returns an iterable of chunks
+        extract_text: Callable returning the text delta of a chunk, if any
+        first_token_timeout: Seconds allowed until the first text arrives (None disables)
+        inter_token_timeout: Seconds allowed between chunks after the first text (None disables)
+        on_text: Optional callback receiving each text delta as it arrives
+        cancel_event: Optional event that stops reading and closes the stream when set
+
+    Returns:
+        Tuple of the complete text and the list of raw chunks
+
+    Raises:
+        StreamTimeoutError: If a deadline passes before the next chunk arrives
+        StreamInterruptedError: If the stream fails after text has arrived; the
+            original error is the cause
+        StreamCancelledError: If the cancel event is set before the stream ends
+    """
+    events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+    holder: dict = {}
+
+    def produce() -> None:
+        try:
+            stream = open_stream()
+            holder["stream"] = stream
+            for chunk in stream:
+                events.put((_CHUNK, chunk))
+            events.put((_DONE, None))
+        except BaseException as e:  # Surface every failure to the consumer
+            events.put((_ERROR, e))
+
+    threading.Thread(target=produce, name="llm-stream-reader", daemon=True).start()
+
+    parts: List[str] = []
+    chunks: List[Any] = []
+    first_deadline = (time.monotonic() + first_token_timeout) if first_token_timeout else None
+    last_chunk_at = time.monotonic()
+
+    while True:
+        if cancel_event is not None and cancel_event.is_set():
+            _close_stream(holder.get("stream"))
+            raise StreamCancelledError("Stream cancelled")
+
+        if not parts:
+            deadline = first_deadline
+        else:
+            deadline = (last_chunk_at + inter_token_timeout) if inter_token_timeout else None
+
+        wait = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+        if cancel_event is not None:
+            wait = CANCEL_POLL_INTERVAL if wait is None else min(wait, CANCEL_POLL_INTERVAL)
+
+        try:
+            kind, payload = events.get(timeout=wait)
+        except queue.Empty:
+            if deadline is None or time.monotonic() < deadline:
+                continue
+            _close_stream(holder.get("stream"))
+            if parts:
+                message = f"Stream timeout: no tokens for {inter_token_timeout:g}s"
+            else:
+                message = f"Stream timeout: no first token within {first_token_timeout:g}s"
+            raise StreamTimeoutError(message, partial_text="".join(parts)) from None
+
+        if kind == _DONE:
+            break
+        if kind == _ERROR:
+            if parts:
+                raise StreamInterruptedError(
+                    f"Stream interrupted after {sum(map(len, parts))} characters: {payload}",
+                    partial_text="".join(parts),
+                ) from payload
+            raise payload
+
+        last_chunk_at = time.monotonic()
+        chunks.append(payload)
+        text = extract_text(payload)
+        if text:
+            parts.append(text)
+            if on_text:
+                try:
+                    on_text(text)
+                except Exception as e:
+                    logger.debug("Stream listener failed: %s", e)
+
+    return "".join(parts), chunks
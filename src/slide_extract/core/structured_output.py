@@ -0,0 +1,325 @@
+"""JSON-schema output for slide analyses, rendered to Markdown locally."""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    from .section_repair import REQUIRED_SECTIONS, SLIDE_NUMBER
+    from .slide_packer import SECTION_END, SECTION_START
+except ImportError:
+    from section_repair import REQUIRED_SECTIONS, SLIDE_NUMBER
+    from slide_packer import SECTION_END, SECTION_START
+
+# Name of the schema (OpenAI) and of the tool the model must call (Anthropic)
+SCHEMA_NAME = "slide_analysis"
+
+# Property holding the "#### Slide: <title>" line
+TITLE_KEY = "title"
+
+# Sections rendered as a bulleted list
+_LIST_SECTIONS = ("**Slide Topics:**",)
+
+# Section headings as the prompts write them, e.g. "**Slide Equations:**"
+_PROMPT_HEADING = re.compile(r"\*\*(Slide [A-Za-z][A-Za-z /&-]*?):\*\*")
+_PACKED_DELIMITER = re.compile(r"<<<(?:END )?SLIDE \d+>>>")
+_FENCE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+class StructuredOutputError(Exception):
+    """Custom exception for structured output errors."""
+
+
+def derive_sections(prompt: str) -> List[str]:
+    """
+    Derive the sections of a slide analysis from a prompt.
+
+    Args:
+        prompt: Analysis prompt/instructions
+
+    Returns:
+        Section headings named in the prompt in prompt order, with any
+        required section the prompt omits added in its usual position
+    """
+    sections: List[str] = []
+    for label in _PROMPT_HEADING.findall(prompt):
+        heading = f"**{label}:**"
+        if heading not in sections:
+            sections.append(heading)
+
+    for index, heading in enumerate(REQUIRED_SECTIONS):
+        if heading not in sections:
+            following = [s for s in REQUIRED_SECTIONS[index + 1:] if s in sections]
+            position = sections.index(following[0]) if following else len(sections)
+            sections.insert(position, heading)
+    return sections
+
+
+def section_key(heading: str) -> str:
+    """
+    Get the schema property name of a section heading.
+
+    Args:
+        heading: Section heading, e.g. "**Slide Images/Diagrams:**"
+
+    Returns:
+        Snake-case property name, e.g. "slide_images_diagrams"
+    """
+    return re.sub(r"[^a-z0-9]+", "_", heading.strip("*: ").lower()).strip("_")
+
+
+class AnalysisSchema:
+    """
+    JSON schema for slide analyses and the Markdown rendering of conforming objects.
+
+    Every section is a required property, so a response that matches the
+    schema always renders with every heading in place. Packed requests use
+    an object with a ``slides`` array of per-slide objects.
+    """
+
+    def __init__(self, sections: Sequence[str], packed: bool = False, title: bool = True):
+        """
+        Initialize the schema.
+
+        Args:
+            sections: Section headings, in output order
+            packed: Whether responses cover several slides
+            title: Whether the "#### Slide: <title>" line is requested
+        """
+        if not sections:
+            raise StructuredOutputError("A structured analysis needs at least one section")
+        self.sections = list(sections)
+        self.packed = packed
+        self.title = title
+
+    @classmethod
+    def from_prompt(cls, prompt: str, packed: bool = False) -> "AnalysisSchema":
+        """
+        Build the schema for the sections a prompt asks for.
+
+        Args:
+            prompt: Analysis prompt/instructions
+            packed: Whether responses cover several slides
+
+        Returns:
+            AnalysisSchema
+        """
+        return cls(derive_sections(prompt), packed=packed)
+
+    def subset(self, sections: Sequence[str]) -> "AnalysisSchema":
+        """
+        Get a single-slide schema for some sections only, without the title.
+
+        Args:
+            sections: Section headings to keep
+
+        Returns:
+            AnalysisSchema in this schema's section order
+        """
+        kept = [heading for heading in self.sections if heading in sections]
+        kept += [heading for heading in sections if heading not in kept]
+        return AnalysisSchema(kept, title=False)
+
+    def _slide_schema(self) -> Dict[str, Any]:
+        properties: Dict[str, Any] = {}
+        if self.title:
+            properties[TITLE_KEY] = {"type": "string", "description": "Slide title"}
+        for heading in self.sections:
+            if heading == SLIDE_NUMBER:
+                field: Dict[str, Any] = {"type": "integer"}
+            elif heading in _LIST_SECTIONS:
+                field = {"type": "array", "items": {"type": "string"}}
+            else:
+                field = {"type": "string"}
+            field["description"] = heading.strip("*: ")
+            properties[section_key(heading)] = field
+        return {
+            "type": "object",
+            "properties": properties,
+            "required": list(properties),
+            "additionalProperties": False,
+        }
+
+    def json_schema(self) -> Dict[str, Any]:
+        """
+        Get the JSON schema of a response.
+
+        Returns:
+            JSON schema dictionary
+        """
+        schema = self._slide_schema()
+        if self.packed:
+            schema = {
+                "type": "object",
+                "properties": {"slides": {"type": "array", "items": schema}},
+                "required": ["slides"],
+                "additionalProperties": False,
+            }
+        return schema
+
+    def parse(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Parse and validate a response.
+
+        Args:
+            text: JSON response text, optionally in a code fence
+
+        Returns:
+            One validated object per slide
+
+        Raises:
+            StructuredOutputError: If the response is not JSON or does not match the schema
+        """
+        fenced = _FENCE.match(text.strip())
+        try:
+            data = json.loads(fenced.group(1) if fenced else text)
+        except json.JSONDecodeError as e:
+            raise StructuredOutputError(f"Response is not valid JSON: {e}") from e
+
+        if self.packed:
+            if not isinstance(data, dict) or not isinstance(data.get("slides"), list):
+                raise StructuredOutputError("Packed response has no 'slides' array")
+            return [self._validate(item) for item in data["slides"]]
+        return [self._validate(data)]
+
+    def _validate(self, data: Any) -> Dict[str, Any]:
+        if not isinstance(data, dict):
+            raise StructuredOutputError(f"Expected a JSON object, got {type(data).__name__}")
+        for key, field in self._slide_schema()["properties"].items():
+            if key not in data:
+                raise StructuredOutputError(f"Response lacks the '{key}' property")
+            value = data[key]
+            if field["type"] == "integer":
+                try:
+                    data[key] = int(value)
+                except (TypeError, ValueError):
+                    raise StructuredOutputError(f"'{key}' is not an integer: {value!r}") from None
+            elif field["type"] == "array":
+                if isinstance(value, str):
+                    value = [value]
+                if not isinstance(value, list):
+                    raise StructuredOutputError(f"'{key}' is not a list")
+                data[key] = [str(item) for item in value]
+            elif not isinstance(value, str):
+                raise StructuredOutputError(f"'{key}' is not a string")
+        return data
+
+    def render(self, text: str, slide_numbers: Optional[Sequence[int]] = None) -> str:
+        """
+        Render a response as the Markdown the prompts ask for.
+
+        Args:
+            text: JSON response text
+            slide_numbers: Slides the request covered; they take precedence
+                over the numbers in the response
+
+        Returns:
+            Markdown analysis; packed responses get one delimited section per slide
+
+        Raises:
+            StructuredOutputError: If the response does not match the schema
+        """
+        slides = self.parse(text)
+        number_key = section_key(SLIDE_NUMBER)
+        if slide_numbers is not None and len(slide_numbers) == len(slides):
+            numbers = list(slide_numbers)
+        else:
+            numbers = [slide.get(number_key, index + 1) for index, slide in enumerate(slides)]
+        if SLIDE_NUMBER in self.sections:
+            for slide, number in zip(slides, numbers):
+                slide[number_key] = number
+
+        if not self.packed:
+            return self._render_slide(slides[0])
+        return "\n\n".join(
+            f"{SECTION_START.format(number=number)}\n{self._render_slide(slide)}\n"
+            f"{SECTION_END.format(number=number)}"
+            for slide, number in zip(slides, numbers)
+        )
+
+    def _render_slide(self, data: Dict[str, Any]) -> str:
+        parts = []
+        if self.title and data.get(TITLE_KEY, "").strip():
+            parts.append(f"#### Slide: {data[TITLE_KEY].strip()}")
+        for heading in self.sections:
+            value = data[section_key(heading)]
+            if heading == SLIDE_NUMBER:
+                parts.append(f"{heading} {value}")
+            elif isinstance(value, list):
+                parts.append(f"{heading}\n" + "\n".join(f"*   {item.strip()}" for item in value))
+            else:
+                parts.append(f"{heading}\n{value.strip() or '[None]'}")
+        return "\n\n".join(parts)
+
+
+def structure_markdown(markdown: str, schema: Dict[str, Any]) -> str:
+    """
+    Convert a Markdown analysis into JSON matching a schema.
+
+    Used by the mock provider and the stand-in server to answer structured
+    requests; property descriptions name the section headings.
+
+    Args:
+        markdown: Markdown analysis (packed responses delimited per slide)
+        schema: JSON schema from AnalysisSchema.json_schema
+
+    Returns:
+        JSON text
+    """
+    slides = (schema.get("properties") or {}).get("slides")
+    if slides is None:
+        return json.dumps(_structure_slide(markdown, schema))
+    chunks = [chunk for chunk in _PACKED_DELIMITER.split(markdown) if chunk.strip()]
+    return json.dumps({"slides": [_structure_slide(chunk, slides["items"]) for chunk in chunks]})
+
+
+def _structure_slide(markdown: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    properties = schema.get("properties") or {}
+    headings = {
+        key: f"**{field.get('description', '')}:**"
+        for key, field in properties.items() if key != TITLE_KEY
+    }
+    starts = sorted(
+        (markdown.find(heading), key) for key, heading in headings.items() if heading in markdown
+    )
+
+    data: Dict[str, Any] = {}
+    for index, (start, key) in enumerate(starts):
+        end = starts[index + 1][0] if index + 1 < len(starts) else len(markdown)
+        data[key] = markdown[start + len(headings[key]):end].strip()
+
+    result: Dict[str, Any] = {}
+    for key, field in properties.items():
+        if key == TITLE_KEY:
+            title = re.search(r"^#### Slide:[ \t]*(.*)$", markdown, re.MULTILINE)
+            result[key] = title.group(1).strip() if title else ""
+        elif field.get("type") == "integer":
+            number = re.search(r"\d+", data.get(key, ""))
+            result[key] = int(number.group(0)) if number else 0
+        elif field.get("type") == "array":
+            result[key] = [
+                line.lstrip("*- ").strip() for line in data.get(key, "").splitlines() if line.strip()
+            ]
+        else:
+            result[key] = data.get(key, "")
+    return result
+
+
+def without_additional_properties(schema: Any) -> Any:
+    """
+    Remove ``additionalProperties`` from a JSON schema, which Gemini's schema dialect rejects.
+
+    Args:
+        schema: JSON schema (or part of one)
+
+    Returns:
+        Copy of the schema without ``additionalProperties`` keys
+    """
+    if isinstance(schema, dict):
+        return {
+            key: without_additional_properties(value)
+            for key, value in schema.items() if key != "additionalProperties"
+        }
+    if isinstance(schema, list):
+        return [without_additional_properties(value) for value in schema]
+    return schema
@@ -0,0 +1,307 @@
+"""Per-request LLM telemetry and aggregated JSON reports with latency percentiles."""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+# Percentiles reported for latency and queue wait
+PERCENTILES = (50, 90, 95, 99)
+
+# Request outcomes
+SUCCESS = "success"
+CACHED = "cached"
+FAILED = "failed"
+
+
+class TelemetryError(Exception):
+    """Custom exception for telemetry errors."""
+
+
+@dataclass
+class RequestRecord:
+    """One logical LLM call (a slide or packed group request, including its retries)."""
+    deck: Optional[str]
+    slides: List[int]
+    provider: Optional[str] = None
+    model: Optional[str] = None
+    outcome: str = SUCCESS
+    attempts: int = 0            # Provider requests sent, including retries and hedges
+    retries: int = 0             # Retries made by the retry policy
+    continuations: int = 0       # Requests that continued a response cut off at max_tokens
+    image_bytes: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    thinking_tokens: int = 0     # Hidden reasoning tokens, where the provider reports them
+    queue_wait: float = 0.0      # Seconds spent waiting before requests were sent (backoff)
+    latency: float = 0.0         # Network latency of the final attempt (seconds)
+    total_seconds: float = 0.0   # Wall-clock time of the whole call
+    error_kind: Optional[str] = None
+
+
+@dataclass
+class _Attempt:
+    model: str
+    latency: float
+    image_bytes: int
+    usage: Dict[str, int] = field(default_factory=dict)
+    failed: bool = False
+    continuation: bool = False
+
+
+class _Call:
+    """Attempts, retries and waits observed while one logical call is in flight."""
+
+    def __init__(self, deck: Optional[str], slides: Sequence[int]):
+        self.deck = deck
+        self.slides = list(slides)
+        self.started = time.monotonic()
+        self.attempts: List[_Attempt] = []
+        self.retries = 0
+        self.queue_wait = 0.0
+        self.cache_model: Optional[str] = None
+
+    def on_retry(self, kind: str, delay: float) -> None:
+        """Count a retry and the backoff waited before it."""
+        self.retries += 1
+        self.queue_wait += delay
+
+    def to_record(self, error: Optional[BaseException]) -> RequestRecord:
+        successful = [attempt for attempt in self.attempts if not attempt.failed]
+        final = (successful or self.attempts or [None])[-1]
+        model = final.model if final else self.cache_model
+
+        record = RequestRecord(
+            deck=self.deck,
+            slides=self.slides,
+            attempts=len(self.attempts),
+            retries=self.retries,
+            continuations=sum(attempt.continuation for attempt in self.attempts if not attempt.failed),
+            queue_wait=round(self.queue_wait, 4),
+            latency=round(final.latency, 4) if final else 0.0,
+            total_seconds=round(time.monotonic() - self.started, 4),
+        )
+        if model:
+            record.provider, _, record.model = model.partition("/")
+        # Images are sent once per call; tokens are billed for every attempt
+        record.image_bytes = max((attempt.image_bytes for attempt in self.attempts), default=0)
+        for attempt in self.attempts:
+            record.input_tokens += attempt.usage.get("input_tokens", 0)
+            record.output_tokens += attempt.usage.get("output_tokens", 0)
+            record.cached_tokens += attempt.usage.get("cached_tokens", 0)
+            record.thinking_tokens += attempt.usage.get("thinking_tokens", 0)
+
+        if error is not None:
+            try:
+                from .retry_policy import classify_error
+            except ImportError:
+                from retry_policy import classify_error
+
+            record.outcome = FAILED
+            record.error_kind = classify_error(error)[0]
+        elif not self.attempts and self.cache_model:
+            record.outcome = CACHED
+        return record
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Compute a percentile with linear interpolation between closest ranks.
+
+    Args:
+        values: Sample values
+        q: Percentile in [0, 100]
+
+    Returns:
+        The percentile, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _distribution(values: Sequence[float]) -> Dict[str, float]:
+    summary = {f"p{q}": round(percentile(values, q), 4) for q in PERCENTILES}
+    summary["max"] = round(max(values), 4) if values else 0.0
+    summary["mean"] = round(sum(values) / len(values), 4) if values else 0.0
+    return summary
+
+
+def summarize_records(records: Sequence[RequestRecord]) -> Dict[str, Any]:
+    """
+    Aggregate request records into totals and latency/queue-wait percentiles.
+
+    Args:
+        records: Request records to aggregate
+
+    Returns:
+        Summary dictionary
+    """
+    outcomes: Dict[str, int] = {}
+    models: Dict[str, int] = {}
+    for record in records:
+        outcomes[record.outcome] = outcomes.get(record.outcome, 0) + 1
+        if record.model:
+            label = f"{record.provider}/{record.model}"
+            models[label] = models.get(label, 0) + 1
+
+    sent = [record for record in records if record.attempts]
+    return {
+        "requests": len(records),
+        "slides": sum(len(record.slides) for record in records),
+        "outcomes": outcomes,
+        "attempts": sum(record.attempts for record in records),
+        "retries": sum(record.retries for record in records),
+        "continuations": sum(record.continuations for record in records),
+        "image_bytes": sum(record.image_bytes for record in records),
+        "input_tokens": sum(record.input_tokens for record in records),
+        "output_tokens": sum(record.output_tokens for record in records),
+        "cached_tokens": sum(record.cached_tokens for record in records),
+        "thinking_tokens": sum(record.thinking_tokens for record in records),
+        "latency": _distribution([record.latency for record in sent]),
+        "queue_wait": _distribution([record.queue_wait for record in sent]),
+        "models": models,
+    }
+
+
+class TelemetryCollector:
+    """
+    Collects one RequestRecord per logical LLM call.
+
+    NoteGenerator opens a call with ``track``; LLMClient reports every provider
+    request sent while it is open with ``record_attempt``. Calls are tracked
+    per thread, so concurrent requests do not mix.
+    """
+
+    def __init__(self):
+        self.records: List[RequestRecord] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def track(self, slides: Sequence[int], deck: Optional[str] = None) -> Iterator[_Call]:
+        """
+        Track one logical call; the record is stored when the block exits.
+
+        Args:
+            slides: Slide numbers covered by the request
+            deck: Deck (file) name the slides belong to
+
+        Yields:
+            The in-flight call; pass its ``on_retry`` to the retry policy
+        """
+        call = _Call(deck, slides)
+        outer = getattr(self._local, "call", None)
+        self._local.call = call
+        error: Optional[BaseException] = None
+        try:
+            yield call
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._local.call = outer
+            self._store(call.to_record(error))
+
+    def _store(self, record: RequestRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def record_attempt(
+        self, model: str, latency: float, image_bytes: int = 0,
+        usage: Optional[Dict[str, int]] = None, failed: bool = False,
+        continuation: bool = False
+    ) -> None:
+        """
+        Record one provider request.
+
+        Requests made outside a tracked call are stored as their own record.
+
+        Args:
+            model: Provider-qualified model label
+            latency: Request latency in seconds
+            image_bytes: Decoded size of the images sent
+            usage: Token usage reported by the provider
+            failed: Whether the request raised
+            continuation: Whether the request continued a truncated response
+        """
+        attempt = _Attempt(model, latency, image_bytes, dict(usage or {}), failed, continuation)
+        call = getattr(self._local, "call", None)
+        if call is not None:
+            call.attempts.append(attempt)
+            return
+
+        standalone = _Call(None, [])
+        standalone.started -= latency
+        standalone.attempts.append(attempt)
+        record = standalone.to_record(None)
+        if failed:
+            record.outcome = FAILED
+        self._store(record)
+
+    def record_cache_hit(self, model: str) -> None:
+        """
+        Record that the current call was answered from the response cache.
+
+        Args:
+            model: Provider-qualified model label
+        """
+        call = getattr(self._local, "call", None)
+        if call is not None:
+            call.cache_model = model
+
+    def build_report(self) -> Dict[str, Any]:
+        """
+        Aggregate the records per deck and for the whole batch.
+
+        Returns:
+            Report dictionary with batch and per-deck summaries and every record
+        """
+        with self._lock:
+            records = list(self.records)
+
+        decks: Dict[str, List[RequestRecord]] = {}
+        for record in records:
+            decks.setdefault(record.deck or "(none)", []).append(record)
+
+        return {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "batch": summarize_records(records),
+            "decks": {deck: summarize_records(items) for deck, items in decks.items()},
+            "requests": [asdict(record) for record in records],
+        }
+
+    def write_report(self, path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Write the aggregated report as JSON.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            The report that was written
+
+        Raises:
+            TelemetryError: If the report cannot be written
+        """
+        report = self.build_report()
+        try:
+            output_path = Path(path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        except OSError as e:
+            raise TelemetryError(f"Failed to write telemetry report {path}: {e}") from e
+        logger.info("Telemetry report written to %s", path)
+        return report
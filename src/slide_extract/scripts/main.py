@@ -17,7 +17,12 @@ try:
     from ..core.pdf_processor import PDFProcessor, PDFProcessingError
     from ..core.note_generator import NoteGenerator, NoteGenerationError
     from ..core.config_manager import ConfigManager, ConfigurationError
-    from ..core.llm_client import create_llm_client, LLMError
+    from ..core.failover import create_failover_client
+    from ..core.health_check import HealthCheckError, create_health_check_cache
+    from ..core.http_transport import HTTPTransportError, configure_http_transport, start_prewarm
+    from ..core.key_pool import KeyPoolError
+    from ..core.llm_client import LLMError
+    from ..core.model_registry import ModelRegistryError, configure_model_registry, rendering_options
 except ImportError:
     # When run directly
     import sys
@@ -27,7 +32,12 @@ except ImportError:
     from pdf_processor import PDFProcessor, PDFProcessingError
     from note_generator import NoteGenerator, NoteGenerationError
     from config_manager import ConfigManager, ConfigurationError
-    from llm_client import create_llm_client, LLMError
+    from failover import create_failover_client
+    from health_check import HealthCheckError, create_health_check_cache
+    from http_transport import HTTPTransportError, configure_http_transport, start_prewarm
+    from key_pool import KeyPoolError
+    from llm_client import LLMError
+    from model_registry import ModelRegistryError, configure_model_registry, rendering_options
 
 
 class SlideExtractorError(Exception):
@@ -119,6 +129,12 @@ Examples:
         help="Use placeholder mode without AI (for testing)",
     )
 
+    parser.add_argument(
+        "--skip-health-check",
+        action="store_true",
+        help="Start processing without checking that the LLM provider is reachable",
+    )
+
     parser.add_argument("--version", action="version", version="%(prog)s 1.0.0")
 
     return parser.parse_args()
@@ -190,12 +206,20 @@ def main() -> int:
         llm_client = None
         if not args.no_ai:
             try:
-                llm_config = config_manager.get_llm_config()
-                llm_client = create_llm_client(llm_config)
-
-                # Test connection
-                logger.info("Testing LLM connection...")
-                if llm_client.test_connection():
+                configure_model_registry(config_manager.get_model_overrides())
+                configure_http_transport(config_manager.get_connection_pool_config())
+                llm_client = create_failover_client(
+                    config_manager.get_llm_chain_config(),
+                    config_manager.get_circuit_breaker_config(),
+                )
+                start_prewarm(llm_client.endpoint_urls())
+
+                # Cheap probe; a recent success is reused from the state file
+                if args.skip_health_check:
+                    logger.info("Skipping LLM health check")
+                elif llm_client.health_check(
+                    create_health_check_cache(config_manager.get_health_check_config())
+                ):
                     model_info = llm_client.get_model_info()
                     logger.info(
                         "LLM connection successful: %s %s",
@@ -210,7 +234,10 @@ def main() -> int:
                         "follow the README instructions to set up an LLM API key."
                     )
 
-            except (ConfigurationError, LLMError) as e:
+            except (
+                ConfigurationError, HealthCheckError, HTTPTransportError, KeyPoolError, LLMError,
+                ModelRegistryError
+            ) as e:
                 logger.error("LLM initialization failed: %s", e)
                 raise SlideExtractorError(
                     "No LLM/AI has been configured. "
@@ -221,7 +248,7 @@ def main() -> int:
             logger.info("Running in no-AI mode (placeholder only)")
 
         # Initialize processors
-        pdf_processor = PDFProcessor()
+        pdf_processor = PDFProcessor(**rendering_options(llm_client))
         note_generator = NoteGenerator(llm_client)
 
         # Load the user prompt
@@ -63,6 +63,8 @@ Test slide has a simple layout with black background and white text.
 "This is a test slide for unit testing purposes."
 """
     mock_client.test_connection.return_value = True
+    mock_client.health_check.return_value = True
+    mock_client.model_capabilities.return_value = []
     mock_client.get_model_info.return_value = {
         "provider": "test",
         "model": "test-model"
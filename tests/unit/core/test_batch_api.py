@@ -0,0 +1,266 @@
+"""Unit tests for offline batch-API processing."""
+
+import json
+
+import pytest
+from unittest.mock import Mock, patch
+
+from slide_extract.core.batch_api import (
+    JOB_COMPLETED,
+    AnthropicBatchBackend,
+    BatchAPIError,
+    BatchAPIRunner,
+    BatchRequest,
+    LocalBatchBackend,
+    OpenAIBatchBackend,
+    create_batch_backend,
+)
+from slide_extract.core.batch_processor import BatchProcessor, BatchProcessingError
+from slide_extract.core.llm_client import LLMClient
+from slide_extract.core.manifest_manager import FileStatus
+from slide_extract.core.mock_provider import MockChatServer, MockResponder
+from slide_extract.core.pdf_processor import SlideContent
+
+
+def valid_analysis(slide_num: int) -> str:
+    """Build an analysis that passes note generator validation."""
+    return (
+        f"#### Slide: Topic {slide_num}\n\n"
+        f"**Slide Number:** {slide_num}\n\n"
+        f"**Slide Text:**\nText of slide {slide_num}\n\n"
+        f"**Slide Images/Diagrams:**\nA diagram is shown.\n\n"
+        f"**Slide Topics:**\n* Topic {slide_num}\n\n"
+        f"**Slide Narration:**\n" + "This slide explains the topic in detail. " * 8
+    )
+
+
+def respond(request: BatchRequest) -> str:
+    """Local backend responder answering with a valid analysis for the slide."""
+    return valid_analysis(int(request.custom_id.split("-s")[1]))
+
+
+def make_client(provider="openai"):
+    with patch.object(LLMClient, "_initialize_client", return_value=Mock()):
+        return LLMClient({"provider": provider, "model": "gpt-4o", "api_key": "test"})
+
+
+@pytest.fixture
+def pdf_dir(temp_dir, create_test_pdf):
+    create_test_pdf("deck_a.pdf")
+    create_test_pdf("deck_b.pdf", "other content")
+    return temp_dir
+
+
+@pytest.fixture
+def mock_pdf_processor():
+    processor = Mock()
+    processor.extract_slide_content.return_value = {
+        n: SlideContent(n, f"Slide {n} text", f"image{n}", True, 1) for n in range(1, 4)
+    }
+    return processor
+
+
+def run_batch(pdf_dir, backend, pdf_processor, client=None, **kwargs):
+    processor = BatchProcessor(input_dir=pdf_dir, output_dir=pdf_dir / "out")
+    with patch("slide_extract.core.batch_processor.PDFProcessor", return_value=pdf_processor):
+        return processor, processor.process_directory_batch_api(
+            llm_client=client or make_client(), prompt="Analyze the slide",
+            backend=backend, poll_interval=0, **kwargs
+        )
+
+
+class TestBatchAPIProcessing:
+    """Test submission, collection and resume through the local backend."""
+
+    def test_processes_directory(self, pdf_dir, temp_dir, mock_pdf_processor):
+        """All slides are submitted in one job and written to per-file outputs."""
+        backend = LocalBatchBackend(temp_dir / "jobs", respond)
+        processor, result = run_batch(pdf_dir, backend, mock_pdf_processor)
+
+        assert result == 0
+        for name in ("deck_a", "deck_b"):
+            output = (pdf_dir / "out" / f"{name}_summary.md").read_text()
+            assert "Topic 1" in output and "Topic 3" in output
+
+        records = processor.manifest.load_manifest()
+        assert all(r.status == FileStatus.COMPLETED for r in records)
+        assert all(r.completed_slides == 3 for r in records)
+        assert len(list((temp_dir / "jobs").glob("*.input.jsonl"))) == 1
+        assert not (pdf_dir / "out" / BatchAPIRunner.STATE_FILENAME).exists()
+
+    def test_resume_after_restart_does_not_resubmit(self, pdf_dir, temp_dir, mock_pdf_processor):
+        """An unfinished job is collected by a later run instead of being resubmitted."""
+        backend = LocalBatchBackend(temp_dir / "jobs", respond, polls_until_complete=3)
+
+        with pytest.raises(BatchProcessingError, match="still running"):
+            run_batch(pdf_dir, backend, mock_pdf_processor, max_wait=0)
+
+        state_file = pdf_dir / "out" / BatchAPIRunner.STATE_FILENAME
+        job_id = json.loads(state_file.read_text())["job_id"]
+
+        # A new process with a fresh backend instance picks the job up from disk
+        restarted = LocalBatchBackend(temp_dir / "jobs", respond, polls_until_complete=3)
+        processor, result = run_batch(pdf_dir, restarted, mock_pdf_processor)
+
+        assert result == 0
+        assert [p.name for p in (temp_dir / "jobs").glob("*.input.jsonl")] == [f"{job_id}.input.jsonl"]
+        assert all(r.status == FileStatus.COMPLETED for r in processor.manifest.load_manifest())
+
+    def test_missing_results_fall_back_to_single_requests(self, pdf_dir, temp_dir, mock_pdf_processor):
+        """Slides without a valid batch result are re-requested individually."""
+        def partial(request):
+            if request.custom_id.endswith("-s2"):
+                raise RuntimeError("request failed")
+            return respond(request)
+
+        client = make_client()
+        backend = LocalBatchBackend(temp_dir / "jobs", partial)
+        with patch.object(client, "generate_slide_analysis", return_value=valid_analysis(2)) as single:
+            _, result = run_batch(pdf_dir, backend, mock_pdf_processor, client=client)
+
+        assert result == 0
+        assert single.call_count == 2  # slide 2 of each deck
+
+    def test_requires_llm_client(self, pdf_dir, temp_dir):
+        """Batch API mode cannot run in placeholder mode."""
+        processor = BatchProcessor(input_dir=pdf_dir, output_dir=pdf_dir / "out")
+        with pytest.raises(BatchProcessingError, match="requires an LLM client"):
+            processor.process_directory_batch_api(None, "prompt")
+
+
+class TestBatchBackends:
+    """Test provider backend selection and request serialization."""
+
+    def test_unsupported_provider(self):
+        """Providers without a batch API are rejected."""
+        with pytest.raises(BatchAPIError, match="not supported"):
+            create_batch_backend(make_client("openrouter"))
+
+    def test_openai_submit_serializes_jsonl(self):
+        """OpenAI requests are uploaded as chat-completion JSONL lines."""
+        client = make_client()
+        client.client.files.create.return_value = Mock(id="file-1")
+        client.client.batches.create.return_value = Mock(id="batch-1")
+        backend = create_batch_backend(client)
+        assert isinstance(backend, OpenAIBatchBackend)
+
+        request = BatchRequest(
+            custom_id="f0-s1",
+            **client.build_slide_request("text", "prompt", 1, image_base64="img")
+        )
+        assert backend.submit([request]) == "batch-1"
+
+        _, payload = client.client.files.create.call_args.kwargs["file"]
+        line = json.loads(payload.decode().splitlines()[0])
+        assert line["custom_id"] == "f0-s1"
+        assert line["url"] == "/v1/chat/completions"
+        assert line["body"]["messages"][0] == {"role": "system", "content": "prompt"}
+        assert line["body"]["messages"][1]["content"][1]["image_url"]["url"].endswith("img")
+
+    def test_reasoning_fields_are_top_level(self):
+        """SDK extra_body fields are merged into the batch body, not nested in it."""
+        with patch.object(LLMClient, "_initialize_client", return_value=Mock()):
+            openai = LLMClient({
+                "provider": "openai", "model": "o3-mini", "api_key": "test", "reasoning": {"effort": "low"},
+            })
+            anthropic = LLMClient({
+                "provider": "anthropic", "model": "claude-3-7-sonnet-20250219", "api_key": "test",
+                "reasoning": {"budget_tokens": 2048},
+            })
+
+        openai_body = json.loads(json.dumps(
+            openai.build_request_params(**openai.build_slide_request("text", "prompt", 1))
+        ))
+        anthropic_body = json.loads(json.dumps(
+            anthropic.build_request_params(**anthropic.build_slide_request("text", "prompt", 1))
+        ))
+
+        assert "extra_body" not in openai_body and openai_body["reasoning_effort"] == "low"
+        assert "extra_body" not in anthropic_body
+        assert anthropic_body["thinking"] == {"type": "enabled", "budget_tokens": 2048}
+
+
+def slide_requests(client, count=2):
+    return [
+        BatchRequest(custom_id=f"f0-s{n}", **client.build_slide_request(f"Topic {n} " * 20, "Analyze", n))
+        for n in range(1, count + 1)
+    ]
+
+
+class TestBatchEndpoints:
+    """Test the backends against the stand-in server's batch endpoints."""
+
+    def test_openai_files_and_batches(self):
+        with MockChatServer(MockResponder()) as server:
+            client = LLMClient({"provider": "openai", "model": "gpt-4o", "api_key": "k", "base_url": server.base_url})
+            backend = create_batch_backend(client)
+
+            job_id = backend.submit(slide_requests(client))
+            assert backend.poll(job_id) == JOB_COMPLETED
+            results = backend.collect(job_id)
+
+        assert sorted(results) == ["f0-s1", "f0-s2"]
+        assert "**Slide Number:** 2" in results["f0-s2"]
+
+    def test_anthropic_message_batches_use_base_url(self):
+        with MockChatServer(MockResponder()) as server:
+            root = server.base_url.rsplit("/v1", 1)[0]
+            client = LLMClient({
+                "provider": "anthropic", "model": "claude-3-5-sonnet-20241022", "api_key": "k", "base_url": root,
+            })
+            backend = create_batch_backend(client)
+            assert isinstance(backend, AnthropicBatchBackend)
+            assert backend.api_url == f"{root}/v1/messages/batches"
+
+            job_id = backend.submit(slide_requests(client))
+            assert job_id.startswith("msgbatch_")
+            assert backend.poll(job_id) == JOB_COMPLETED
+            results = backend.collect(job_id)
+
+        assert sorted(results) == ["f0-s1", "f0-s2"]
+        assert "**Slide Number:** 1" in results["f0-s1"]
+
+    def test_failed_requests_are_left_out(self):
+        with MockChatServer(MockResponder(server_error_rate=1.0)) as server:
+            client = LLMClient({"provider": "openai", "model": "gpt-4o", "api_key": "k", "base_url": server.base_url})
+            backend = create_batch_backend(client)
+            job_id = backend.submit(slide_requests(client))
+
+            assert backend.poll(job_id) == JOB_COMPLETED
+            assert backend.collect(job_id) == {}
+
+    def test_directory_through_anthropic_endpoint(self, pdf_dir, mock_pdf_processor):
+        with MockChatServer(MockResponder()) as server:
+            client = LLMClient({
+                "provider": "anthropic", "model": "claude-3-5-sonnet-20241022", "api_key": "k",
+                "base_url": server.base_url.rsplit("/v1", 1)[0],
+            })
+            processor, result = run_batch(pdf_dir, create_batch_backend(client), mock_pdf_processor, client=client)
+
+        assert result == 0
+        output = (pdf_dir / "out" / "deck_a_summary.md").read_text()
+        assert output.count("<!-- model: anthropic/claude-3-5-sonnet-20241022 -->") == 3
+        assert all(r.status == FileStatus.COMPLETED for r in processor.manifest.load_manifest())
+
+    @pytest.mark.parametrize("provider", ["openai", "anthropic"])
+    def test_structured_output_is_requested_and_rendered(self, provider, pdf_dir, mock_pdf_processor):
+        responder = MockResponder()
+        with MockChatServer(responder) as server:
+            base_url = server.base_url if provider == "openai" else server.base_url.rsplit("/v1", 1)[0]
+            client = LLMClient({
+                "provider": provider, "model": "gpt-4o" if provider == "openai" else "claude-3-5-sonnet-20241022",
+                "api_key": "k", "base_url": base_url, "structured_output": True,
+            })
+            body = client.build_request_params(**client.build_slide_request("text", "Analyze the slide", 1))
+            processor, result = run_batch(pdf_dir, create_batch_backend(client), mock_pdf_processor, client=client)
+
+        if provider == "openai":
+            assert body["response_format"]["type"] == "json_schema"
+        else:
+            assert body["tool_choice"]["type"] == "tool"
+        assert result == 0
+        # Every slide came from the batch job; none was re-requested
+        assert responder.get_stats()["requests"] == 6
+        output = (pdf_dir / "out" / "deck_a_summary.md").read_text()
+        assert output.count("**Slide Narration:**") == output.count("<!-- model: ") == 3
+        assert '"slide_narration"' not in output
@@ -0,0 +1,117 @@
+"""Unit tests for LLM traffic record/replay cassettes."""
+
+import json
+import time
+
+import pytest
+
+from slide_extract.core.cassette import Cassette, CassetteError, ReplayedError, create_cassette
+from slide_extract.core.llm_client import LLMClient, LLMError
+from slide_extract.core.retry_policy import RATE_LIMIT, classify_error
+
+
+def mock_client(cassette_path, mode, **config):
+    return LLMClient({
+        "provider": "mock", "model": "mock-1",
+        "cassette": {"mode": mode, "path": str(cassette_path), "time_scale": config.pop("time_scale", 1.0)},
+        **config,
+    })
+
+
+class TestCassette:
+    """Test the cassette file format and replay order."""
+
+    def test_records_hashed_requests(self, temp_dir):
+        path = temp_dir / "run.jsonl"
+        client = mock_client(path, "record")
+        response = client.generate_slide_analysis("Secret slide text", "Analyze", 1)
+        client.cassette.close()
+
+        [entry] = [json.loads(line) for line in path.read_text().splitlines()]
+        assert entry["response"] == response
+        assert entry["model"] == "mock/mock-1"
+        assert entry["usage"]["output_tokens"] > 0
+        assert "Secret slide text" not in entry["key"]
+
+    def test_replay_matches_recording(self, temp_dir):
+        path = temp_dir / "run.jsonl"
+        recorder = mock_client(path, "record", mock={"latency": {"mean": 0.2}})
+        recorded = [recorder.generate_slide_analysis(f"Slide {n}", "Analyze", n) for n in (1, 2)]
+        recorder.cassette.close()
+
+        replayer = mock_client(path, "replay", mock={"rate_limit_rate": 1.0})
+        start = time.monotonic()
+        replayed = [replayer.generate_slide_analysis(f"Slide {n}", "Analyze", n) for n in (1, 2)]
+
+        assert replayed == recorded
+        assert time.monotonic() - start >= 0.4
+        assert replayer.last_usage["output_tokens"] > 0
+        assert replayer.get_cassette_stats()["replayed"] == 2
+
+    def test_recording_replaces_existing_cassette(self, temp_dir):
+        path = temp_dir / "run.jsonl"
+        path.write_text(json.dumps({"key": "k", "model": "m", "latency": 0.0, "response": "stale"}) + "\n")
+
+        cassette = Cassette(path, "record")
+        cassette.record("k", "m", 0.0, response="fresh")
+        cassette.close()
+
+        [entry] = [json.loads(line) for line in path.read_text().splitlines()]
+        assert entry["response"] == "fresh"
+        assert "offset" not in entry
+        assert Cassette(path, "replay", time_scale=0).play("k")[0] == "fresh"
+
+    def test_scaled_replay_timing(self, temp_dir):
+        path = temp_dir / "run.jsonl"
+        path.write_text(json.dumps({"key": "k", "model": "m", "latency": 10.0, "response": "ok"}) + "\n")
+
+        start = time.monotonic()
+        assert Cassette(path, "replay", time_scale=0.01).play("k")[0] == "ok"
+        assert 0.1 <= time.monotonic() - start < 1.0
+
+    def test_failures_replay_in_order(self, temp_dir):
+        path = temp_dir / "run.jsonl"
+        entries = [
+            {"key": "k", "model": "m", "latency": 0,
+             "error": {"kind": "rate_limit", "message": "429", "retry_after": 2.0}},
+            {"key": "k", "model": "m", "latency": 0, "response": "ok", "usage": {}},
+        ]
+        path.write_text("".join(json.dumps(entry) + "\n" for entry in entries))
+        cassette = Cassette(path, "replay")
+
+        with pytest.raises(ReplayedError) as exc_info:
+            cassette.play("k")
+        assert classify_error(exc_info.value) == (RATE_LIMIT, 2.0)
+        assert cassette.play("k")[0] == "ok"
+        assert cassette.play("k")[0] == "ok"
+
+    def test_recorded_failure_is_classified(self, temp_dir):
+        path = temp_dir / "run.jsonl"
+        client = mock_client(path, "record", mock={"rate_limit_rate": 1.0, "retry_after": 3})
+        with pytest.raises(LLMError):
+            client.generate_slide_analysis("text", "prompt", 1)
+        client.cassette.close()
+
+        replayer = mock_client(path, "replay")
+        with pytest.raises(LLMError) as exc_info:
+            replayer.generate_slide_analysis("text", "prompt", 1)
+        assert classify_error(exc_info.value) == (RATE_LIMIT, 3.0)
+
+    def test_unrecorded_request_fails(self, temp_dir):
+        path = temp_dir / "empty.jsonl"
+        path.write_text("")
+        client = mock_client(path, "replay")
+
+        with pytest.raises(LLMError, match="not in cassette"):
+            client.generate_slide_analysis("text", "prompt", 1)
+        assert client.get_cassette_stats()["misses"] == 1
+
+    def test_configuration(self, temp_dir):
+        assert create_cassette({"mode": "off"}) is None
+        with pytest.raises(CassetteError):
+            create_cassette({"mode": "record"})
+        with pytest.raises(CassetteError):
+            create_cassette({"mode": "rewind", "path": str(temp_dir / "c.jsonl")})
+
+        config = {"mode": "record", "path": str(temp_dir / "shared.jsonl")}
+        assert create_cassette(config) is create_cassette(dict(config))
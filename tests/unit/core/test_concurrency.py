@@ -0,0 +1,149 @@
+"""Unit tests for local OpenAI-compatible servers and endpoint request slots."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from slide_extract.core.concurrency import (
+    RequestSlots, get_request_slots, reset_request_slots, run_concurrently
+)
+from slide_extract.core.config_manager import ConfigManager
+from slide_extract.core.llm_client import LLMClient, LLMError
+from slide_extract.core.mock_provider import MockChatServer, MockResponder
+from slide_extract.core.note_generator import NoteGenerator
+from slide_extract.core.pdf_processor import SlideContent
+
+
+@pytest.fixture(autouse=True)
+def fresh_slots():
+    """Endpoint slots are process-wide; start every test without any."""
+    reset_request_slots()
+    yield
+    reset_request_slots()
+
+
+def local_client(base_url, **config):
+    return LLMClient({"provider": "openai_compatible", "model": "local-model", "base_url": base_url, **config})
+
+
+def progress():
+    manager = Mock()
+    manager.output_path = None
+    manager.file_path = "deck.pdf"
+    return manager
+
+
+class TestRequestSlots:
+    """Test the per-endpoint concurrency bound."""
+
+    def test_slots_bound_concurrent_tasks(self):
+        slots = RequestSlots(2)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def task():
+            with slots.acquire():
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.05)
+                with lock:
+                    active[0] -= 1
+            return "done"
+
+        outcomes = run_concurrently({n: task for n in range(5)}, max_workers=5)
+
+        assert peak[0] == 2
+        assert list(outcomes) == [0, 1, 2, 3, 4]
+        assert all(outcome == ("done", None) for outcome in outcomes.values())
+        assert slots.get_stats()["waited"] >= 1
+
+    def test_errors_are_returned_per_task(self):
+        def fail():
+            raise ValueError("boom")
+
+        outcomes = run_concurrently({"ok": lambda: 1, "bad": fail}, max_workers=2)
+        assert outcomes["ok"] == (1, None)
+        assert isinstance(outcomes["bad"][1], ValueError)
+
+    def test_endpoint_slots_are_shared(self):
+        assert get_request_slots("http://local/v1", 4) is get_request_slots("http://local/v1", 2)
+        assert get_request_slots("http://local/v1", 2).limit == 4
+
+
+class TestOpenAICompatibleProvider:
+    """Test the keyless local-server provider against the stand-in server."""
+
+    def test_requires_base_url_but_no_key(self):
+        with pytest.raises(LLMError, match="base_url"):
+            LLMClient({"provider": "openai_compatible", "model": "local-model"})
+
+        with MockChatServer(MockResponder()) as server:
+            client = local_client(server.base_url)
+            response = client.generate_slide_analysis("Local inference", "Analyze", 1)
+            assert "**Slide Number:** 1" in response
+            assert client.health_check() is True
+
+    def test_text_only_fallback(self):
+        with MockChatServer(MockResponder(), vision=False) as server:
+            client = local_client(server.base_url)
+            # Declared as a vision model, but the server has no image support
+            client.model = "local-llava"
+            assert client.capabilities.vision
+
+            response = client.generate_slide_analysis("Diagram", "Analyze", 1, image_base64="aGVsbG8=")
+            assert "**Slide Number:** 1" in response
+            assert client.vision_disabled
+            assert not client.capabilities.vision
+
+    def test_optional_api_key(self, temp_dir):
+        config_file = temp_dir / "config.yaml"
+        config_file.write_text(
+            "llm:\n"
+            "  provider: openai_compatible\n"
+            "  model: local-model\n"
+            "  base_url: http://127.0.0.1:8080/v1\n"
+        )
+        manager = ConfigManager(config_file)
+        manager.api_keys = {}
+        assert "api_key" not in manager.get_llm_config()
+
+        manager = ConfigManager(config_file)
+        manager.api_keys = {"OPENAI_COMPATIBLE_API_KEY": "local-secret"}
+        assert manager.get_llm_config()["api_key"] == "local-secret"
+
+
+class TestConcurrentWindows:
+    """Test slides requested concurrently up to the server's slots."""
+
+    def test_window_matches_server_slots(self):
+        slides = {n: SlideContent(n, f"Topic {n} " * 20) for n in range(1, 6)}
+        with MockChatServer(MockResponder(latency_mean=0.1)) as server:
+            generator = NoteGenerator(local_client(server.base_url, max_concurrency=2))
+            notes = generator.generate_notes_for_slide_contents_resumable(slides, "Analyze", progress())
+
+            assert server.peak_in_flight == 2
+        assert [line for line in notes.split("\n") if line.startswith("**Slide Number:**")] == [
+            f"**Slide Number:** {n}" for n in range(1, 6)
+        ]
+
+    def test_each_slide_records_its_own_model(self):
+        client = LLMClient({"provider": "mock", "model": "mock-1", "max_concurrency": 2})
+        generate = client.generate_slide_analysis
+        both_answered = threading.Barrier(2)
+
+        def analysis(text, prompt, slide_number, **kwargs):
+            response = generate(text, prompt, slide_number, **kwargs)
+            client.last_model = f"mock/slide-{slide_number}"
+            # Both workers record their model before either reads it back
+            both_answered.wait(timeout=5)
+            return response
+
+        client.generate_slide_analysis = analysis
+        slides = {n: SlideContent(n, f"Topic {n} " * 20) for n in range(1, 3)}
+        notes = NoteGenerator(client).generate_notes_for_slide_contents_resumable(slides, "Analyze", progress())
+
+        assert notes.count("<!-- model: mock/slide-1 -->") == 1
+        assert notes.count("<!-- model: mock/slide-2 -->") == 1
@@ -0,0 +1,152 @@
+"""Unit tests for the provider failover chain and circuit breakers."""
+
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+
+from slide_extract.core.config_manager import ConfigManager
+from slide_extract.core.failover import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, FailoverLLMClient, create_failover_client
+)
+from slide_extract.core.llm_client import LLMClient, LLMError
+from slide_extract.core.note_generator import NoteGenerator
+
+
+def make_client(provider="openai", model="gpt-4o"):
+    with patch.object(LLMClient, "_initialize_client", return_value=Mock()):
+        return LLMClient({"provider": provider, "model": model, "api_key": "test"})
+
+
+class TestCircuitBreaker:
+    """Test circuit state transitions."""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success(0.1)
+        breaker.record_failure()
+
+        assert breaker.state == CLOSED
+
+    def test_latency_spikes_open_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=2, latency_threshold=1.0)
+        breaker.record_success(5.0)
+        breaker.record_success(5.0)
+
+        assert breaker.state == OPEN
+
+    def test_half_open_admits_single_probe(self):
+        """After the reset timeout one probe is allowed; success closes the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.1)
+
+        assert breaker.allow_request()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow_request()
+
+        breaker.record_success(0.1)
+        assert breaker.state == CLOSED
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.05)
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.1)
+
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.times_opened == 2
+
+
+class TestFailoverLLMClient:
+    """Test request routing across the chain."""
+
+    def test_fails_over_to_next_entry(self):
+        primary, fallback = make_client(), make_client("anthropic", "claude-3-5-sonnet-20241022")
+        client = FailoverLLMClient([primary, fallback], {"failure_threshold": 1})
+
+        with patch.object(primary, "_generate_text_response", side_effect=LLMError("overloaded")), \
+                patch.object(fallback, "_generate_text_response", return_value="fallback analysis"):
+            assert client.generate_slide_analysis("text", "prompt", 1) == "fallback analysis"
+
+        assert client.last_model == "anthropic/claude-3-5-sonnet-20241022"
+        assert client.breakers[0].state == OPEN
+
+    def test_open_circuit_skips_entry(self):
+        primary, fallback = make_client(), make_client(model="gpt-4o-mini")
+        client = FailoverLLMClient([primary, fallback], {"failure_threshold": 1, "reset_timeout": 60})
+        client.breakers[0].record_failure()
+
+        with patch.object(primary, "_generate_text_response") as primary_call, \
+                patch.object(fallback, "_generate_text_response", return_value="ok"):
+            client.generate_slide_analysis("text", "prompt", 1)
+            client.generate_slide_analysis("text", "prompt", 2)
+
+        primary_call.assert_not_called()
+        assert client.get_failover_stats()["responses_by_model"] == {"openai/gpt-4o-mini": 2}
+
+    def test_error_when_every_entry_fails(self):
+        primary, fallback = make_client(), make_client(model="gpt-4o-mini")
+        client = FailoverLLMClient([primary, fallback])
+
+        with patch.object(primary, "_generate_text_response", side_effect=LLMError("down")), \
+                patch.object(fallback, "_generate_text_response", side_effect=LLMError("also down")):
+            with pytest.raises(LLMError, match="also down"):
+                client.generate_slide_analysis("text", "prompt", 1)
+
+    def test_single_entry_returns_plain_client(self):
+        with patch.object(LLMClient, "_initialize_client", return_value=Mock()):
+            client = create_failover_client([{"provider": "openai", "model": "gpt-4o", "api_key": "k"}])
+        assert isinstance(client, LLMClient)
+
+
+class TestChainConfiguration:
+    """Test the failover chain read from configuration."""
+
+    def test_fallbacks_inherit_primary_settings(self, temp_dir):
+        config_file = temp_dir / "config.yaml"
+        config_file.write_text(
+            "llm:\n"
+            "  provider: google\n"
+            "  model: gemini-2.5-flash\n"
+            "  temperature: 0.1\n"
+            "  fallbacks:\n"
+            "    - provider: openai\n"
+            "      model: gpt-4o\n"
+            "    - provider: anthropic\n"
+            "      model: claude-3-5-sonnet-20241022\n"
+        )
+        manager = ConfigManager(config_file)
+        manager.api_keys = {"GOOGLE_AI_API_KEY": "g", "OPENAI_API_KEY": "o"}
+
+        chain = manager.get_llm_chain_config()
+
+        # The Anthropic entry has no API key and is skipped
+        assert [entry["provider"] for entry in chain] == ["google", "openai"]
+        assert chain[1]["temperature"] == 0.1
+        assert chain[1]["api_key"] == "o"
+        assert "fallbacks" not in chain[1]
+
+
+class TestModelMetadata:
+    """Test that the producing model is recorded in the output."""
+
+    def test_model_comment_added(self):
+        generator = NoteGenerator()
+        formatted = generator._format_slide_analysis(
+            "**Slide Number:** 1\n\nText", 1, Mock(), model="openai/gpt-4o"
+        )
+        assert "<!-- model: openai/gpt-4o -->" in formatted
+        assert formatted.endswith("---\n\n")
@@ -0,0 +1,82 @@
+"""Unit tests for the cached startup health check."""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from slide_extract.core.health_check import (
+    HealthCheckCache, HealthCheckError, compute_health_key, create_health_check_cache
+)
+from slide_extract.core.llm_client import LLMClient
+from slide_extract.core.mock_provider import MockChatServer, MockResponder
+
+
+def remote_client(base_url, api_key="key"):
+    return LLMClient({"provider": "openrouter", "model": "mock", "api_key": api_key, "base_url": base_url})
+
+
+class TestHealthCheckCache:
+    """Test TTL handling of the state file."""
+
+    def test_success_is_fresh_until_ttl(self, temp_dir):
+        cache = HealthCheckCache(temp_dir / "health.json", ttl=60)
+        cache.record_success("key")
+
+        assert cache.is_fresh("key")
+        assert not cache.is_fresh("other")
+        with patch("slide_extract.core.health_check.time.time", return_value=json.loads(
+            (temp_dir / "health.json").read_text()
+        )["key"] + 61):
+            assert not cache.is_fresh("key")
+
+    def test_state_is_shared_across_instances(self, temp_dir):
+        HealthCheckCache(temp_dir / "health.json").record_success("key")
+        assert HealthCheckCache(temp_dir / "health.json").is_fresh("key")
+
+    def test_corrupt_state_file_is_ignored(self, temp_dir):
+        state_path = temp_dir / "health.json"
+        state_path.write_text("not json")
+        cache = HealthCheckCache(state_path)
+
+        assert not cache.is_fresh("key")
+        cache.record_success("key")
+        assert cache.is_fresh("key")
+
+    def test_key_depends_on_credentials(self):
+        assert compute_health_key("openai", "gpt-4o", None, "a") != compute_health_key("openai", "gpt-4o", None, "b")
+
+    def test_configuration(self, temp_dir):
+        assert create_health_check_cache({"ttl": 0}) is None
+        assert create_health_check_cache({"ttl": 10, "state_path": str(temp_dir / "h.json")}).ttl == 10
+        with pytest.raises(HealthCheckError):
+            HealthCheckCache(temp_dir / "h.json", ttl=-1)
+
+
+class TestLLMHealthCheck:
+    """Test the provider probes and their use of the cache."""
+
+    def test_probe_lists_models_and_caches_success(self, temp_dir):
+        cache = HealthCheckCache(temp_dir / "health.json")
+        responder = MockResponder()
+        with MockChatServer(responder) as server:
+            base_url = server.base_url
+            assert remote_client(base_url).health_check(cache)
+
+        # No generation was requested; with the server gone the cached success is reused
+        assert responder.get_stats()["requests"] == 0
+        assert remote_client(base_url).health_check(cache)
+
+    def test_failed_probe_is_not_cached(self, temp_dir):
+        cache = HealthCheckCache(temp_dir / "health.json")
+
+        assert not remote_client("http://127.0.0.1:9/v1").health_check(cache)
+        assert not (temp_dir / "health.json").exists()
+
+    def test_openai_probe_uses_model_metadata(self):
+        client = LLMClient({"provider": "openai", "model": "gpt-4o", "api_key": "key"})
+        client.client = Mock()
+
+        assert client.health_check()
+        client.client.models.retrieve.assert_called_once_with("gpt-4o")
+        client.client.chat.completions.create.assert_not_called()
@@ -0,0 +1,173 @@
+"""Unit tests for hedged LLM requests."""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+
+from slide_extract.core.hedging import LatencyTracker, RequestHedger, create_request_hedger
+from slide_extract.core.llm_client import LLMClient
+
+
+def warmed_hedger(**kwargs) -> RequestHedger:
+    """Create a hedger whose latency window already holds fast requests."""
+    params = {"min_samples": 5, "min_delay": 0.05, "max_hedge_rate": 1.0}
+    params.update(kwargs)
+    hedger = RequestHedger(**params)
+    for _ in range(10):
+        hedger.latencies.record(0.01)
+    hedger.stats["requests"] = 10
+    return hedger
+
+
+def slow(result, seconds):
+    def call(cancel):
+        if cancel.wait(seconds):
+            raise RuntimeError("cancelled")
+        return result
+    return call
+
+
+class TestLatencyTracker:
+    """Test rolling percentile computation."""
+
+    def test_percentile(self):
+        tracker = LatencyTracker(window=100)
+        for value in range(1, 101):
+            tracker.record(float(value))
+
+        assert tracker.percentile(50) == 50.0
+        assert tracker.percentile(95) == 95.0
+
+    def test_window_drops_old_samples(self):
+        tracker = LatencyTracker(window=3)
+        for value in (100.0, 1.0, 2.0, 3.0):
+            tracker.record(value)
+
+        assert tracker.percentile(100) == 3.0
+
+
+class TestRequestHedger:
+    """Test hedge triggering, winner selection and the rate cap."""
+
+    def test_fast_request_is_not_hedged(self):
+        """Requests finishing before the threshold never send a hedge."""
+        hedger = warmed_hedger()
+        hedge = Mock()
+
+        assert hedger.run(lambda cancel: "primary", hedge) == "primary"
+        hedge.assert_not_called()
+        assert hedger.get_stats()["hedged"] == 0
+
+    def test_hedge_wins_and_primary_is_cancelled(self):
+        """A slow original is hedged and cancelled when the hedge wins."""
+        hedger = warmed_hedger()
+        primary_cancelled = threading.Event()
+
+        def primary(cancel):
+            if cancel.wait(2):
+                primary_cancelled.set()
+            return "primary"
+
+        started = time.monotonic()
+        assert hedger.run(primary, lambda cancel: "hedge") == "hedge"
+        assert time.monotonic() - started < 1
+
+        assert primary_cancelled.wait(1)
+        stats = hedger.get_stats()
+        assert stats["hedged"] == 1
+        assert stats["hedge_wins"] == 1
+        assert stats["cancelled"] == 1
+
+    def test_invalid_response_does_not_win(self):
+        """The first valid response wins, not the first response."""
+        hedger = warmed_hedger()
+
+        result = hedger.run(
+            slow("valid primary", 0.2), lambda cancel: "bad",
+            validate=lambda text: text.startswith("valid")
+        )
+        assert result == "valid primary"
+
+    def test_rejected_response_is_returned_when_none_is_valid(self):
+        """Without a valid response the original's is returned for the caller to repair."""
+        hedger = warmed_hedger()
+
+        result = hedger.run(slow("bad primary", 0.2), lambda cancel: "bad hedge", validate=lambda text: False)
+        assert result == "bad primary"
+        assert hedger.get_stats()["hedge_wins"] == 0
+
+    def test_hedge_rate_cap(self):
+        """No hedge is sent once the hedge budget is used up."""
+        hedger = warmed_hedger(max_hedge_rate=0.0)
+        hedge = Mock(return_value="hedge")
+
+        assert hedger.run(slow("primary", 0.15), hedge) == "primary"
+        hedge.assert_not_called()
+
+    def test_no_hedging_before_warm_up(self):
+        """Hedging waits for enough latency samples."""
+        hedger = RequestHedger(min_samples=10, min_delay=0.0, max_hedge_rate=1.0)
+        hedge = Mock(return_value="hedge")
+
+        assert hedger.run(slow("primary", 0.1), hedge) == "primary"
+        hedge.assert_not_called()
+
+    def test_primary_error_propagates(self):
+        """A failed original is surfaced for the retry policy to handle."""
+        hedger = warmed_hedger()
+
+        def fail(cancel):
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            hedger.run(fail, Mock())
+
+    def test_factory_disabled_by_default(self):
+        assert create_request_hedger({}) is None
+        assert isinstance(create_request_hedger({"enabled": True}), RequestHedger)
+
+
+class TestLLMClientHedging:
+    """Test hedging in the LLM client call path."""
+
+    def test_hedges_to_alternate_model(self):
+        """Slow requests are duplicated to the configured alternate model."""
+        with patch.object(LLMClient, "_initialize_client", return_value=Mock()):
+            client = LLMClient({
+                "provider": "openai", "model": "gpt-4o", "api_key": "test",
+                "hedging": {"enabled": True, "model": "gpt-4o-mini"},
+            })
+        client.hedger = warmed_hedger()
+
+        assert client.hedge_client.model == "gpt-4o-mini"
+        with patch.object(client, "_generate_text_response", side_effect=lambda *a: time.sleep(1) or "slow"), \
+                patch.object(client.hedge_client, "_generate_text_response", return_value="fast"):
+            assert client.generate_slide_analysis("text", "prompt", 1) == "fast"
+
+        assert client.get_hedging_stats()["hedge_wins"] == 1
+
+    def test_garbage_hedge_does_not_win(self):
+        """An empty or truncated hedge response loses to the slower complete original."""
+        with patch.object(LLMClient, "_initialize_client", return_value=Mock()):
+            client = LLMClient({
+                "provider": "openai", "model": "gpt-4o", "api_key": "test",
+                "hedging": {"enabled": True, "model": "gpt-4o-mini"},
+            })
+
+        def slow_analysis(*args):
+            time.sleep(0.3)
+            return "complete analysis"
+
+        def truncated(*args):
+            client.hedge_client._request_state.truncated = True
+            return "cut off mid-"
+
+        for garbage in (lambda *a: "  ", truncated):
+            client.hedger = warmed_hedger()
+            with patch.object(client, "_generate_text_response", side_effect=slow_analysis), \
+                    patch.object(client.hedge_client, "_generate_text_response", side_effect=garbage):
+                assert client.generate_slide_analysis("text", "prompt", 1) == "complete analysis"
+            assert client.get_hedging_stats()["hedged"] == 1
+            assert client.get_hedging_stats()["hedge_wins"] == 0
@@ -0,0 +1,104 @@
+"""Unit tests for the shared pooled HTTP transport."""
+
+import threading
+
+import pytest
+
+from slide_extract.core import http_transport
+from slide_extract.core.failover import FailoverLLMClient
+from slide_extract.core.http_transport import (
+    HTTPTransportError, close_shared_http_client, configure_http_transport,
+    get_shared_http_client, prewarm_connections, start_prewarm
+)
+from slide_extract.core.llm_client import LLMClient
+from slide_extract.core.mock_provider import MockChatServer, MockResponder, _ChatCompletionsHandler
+
+
+@pytest.fixture(autouse=True)
+def fresh_transport():
+    """Start each test without a shared client and restore the defaults afterwards."""
+    close_shared_http_client()
+    configure_http_transport(None)
+    yield
+    close_shared_http_client()
+    configure_http_transport(None)
+
+
+def pool(client):
+    return client._transport._pool
+
+
+class TestSharedClient:
+    """Test that provider clients share one configured pool."""
+
+    def test_provider_clients_share_one_pool(self):
+        openai_client = LLMClient({"provider": "openai", "model": "gpt-4o", "api_key": "k"})
+        anthropic_client = LLMClient({"provider": "anthropic", "model": "claude-3-haiku-20240307", "api_key": "k"})
+
+        shared = get_shared_http_client()
+        assert openai_client.client._client is shared
+        assert anthropic_client.client._client is shared
+
+    def test_pool_limits_are_configurable(self):
+        configure_http_transport({"max_connections": 5, "max_keepalive_connections": 2})
+        connection_pool = pool(get_shared_http_client())
+
+        assert connection_pool._max_connections == 5
+        assert connection_pool._max_keepalive_connections == 2
+
+    def test_invalid_limits_are_rejected(self):
+        with pytest.raises(HTTPTransportError):
+            configure_http_transport({"max_connections": 2, "max_keepalive_connections": 5})
+
+    def test_http2_falls_back_without_h2(self, monkeypatch):
+        monkeypatch.setattr(http_transport, "http2_available", lambda: False)
+        configure_http_transport({"http2": True})
+
+        assert pool(get_shared_http_client())._http2 is False
+
+    def test_configuration_after_creation_is_ignored(self):
+        first = get_shared_http_client()
+        configure_http_transport({"max_connections": 1, "max_keepalive_connections": 1})
+
+        assert get_shared_http_client() is first
+        assert pool(first)._max_connections == 20
+
+
+class TestPrewarm:
+    """Test opening pooled connections ahead of the first request."""
+
+    def test_prewarm_opens_pooled_connections(self, monkeypatch):
+        # Hold every response until all three HEADs are in flight, so none can
+        # reuse a connection released by an earlier one
+        all_in_flight = threading.Barrier(3)
+        do_head = _ChatCompletionsHandler.do_HEAD
+
+        def held_head(handler):
+            all_in_flight.wait(timeout=5)
+            do_head(handler)
+
+        monkeypatch.setattr(_ChatCompletionsHandler, "do_HEAD", held_head)
+        with MockChatServer(MockResponder()) as server:
+            warmed = prewarm_connections([server.base_url, server.base_url], connections=3)
+            idle = len(pool(get_shared_http_client()).connections)
+
+        assert warmed == 3
+        assert idle == 3
+
+    def test_unreachable_endpoint_is_ignored(self):
+        assert prewarm_connections(["http://127.0.0.1:9"], connections=1) == 0
+
+    def test_disabled_prewarm_starts_no_thread(self):
+        configure_http_transport({"prewarm": False})
+        assert start_prewarm(["http://127.0.0.1:9"]) is None
+
+    def test_endpoint_urls(self):
+        with MockChatServer(MockResponder()) as server:
+            remote = LLMClient({
+                "provider": "openrouter", "model": "mock", "api_key": "k", "base_url": server.base_url
+            })
+            local = LLMClient({"provider": "mock", "model": "mock-1"})
+            urls = FailoverLLMClient([local, remote]).endpoint_urls()
+
+            assert urls == [str(remote.client.base_url)]
+            assert start_prewarm(urls).join(5) is None
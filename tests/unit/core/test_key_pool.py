@@ -0,0 +1,165 @@
+"""Unit tests for API key/endpoint pools balanced by rate-limit headroom."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from slide_extract.core.config_manager import ConfigManager
+from slide_extract.core.failover import create_failover_client
+from slide_extract.core.key_pool import (
+    KeyPoolError, KeyPoolLLMClient, create_key_pool_client, parse_reset
+)
+from slide_extract.core.llm_client import LLMError
+from slide_extract.core.mock_provider import MockChatServer, MockResponder
+from slide_extract.core.retry_policy import RATE_LIMIT, classify_error
+
+
+def pool_config(base_url, *keys, **config):
+    return {
+        "provider": "openrouter", "model": "mock", "api_key": keys[0], "base_url": base_url,
+        "key_pool": {"enabled": True, "members": [{"name": key, "api_key": key} for key in keys]},
+        **config,
+    }
+
+
+def analyze(client, slide_number=1):
+    return client.generate_slide_analysis(f"Slide {slide_number}", "Analyze", slide_number)
+
+
+class TestParseReset:
+    """Test the rate-limit reset header formats."""
+
+    def test_formats(self):
+        assert parse_reset("12") == 12.0
+        assert parse_reset("6m0s") == 360.0
+        assert parse_reset("1.5s") == 1.5
+        assert parse_reset("250ms") == 0.25
+        assert parse_reset("2000-01-01T00:00:00Z") == 0.0
+        assert parse_reset("soon") is None
+        assert parse_reset(None) is None
+
+
+class TestKeyPool:
+    """Test member selection and per-member accounting."""
+
+    def test_without_pool_returns_plain_client(self):
+        client = create_key_pool_client({"provider": "mock", "model": "mock-1"})
+        assert not isinstance(client, KeyPoolLLMClient)
+
+    def test_spreads_requests_without_known_limits(self):
+        client = create_key_pool_client({
+            "provider": "mock", "model": "mock-1",
+            "key_pool": {"enabled": True, "members": [{"name": "a"}, {"name": "b"}]},
+        })
+        for n in range(1, 5):
+            analyze(client, n)
+
+        assert [member["requests"] for member in client.get_key_pool_stats()["members"]] == [2, 2]
+        assert client.last_model == "mock/mock-1"
+
+    def test_concurrent_usage_is_counted_per_request(self):
+        client = create_key_pool_client({
+            "provider": "mock", "model": "mock-1",
+            "key_pool": {"enabled": True, "members": [{"name": "a"}]},
+        })
+        member_client = client.members[0].client
+        generate = member_client.generate_slide_analysis
+        all_sent = threading.Barrier(4)
+
+        def generate_then_wait(*args, **kwargs):
+            # Every request finishes before the pool reads any usage
+            response = generate(*args, **kwargs)
+            all_sent.wait(timeout=5)
+            return response
+
+        member_client.generate_slide_analysis = generate_then_wait
+
+        def request(slide_number):
+            client.generate_slide_analysis("word " * 50 * slide_number, "Analyze", slide_number)
+            usage = member_client.last_usage
+            return usage["input_tokens"] + usage["output_tokens"]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            seen = list(executor.map(request, range(1, 5)))
+
+        assert len(set(seen)) == 4
+        assert client.get_key_pool_stats()["members"][0]["tokens"] == sum(seen)
+
+    def test_headroom_from_rate_limit_headers(self):
+        with MockChatServer(MockResponder(), requests_per_minute=2) as server:
+            client = create_key_pool_client(pool_config(server.base_url, "key-a", "key-b"))
+            for n in range(1, 5):
+                analyze(client, n)
+
+            stats = client.get_key_pool_stats()["members"]
+            assert [member["requests"] for member in stats] == [2, 2]
+            assert [member["requests_per_minute"] for member in stats] == [2, 2]
+            assert [member["headroom"] for member in stats] == [0.0, 0.0]
+            assert all(member["rate_limited"] == 0 for member in stats)
+
+    def test_rate_limited_member_is_skipped(self):
+        with MockChatServer(MockResponder(), requests_per_minute=1) as server:
+            exhausted = create_key_pool_client(pool_config(server.base_url, "key-a"))
+            analyze(exhausted)
+
+            # key-a is already exhausted by another client; the request moves to key-b
+            client = create_key_pool_client(pool_config(server.base_url, "key-a", "key-b"))
+            analyze(client)
+            first, second = client.get_key_pool_stats()["members"]
+            assert (first["rate_limited"], first["cooling_down"]) == (1, True)
+            assert (second["requests"], second["errors"]) == (1, 0)
+
+            with pytest.raises(LLMError) as exc_info:
+                analyze(client, 2)
+            assert classify_error(exc_info.value)[0] == RATE_LIMIT
+
+    def test_several_google_keys_are_rejected(self):
+        with pytest.raises(KeyPoolError):
+            create_key_pool_client({
+                "provider": "google", "model": "gemini-2.5-flash", "api_key": "a",
+                "key_pool": {"enabled": True, "members": [{"api_key": "a"}, {"api_key": "b"}]},
+            })
+
+    def test_failover_entries_are_pooled(self):
+        client = create_failover_client([{
+            "provider": "mock", "model": "mock-1",
+            "key_pool": {"enabled": True, "members": [{"name": "a"}, {"name": "b"}]},
+        }])
+        assert isinstance(client, KeyPoolLLMClient)
+        assert client.health_check() is True
+
+
+class TestKeyPoolConfiguration:
+    """Test resolving member keys from the key file and environment."""
+
+    def test_member_keys_are_resolved(self, temp_dir, monkeypatch):
+        config_file = temp_dir / "config.yaml"
+        config_file.write_text(
+            "llm:\n"
+            "  provider: openai\n"
+            "  model: gpt-4o\n"
+            "  key_pool:\n"
+            "    enabled: true\n"
+            "    members:\n"
+            "      - api_key_env: OPENAI_API_KEY\n"
+            "      - api_key_env: OPENAI_API_KEY_2\n"
+            "        requests_per_minute: 5000\n"
+            "      - api_key_env: OPENAI_API_KEY_3\n"
+            "      - base_url: https://proxy.example.com/v1\n"
+            "  fallbacks:\n"
+            "    - model: gpt-4o-mini\n"
+        )
+        monkeypatch.setenv("OPENAI_API_KEY_2", "second")
+        monkeypatch.delenv("OPENAI_API_KEY_3", raising=False)
+        manager = ConfigManager(config_file)
+        manager.api_keys = {"OPENAI_API_KEY": "first"}
+
+        primary, fallback = manager.get_llm_chain_config()
+        members = primary["key_pool"]["members"]
+
+        # OPENAI_API_KEY_3 is missing and skipped
+        assert [member.get("api_key") for member in members] == ["first", "second", None]
+        assert members[1]["requests_per_minute"] == 5000
+        assert members[2]["base_url"] == "https://proxy.example.com/v1"
+        assert "key_pool" not in fallback
@@ -0,0 +1,199 @@
+"""Unit tests for the LLM client."""
+
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+
+from slide_extract.core.concurrency import run_concurrently
+from slide_extract.core.llm_client import LLMClient, LLMError
+
+
+def make_client(provider="openai", model="gpt-4o", **config):
+    """Create an LLM client with a mocked provider SDK client."""
+    config.update({"provider": provider, "model": model, "api_key": "test-key"})
+    with patch.object(LLMClient, "_initialize_client", return_value=Mock()):
+        return LLMClient(config)
+
+
+class TestPromptCaching:
+    """Test placement of the static instructions in a cacheable prefix."""
+
+    def test_slide_prompt_composes_instructions_and_message(self):
+        """The combined prompt is the instructions followed by the slide message."""
+        client = make_client()
+        message = client._create_slide_message("slide text", 3, "context")
+        full_prompt = client._create_slide_prompt("slide text", "INSTRUCTIONS", 3, "context")
+
+        assert full_prompt == f"\nINSTRUCTIONS\n\n{message}"
+        assert "INSTRUCTIONS" not in message
+        assert "**Slide Number:** 3" in message
+
+    def test_openai_sends_instructions_as_leading_system_message(self):
+        """OpenAI requests start with the static system message."""
+        client = make_client()
+        response = Mock()
+        response.choices = [Mock(message=Mock(content="analysis"))]
+        response.usage = Mock(prompt_tokens=1200, completion_tokens=300,
+                              prompt_tokens_details=Mock(cached_tokens=1024))
+        client.client.chat.completions.create.return_value = response
+
+        client.generate_slide_analysis("slide text", "INSTRUCTIONS", 1, image_base64="aW1n")
+
+        messages = client.client.chat.completions.create.call_args[1]["messages"]
+        assert messages[0] == {"role": "system", "content": "INSTRUCTIONS"}
+        assert messages[1]["role"] == "user"
+        assert client.last_usage["cached_tokens"] == 1024
+
+    def test_anthropic_marks_instructions_cacheable(self):
+        """Anthropic requests carry a cache_control system block."""
+        client = make_client(provider="anthropic", model="claude-3-5-sonnet-20241022")
+        response = Mock()
+        response.content = [Mock(text="analysis")]
+        response.usage = Mock(input_tokens=50, output_tokens=300,
+                              cache_read_input_tokens=1100, cache_creation_input_tokens=0)
+        client.client.messages.create.return_value = response
+
+        client.generate_slide_analysis("slide text", "INSTRUCTIONS", 1)
+
+        kwargs = client.client.messages.create.call_args[1]
+        assert kwargs["system"][0]["text"] == "INSTRUCTIONS"
+        assert kwargs["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert "INSTRUCTIONS" not in kwargs["messages"][0]["content"]
+        assert client.last_usage["cached_tokens"] == 1100
+
+    def test_google_reuses_model_per_prompt(self):
+        """Gemini models with attached instructions are created once per prompt."""
+        client = make_client(provider="google", model="gemini-1.5-flash")
+        model = Mock()
+        model.generate_content.return_value = Mock(text="analysis", usage_metadata=None)
+
+        with patch.object(client, "_get_google_model", return_value=model) as mock_get:
+            client.generate_slide_analysis("slide 1", "INSTRUCTIONS", 1)
+            client.generate_slide_analysis("slide 2", "INSTRUCTIONS", 2)
+
+        mock_get.assert_called_with("INSTRUCTIONS")
+        assert model.generate_content.call_count == 2
+
+    def test_google_cached_content_is_created_once_and_deleted_on_close(self):
+        """Concurrent slides share one cached content, which close() deletes."""
+        from google.generativeai import GenerativeModel, caching
+
+        client = make_client(provider="google", model="gemini-1.5-flash")
+        cached_content = Mock()
+        cached_content.name = "cachedContents/abc"
+
+        def create(**kwargs):
+            time.sleep(0.05)
+            return cached_content
+
+        with patch.object(caching.CachedContent, "create", side_effect=create) as mock_create, \
+                patch.object(GenerativeModel, "from_cached_content", return_value=Mock()):
+            outcomes = run_concurrently(
+                {n: lambda: client._get_google_model("INSTRUCTIONS") for n in range(4)}, max_workers=4
+            )
+
+        assert mock_create.call_count == 1
+        assert len({id(model) for model, _ in outcomes.values()}) == 1
+
+        client.close()
+        client.close()
+        cached_content.delete.assert_called_once()
+
+    def test_prompt_caching_disabled_sends_combined_prompt(self):
+        """Without prompt caching a single user message is sent."""
+        client = make_client(prompt_caching=False)
+        response = Mock()
+        response.choices = [Mock(message=Mock(content="analysis"))]
+        client.client.chat.completions.create.return_value = response
+
+        client.generate_slide_analysis("slide text", "INSTRUCTIONS", 1)
+
+        messages = client.client.chat.completions.create.call_args[1]["messages"]
+        assert len(messages) == 1
+        assert "INSTRUCTIONS" in messages[0]["content"]
+
+    def test_provider_error_wrapped(self):
+        """Provider failures surface as LLMError."""
+        client = make_client()
+        client.client.chat.completions.create.side_effect = RuntimeError("boom")
+
+        with pytest.raises(LLMError, match="boom"):
+            client.generate_slide_analysis("slide text", "INSTRUCTIONS", 1)
+
+
+class TestPackedRequests:
+    """Test multi-slide packed requests."""
+
+    def test_packed_request_attaches_every_image(self):
+        """A packed request sends all slide images in one call."""
+        from slide_extract.core.pdf_processor import SlideContent
+
+        client = make_client()
+        response = Mock()
+        response.choices = [Mock(message=Mock(content="packed"))]
+        client.client.chat.completions.create.return_value = response
+        slides = [SlideContent(n, f"text {n}", f"aW1n{n}", True, 1) for n in (4, 5)]
+
+        assert client.generate_packed_slide_analysis(slides, "INSTRUCTIONS") == "packed"
+
+        content = client.client.chat.completions.create.call_args[1]["messages"][1]["content"]
+        assert [part["type"] for part in content] == ["text", "image_url", "image_url"]
+        assert "<<<SLIDE 4>>>" in content[0]["text"]
+
+
+class TestReasoning:
+    """Test provider-specific reasoning controls and thinking-token usage."""
+
+    def test_openai_reasoning_effort(self):
+        client = make_client(model="o3-mini", reasoning={"effort": "low"})
+        response = Mock()
+        response.choices = [Mock(message=Mock(content="analysis"), finish_reason="stop")]
+        response.usage = Mock(prompt_tokens=100, completion_tokens=400,
+                              completion_tokens_details=Mock(reasoning_tokens=250))
+        client.client.chat.completions.create.return_value = response
+
+        client.generate_slide_analysis("slide text", "INSTRUCTIONS", 1)
+
+        kwargs = client.client.chat.completions.create.call_args[1]
+        assert kwargs["extra_body"] == {"reasoning_effort": "low"}
+        assert kwargs["max_completion_tokens"] == client.max_tokens
+        assert "temperature" not in kwargs and "max_tokens" not in kwargs
+        assert client.last_usage["thinking_tokens"] == 250
+
+    def test_anthropic_thinking_budget(self):
+        client = make_client(
+            provider="anthropic", model="claude-3-7-sonnet-20250219", max_tokens=4000,
+            reasoning={"budget_tokens": 2048},
+        )
+        response = Mock()
+        response.content = [
+            Mock(type="thinking", thinking="step " * 40), Mock(type="text", text="analysis"),
+        ]
+        response.usage = Mock(input_tokens=50, output_tokens=300,
+                              cache_read_input_tokens=0, cache_creation_input_tokens=0, thinking_tokens=None)
+        client.client.messages.create.return_value = response
+
+        assert client.generate_slide_analysis("slide text", "INSTRUCTIONS", 1) == "analysis"
+
+        kwargs = client.client.messages.create.call_args[1]
+        assert kwargs["extra_body"] == {"thinking": {"type": "enabled", "budget_tokens": 2048}}
+        assert kwargs["max_tokens"] == 6048
+        assert "temperature" not in kwargs
+        assert client.last_usage["thinking_tokens"] > 0
+
+    def test_effort_maps_to_budget_and_cache_key(self):
+        client = make_client(provider="google", model="gemini-2.5-flash", reasoning={"effort": "minimal"})
+        assert client.thinking_budget == 0
+        assert client.cache_model_id != make_client(provider="google", model="gemini-2.5-flash").cache_model_id
+
+        with pytest.raises(LLMError, match="reasoning effort"):
+            make_client(reasoning={"effort": "extreme"})
+
+    def test_anthropic_budget_below_minimum_is_rejected(self):
+        with pytest.raises(LLMError, match="0 or >= 1024"):
+            make_client(provider="anthropic", model="claude-3-7-sonnet-20250219", reasoning={"budget_tokens": 512})
+        assert make_client(provider="anthropic", model="claude-3-7-sonnet-20250219",
+                           reasoning={"budget_tokens": 0}).thinking_budget == 0
+        assert make_client(provider="google", model="gemini-2.5-flash",
+                           reasoning={"budget_tokens": 512}).thinking_budget == 512
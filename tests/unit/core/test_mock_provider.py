@@ -0,0 +1,121 @@
+"""Unit tests for the mock provider and the local OpenAI-compatible stand-in server."""
+
+import pytest
+from unittest.mock import Mock
+
+from slide_extract.core.config_manager import ConfigManager
+from slide_extract.core.llm_client import LLMClient, LLMError
+from slide_extract.core.mock_provider import (
+    MockChatServer, MockProviderError, MockResponder, create_mock_responder
+)
+from slide_extract.core.note_generator import NoteGenerator
+from slide_extract.core.pdf_processor import SlideContent
+from slide_extract.core.retry_policy import RATE_LIMIT, SERVER_ERROR, classify_error
+from slide_extract.core.slide_packer import SlidePacker
+
+SLIDES = [SlideContent(1, "Introduction to sorting"), SlideContent(2, "Quicksort partitioning")]
+
+
+def mock_client(**config):
+    return LLMClient({"provider": "mock", "model": "mock-1", **config})
+
+
+@pytest.fixture
+def validator():
+    return NoteGenerator(llm_client=Mock())
+
+
+class TestMockResponder:
+    """Test deterministic responses, latency and failure injection."""
+
+    def test_single_slide_response_passes_validation(self, validator):
+        client = mock_client()
+        response = client.generate_slide_analysis("Introduction to sorting", "Analyze the slide", 7)
+
+        assert validator._validate_generated_content(response, 7)
+        assert "**Slide Number:** 7" in response
+        assert response == client.generate_slide_analysis("Introduction to sorting", "Analyze the slide", 7)
+
+    def test_packed_response_splits_into_valid_sections(self, validator):
+        response = mock_client().generate_packed_slide_analysis(SLIDES, "Analyze the slides")
+        sections = SlidePacker.split_packed_response(response, [1, 2])
+
+        assert sorted(sections) == [1, 2]
+        assert all(validator._validate_generated_content(text, n) for n, text in sections.items())
+
+    def test_connection_test_succeeds(self):
+        assert mock_client().test_connection()
+
+    def test_injected_rate_limit_is_retryable(self):
+        client = mock_client(mock={"rate_limit_rate": 1.0, "retry_after": 3})
+
+        with pytest.raises(LLMError) as exc_info:
+            client.generate_slide_analysis("text", "prompt", 1)
+        assert classify_error(exc_info.value) == (RATE_LIMIT, 3.0)
+
+    def test_injected_server_errors(self):
+        responder = MockResponder(server_error_rate=1.0)
+        with pytest.raises(MockProviderError) as exc_info:
+            responder.complete("prompt")
+        assert exc_info.value.status_code in (500, 503)
+        assert classify_error(exc_info.value)[0] == SERVER_ERROR
+
+    def test_failures_are_seeded(self):
+        def outcomes(seed):
+            responder = MockResponder(rate_limit_rate=0.5, seed=seed)
+            return [responder._sample()[1] for _ in range(20)]
+
+        assert outcomes(1) == outcomes(1)
+        assert 429 in outcomes(1) and None in outcomes(1)
+
+    def test_latency_distribution(self):
+        responder = create_mock_responder(
+            {"latency": {"distribution": "uniform", "mean": 1.0, "spread": 0.5}}
+        )
+        latencies = [responder._sample()[0] for _ in range(50)]
+        assert all(0.5 <= latency <= 1.5 for latency in latencies)
+
+    def test_streaming(self):
+        client = mock_client(streaming={"enabled": True})
+        received = []
+        client.stream_listener = received.append
+
+        response = client.generate_slide_analysis("Introduction", "prompt", 1)
+        assert "".join(received).strip() == response
+
+    def test_no_api_key_required(self, temp_dir):
+        config_file = temp_dir / "config.yaml"
+        config_file.write_text("llm:\n  provider: mock\n  model: mock-1\n")
+        manager = ConfigManager(config_file)
+        manager.api_keys = {"UNUSED": "x"}
+
+        assert manager.get_llm_config()["provider"] == "mock"
+
+
+class TestMockChatServer:
+    """Test the OpenAI wire format through the real SDK."""
+
+    def _client(self, server, streaming=False):
+        return LLMClient({
+            "provider": "openrouter", "model": "mock", "api_key": "unused",
+            "base_url": server.base_url, "streaming": {"enabled": streaming},
+        })
+
+    def test_chat_completion(self, validator):
+        with MockChatServer(MockResponder()) as server:
+            response = self._client(server).generate_slide_analysis("Quicksort", "Analyze", 3)
+
+        assert validator._validate_generated_content(response, 3)
+
+    def test_streamed_chat_completion(self, validator):
+        with MockChatServer(MockResponder(tokens_per_second=10000)) as server:
+            response = self._client(server, streaming=True).generate_slide_analysis("Quicksort", "Analyze", 3)
+
+        assert validator._validate_generated_content(response, 3)
+
+    def test_http_429_with_retry_after(self):
+        with MockChatServer(MockResponder(rate_limit_rate=1.0, retry_after=2)) as server:
+            with pytest.raises(LLMError) as exc_info:
+                self._client(server).generate_slide_analysis("text", "prompt", 1)
+
+        assert classify_error(exc_info.value) == (RATE_LIMIT, 2.0)
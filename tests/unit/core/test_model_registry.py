@@ -0,0 +1,127 @@
+"""Unit tests for the model capability registry."""
+
+import base64
+
+import fitz
+import pytest
+
+from slide_extract.core.failover import FailoverLLMClient
+from slide_extract.core.llm_client import LLMClient
+from slide_extract.core.model_registry import (
+    ModelCapabilities, ModelRegistry, ModelRegistryError, combine_capabilities,
+    configure_model_registry, get_model_capabilities, rendering_options
+)
+from slide_extract.core.pdf_processor import PDFProcessor, SlideContent
+from slide_extract.core.slide_packer import SlidePacker
+
+
+@pytest.fixture(autouse=True)
+def default_registry():
+    """Restore the built-in registry after each test."""
+    yield
+    configure_model_registry(None)
+
+
+@pytest.fixture
+def deck(temp_dir):
+    """A two-slide 16:9 deck."""
+    pdf_path = temp_dir / "deck.pdf"
+    doc = fitz.open()
+    for number in range(1, 3):
+        page = doc.new_page(width=960, height=540)
+        page.insert_text((72, 72), f"Slide {number}")
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+def image_size(image_base64):
+    data = base64.b64decode(image_base64)
+    return int.from_bytes(data[16:20], "big"), int.from_bytes(data[20:24], "big"), len(data)
+
+
+class TestModelRegistry:
+    """Test lookups, pattern precedence and overrides."""
+
+    def test_vision_support(self):
+        assert get_model_capabilities("openai", "gpt-4o").vision
+        assert not get_model_capabilities("openai", "gpt-3.5-turbo").vision
+        assert get_model_capabilities("google", "gemini-2.5-flash").vision
+        assert get_model_capabilities("openrouter", "anthropic/claude-3-haiku").vision
+        assert get_model_capabilities("mock", "mock-1").vision
+        assert get_model_capabilities("openai", "local-model") == ModelCapabilities(
+            max_image_dimension=2048, max_image_bytes=20 * 1024 * 1024, max_images_per_request=10
+        )
+
+    def test_specific_patterns_override_families(self):
+        mini = get_model_capabilities("openai", "gpt-4o-mini")
+        assert mini.tokens_per_minute == 200000
+        assert mini.context_window == 128000
+
+        pro = get_model_capabilities("google", "gemini-1.5-pro")
+        assert pro.context_window == 2097152
+        assert pro.max_image_dimension == 3072
+
+    def test_overrides(self):
+        configure_model_registry({
+            "openai/local-*": {"vision": True, "context_window": 8192},
+            "openai/gpt-4o": {"requests_per_minute": 10000},
+        })
+
+        assert get_model_capabilities("openai", "local-llava").vision
+        assert get_model_capabilities("openai", "local-llava").context_window == 8192
+        assert get_model_capabilities("openai", "gpt-4o").requests_per_minute == 10000
+        assert get_model_capabilities("openai", "gpt-4o-2024-08-06").requests_per_minute == 500
+
+    def test_unknown_capability_is_rejected(self):
+        with pytest.raises(ModelRegistryError, match="max_rpm"):
+            ModelRegistry({"openai/gpt-4o": {"max_rpm": 10}})
+
+    def test_combined_limits(self):
+        combined = combine_capabilities([
+            get_model_capabilities("openai", "gpt-4o"),
+            get_model_capabilities("anthropic", "claude-3-haiku-20240307"),
+            get_model_capabilities("openai", "gpt-3.5-turbo"),
+        ])
+
+        assert combined.vision
+        assert combined.max_image_dimension == 1568
+        assert combined.context_window == 16385
+        assert not combined.pdf_input
+
+
+class TestSizing:
+    """Test that rendering and packing follow the registered limits."""
+
+    def test_rendering_options_follow_client_models(self):
+        text_only = LLMClient({"provider": "openai", "model": "gpt-3.5-turbo", "api_key": "k"})
+        claude = LLMClient({"provider": "anthropic", "model": "claude-3-haiku-20240307", "api_key": "k"})
+
+        assert rendering_options(None) == {}
+        assert rendering_options(text_only)["render_images"] is False
+        assert rendering_options(FailoverLLMClient([text_only, claude])) == {
+            "render_images": True, "max_image_dimension": 1568, "max_image_bytes": 5 * 1024 * 1024,
+        }
+
+    def test_renderer_fits_dimension_and_bytes(self, deck):
+        width, height, _ = image_size(PDFProcessor().extract_slide_content(deck)[1].image_base64)
+        assert (width, height) == (2000, 1125)
+
+        fitted = PDFProcessor(max_image_dimension=1000).extract_slide_content(deck)[1].image_base64
+        assert image_size(fitted)[0] <= 1000
+
+        _, _, full_bytes = image_size(fitted)
+        capped = PDFProcessor(max_image_bytes=full_bytes // 2).extract_slide_content(deck)[1].image_base64
+        assert image_size(capped)[2] <= full_bytes // 2
+
+        assert PDFProcessor(render_images=False).extract_slide_content(deck)[1].image_base64 is None
+
+    def test_packer_respects_image_and_context_limits(self):
+        slides = {n: SlideContent(n, "text", image_base64="img") for n in range(1, 5)}
+        packer = SlidePacker(token_budget=100000, max_slides=4, output_tokens_per_slide=100, image_tokens=100)
+
+        assert len(packer.plan_group(slides, 1, "prompt")) == 4
+        limited = ModelCapabilities(vision=True, max_images_per_request=2)
+        assert len(packer.plan_group(slides, 1, "prompt", capabilities=limited)) == 2
+        small = ModelCapabilities(vision=True, context_window=450)
+        assert len(packer.plan_group(slides, 1, "prompt", capabilities=small)) == 2
@@ -0,0 +1,121 @@
+"""Unit tests for complexity-based per-slide model routing."""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from slide_extract.core.config_manager import ConfigManager
+from slide_extract.core.llm_client import LLMClient
+from slide_extract.core.model_router import (
+    DEFAULT_ROUTE, ModelRouter, RoutingError, RoutingRule, create_model_router
+)
+from slide_extract.core.pdf_processor import SlideContent
+from slide_extract.core.slide_packer import SlidePacker
+
+
+def make_client(model):
+    with patch.object(LLMClient, "_initialize_client", return_value=Mock()):
+        return LLMClient({"provider": "google", "model": model, "api_key": "test"})
+
+
+TEXT_SLIDE = SlideContent(1, "Short bullet list")
+DIAGRAM_SLIDE = SlideContent(2, "Architecture", "image", True, 8)
+LONG_SLIDE = SlideContent(3, "x" * 2000)
+
+
+@pytest.fixture
+def router():
+    rules = [
+        RoutingRule("fast", has_images=False, max_text_chars=800),
+        RoutingRule("strong", min_image_count=5),
+    ]
+    return ModelRouter(
+        make_client("gemini-2.5-flash"),
+        {"fast": make_client("gemini-2.5-flash-lite"), "strong": make_client("gemini-2.5-pro")},
+        rules,
+    )
+
+
+class TestRoutingRule:
+    """Test rule matching against slide signals."""
+
+    def test_conditions(self):
+        rule = RoutingRule("fast", has_images=False, max_text_chars=800)
+        assert rule.matches(TEXT_SLIDE)
+        assert not rule.matches(DIAGRAM_SLIDE)
+        assert not rule.matches(LONG_SLIDE)
+
+    def test_unknown_condition_rejected(self):
+        with pytest.raises(RoutingError, match="Unknown routing condition"):
+            RoutingRule("fast", max_words=10)
+
+
+class TestModelRouter:
+    """Test route selection and the model mix."""
+
+    def test_first_matching_rule_wins(self, router):
+        assert router.route_name(TEXT_SLIDE) == "fast"
+        assert router.route_name(DIAGRAM_SLIDE) == "strong"
+        assert router.route_name(LONG_SLIDE) == DEFAULT_ROUTE
+
+    def test_requests_go_to_selected_model(self, router):
+        with patch.object(router.routes["strong"], "_send", return_value="pro notes"), \
+                patch.object(router.default_client, "_send", return_value="flash notes"):
+            router.route_slide(DIAGRAM_SLIDE)
+            assert router.generate_slide_analysis("text", "prompt", 2, image_base64="image") == "pro notes"
+            assert router.last_model == "google/gemini-2.5-pro"
+
+            router.route_slide(LONG_SLIDE)
+            assert router.generate_slide_analysis("text", "prompt", 3) == "flash notes"
+
+        stats = router.get_routing_stats()
+        assert stats["slides_by_route"] == {"strong": 1, DEFAULT_ROUTE: 1}
+        assert stats["responses_by_model"] == {"google/gemini-2.5-pro": 1, "google/gemini-2.5-flash": 1}
+
+    def test_unavailable_route_uses_default(self, router):
+        with patch.object(router.routes["fast"], "test_connection", return_value=False), \
+                patch.object(router.routes["strong"], "test_connection", return_value=True), \
+                patch.object(router.default_client, "test_connection", return_value=True):
+            assert router.test_connection()
+
+        assert router.route_name(TEXT_SLIDE) == DEFAULT_ROUTE
+
+    def test_packing_keeps_routes_apart(self, router):
+        slides = {1: TEXT_SLIDE, 2: DIAGRAM_SLIDE._replace(slide_number=2)}
+        group = SlidePacker(token_budget=100000).plan_group(
+            slides, 1, "prompt", group_key=router.route_name
+        )
+        assert [slide.slide_number for slide in group] == [1]
+
+    def test_disabled_returns_default_client(self):
+        client = make_client("gemini-2.5-flash")
+        assert create_model_router(client, {"enabled": False}) is client
+
+
+def test_routes_read_from_config(temp_dir):
+    config_file = temp_dir / "config.yaml"
+    config_file.write_text(
+        "llm:\n"
+        "  provider: google\n"
+        "  model: gemini-2.5-flash\n"
+        "  routing:\n"
+        "    enabled: true\n"
+        "    routes:\n"
+        "      fast:\n"
+        "        model: gemini-2.5-flash-lite\n"
+        "      strong:\n"
+        "        provider: openai\n"
+        "        model: gpt-4o\n"
+        "    rules:\n"
+        "      - route: fast\n"
+        "        has_images: false\n"
+    )
+    manager = ConfigManager(config_file)
+    manager.api_keys = {"GOOGLE_AI_API_KEY": "g"}
+
+    routing = manager.get_routing_config()
+
+    # The OpenAI route has no API key and is dropped
+    assert list(routing["routes"]) == ["fast"]
+    assert routing["routes"]["fast"]["provider"] == "google"
+    assert routing["routes"]["fast"]["api_key"] == "g"
+    assert routing["rules"] == [{"route": "fast", "has_images": False}]
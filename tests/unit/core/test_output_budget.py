@@ -0,0 +1,86 @@
+"""Unit tests for adaptive output limits and continuation of truncated responses."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from slide_extract.core.llm_client import CONTINUE_PROMPT, LLMClient
+from slide_extract.core.mock_provider import MockChatServer, MockResponder
+from slide_extract.core.output_budget import (
+    OutputBudget, OutputBudgetError, compute_budget_key, get_output_budget
+)
+from slide_extract.core.telemetry import TelemetryCollector
+
+
+class TestOutputBudget:
+    """Test limits learned from observed output lengths."""
+
+    def test_ceiling_until_enough_samples(self, temp_dir):
+        budget = OutputBudget(min_samples=3, floor=10, state_path=temp_dir / "lengths.json")
+        for _ in range(2):
+            budget.record("Analyze", "openai/gpt-4o", 100)
+        assert budget.limit("Analyze", "openai/gpt-4o", 4000) == 4000
+
+        budget.record("Analyze", "openai/gpt-4o", 100)
+        assert budget.limit("Analyze", "openai/gpt-4o", 4000) == 125
+        # Packed requests scale with their slides; other prompts are unaffected
+        assert budget.limit("Analyze", "openai/gpt-4o", 4000, slides=3) == 375
+        assert budget.limit("Summarize", "openai/gpt-4o", 4000) == 4000
+
+    def test_limit_is_clamped(self, temp_dir):
+        budget = OutputBudget(min_samples=1, floor=512, state_path=temp_dir / "lengths.json")
+        budget.record("Analyze", "openai/gpt-4o", 50)
+        assert budget.limit("Analyze", "openai/gpt-4o", 4000) == 512
+        assert budget.limit("Analyze", "openai/gpt-4o", 300) == 300
+
+        budget.record("Analyze", "openai/gpt-4o", 9000)
+        assert budget.limit("Analyze", "openai/gpt-4o", 4000) == 4000
+
+    def test_lengths_persist_per_slide(self, temp_dir):
+        state_path = temp_dir / "lengths.json"
+        OutputBudget(state_path=state_path).record("Analyze", "mock/mock-1", 900, slides=3)
+
+        stats = OutputBudget(state_path=state_path).get_stats()
+        assert stats[compute_budget_key("Analyze", "mock/mock-1")]["p50"] == 300
+
+    def test_configuration(self, temp_dir):
+        assert get_output_budget({"enabled": False}) is None
+        config = {"enabled": True, "state_path": str(temp_dir / "lengths.json")}
+        assert get_output_budget(config) is get_output_budget(config)
+        with pytest.raises(OutputBudgetError):
+            OutputBudget(percentile=0, state_path=temp_dir / "lengths.json")
+
+
+class TestContinuation:
+    """Test that truncated responses are continued rather than regenerated."""
+
+    def test_join_removes_overlap(self):
+        partial = "The quick brown fox jumps over the lazy"
+        assert LLMClient._join_continuation(partial, "jumps over the lazy dog") == f"{partial} dog"
+        assert LLMClient._join_continuation("The quick ", "brown fox") == "The quick brown fox"
+        assert LLMClient._join_continuation("The quick", "The quick brown fox") == "The quick brown fox"
+
+    def test_truncated_response_is_continued(self):
+        client = LLMClient({"provider": "mock", "model": "mock-1", "max_tokens": 50})
+        client.telemetry = TelemetryCollector()
+        full = "## Analysis\n\n" + " ".join(f"point{n}" for n in range(40))
+        client.client.complete = Mock(side_effect=[full, full[200:]])
+
+        with client.telemetry.track([1]):
+            response = client.generate_slide_analysis("Long slide", "Analyze", 1)
+
+        assert response == full.strip()
+        assert client.client.complete.call_args[0][0].endswith(CONTINUE_PROMPT)
+        assert client.telemetry.records[0].continuations == 1
+
+    def test_server_honors_learned_limit(self, temp_dir):
+        budget_config = {"enabled": True, "min_samples": 1, "floor": 1, "state_path": str(temp_dir / "l.json")}
+        with MockChatServer(MockResponder()) as server:
+            client = LLMClient({
+                "provider": "openai_compatible", "model": "local-model", "base_url": server.base_url,
+                "adaptive_max_tokens": budget_config, "max_continuations": 0,
+            })
+            client.output_budget.record("Analyze", client.model_label, 5)
+
+            response = client.generate_slide_analysis("Limited", "Analyze", 1)
+            assert len(response) <= 7 * 4
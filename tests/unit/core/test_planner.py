@@ -0,0 +1,125 @@
+"""Unit tests for the pre-flight run planner."""
+
+import json
+
+import fitz
+import pytest
+
+from slide_extract.core.planner import (
+    DEFAULT_PRICING, RunPlanner, estimate_image_tokens, format_plan_table, write_plan_json
+)
+from slide_extract.core.slide_packer import SlidePacker
+
+PLANNING = {
+    "concurrency": 1,
+    "base_latency": 2.0,
+    "output_tokens_per_second": 100,
+    "output_tokens_per_slide": 1000,
+    "context_chars": 2000,
+    "requests_per_minute": None,
+    "input_tokens_per_minute": None,
+    "pricing": {},
+}
+
+
+@pytest.fixture
+def deck(temp_dir):
+    """A three-slide 16:9 deck with one drawing on the last slide."""
+    pdf_path = temp_dir / "deck.pdf"
+    doc = fitz.open()
+    for number in range(1, 4):
+        page = doc.new_page(width=960, height=540)
+        page.insert_text((72, 72), f"Slide {number} bullet point")
+        if number == 3:
+            page.draw_rect(fitz.Rect(100, 100, 300, 300))
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+def planner(model="gpt-4o", provider="openai", **kwargs):
+    config = dict(PLANNING, **kwargs.pop("planning", {}))
+    settings = {"provider": provider, "model": model, "max_tokens": 4000}
+    settings.update(kwargs)
+    return RunPlanner(settings, config)
+
+
+class TestImageTokens:
+    """Test per-provider image token formulas."""
+
+    def test_openai_tiles(self):
+        # 2000x1125 is scaled to 1365x768: 3x2 tiles
+        assert estimate_image_tokens("openai", 2000, 1125) == 85 + 170 * 6
+
+    def test_anthropic_pixels(self):
+        assert estimate_image_tokens("anthropic", 750, 100) == 100
+
+    def test_google_tiles(self):
+        assert estimate_image_tokens("google", 300, 300) == 258
+        assert estimate_image_tokens("google", 2000, 1125) == 258 * 6
+
+
+class TestRunPlanner:
+    """Test per-deck and total projections."""
+
+    def test_deck_estimate(self, deck):
+        estimate = planner().plan_deck(deck, "Analyze the slide")
+
+        assert estimate.slides == 3
+        assert estimate.requests == 3
+        assert estimate.output_tokens == 3000
+        assert estimate.request_seconds == pytest.approx(3 * (2.0 + 10.0))
+        input_price, output_price = DEFAULT_PRICING["gpt-4o"]
+        assert estimate.cost_usd == pytest.approx(
+            (estimate.input_tokens * input_price + 3000 * output_price) / 1_000_000
+        )
+        assert estimate.models == {"openai/gpt-4o": 3}
+
+    def test_text_only_model_sends_no_image_tokens(self, deck):
+        vision = planner().plan_deck(deck, "prompt")
+        text_only = planner(model="gpt-3.5-turbo").plan_deck(deck, "prompt")
+
+        assert text_only.input_tokens < vision.input_tokens
+
+    def test_concurrency_and_rate_limits(self, deck):
+        parallel = planner(planning={"concurrency": 3}).plan_deck(deck, "prompt")
+        assert parallel.wall_seconds == pytest.approx(12.0)
+
+        limited = planner(planning={"concurrency": 3, "requests_per_minute": 1}).plan_deck(deck, "prompt")
+        assert limited.wall_seconds == pytest.approx(180.0)
+
+    def test_packing_reduces_requests(self, deck):
+        packed = RunPlanner(
+            {"provider": "openai", "model": "gpt-4o", "max_tokens": 8000}, PLANNING,
+            slide_packer=SlidePacker(token_budget=100000, max_slides=4, output_tokens_per_slide=1000),
+        ).plan_deck(deck, "prompt")
+
+        assert packed.requests == 1
+        assert packed.output_tokens == 3000
+
+    def test_routing_is_applied(self, deck):
+        estimate = planner(routing={
+            "enabled": True,
+            "routes": {"fast": {"model": "gpt-4o-mini"}},
+            "rules": [{"route": "fast", "has_images": False}],
+        }).plan_deck(deck, "prompt")
+
+        assert estimate.models == {"openai/gpt-4o-mini": 2, "openai/gpt-4o": 1}
+
+    def test_unknown_model_has_no_cost(self, deck, caplog):
+        plan = planner(model="local-model").plan([deck, deck], "prompt")
+
+        assert plan["total"]["cost_usd"] is None
+        assert caplog.text.count("No pricing for model local-model") == 1
+
+    def test_plan_table_and_json(self, deck, temp_dir):
+        plan = planner().plan([deck, deck], "prompt")
+
+        assert plan["total"]["slides"] == 6
+        assert plan["total"]["requests"] == 6
+        table = format_plan_table(plan)
+        assert "deck.pdf" in table and "TOTAL" in table
+
+        json_path = temp_dir / "plan.json"
+        write_plan_json(plan, json_path)
+        assert json.loads(json_path.read_text())["total"]["output_tokens"] == 6000
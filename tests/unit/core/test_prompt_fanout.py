@@ -0,0 +1,87 @@
+"""Unit tests for several prompts sharing one extraction of a deck."""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from slide_extract.core.concurrency import reset_request_slots
+from slide_extract.core.llm_client import LLMClient
+from slide_extract.core.model_router import ModelRouter
+from slide_extract.core.note_generator import NoteGenerator
+from slide_extract.core.pdf_processor import SlideContent
+from slide_extract.core.prompt_fanout import (
+    PromptFanOutError, PromptJob, fan_out_workers, generate_deck_for_prompts, pair_prompts_with_outputs
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_slots():
+    """Endpoint slots are process-wide; start every test without any."""
+    reset_request_slots()
+    yield
+    reset_request_slots()
+
+
+def jobs_for(client, temp_dir, names):
+    return [
+        PromptJob(
+            prompt_path=Path(f"{name}.md"), prompt=f"Write the {name} for each slide.",
+            output_path=temp_dir / f"deck_{name}.md", note_generator=NoteGenerator(client),
+        )
+        for name in names
+    ]
+
+
+class TestPairing:
+    """Test matching prompt files with output files."""
+
+    def test_single_prompt_may_use_stdout(self):
+        assert pair_prompts_with_outputs([Path("a.md")], None) == [(Path("a.md"), None)]
+
+    def test_each_prompt_needs_its_own_output(self):
+        prompts = [Path("notes.md"), Path("quiz.md")]
+        assert pair_prompts_with_outputs(prompts, [Path("n.md"), Path("q.md")])[1] == (Path("quiz.md"), Path("q.md"))
+
+        with pytest.raises(PromptFanOutError, match="2 output paths"):
+            pair_prompts_with_outputs(prompts, [Path("n.md")])
+        with pytest.raises(PromptFanOutError, match="own output"):
+            pair_prompts_with_outputs(prompts, [Path("n.md"), Path("n.md")])
+        with pytest.raises(PromptFanOutError, match="only once"):
+            pair_prompts_with_outputs([Path("a.md"), Path("a.md")], [Path("n.md"), Path("q.md")])
+
+
+class TestFanOut:
+    """Test generating notes for every prompt from one extraction."""
+
+    def test_prompts_share_slides_and_client(self, temp_dir):
+        client = LLMClient({"provider": "mock", "model": "mock-1", "max_concurrency": 2})
+        client.client.complete = Mock(wraps=client.client.complete)
+        slides = {n: SlideContent(n, f"Topic {n} " * 20) for n in range(1, 4)}
+        jobs = jobs_for(client, temp_dir, ["summary", "quiz"])
+
+        notes = generate_deck_for_prompts(jobs, slides, Path("deck.pdf"), workers=fan_out_workers(client, 2))
+
+        prompts = [call.args[0] for call in client.client.complete.call_args_list]
+        assert sum("Write the summary" in prompt for prompt in prompts) == 3
+        assert sum("Write the quiz" in prompt for prompt in prompts) == 3
+        assert all(notes[job.prompt_path].count("**Slide Number:**") == 3 for job in jobs)
+        assert client.request_slots.get_stats()["peak_in_flight"] <= 2
+        assert not list(temp_dir.glob(".slide_extract_progress_*"))
+
+    def test_failure_is_raised_after_other_prompts_finish(self, temp_dir):
+        client = LLMClient({"provider": "mock", "model": "mock-1", "max_concurrency": 2})
+        slides = {1: SlideContent(1, "Only slide")}
+        jobs = jobs_for(client, temp_dir, ["summary", "quiz"])
+        jobs[1].note_generator.generate_notes_for_slide_contents_resumable = Mock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(RuntimeError, match="boom"):
+            generate_deck_for_prompts(jobs, slides, Path("deck.pdf"), workers=2)
+        assert jobs[0].note_generator.stats["notes_generated"] == 1
+
+    def test_workers(self):
+        client = LLMClient({"provider": "mock", "model": "mock-1", "max_concurrency": 4})
+        assert fan_out_workers(client, 3) == 3
+        assert fan_out_workers(LLMClient({"provider": "mock", "model": "mock-1"}), 3) == 1
+        assert fan_out_workers(Mock(spec=ModelRouter), 3) == 1
+        assert fan_out_workers(None, 3) == 1
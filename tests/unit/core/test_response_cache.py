@@ -0,0 +1,174 @@
+"""Unit tests for the LLM response cache."""
+
+import base64
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+
+from slide_extract.core.llm_client import LLMClient
+from slide_extract.core.response_cache import (
+    ResponseCache,
+    ResponseCacheError,
+    compute_cache_key,
+    create_response_cache,
+)
+
+
+def _key(prompt="prompt", image=None, **overrides):
+    params = {"provider": "openai", "model": "gpt-4o", "temperature": 0.3, "max_tokens": 4000}
+    params.update(overrides)
+    return compute_cache_key(prompt=prompt, image_base64=image, **params)
+
+
+class TestComputeCacheKey:
+    """Test cache key derivation."""
+
+    def test_key_is_deterministic(self):
+        """Identical requests produce identical keys."""
+        assert _key() == _key()
+
+    @pytest.mark.parametrize("override", [
+        {"provider": "anthropic"},
+        {"model": "gpt-4o-mini"},
+        {"temperature": 0.7},
+        {"max_tokens": 100},
+        {"prompt": "different prompt"},
+    ])
+    def test_key_changes_with_request(self, override):
+        """Every request component is part of the key."""
+        assert _key(**override) != _key()
+
+    def test_key_includes_image_bytes(self):
+        """Different images produce different keys."""
+        image_a = base64.b64encode(b"image-a").decode()
+        image_b = base64.b64encode(b"image-b").decode()
+
+        assert _key(image=image_a) != _key(image=image_b)
+        assert _key(image=image_a) != _key()
+
+
+class TestResponseCache:
+    """Test cache storage, modes and eviction."""
+
+    def test_put_and_get(self, temp_dir):
+        """Stored responses are returned on lookup."""
+        cache = ResponseCache(temp_dir / "cache.sqlite3")
+        cache.put("k1", "response text")
+
+        assert cache.get("k1") == "response text"
+        assert cache.get("missing") is None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_persists_across_instances(self, temp_dir):
+        """Entries survive reopening the cache."""
+        ResponseCache(temp_dir / "cache.sqlite3").put("k1", "persisted")
+
+        assert ResponseCache(temp_dir / "cache.sqlite3").get("k1") == "persisted"
+
+    def test_write_mode_does_not_read(self, temp_dir):
+        """Write mode refreshes entries without serving them."""
+        cache = ResponseCache(temp_dir / "cache.sqlite3", mode="write")
+        cache.put("k1", "fresh")
+
+        assert cache.get("k1") is None
+        assert ResponseCache(temp_dir / "cache.sqlite3").get("k1") == "fresh"
+
+    def test_off_mode_is_noop(self, temp_dir):
+        """Off mode neither stores nor creates a database."""
+        cache = ResponseCache(temp_dir / "cache.sqlite3", mode="off")
+        cache.put("k1", "ignored")
+
+        assert cache.get("k1") is None
+        assert not (temp_dir / "cache.sqlite3").exists()
+
+    def test_invalid_mode(self, temp_dir):
+        """Unknown modes are rejected."""
+        with pytest.raises(ResponseCacheError, match="Invalid cache mode"):
+            ResponseCache(temp_dir / "cache.sqlite3", mode="sometimes")
+
+    def test_age_based_eviction(self, temp_dir):
+        """Expired entries are not served."""
+        cache = ResponseCache(temp_dir / "cache.sqlite3", max_age_days=1)
+        cache.put("k1", "old")
+
+        with patch("slide_extract.core.response_cache.time.time", return_value=time.time() + 2 * 86400):
+            assert cache.get("k1") is None
+
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_size_based_eviction_removes_least_recently_used(self, temp_dir):
+        """Oldest accessed entries are removed first when over the size limit."""
+        cache = ResponseCache(temp_dir / "cache.sqlite3", max_size_mb=1.5 / 1024)
+        cache.put("k1", "a" * 600)
+        time.sleep(0.01)
+        cache.put("k2", "b" * 600)
+        time.sleep(0.01)
+        cache.get("k1")  # k1 is now more recently used than k2
+        cache.put("k3", "c" * 600)
+
+        assert cache.evict() == 1
+        assert cache.get("k2") is None
+        assert cache.get("k1") is not None
+        assert cache.get("k3") is not None
+
+    def test_create_response_cache_off(self):
+        """The factory returns None when caching is disabled."""
+        assert create_response_cache({"mode": "off"}) is None
+
+
+class TestLLMClientCaching:
+    """Test response caching in the LLM client."""
+
+    def _client(self, cache):
+        with patch.object(LLMClient, "_initialize_client", return_value=Mock()):
+            return LLMClient(
+                {"provider": "openai", "model": "gpt-4o", "api_key": "test"},
+                response_cache=cache,
+            )
+
+    def test_cache_hit_skips_provider(self, temp_dir):
+        """A repeated request is served from the cache."""
+        client = self._client(ResponseCache(temp_dir / "cache.sqlite3"))
+
+        with patch.object(client, "_generate_text_response", return_value="analysis") as mock_generate:
+            first = client.generate_slide_analysis("text", "prompt", 1)
+            second = client.generate_slide_analysis("text", "prompt", 1)
+
+        assert first == second == "analysis"
+        assert mock_generate.call_count == 1
+        assert client.get_cache_stats()["hits"] == 1
+
+    def test_use_cache_false_bypasses_cache(self, temp_dir):
+        """Callers can opt out of the cache for individual requests."""
+        client = self._client(ResponseCache(temp_dir / "cache.sqlite3"))
+
+        with patch.object(client, "_generate_text_response", return_value="analysis") as mock_generate:
+            client.generate_slide_analysis("text", "prompt", 1)
+            client.generate_slide_analysis("text", "prompt", 1, use_cache=False)
+
+        assert mock_generate.call_count == 2
+
+    def test_no_cache_stats_without_cache(self):
+        """Clients without a cache report no statistics."""
+        assert self._client(None).get_cache_stats() is None
+
+    def test_truncated_response_is_not_cached(self, temp_dir):
+        """A response still cut off after all continuations is requested again next time."""
+        client = self._client(ResponseCache(temp_dir / "cache.sqlite3"))
+        client.max_continuations = 0
+
+        def truncated_send(*args, **kwargs):
+            client._request_state.truncated = True
+            return "partial analysis"
+
+        with patch.object(client, "_send", side_effect=truncated_send) as mock_send:
+            client.generate_slide_analysis("text", "prompt", 1)
+            client.generate_slide_analysis("text", "prompt", 1)
+
+        assert mock_send.call_count == 2
+        assert client.get_cache_stats()["hits"] == 0
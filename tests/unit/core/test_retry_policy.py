@@ -0,0 +1,145 @@
+"""Unit tests for the typed LLM retry policy."""
+
+import httpx
+import openai
+import pytest
+from google.api_core import exceptions as google_exceptions
+from unittest.mock import Mock, patch
+
+from slide_extract.core.llm_client import LLMError
+from slide_extract.core.retry_policy import (
+    CONNECTION,
+    DEADLINE,
+    FATAL,
+    RATE_LIMIT,
+    SERVER_ERROR,
+    RetryPolicy,
+    classify_error,
+    create_retry_policy,
+)
+from slide_extract.core.streaming import StreamTimeoutError
+
+
+def status_error(status: int, headers=None) -> openai.APIStatusError:
+    """Build an OpenAI SDK status error for the given HTTP status."""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    error_type = openai.RateLimitError if status == 429 else openai.APIStatusError
+    return error_type("error", response=response, body=None)
+
+
+def wrapped(error: BaseException) -> LLMError:
+    """Wrap an SDK error the way LLMClient does."""
+    try:
+        try:
+            raise error
+        except Exception as e:
+            raise LLMError(f"OpenAI API error: {e}") from e
+    except LLMError as outer:
+        return outer
+
+
+class TestClassifyError:
+    """Test classification of provider exceptions by type."""
+
+    @pytest.mark.parametrize("error,kind", [
+        (status_error(429), RATE_LIMIT),
+        (status_error(503), SERVER_ERROR),
+        (status_error(504), DEADLINE),
+        (status_error(401), FATAL),
+        (openai.APITimeoutError(request=httpx.Request("POST", "https://x")), DEADLINE),
+        (openai.APIConnectionError(request=httpx.Request("POST", "https://x")), CONNECTION),
+        (google_exceptions.ResourceExhausted("quota"), RATE_LIMIT),
+        (google_exceptions.DeadlineExceeded("slow"), DEADLINE),
+        (google_exceptions.InternalServerError("oops"), SERVER_ERROR),
+        (StreamTimeoutError("stalled"), DEADLINE),
+        (ValueError("bad input"), FATAL),
+    ])
+    def test_classifies_wrapped_sdk_errors(self, error, kind):
+        """SDK errors are classified through the LLMError cause chain."""
+        assert classify_error(wrapped(error))[0] == kind
+
+    def test_message_text_is_not_used(self):
+        """An error that merely mentions a timeout is not retried."""
+        assert classify_error(LLMError("prompt mentions timeout and 504"))[0] == FATAL
+
+    def test_retry_after_header(self):
+        """Retry-After hints are read from the HTTP response."""
+        assert classify_error(wrapped(status_error(429, {"retry-after": "7"}))) == (RATE_LIMIT, 7.0)
+        assert classify_error(wrapped(status_error(429, {"retry-after-ms": "1500"})))[1] == 1.5
+
+
+class TestRetryPolicy:
+    """Test retry decisions, backoff and statistics."""
+
+    @patch("slide_extract.core.retry_policy.time.sleep")
+    def test_retries_transient_errors(self, mock_sleep):
+        """Transient failures are retried until the request succeeds."""
+        policy = RetryPolicy(max_retries=3, base_delay=1)
+        func = Mock(side_effect=[wrapped(status_error(503)), wrapped(status_error(429)), "ok"])
+
+        assert policy.call(func) == "ok"
+        assert func.call_count == 3
+        stats = policy.get_stats()
+        assert stats["retries"] == 2
+        assert stats["retries_by_kind"][SERVER_ERROR] == 1
+        assert stats["retries_by_kind"][RATE_LIMIT] == 1
+
+    @patch("slide_extract.core.retry_policy.time.sleep")
+    def test_fatal_errors_are_not_retried(self, mock_sleep):
+        """Non-retryable errors propagate immediately."""
+        policy = RetryPolicy(max_retries=3)
+        func = Mock(side_effect=wrapped(status_error(400)))
+
+        with pytest.raises(LLMError):
+            policy.call(func)
+        assert func.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch("slide_extract.core.retry_policy.time.sleep")
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        """Retries stop after max_retries."""
+        policy = RetryPolicy(max_retries=2)
+        func = Mock(side_effect=wrapped(status_error(500)))
+
+        with pytest.raises(LLMError):
+            policy.call(func)
+        assert func.call_count == 3
+        assert policy.get_stats()["failures"] == 1
+
+    @patch("slide_extract.core.retry_policy.time.sleep")
+    def test_retry_after_is_lower_bound(self, mock_sleep):
+        """The provider's Retry-After wait is honored."""
+        policy = RetryPolicy(max_retries=1, base_delay=0.01)
+        func = Mock(side_effect=[wrapped(status_error(429, {"retry-after": "5"})), "ok"])
+
+        policy.call(func)
+        assert mock_sleep.call_args[0][0] == 5.0
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Backoff never exceeds the exponential ceiling or max_delay."""
+        policy = RetryPolicy(base_delay=2, max_delay=10)
+        delays = [policy.backoff(attempt) for attempt in range(6) for _ in range(20)]
+
+        assert all(0 <= delay <= 10 for delay in delays)
+        assert len(set(delays)) > 1
+
+    @patch("slide_extract.core.retry_policy.time.sleep")
+    def test_deadline_stops_retries(self, mock_sleep):
+        """No retry starts after the slide deadline."""
+        policy = RetryPolicy(max_retries=5, base_delay=1)
+        func = Mock(side_effect=wrapped(status_error(429, {"retry-after": "30"})))
+
+        with patch("slide_extract.core.retry_policy.time.monotonic", return_value=100.0):
+            with pytest.raises(LLMError, match="deadline"):
+                policy.call(func, "Slide 3 request", deadline=110.0)
+
+        assert func.call_count == 1
+        assert policy.get_stats()["deadline_exceeded"] == 1
+
+    def test_create_retry_policy(self):
+        """The factory reads the configured limits."""
+        policy = create_retry_policy({"max_retries": 5, "slide_deadline": 120})
+
+        assert policy.max_retries == 5
+        assert policy.slide_deadline == 120
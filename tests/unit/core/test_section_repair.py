@@ -0,0 +1,77 @@
+"""Unit tests for targeted repair of missing analysis sections."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from slide_extract.core.llm_client import LLMClient
+from slide_extract.core.note_generator import NoteGenerator
+from slide_extract.core.pdf_processor import SlideContent
+from slide_extract.core.section_repair import (
+    SLIDE_IMAGES, SLIDE_NARRATION, SectionRepairError, find_incomplete_sections, merge_sections
+)
+
+NARRATION = "**Slide Narration:**\n" + "Spoken explanation of the slide. " * 10
+
+ANALYSIS = (
+    "#### Slide: Sorting\n\n"
+    "**Slide Number:** 3\n\n"
+    "**Slide Text:**\nQuicksort partitions around a pivot.\n\n"
+    "**Slide Topics:**\n*   Quicksort\n\n"
+    "**Slide Narration:**\nToo short."
+)
+
+
+class TestMergeSections:
+    """Test detection and in-place merging of sections."""
+
+    def test_finds_missing_and_short_sections(self):
+        assert find_incomplete_sections(ANALYSIS) == [SLIDE_IMAGES, SLIDE_NARRATION]
+
+    def test_sections_are_merged_in_order(self):
+        repair = f"{SLIDE_IMAGES}\nA diagram of the partition step.\n\n{NARRATION}"
+        merged = merge_sections(ANALYSIS, repair, [SLIDE_IMAGES, SLIDE_NARRATION])
+
+        assert merged.startswith("#### Slide: Sorting\n\n**Slide Number:** 3")
+        assert merged.index("**Slide Text:**") < merged.index(SLIDE_IMAGES) < merged.index("**Slide Topics:**")
+        assert "Too short." not in merged
+        assert find_incomplete_sections(merged) == []
+
+    def test_unrequested_sections_are_ignored(self):
+        repair = f"**Slide Text:**\nRewritten text\n\n{SLIDE_IMAGES}\nDiagram"
+        merged = merge_sections(ANALYSIS, repair, [SLIDE_IMAGES])
+        assert "Rewritten text" not in merged
+
+        with pytest.raises(SectionRepairError):
+            merge_sections(ANALYSIS, "I cannot help with that.", [SLIDE_IMAGES])
+
+
+class TestRepairRequests:
+    """Test that invalid analyses are repaired before being regenerated."""
+
+    def test_repair_replaces_full_retry(self):
+        client = LLMClient({"provider": "mock", "model": "mock-1"})
+        client.client.complete = Mock(wraps=client.client.complete)
+        generator = NoteGenerator(client)
+        slide = SlideContent(3, "Quicksort partitions around a pivot.", image_base64="aW1n")
+
+        analysis, _ = generator._recover_invalid_analysis(slide, "Analyze", ANALYSIS, "mock/mock-1")
+
+        prompt = client.client.complete.call_args[0][0]
+        assert client.client.complete.call_count == 1
+        assert "## Existing Analysis" in prompt and f"- {SLIDE_NARRATION}" in prompt
+        assert "Quicksort partitions around a pivot." in analysis
+        assert generator._validate_generated_content(analysis, 3)
+        assert generator.get_repair_stats() == {"repaired": 1, "failed": 0}
+
+    def test_failed_repair_falls_back_to_full_retry(self):
+        client = LLMClient({"provider": "mock", "model": "mock-1"})
+        generator = NoteGenerator(client)
+        client.generate_section_repair = Mock(return_value="Nothing useful")
+        slide = SlideContent(3, "Quicksort partitions around a pivot.")
+
+        analysis, model = generator._recover_invalid_analysis(slide, "Analyze", ANALYSIS, None)
+
+        assert generator._validate_generated_content(analysis, 3)
+        assert model == "mock/mock-1"
+        assert generator.get_repair_stats() == {"repaired": 0, "failed": 1}
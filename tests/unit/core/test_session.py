@@ -0,0 +1,124 @@
+"""Unit tests for stateful conversation sessions."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from slide_extract.core.llm_client import LLMClient
+from slide_extract.core.note_generator import NoteGenerator
+from slide_extract.core.pdf_processor import SlideContent
+from slide_extract.core.session import (
+    SUMMARY_HEADING, ConversationSession, SessionError, create_conversation_session
+)
+
+
+def add_turns(session, count, start=1):
+    for n in range(start, start + count):
+        session.add(f"slide {n}", f"## Current Slide to Analyze\n\nslide {n} text", f"Notes for slide {n}")
+
+
+def progress():
+    manager = Mock()
+    manager.output_path = None
+    manager.file_path = "deck.pdf"
+    return manager
+
+
+class TestConversationSession:
+    """Test history bookkeeping and compaction."""
+
+    def test_messages_alternate(self):
+        session = ConversationSession()
+        add_turns(session, 2)
+
+        assert [message["role"] for message in session.messages()] == ["user", "assistant"] * 2
+        assert session.messages()[-1]["content"] == "Notes for slide 2"
+
+    def test_compaction_summarizes_in_steps(self):
+        session = ConversationSession(max_turns=3, keep_turns=1)
+        add_turns(session, 3)
+        assert len(session.turns) == 3
+
+        # The 4th turn compacts to one turn; the prefix then stays fixed until the 7th
+        add_turns(session, 1, start=4)
+        assert [turn.label for turn in session.turns] == ["slide 4"]
+        add_turns(session, 2, start=5)
+        assert [turn.label for turn in session.turns] == ["slide 4", "slide 5", "slide 6"]
+
+        first = session.messages()[0]["content"]
+        assert first.startswith(SUMMARY_HEADING)
+        assert "Slide 1: Notes for slide 1" in first and "Slide 3: Notes for slide 3" in first
+        assert first.endswith("slide 4 text")
+        assert session.get_stats()["compactions"] == 1
+
+    def test_truncate_discards_turns(self):
+        session = ConversationSession(max_turns=2, keep_turns=1, strategy="truncate")
+        add_turns(session, 3)
+
+        assert session.summary == []
+        assert session.messages()[0]["content"].endswith("slide 3 text")
+        assert session.get_stats()["dropped_turns"] == 2
+
+    def test_token_limit_triggers_compaction(self):
+        session = ConversationSession(max_turns=10, keep_turns=1, max_history_tokens=20)
+        add_turns(session, 2)
+        assert len(session.turns) == 1
+
+    def test_invalid_configuration(self):
+        assert create_conversation_session({"enabled": False}) is None
+        with pytest.raises(SessionError):
+            create_conversation_session({"enabled": True, "strategy": "forget"})
+        with pytest.raises(SessionError):
+            ConversationSession(max_turns=2, keep_turns=0)
+
+
+class TestSessionRequests:
+    """Test that history is sent to providers and recorded by the client."""
+
+    def test_history_precedes_new_slide(self):
+        client = LLMClient({"provider": "mock", "model": "mock-1"})
+        client.client.complete = Mock(wraps=client.client.complete)
+        session = ConversationSession()
+
+        client.generate_slide_analysis("Sorting basics", "Analyze", 1, session=session)
+        response = client.generate_slide_analysis("Quicksort", "Analyze", 2, session=session)
+
+        prompt = client.client.complete.call_args[0][0]
+        assert prompt.index("Sorting basics") < prompt.index("Quicksort")
+        assert "Previous Slides Context" not in prompt
+        assert "**Slide Number:** 2" in response
+        assert [turn.label for turn in session.turns] == ["slide 1", "slide 2"]
+
+    def test_provider_message_layouts(self):
+        client = LLMClient({"provider": "anthropic", "model": "claude-3-haiku-20240307", "api_key": "k"})
+        client._request_state.history = [
+            {"role": "user", "content": "slide 1"}, {"role": "assistant", "content": "notes 1"},
+        ]
+
+        openai_messages = client._openai_messages("slide 2", "instructions")
+        assert [message["role"] for message in openai_messages] == ["system", "user", "assistant", "user"]
+
+        anthropic_messages = client._anthropic_messages("slide 2")
+        assert anthropic_messages[1]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert anthropic_messages[-1] == {"role": "user", "content": "slide 2"}
+
+        contents = client._google_contents(["slide 2", {"mime_type": "image/png", "data": b""}])
+        assert [content["role"] for content in contents] == ["user", "model", "user"]
+        assert len(contents[-1]["parts"]) == 2
+
+
+class TestSessionGeneration:
+    """Test decks processed as one conversation."""
+
+    def test_each_deck_is_one_conversation(self):
+        session = ConversationSession()
+        generator = NoteGenerator(LLMClient({"provider": "mock", "model": "mock-1"}), session=session)
+        generator._build_context_for_slide = Mock(side_effect=AssertionError("context rebuilt"))
+        slides = {n: SlideContent(n, f"Topic {n} " * 20) for n in range(1, 4)}
+
+        notes = generator.generate_notes_for_slide_contents_resumable(slides, "Analyze", progress())
+        assert notes.count("**Slide Number:**") == 3
+        assert [turn.label for turn in session.turns] == ["slide 1", "slide 2", "slide 3"]
+
+        generator.generate_notes_for_slide_contents_resumable(slides, "Analyze", progress())
+        assert len(session.turns) == 3
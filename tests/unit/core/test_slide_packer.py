@@ -0,0 +1,126 @@
+"""Unit tests for multi-slide request packing."""
+
+import pytest
+from unittest.mock import Mock
+
+from slide_extract.core.note_generator import NoteGenerator
+from slide_extract.core.pdf_processor import SlideContent
+from slide_extract.core.slide_packer import SlidePacker, create_slide_packer
+
+
+def valid_analysis(slide_num: int) -> str:
+    """Build an analysis that passes note generator validation."""
+    return (
+        f"#### Slide: Topic {slide_num}\n\n"
+        f"**Slide Number:** {slide_num}\n\n"
+        f"**Slide Text:**\nText of slide {slide_num}\n\n"
+        f"**Slide Images/Diagrams:**\nA diagram is shown.\n\n"
+        f"**Slide Topics:**\n* Topic {slide_num}\n\n"
+        f"**Slide Narration:**\n" + "This slide explains the topic in detail. " * 8
+    )
+
+
+def packed_response(slide_numbers) -> str:
+    return "\n".join(
+        f"<<<SLIDE {n}>>>\n{valid_analysis(n)}\n<<<END SLIDE {n}>>>" for n in slide_numbers
+    )
+
+
+@pytest.fixture
+def slides():
+    return {
+        n: SlideContent(n, f"Slide {n} text", f"image{n}", True, 1)
+        for n in range(1, 6)
+    }
+
+
+class TestSlidePacker:
+    """Test group planning and response splitting."""
+
+    def test_plan_group_respects_max_slides(self, slides):
+        """Groups never exceed max_slides."""
+        packer = SlidePacker(token_budget=100000, max_slides=3)
+        group = packer.plan_group(slides, 1, "prompt")
+
+        assert [s.slide_number for s in group] == [1, 2, 3]
+
+    def test_plan_group_respects_token_budget(self, slides):
+        """Groups stop growing when the token budget is reached."""
+        packer = SlidePacker(token_budget=5000, max_slides=10,
+                             output_tokens_per_slide=1500, image_tokens=800)
+        group = packer.plan_group(slides, 2, "prompt")
+
+        assert [s.slide_number for s in group] == [2, 3]
+
+    def test_plan_group_respects_output_limit(self, slides):
+        """Groups stop growing when expected output exceeds max_tokens."""
+        packer = SlidePacker(token_budget=100000, max_slides=10, output_tokens_per_slide=1500)
+        group = packer.plan_group(slides, 1, "prompt", max_output_tokens=4000)
+
+        assert len(group) == 2
+
+    def test_plan_group_always_returns_one_slide(self, slides):
+        """A slide larger than the budget is still planned on its own."""
+        packer = SlidePacker(token_budget=10)
+        assert len(packer.plan_group(slides, 5, "prompt")) == 1
+
+    def test_build_packed_message_lists_slides_and_delimiters(self, slides):
+        """The packed message includes each slide and the delimiter format."""
+        message = SlidePacker.build_packed_message([slides[1], slides[2]], context="earlier")
+
+        assert "Slide 1 text" in message and "Slide 2 text" in message
+        assert "<<<SLIDE 1>>>" in message
+        assert "earlier" in message
+
+    def test_build_packed_message_numbers_attached_images_only(self, slides):
+        """Image labels follow the attached images when a slide has none."""
+        text_only = slides[1]._replace(image_base64=None)
+        message = SlidePacker.build_packed_message([text_only, slides[2], slides[3]])
+
+        assert "### Slide 1 (no image)" in message
+        assert "### Image 1: Slide 2" in message
+        assert "### Image 2: Slide 3" in message
+        assert "### Image 3" not in message
+
+    def test_split_packed_response(self):
+        """Delimited sections are split back per slide."""
+        sections = SlidePacker.split_packed_response(packed_response([3, 4]), [3, 4])
+
+        assert set(sections) == {3, 4}
+        assert "**Slide Number:** 4" in sections[4]
+        assert "<<<" not in sections[3]
+
+    def test_split_ignores_unrequested_and_missing_sections(self):
+        """Only requested slides are returned; missing ones are absent."""
+        sections = SlidePacker.split_packed_response(packed_response([1, 9]), [1, 2])
+
+        assert set(sections) == {1}
+
+    def test_create_slide_packer_disabled(self):
+        """The factory returns None when packing is disabled."""
+        assert create_slide_packer({"enabled": False}) is None
+
+
+class TestPackedNoteGeneration:
+    """Test packed generation in the note generator."""
+
+    def test_invalid_section_falls_back_to_single_request(self, slides, temp_dir):
+        """Valid sections are used and invalid ones are re-requested individually."""
+        llm_client = Mock()
+        llm_client.max_tokens = 40000
+        response = packed_response([1, 3]) + "\n<<<SLIDE 2>>>\ntoo short\n<<<END SLIDE 2>>>"
+        llm_client.generate_packed_slide_analysis.return_value = response
+        llm_client.generate_slide_analysis.return_value = valid_analysis(2)
+
+        generator = NoteGenerator(llm_client, slide_packer=SlidePacker(token_budget=100000, max_slides=3))
+        progress_manager = Mock(output_path=None)
+        three_slides = {n: slides[n] for n in (1, 2, 3)}
+
+        notes = generator.generate_notes_for_slide_contents_resumable(
+            three_slides, "prompt", progress_manager
+        )
+
+        assert llm_client.generate_packed_slide_analysis.call_count == 1
+        assert llm_client.generate_slide_analysis.call_count == 1
+        assert llm_client.generate_slide_analysis.call_args[0][2] == 2
+        assert notes.count("**Slide Number:**") == 3
@@ -0,0 +1,208 @@
+"""Unit tests for streamed responses with first-token and inter-token deadlines."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import Mock, patch
+
+from slide_extract.core.llm_client import LLMClient, LLMError
+from slide_extract.core.progress_manager import ProgressManager
+from slide_extract.core.streaming import (
+    StreamCancelledError, StreamInterruptedError, StreamTimeoutError, consume_stream
+)
+
+
+def delayed(items, delays):
+    """Yield items after the given per-item delays."""
+    for item, delay in zip(items, delays):
+        time.sleep(delay)
+        yield item
+
+
+def identity(chunk):
+    return chunk
+
+
+class TestConsumeStream:
+    """Test deadline enforcement while reading a stream."""
+
+    def test_collects_text_and_notifies_listener(self):
+        """All text deltas are joined and forwarded as they arrive."""
+        received = []
+        text, chunks = consume_stream(
+            lambda: iter(["Hello", None, " world"]), identity, on_text=received.append
+        )
+
+        assert text == "Hello world"
+        assert chunks == ["Hello", None, " world"]
+        assert received == ["Hello", " world"]
+
+    def test_first_token_deadline(self):
+        """A stream that never produces text fails at the first-token deadline."""
+        started = time.monotonic()
+        with pytest.raises(StreamTimeoutError, match="first token"):
+            consume_stream(
+                lambda: delayed([None, "late"], [0.0, 1.0]), identity,
+                first_token_timeout=0.1, inter_token_timeout=5
+            )
+        assert time.monotonic() - started < 0.5
+
+    def test_inter_token_deadline_keeps_partial_text(self):
+        """A stall after the first token fails with the partial text attached."""
+        with pytest.raises(StreamTimeoutError, match="no tokens") as exc_info:
+            consume_stream(
+                lambda: delayed(["partial", "late"], [0.0, 1.0]), identity,
+                first_token_timeout=5, inter_token_timeout=0.1
+            )
+        assert exc_info.value.partial_text == "partial"
+
+    def test_stream_is_closed_on_timeout(self):
+        """Stalled streams are closed so the reader thread stops."""
+        closed = threading.Event()
+
+        class StalledStream:
+            def __iter__(self):
+                closed.wait(2)
+                return iter([])
+
+            def close(self):
+                closed.set()
+
+        with pytest.raises(StreamTimeoutError):
+            consume_stream(StalledStream, identity, first_token_timeout=0.1)
+        assert closed.is_set()
+
+    def test_cancel_event_stops_stream(self):
+        """Setting the cancel event aborts a stream that is still running."""
+        cancel = threading.Event()
+        threading.Timer(0.1, cancel.set).start()
+
+        started = time.monotonic()
+        with pytest.raises(StreamCancelledError):
+            consume_stream(
+                lambda: delayed(["a", "b"], [0.0, 2.0]), identity,
+                first_token_timeout=None, inter_token_timeout=None, cancel_event=cancel
+            )
+        assert time.monotonic() - started < 1
+
+    def test_reader_errors_propagate(self):
+        """Errors raised while opening the stream reach the caller."""
+        def fail():
+            raise RuntimeError("connection refused")
+
+        with pytest.raises(RuntimeError, match="connection refused"):
+            consume_stream(fail, identity)
+
+    def test_dropped_stream_keeps_partial_text(self):
+        """A connection lost mid-response fails with the text received so far."""
+        def drop():
+            yield "partial"
+            raise ConnectionResetError("connection reset")
+
+        with pytest.raises(StreamInterruptedError) as exc_info:
+            consume_stream(drop, identity)
+        assert exc_info.value.partial_text == "partial"
+        assert isinstance(exc_info.value.__cause__, ConnectionResetError)
+
+
+def openai_chunk(text=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=text))] if text is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class TestLLMClientStreaming:
+    """Test streaming through the provider SDKs."""
+
+    def _client(self, provider="openai"):
+        with patch.object(LLMClient, "_initialize_client", return_value=Mock()):
+            return LLMClient({
+                "provider": provider, "model": "gpt-4o", "api_key": "test",
+                "streaming": {"enabled": True, "first_token_timeout": 1, "inter_token_timeout": 1},
+            })
+
+    def test_openai_streaming_records_usage(self):
+        """OpenAI text is streamed and usage is read from the final chunk."""
+        client = self._client()
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=5, prompt_tokens_details=None)
+        client.client.chat.completions.create.return_value = iter([
+            openai_chunk("Slide "), openai_chunk("analysis"), openai_chunk(usage=usage)
+        ])
+        received = []
+        client.stream_listener = received.append
+
+        assert client.generate_slide_analysis("text", "prompt", 1) == "Slide analysis"
+        assert received == ["Slide ", "analysis"]
+        assert client.last_usage["input_tokens"] == 100
+
+        kwargs = client.client.chat.completions.create.call_args.kwargs
+        assert kwargs["stream"] is True
+        assert kwargs["stream_options"] == {"include_usage": True}
+
+    def test_anthropic_streaming(self):
+        """Anthropic text deltas are joined and usage is assembled from events."""
+        client = self._client("anthropic")
+        client.client.messages.create.return_value = iter([
+            SimpleNamespace(type="message_start", message=SimpleNamespace(
+                usage=SimpleNamespace(input_tokens=50, cache_read_input_tokens=40))),
+            SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(text="Hello")),
+            SimpleNamespace(type="message_delta", usage=SimpleNamespace(output_tokens=3)),
+        ])
+
+        assert client.generate_slide_analysis("text", "prompt", 1) == "Hello"
+        assert client.last_usage["cached_tokens"] == 40
+        assert client.last_usage["output_tokens"] == 3
+
+    def test_stalled_stream_raises_retryable_error(self):
+        """A stalled stream surfaces as an LLM timeout error."""
+        client = self._client()
+        client.first_token_timeout = 0.1
+        client.client.chat.completions.create.side_effect = lambda **kwargs: delayed(
+            [openai_chunk("late")], [1.0]
+        )
+
+        with pytest.raises(LLMError, match="timeout"):
+            client.generate_slide_analysis("text", "prompt", 1)
+
+    def test_dropped_stream_is_continued(self):
+        """Text from a stream that broke off is kept and only the remainder is requested."""
+        client = self._client()
+        client.resume_min_chars = 10
+
+        def drop():
+            yield openai_chunk("### Slide Content\n\nBullet points ")
+            raise ConnectionResetError("connection reset")
+
+        client.client.chat.completions.create.side_effect = [
+            drop(), iter([openai_chunk("and more.\n\n### Narration\n\nSpoken text")]),
+        ]
+
+        response = client.generate_slide_analysis("text", "prompt", 1)
+        assert response == "### Slide Content\n\nBullet points and more.\n\n### Narration\n\nSpoken text"
+        continuation = client.client.chat.completions.create.call_args.kwargs["messages"]
+        assert continuation[-2] == {"role": "assistant", "content": "### Slide Content\n\nBullet points "}
+
+
+class TestPartialOutput:
+    """Test partial text emitted to the progress layer."""
+
+    def test_partial_output_is_written_and_cleared(self, temp_dir):
+        """Streamed text is written per slide and removed when the slide is checkpointed."""
+        manager = ProgressManager(temp_dir / "notes.md", "single", temp_dir / "deck.pdf")
+        manager.record_partial_output(1, "Hello ")
+        manager.record_partial_output(1, "world")
+
+        # The first chunk is flushed at once, later ones once per flush interval
+        assert manager.partial_file.read_text().endswith("Hello ")
+        manager.PARTIAL_FLUSH_INTERVAL = 0.0
+        manager.record_partial_output(1, "!")
+        assert manager.partial_file.read_text().endswith("Hello world!")
+
+        manager.record_partial_output(2, "Next")
+        assert "Hello" not in manager.partial_file.read_text()
+
+        handle = manager._partial_handle
+        manager.checkpoint_slide(2, "content", Mock())
+        assert handle.closed
+        assert not manager.partial_file.exists()
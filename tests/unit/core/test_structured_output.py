@@ -0,0 +1,125 @@
+"""Unit tests for JSON-schema output rendered to Markdown locally."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from slide_extract.core.llm_client import LLMClient
+from slide_extract.core.mock_provider import MockChatServer, MockResponder
+from slide_extract.core.note_generator import NoteGenerator
+from slide_extract.core.section_repair import REQUIRED_SECTIONS, SLIDE_NARRATION, find_incomplete_sections
+from slide_extract.core.slide_packer import SlidePacker
+from slide_extract.core.structured_output import (
+    SCHEMA_NAME, AnalysisSchema, StructuredOutputError, derive_sections
+)
+
+PROMPT = (
+    "Analyze each slide.\n\n"
+    "**Slide Number:** The slide number.\n\n"
+    "**Slide Text:** Transcribe all text.\n\n"
+    "**Slide Equations:** Extract formulas as LaTeX.\n\n"
+    "**Slide Narration:** A lecturer's narration.\n"
+)
+
+NARRATION = "A lecturer explains how the pivot splits the array into two halves. " * 4
+
+SLIDE = {
+    "title": "Quicksort",
+    "slide_number": 9,
+    "slide_text": "Quicksort partitions around a pivot.",
+    "slide_equations": "",
+    "slide_images_diagrams": "Arrows from the pivot to both partitions.",
+    "slide_topics": ["Partitioning", "Recursion"],
+    "slide_narration": NARRATION,
+}
+
+
+class TestAnalysisSchema:
+    """Test schema derivation, validation and rendering."""
+
+    def test_sections_follow_prompt_and_include_required(self):
+        sections = derive_sections(PROMPT)
+        assert sections == [
+            "**Slide Number:**", "**Slide Text:**", "**Slide Equations:**",
+            "**Slide Images/Diagrams:**", "**Slide Topics:**", "**Slide Narration:**",
+        ]
+
+        schema = AnalysisSchema(sections).json_schema()
+        assert schema["required"] == list(SLIDE)
+        assert schema["additionalProperties"] is False
+        assert schema["properties"]["slide_topics"]["type"] == "array"
+
+    def test_render_passes_validation(self):
+        schema = AnalysisSchema.from_prompt(PROMPT)
+        rendered = schema.render(json.dumps(SLIDE), slide_numbers=[3])
+
+        assert rendered.startswith("#### Slide: Quicksort\n\n**Slide Number:** 3")
+        assert "**Slide Equations:**\n[None]" in rendered
+        assert "*   Partitioning\n*   Recursion" in rendered
+        assert find_incomplete_sections(rendered) == []
+
+    def test_packed_render_splits_per_slide(self):
+        schema = AnalysisSchema.from_prompt(PROMPT, packed=True)
+        response = "```json\n" + json.dumps({"slides": [SLIDE, dict(SLIDE, title="Merge sort")]}) + "\n```"
+
+        sections = SlidePacker.split_packed_response(schema.render(response, [4, 5]), [4, 5])
+        assert sections[5].startswith("#### Slide: Merge sort\n\n**Slide Number:** 5")
+
+    def test_invalid_responses_raise(self):
+        schema = AnalysisSchema.from_prompt(PROMPT)
+        with pytest.raises(StructuredOutputError, match="not valid JSON"):
+            schema.parse("**Slide Number:** 3")
+        with pytest.raises(StructuredOutputError, match="slide_narration"):
+            schema.parse(json.dumps({key: value for key, value in SLIDE.items() if key != "slide_narration"}))
+
+
+class TestStructuredRequests:
+    """Test the schema on provider requests and the locally rendered results."""
+
+    def test_provider_request_parameters(self):
+        schema = AnalysisSchema.from_prompt(PROMPT).json_schema()
+        openai = LLMClient({"provider": "openai", "model": "gpt-4o", "api_key": "k", "structured_output": True})
+        anthropic = LLMClient({"provider": "anthropic", "model": "claude-3", "api_key": "k"})
+        google = LLMClient({"provider": "google", "model": "gemini-1.5-pro", "api_key": "k"})
+        for client in (openai, anthropic, google):
+            client._request_state.schema = schema
+
+        assert openai._generation_params()["response_format"]["json_schema"]["schema"] == schema
+        assert anthropic._generation_params()["tool_choice"] == {"type": "tool", "name": SCHEMA_NAME}
+        config = google._google_generation_config()
+        assert config["response_mime_type"] == "application/json"
+        assert "additionalProperties" not in json.dumps(config["response_schema"])
+        assert openai.cache_model_id == "gpt-4o#structured"
+
+        blocks = [SimpleNamespace(type="tool_use", input=SLIDE)]
+        assert json.loads(LLMClient._anthropic_text(blocks)) == SLIDE
+
+    def test_stand_in_server_returns_json(self):
+        with MockChatServer(MockResponder()) as server:
+            client = LLMClient({
+                "provider": "openai_compatible", "model": "local-model", "base_url": server.base_url,
+                "structured_output": True,
+            })
+            client.client.chat.completions.create = Mock(wraps=client.client.chat.completions.create)
+
+            response = client.generate_slide_analysis("Quicksort partitions around a pivot.", PROMPT, 2)
+
+        assert client.client.chat.completions.create.call_args[1]["response_format"]["type"] == "json_schema"
+        assert all(section in response for section in REQUIRED_SECTIONS)
+        assert "**Slide Equations:**" in response
+
+    def test_repair_requests_only_missing_sections(self):
+        client = LLMClient({"provider": "mock", "model": "mock-1", "structured_output": True})
+        repair = client.generate_section_repair("Pivot", PROMPT, 3, "**Slide Number:** 3", [SLIDE_NARRATION])
+        assert repair.startswith(SLIDE_NARRATION) and "**Slide Text:**" not in repair
+
+    def test_mismatched_response_is_left_to_validation(self):
+        client = LLMClient({"provider": "mock", "model": "mock-1", "structured_output": True})
+        client._generate = Mock(return_value="Sorry, I cannot produce JSON.")
+        generator = NoteGenerator(client)
+
+        response = client.generate_slide_analysis("Pivot", PROMPT, 3)
+        assert response == "Sorry, I cannot produce JSON."
+        assert not generator._validate_generated_content(response, 3)
@@ -0,0 +1,123 @@
+"""Unit tests for per-request telemetry and its aggregated report."""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from slide_extract.core.llm_client import LLMClient, LLMError
+from slide_extract.core.note_generator import NoteGenerator
+from slide_extract.core.pdf_processor import SlideContent
+from slide_extract.core.response_cache import ResponseCache
+from slide_extract.core.retry_policy import RetryPolicy
+from slide_extract.core.telemetry import (
+    CACHED, FAILED, SUCCESS, TelemetryCollector, percentile, summarize_records
+)
+
+
+def mock_client(**mock_config):
+    return LLMClient({"provider": "mock", "model": "mock-1", "mock": mock_config})
+
+
+def generator(client, collector, **retry):
+    return NoteGenerator(
+        client, retry_policy=RetryPolicy(base_delay=0.01, max_delay=0.01, **retry), telemetry=collector
+    )
+
+
+def progress(file_path="deck.pdf"):
+    manager = Mock()
+    manager.output_path = None
+    manager.file_path = file_path
+    return manager
+
+
+SLIDES = {
+    1: SlideContent(1, "Introduction to sorting", image_base64="aGVsbG8gd29ybGQ="),
+    2: SlideContent(2, "Quicksort partitioning"),
+}
+
+
+class TestPercentile:
+    """Test the percentile helper."""
+
+    def test_interpolates(self):
+        assert percentile([1, 2, 3, 4], 50) == pytest.approx(2.5)
+        assert percentile([5], 99) == 5
+        assert percentile([], 50) == 0.0
+
+
+class TestTelemetryCollector:
+    """Test record construction from tracked calls."""
+
+    def test_records_usage_latency_and_images(self):
+        collector = TelemetryCollector()
+        generator(mock_client(latency={"mean": 0.05}), collector) \
+            .generate_notes_for_slide_contents_resumable(SLIDES, "Analyze", progress())
+
+        first, second = collector.records
+        assert (first.deck, first.slides, first.outcome) == ("deck.pdf", [1], SUCCESS)
+        assert (first.provider, first.model) == ("mock", "mock-1")
+        assert first.image_bytes == 11
+        assert second.image_bytes == 0
+        assert first.input_tokens > 0 and first.output_tokens > 0
+        assert first.latency >= 0.05
+        assert first.attempts == 1 and first.retries == 0
+
+    def test_retries_and_queue_wait(self):
+        collector = TelemetryCollector()
+        client = mock_client(rate_limit_rate=1.0, retry_after=0)
+        notes = generator(client, collector, max_retries=2)
+
+        with pytest.raises(LLMError):
+            notes._request_with_retry(
+                lambda: client.generate_slide_analysis("text", "prompt", 1), "Slide 1 request", [1]
+            )
+
+        [record] = collector.records
+        assert record.outcome == FAILED
+        assert record.error_kind == "rate_limit"
+        assert record.attempts == 3
+        assert record.retries == 2
+        assert record.queue_wait > 0
+
+    def test_cache_hits(self, temp_dir):
+        collector = TelemetryCollector()
+        client = LLMClient(
+            {"provider": "mock", "model": "mock-1"},
+            response_cache=ResponseCache(cache_path=temp_dir / "cache.sqlite3", mode="read"),
+        )
+        notes = generator(client, collector)
+        for _ in range(2):
+            notes._request_with_retry(
+                lambda: client.generate_slide_analysis("text", "prompt", 1), "Slide 1 request", [1]
+            )
+
+        assert [record.outcome for record in collector.records] == [SUCCESS, CACHED]
+        assert collector.records[1].attempts == 0
+
+
+class TestReport:
+    """Test aggregation per deck and batch."""
+
+    def test_report_per_deck_and_batch(self, temp_dir):
+        collector = TelemetryCollector()
+        client = mock_client()
+        for deck in ("a.pdf", "b.pdf"):
+            generator(client, collector).generate_notes_for_slide_contents_resumable(
+                SLIDES, "Analyze", progress(deck)
+            )
+
+        report = collector.write_report(temp_dir / "telemetry.json")
+        assert json.loads((temp_dir / "telemetry.json").read_text()) == report
+        assert report["batch"]["requests"] == 4
+        assert report["batch"]["outcomes"] == {SUCCESS: 4}
+        assert report["batch"]["models"] == {"mock/mock-1": 4}
+        assert set(report["decks"]) == {"a.pdf", "b.pdf"}
+        assert report["decks"]["a.pdf"]["slides"] == 2
+        assert set(report["batch"]["latency"]) == {"p50", "p90", "p95", "p99", "max", "mean"}
+
+    def test_empty_summary(self):
+        summary = summarize_records([])
+        assert summary["requests"] == 0
+        assert summary["latency"]["p95"] == 0.0